@@ -1,5 +1,8 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
 from odoo import fields, models
 from odoo.exceptions import UserError
 
@@ -7,7 +10,7 @@ from odoo.addons.ecommerce_bigcommerce import const
 from odoo.addons.ecommerce_bigcommerce.utils.bigcommerce_request import (
     BigcommerceRequest,
 )
-from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils import ECommerceAccountWideError, ECommerceApiError
 
 bigcommerce_request_handler = BigcommerceRequest()
 
@@ -133,29 +136,71 @@ class ecommerceAccount(models.Model):
     def _fetch_orders_from_ecommerce(self):
         if self.channel_code != 'bigcommerce':
             return super()._fetch_orders_from_ecommerce()
+        result = {'orders': []}
+        for orders_page in self._fetch_orders_pages_from_ecommerce():
+            result['orders'].extend(orders_page)
+        return result
+
+    def _fetch_orders_pages_from_ecommerce(self):
+        if self.channel_code != 'bigcommerce':
+            return super()._fetch_orders_pages_from_ecommerce()
+        return self._bigcommerce_iter_orders_pages()
+
+    def _bigcommerce_iter_orders_pages(self):
         params = {
-            'min_date_modified': self.last_orders_sync.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'min_date_modified': self._get_orders_sync_date().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'sort': 'date_modified:asc',
             'include': 'consignments, consignments.line_items',
         }
-        response = bigcommerce_request_handler.request(
-            ecommerce_account=self,
-            method='GET',
-            version='v2',
-            endpoint='orders',
-            params=params,
-        )
-        if isinstance(response, dict) and 'errors' in response:
-            raise ECommerceApiError(response.get('errors'))
-        is_valid_response = response and len(response) > 0
-        if not is_valid_response:
-            return {'orders': []}
-        result = {'orders': []}
-        for order in response:
-            order_data = self._prepare_order_structure(order)
-            if not order_data:
-                continue
-            result['orders'].append(order_data)
-        return result
+        if date_to := self._get_orders_sync_date_to():
+            params['max_date_modified'] = date_to.strftime('%Y-%m-%dT%H:%M:%SZ')
+        for response in bigcommerce_request_handler.iter_orders_pages(self, params=params):
+            if isinstance(response, dict) and 'errors' in response:
+                raise ECommerceApiError(response.get('errors'))
+            self.env['ecommerce.order.archive']._archive(self, [
+                (order['id'], order) for order in response if order.get('status_id', 0) != 0
+            ])
+            orders_page = []
+            for order in response:
+                order_data = self._prepare_order_structure(order)
+                if not order_data:
+                    continue
+                orders_page.append(order_data)
+            yield orders_page
+
+    def _fetch_order_stamps_from_ecommerce(self, date_from):
+        if self.channel_code != 'bigcommerce':
+            return super()._fetch_order_stamps_from_ecommerce(date_from)
+        # The v2 orders list cannot select fields, but without the consignments and with the
+        # largest pages it still costs a fraction of the calls of `_bigcommerce_iter_orders_pages`.
+        params = {
+            'min_date_modified': date_from.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'limit': 250,
+        }
+        order_stamps = []
+        for response in bigcommerce_request_handler.iter_orders_pages(self, params=params):
+            if isinstance(response, dict) and 'errors' in response:
+                raise ECommerceApiError(response.get('errors'))
+            order_stamps += [
+                {
+                    'id': str(order['id']),
+                    'order_ref': str(order['id']),
+                    'write_date': self._bigcommerce_convert_date(order.get('date_modified')),
+                }
+                for order in response
+                if order.get('status_id', 0) != 0
+            ]
+        return order_stamps
+
+    def _bigcommerce_convert_date(self, bigcommerce_date):
+        """Convert a RFC 2822 date of BigCommerce, e.g. 'Tue, 20 Nov 2012 00:00:00 +0000', to the Odoo format."""
+        if not bigcommerce_date:
+            return False
+        try:
+            date = parsedate_to_datetime(bigcommerce_date)
+        except (TypeError, ValueError):
+            return False
+        return fields.Datetime.to_string(date.astimezone(timezone.utc).replace(tzinfo=None))
 
     def _fetch_order_from_ecommerce_by_order_ref(self, ecommerce_order_ref):
         if self.channel_code != 'bigcommerce':
@@ -171,6 +216,12 @@ class ecommerceAccount(models.Model):
             raise ECommerceApiError(order.get('errors'))
         return self._prepare_order_structure(order)
 
+    def _normalize_archived_order(self, payload):
+        if self.channel_code != 'bigcommerce':
+            return super()._normalize_archived_order(payload)
+        # The shipments are not part of the order payload and are still fetched from BigCommerce.
+        return self._prepare_order_structure(payload)
+
     def _prepare_order_structure(self, order):
         """ Prepare order structure for BigCommerce order creation """
         if order.get('status_id', 0) == 0:
@@ -201,6 +252,7 @@ class ecommerceAccount(models.Model):
             'customer_id': order.get('customer_id'),
             'create_date': order.get('date_created'),
             'update_date': order.get('date_modified'),
+            'write_date': self._bigcommerce_convert_date(order.get('date_modified')),
             "date_order": order.get("date_created"),
             'currency_code': order.get('currency_code'),
             'fulfillments': self._prepare_fulfillment(order),
@@ -433,6 +485,11 @@ class ecommerceAccount(models.Model):
 
         return {}
 
+    def _get_api_secrets(self):
+        if self.channel_code != 'bigcommerce':
+            return super()._get_api_secrets()
+        return [self.bigcommerce_access_token] if self.bigcommerce_access_token else []
+
     def _get_product_url(self, offer):
         if self.channel_code != 'bigcommerce':
             return super()._get_product_url(offer)
@@ -444,22 +501,44 @@ class ecommerceAccount(models.Model):
         if self.channel_code != 'bigcommerce':
             return super()._update_pickings_to_ecommerce(pickings)
 
-        for picking in pickings:
+        # BigCommerce has no bulk shipment endpoint: the order is marked as shipped and its
+        # consignments are fetched once per order, then a shipment is created per picking.
+        for bigcommerce_order_id, order_pickings in self._group_pickings_by_order(pickings):
+            pickings_to_ship = self.env['stock.picking']
+            for picking in order_pickings:
+                if not bigcommerce_order_id or not picking.carrier_tracking_ref:
+                    self._post_process_after_picking_update_failed(
+                        picking, self.env._("Missing BigCommerce order ID or tracking number."),
+                    )
+                else:
+                    pickings_to_ship |= picking
+            if not pickings_to_ship:
+                continue
             try:
-                fulfillment = self._update_picking_to_bigcommerce(picking)
+                order_address_id, items_payload = self._ship_order_to_bigcommerce(bigcommerce_order_id)
+            except ECommerceAccountWideError:
+                raise
             except ECommerceApiError as error:
-                self._post_process_after_picking_update_failed(picking, error)
-            else:
-                self._post_process_after_picking_update_success(picking, fulfillment.get('id'))
-
-    def _update_picking_to_bigcommerce(self, pickings):
-        bigcommerce_order_id = pickings.ecommerce_order_identifier
-        carrier_name = pickings.carrier_id.name.lower() if pickings.carrier_id else ""
-        tracking_number = pickings.carrier_tracking_ref
-
-        if not bigcommerce_order_id or not tracking_number:
-            raise ECommerceApiError(self.env._("Missing BigCommerce order ID or tracking number."))
-
+                for picking in pickings_to_ship:
+                    self._post_process_after_picking_update_failed(picking, error)
+                continue
+            for picking in pickings_to_ship:
+                try:
+                    fulfillment = self._update_picking_to_bigcommerce(picking, order_address_id, items_payload)
+                except ECommerceAccountWideError:
+                    raise
+                except ECommerceApiError as error:
+                    self._post_process_after_picking_update_failed(picking, error)
+                else:
+                    self._post_process_after_picking_update_success(picking, fulfillment.get('id'))
+
+    def _ship_order_to_bigcommerce(self, bigcommerce_order_id):
+        """Mark the order as shipped and return what its shipments need.
+
+        :param str bigcommerce_order_id: The BigCommerce identifier of the order.
+        :return: The id of the first shipping address of the order and the items of its consignments.
+        :rtype: tuple(int, list)
+        """
         # Update order status to "Shipped" (status_id=2)
         update_payload = {"status_id": 2}
         update_response = bigcommerce_request_handler.request(
@@ -499,7 +578,18 @@ class ecommerceAccount(models.Model):
 
         if not order_address_id:
             raise ECommerceApiError(self.env._("No shipping address found for creating shipment."))
+        return order_address_id, items_payload
 
+    def _update_picking_to_bigcommerce(self, picking, order_address_id, items_payload):
+        """Create the shipment of the picking on its order.
+
+        :param recordset picking: The picking, as a `stock.picking` record.
+        :param int order_address_id: The shipping address of the order, see `_ship_order_to_bigcommerce`.
+        :param list items_payload: The items to ship, see `_ship_order_to_bigcommerce`.
+        :return: The created shipment.
+        :rtype: dict
+        """
+        carrier_name = picking.carrier_id.name.lower() if picking.carrier_id else ""
         if carrier_name in [
             'auspost', 'canadapost', 'endicia', 'usps', 'fedex', 'royalmail',
             'ups', 'upsready', 'shipperhq',
@@ -511,7 +601,7 @@ class ecommerceAccount(models.Model):
         # Create shipment
         shipment_payload = {
             'order_address_id': order_address_id,
-            'tracking_number': tracking_number,
+            'tracking_number': picking.carrier_tracking_ref,
             'shipping_provider': shipping_provider,
             'items': items_payload,
         }
@@ -520,7 +610,7 @@ class ecommerceAccount(models.Model):
             ecommerce_account=self,
             method='POST',
             version='v2',
-            endpoint=f'orders/{bigcommerce_order_id}/shipments',
+            endpoint=f'orders/{picking.ecommerce_order_identifier}/shipments',
             payload=shipment_payload,
         )
 
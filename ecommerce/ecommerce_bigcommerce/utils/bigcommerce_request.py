@@ -4,6 +4,9 @@ import logging
 
 import requests
 
+from odoo.addons.odoo_ecommerce.utils.pipeline import prefetch_pages
+from odoo.addons.odoo_ecommerce.utils.request import ecommerce_request, get_account_ref
+
 TIMEOUT = 30
 LIMIT = 40
 
@@ -13,18 +16,11 @@ _logger = logging.getLogger(__name__)
 class BigcommerceRequest:
 
     def request(self, ecommerce_account, version, endpoint, method, params={}, payload={}):
-        store_hash = ecommerce_account.bigcommerce_store_hash
-        access_token = ecommerce_account.bigcommerce_access_token
-        if not (store_hash and access_token):
-            _logger.error("Required credentials are not set yet.")
+        request_url, headers = self._get_request_url_and_headers(ecommerce_account, version, endpoint)
+        if not request_url:
             return {
                 "errors": "Required credentials are not set yet.",
             }
-        request_url = f"https://api.bigcommerce.com/stores/{store_hash}/{version}/{endpoint}"
-        headers = {
-            'X-Auth-Token': access_token,
-            'Accept': 'application/json',
-        }
         params = dict(params)  # copy to avoid modifying caller dict
         params.setdefault("limit", LIMIT)
         params.setdefault('page', 1)
@@ -33,16 +29,54 @@ class BigcommerceRequest:
             parts = endpoint.strip('/').split('/')
             if len(parts) == 1:
                 # /orders → list of orders
-                return self._fetch_all_orders(request_url, headers, params, method, payload)
+                return self._fetch_all_orders(request_url, headers, params, method, payload, ecommerce_account)
 
             if len(parts) == 2:
                 # /orders/{id} → single order
-                return self._fetch_single_object(request_url, headers, params, method, payload)
+                return self._fetch_single_object(request_url, headers, params, method, payload, ecommerce_account)
 
             # e.g. /orders/{id}/shipments → list of shipments (no pagination metadata in v2)
-            return self._fetch_all_orders(request_url, headers, params, method, payload)
+            return self._fetch_all_orders(request_url, headers, params, method, payload, ecommerce_account)
+
+        return self._fetch_with_meta(request_url, headers, params, method, payload, ecommerce_account)
+
+    def iter_orders_pages(self, ecommerce_account, params={}):
+        """Yield the v2 orders list page by page.
+
+        The next page is downloaded in a background thread while the current page is being processed
+        by the caller. If a page cannot be fetched, an error dictionary is yielded in place of the page.
+        """
+        request_url, headers = self._get_request_url_and_headers(ecommerce_account, 'v2', 'orders')
+        if not request_url:
+            yield {"errors": "Required credentials are not set yet."}
+            return
+        params = dict(params)  # copy to avoid modifying caller dict
+        params.setdefault("limit", LIMIT)
+        account_ref = get_account_ref(ecommerce_account)  # The record must not be used from the I/O thread.
+
+        def fetch_page(page):
+            data, has_next_page = self._fetch_orders_page(
+                request_url, headers, {**params, 'page': page}, 'GET', {}, account_ref,
+            )
+            return data, page + 1 if has_next_page else None
 
-        return self._fetch_with_meta(request_url, headers, params, method, payload)
+        yield from prefetch_pages(fetch_page, params.get('page', 1))
+
+    def _get_request_url_and_headers(self, ecommerce_account, version, endpoint):
+        store_hash = ecommerce_account.bigcommerce_store_hash
+        access_token = ecommerce_account.bigcommerce_access_token
+        if not (store_hash and access_token):
+            _logger.error("Required credentials are not set yet.")
+            return None, None
+        # Overridable with the `ecommerce_api_url` context key, e.g. to run the sync flows against
+        # the local `BigCommerceMockServer` of `odoo_ecommerce.tools.mock_platforms`.
+        api_url = ecommerce_account.env.context.get('ecommerce_api_url') or 'https://api.bigcommerce.com'
+        request_url = f"{api_url.rstrip('/')}/stores/{store_hash}/{version}/{endpoint}"
+        headers = {
+            'X-Auth-Token': access_token,
+            'Accept': 'application/json',
+        }
+        return request_url, headers
 
     def oauth_request(self, method, params={}, payload={}, headers={}):
         """Handles OAuth specific requests."""
@@ -70,7 +104,7 @@ class BigcommerceRequest:
 
         return data
 
-    def _fetch_with_meta(self, url, headers, params, method, payload):
+    def _fetch_with_meta(self, url, headers, params, method, payload, ecommerce_account=None):
         """Handles APIs that return meta or response in object"""
         combined_data = []
         meta_info = None
@@ -83,6 +117,7 @@ class BigcommerceRequest:
                 headers=headers,
                 payload=payload,
                 timeout=TIMEOUT,
+                ecommerce_account=ecommerce_account,
             )
 
             if not response:
@@ -116,57 +151,74 @@ class BigcommerceRequest:
 
         return {'data': combined_data, 'meta': meta_info}
 
-    def _fetch_all_orders(self, url, headers, params, method, payload):
+    def _fetch_all_orders(self, url, headers, params, method, payload, ecommerce_account=None):
         """Handles v2 orders API pagination (no meta, returns plain list)."""
         all_orders = []
 
         while True:
-            response = self.make_api_call(
-                method=method,
-                url=url,
-                params=params,
-                headers=headers,
-                payload=payload,
-                timeout=TIMEOUT,
-            )
+            data, has_next_page = self._fetch_orders_page(url, headers, params, method, payload, ecommerce_account)
+            if isinstance(data, dict):
+                return data
+            all_orders.extend(data)
+            if not has_next_page:
+                break
+            params['page'] += 1
 
-            if not response:
-                return {'errors': "Unexpected error. Please report this to your administrator."}
+        return all_orders
 
-            try:
-                data = response.json()
-            except ValueError:
-                # If decoding fails, it could mean no content (204) or bad response
-                if response.status_code == 204 or not response.text.strip():
-                    break  # no more orders, stop gracefully
-                return {'errors': "Failed to decode JSON from Orders API response."}
+    def _fetch_orders_page(self, url, headers, params, method, payload, ecommerce_account=None):
+        """Fetch a single page of the v2 orders API.
 
-            if not isinstance(data, list):
-                return {'errors': "Unexpected response format for orders API."}
+        Only uses the given arguments, so it can be called from an I/O thread.
 
-            if not data:
-                break  # no more orders
+        :return: The orders of the page (or an error dictionary) and whether a next page exists.
+        :rtype: tuple
+        """
+        response = self.make_api_call(
+            method=method,
+            url=url,
+            params=params,
+            headers=headers,
+            payload=payload,
+            timeout=TIMEOUT,
+            ecommerce_account=ecommerce_account,
+        )
 
-            all_orders.extend(data)
+        if not response:
+            return {'errors': "Unexpected error. Please report this to your administrator."}, False
+
+        try:
+            data = response.json()
+        except ValueError:
+            # If decoding fails, it could mean no content (204) or bad response
+            if response.status_code == 204 or not response.text.strip():
+                return [], False  # no more orders, stop gracefully
+            return {'errors': "Failed to decode JSON from Orders API response."}, False
 
-            if len(data) < params.get('limit', LIMIT):
-                break  # last page (didn't hit full limit)
+        if not isinstance(data, list):
+            return {'errors': "Unexpected response format for orders API."}, False
 
-            params['page'] += 1
+        # last page when empty or when it didn't hit full limit
+        return data, len(data) >= params.get('limit', LIMIT)
 
-        return all_orders
+    def make_api_call(self, method, url, params, headers, timeout, payload={}, ecommerce_account=None):
+        """Send the request, guarded by the circuit breaker of `ecommerce_account` when given.
 
-    def make_api_call(self, method, url, params, headers, timeout, payload={}):
+        Account-wide failures are raised as `ECommerceAccountWideError`, other failures are logged
+        and the (possibly empty) response is returned.
+        """
         response = None
+        request_kwargs = {
+            'params': params,
+            'headers': headers,
+            'timeout': timeout,
+            'json': payload if payload else None,
+        }
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                params=params,
-                headers=headers,
-                timeout=timeout,
-                json=payload if payload else None,
-            )
+            if ecommerce_account:
+                response = ecommerce_request(ecommerce_account, method, url, **request_kwargs)
+            else:
+                response = requests.request(method=method, url=url, **request_kwargs)
             response.raise_for_status()
             return response
         except (ValueError, requests.exceptions.ConnectionError, requests.exceptions.MissingSchema,
@@ -174,7 +226,7 @@ class BigcommerceRequest:
             _logger.error("API request failed: %s", ex)
             return response
 
-    def _fetch_single_object(self, url, headers, params, method, payload):
+    def _fetch_single_object(self, url, headers, params, method, payload, ecommerce_account=None):
         """Handles single order fetch (returns an object, not a list)."""
         response = self.make_api_call(
             method=method,
@@ -183,6 +235,7 @@ class BigcommerceRequest:
             headers=headers,
             payload=payload,
             timeout=TIMEOUT,
+            ecommerce_account=ecommerce_account,
         )
 
         if not response:
@@ -20,3 +20,5 @@ DELIVERY_CARRIER_MAPPING = {
     "ups": "UPS US",
     "usps": "USPS International",
 }
+# Number of shipments whose items are fetched per `/shipments` search after pushing the pickings
+SHIPMENTS_FETCH_BATCH_SIZE = 50
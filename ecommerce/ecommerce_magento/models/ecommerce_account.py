@@ -4,9 +4,10 @@ from collections import defaultdict
 
 from odoo import api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import split_every
 
 from odoo.addons.ecommerce_magento import const, utils as magento_utils
-from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils import ECommerceAccountWideError, ECommerceApiError
 
 
 class EcommerceAccount(models.Model):
@@ -172,14 +173,15 @@ class EcommerceAccount(models.Model):
             "searchCriteria[filterGroups][2][filters][0][value]": self.last_products_sync.strftime("%Y-%m-%d %H:%M:%S"),
             "fields": "total_count,items[id,name,sku,price,status,type_id,updated_at,extension_attributes[website_ids]]",
         }
-        magento_products = magento_utils.make_paginated_request(self, "GET", "/products", params)
+        # The products are decoded one by one from the responses while they are synchronized.
+        magento_products = magento_utils.iter_paginated_request(self, "GET", "/products", params)
         return {
-            "products": [
+            "products": (
                 self._magento_prepare_product_structure(magento_product)
                 for magento_product in magento_products
                 if not self.magento_website_id or self.magento_website_id in
                 magento_product.get("extension_attributes", {}).get("website_ids", [])
-            ],
+            ),
         }
 
     def _fetch_locations_from_ecommerce(self):
@@ -200,6 +202,29 @@ class EcommerceAccount(models.Model):
             } for magento_location in magento_locations],
         }
 
+    def _fetch_order_stamps_from_ecommerce(self, date_from):
+        """Override for magento accounts to fetch only the identifiers and update dates of the orders."""
+        if self.channel_code != "magento":
+            return super()._fetch_order_stamps_from_ecommerce(date_from)
+        params = {
+            "searchCriteria[filterGroups][0][filters][0][field]": "updated_at",
+            "searchCriteria[filterGroups][0][filters][0][conditionType]": "from",
+            "searchCriteria[filterGroups][0][filters][0][value]": date_from.strftime("%Y-%m-%d %H:%M:%S"),
+            "fields": "items[entity_id,increment_id,updated_at],total_count",
+        }
+        if self.magento_store_view_id:
+            params.update({
+                "searchCriteria[filterGroups][1][filters][0][field]": "store_id",
+                "searchCriteria[filterGroups][1][filters][0][conditionType]": "eq",
+                "searchCriteria[filterGroups][1][filters][0][value]": self.magento_store_view_id,
+            })
+        magento_orders = magento_utils.make_paginated_request(self, "GET", "/orders", params, page_size=500)
+        return [{
+            "id": str(order_data["entity_id"]),
+            "order_ref": order_data["increment_id"],
+            "write_date": order_data["updated_at"],
+        } for order_data in magento_orders]
+
     def _fetch_order_from_ecommerce_by_order_ref(self, ecommerce_order_ref):
         """Override for magento accounts to fetch a single order by its Order Reference."""
         if self.channel_code != "magento":
@@ -227,7 +252,9 @@ class EcommerceAccount(models.Model):
         params = {
             "searchCriteria[filterGroups][0][filters][0][field]": "updated_at",
             "searchCriteria[filterGroups][0][filters][0][conditionType]": "from",
-            "searchCriteria[filterGroups][0][filters][0][value]": self.last_orders_sync.strftime("%Y-%m-%d %H:%M:%S"),
+            "searchCriteria[filterGroups][0][filters][0][value]": self._get_orders_sync_date().strftime("%Y-%m-%d %H:%M:%S"),
+            "searchCriteria[sortOrders][0][field]": "updated_at",
+            "searchCriteria[sortOrders][0][direction]": "ASC",
         }
         if self.magento_store_view_id:
             params.update({
@@ -235,6 +262,14 @@ class EcommerceAccount(models.Model):
                 "searchCriteria[filterGroups][1][filters][0][conditionType]": "eq",
                 "searchCriteria[filterGroups][1][filters][0][value]": self.magento_store_view_id,
             })
+        if date_to := self._get_orders_sync_date_to():
+            # The filters of a group are combined with OR, the groups with AND.
+            group = 2 if self.magento_store_view_id else 1
+            params.update({
+                f"searchCriteria[filterGroups][{group}][filters][0][field]": "updated_at",
+                f"searchCriteria[filterGroups][{group}][filters][0][conditionType]": "to",
+                f"searchCriteria[filterGroups][{group}][filters][0][value]": date_to.strftime("%Y-%m-%d %H:%M:%S"),
+            })
         magento_orders = magento_utils.make_paginated_request(self, "GET", "/orders", params)
         if not magento_orders:
             return {"orders": []}
@@ -243,6 +278,12 @@ class EcommerceAccount(models.Model):
         shipments_by_order = defaultdict(list)
         for shipment in orders_related_resources["shipments"]:
             shipments_by_order[shipment["order_id"]].append(shipment)
+        self.env["ecommerce.order.archive"]._archive(self, [
+            (order_data["entity_id"], {
+                "order": order_data,
+                "shipments": shipments_by_order.get(order_data["entity_id"], []),
+            }) for order_data in magento_orders
+        ])
         return {
             "orders": [
                 self._magento_prepare_order_structure(
@@ -252,10 +293,18 @@ class EcommerceAccount(models.Model):
             ],
         }
 
+    def _normalize_archived_order(self, payload):
+        """Override for magento accounts to prepare an archived order with its shipments."""
+        if self.channel_code != "magento":
+            return super()._normalize_archived_order(payload)
+        return self._magento_prepare_order_structure(payload["order"], payload["shipments"])
+
     def _update_pickings_to_ecommerce(self, pickings):
         """Override for magento accounts to create shipments from given pickings."""
         if self.channel_code != "magento":
             return super()._update_pickings_to_ecommerce(pickings)
+        delivery_carrier_odoo_to_magento = {v: k for k, v in const.DELIVERY_CARRIER_MAPPING.items()}
+        pickings_by_shipment_id = {}
         for picking in pickings:
             payload = {
                 "items": [],
@@ -277,7 +326,6 @@ class EcommerceAccount(models.Model):
                     "No moves found in delivery that can be sent to Magento."))
                 continue
             if picking.carrier_id and picking.carrier_tracking_ref:
-                delivery_carrier_odoo_to_magento = {v: k for k, v in const.DELIVERY_CARRIER_MAPPING.items()}
                 payload["tracks"] = [{
                     "carrier_code": delivery_carrier_odoo_to_magento.get(picking.carrier_id.name, "custom"),
                     "title": picking.carrier_id.name or "Custom Delivery",
@@ -290,34 +338,58 @@ class EcommerceAccount(models.Model):
                         "source_code": ec_location[0].ecommerce_location_identifier,
                     },
                 }
-            shipment_id = None
             try:
                 shipment_id = magento_utils.make_request(
                     self, "POST", f"/order/{picking.sale_id.ecommerce_order_identifier}/ship", payload=payload)
-                self._post_process_after_picking_update_success(picking, shipment_id)
+            except ECommerceAccountWideError:
+                self._magento_update_moves_from_shipments(pickings_by_shipment_id)
+                raise
             except ECommerceApiError as e:
                 self._post_process_after_picking_update_failed(picking, str(e))
                 continue
+            self._post_process_after_picking_update_success(picking, shipment_id)
+            pickings_by_shipment_id[str(shipment_id)] = picking
+        self._magento_update_moves_from_shipments(pickings_by_shipment_id)
+
+    def _magento_update_moves_from_shipments(self, pickings_by_shipment_id):
+        """Link the moves of the pushed pickings to the items of their Magento shipment.
+
+        The items of all the shipments are fetched at once from `/shipments`, rather than with one
+        `/shipment/{id}` request per picking.
+
+        :param dict pickings_by_shipment_id: The pushed pickings, by the id of their Magento shipment.
+        :return: None
+        """
+        for shipment_ids in split_every(const.SHIPMENTS_FETCH_BATCH_SIZE, pickings_by_shipment_id):
             try:
-                # NOTE: according to API docs, /shipment/{id} is supposed to return the shipment object but it actually returns a list of shipment items
-                shipment_items = magento_utils.make_paginated_request(self, "GET", f"/shipment/{shipment_id}")
+                shipments = magento_utils.make_paginated_request(self, "GET", "/shipments", params={
+                    "searchCriteria[filterGroups][0][filters][0][field]": "entity_id",
+                    "searchCriteria[filterGroups][0][filters][0][conditionType]": "in",
+                    "searchCriteria[filterGroups][0][filters][0][value]": ",".join(shipment_ids),
+                })
             except ECommerceApiError as e:
                 self.log_xml(
-                    message="Failed to fetch shipment items for shipment %s after creating it on Magento: %s" % (shipment_id, str(e)),
+                    message="Failed to fetch shipment items for shipments %s after creating them on Magento: %s" % (", ".join(shipment_ids), str(e)),
                     func='_update_pickings_to_ecommerce',
                     type='server',
                 )
                 continue
-            for shipment_item in shipment_items:
-                move = picking.move_ids.filtered(
-                    lambda move: move.sale_line_id.ecommerce_line_identifier == str(shipment_item["order_item_id"])
-                )[0]
-                move.ecommerce_move_identifier = shipment_item["entity_id"]
-                if move.quantity != shipment_item["qty"]:
-                    picking.message_post(body=self.env._(
-                        "The Magento shipment item with ID '%s' linked to '%s' move was created with a "
-                        "different quantity than the move.", shipment_item["entity_id"], move.reference)
-                    )
+            for shipment in shipments:
+                picking = pickings_by_shipment_id.get(str(shipment["entity_id"]))
+                if not picking:
+                    continue
+                for shipment_item in shipment.get("items", []):
+                    move = picking.move_ids.filtered(
+                        lambda move: move.sale_line_id.ecommerce_line_identifier == str(shipment_item["order_item_id"])
+                    )[:1]
+                    if not move:
+                        continue
+                    move.ecommerce_move_identifier = shipment_item["entity_id"]
+                    if move.quantity != shipment_item["qty"]:
+                        picking.message_post(body=self.env._(
+                            "The Magento shipment item with ID '%s' linked to '%s' move was created with a "
+                            "different quantity than the move.", shipment_item["entity_id"], move.reference)
+                        )
 
     def _update_inventory_to_ecommerce(self, inventory_data):
         """Override for magento accounts to update stock of given products."""
@@ -333,6 +405,18 @@ class EcommerceAccount(models.Model):
         }
         return magento_utils.make_request(self, "POST", "/inventory/source-items", payload=payload)
 
+    def _get_api_secrets(self):
+        if self.channel_code != "magento":
+            return super()._get_api_secrets()
+        return [secret for secret in (
+            self.magento_admin_password,
+            self.magento_admin_access_token,
+            self.magento_oauth_consumer_key,
+            self.magento_oauth_consumer_secret,
+            self.magento_oauth_access_token,
+            self.magento_oauth_access_token_secret,
+        ) if secret]
+
     def _magento_fetch_orders_related_resources(self, magento_order_ids):
         """Fetch shipments for the given Magento orders."""
         params = {
@@ -13,6 +13,8 @@ import uuid
 
 from odoo.tools.urls import urljoin as url_join
 from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils.json_stream import iter_response_json_array
+from odoo.addons.odoo_ecommerce.utils.request import ecommerce_request
 
 _logger = logging.getLogger(__name__)
 
@@ -103,6 +105,33 @@ def make_paginated_request(ec_account, method, route, params=None, page_size=100
     return items
 
 
+def iter_paginated_request(ec_account, method, route, params=None, page_size=100, current_page=1):
+    """Same as `make_paginated_request`, but yield the items as they are decoded from the responses
+    instead of loading all of them in memory."""
+    count_items = 0
+    while True:
+        page_params = {
+            **(params or {}),
+            "searchCriteria[pageSize]": page_size,
+            "searchCriteria[currentPage]": current_page,
+        }
+        response = send_request(ec_account, method, route, page_params, stream=True)
+        page_values = {}
+        count_page_items = 0
+        try:
+            for item in iter_response_json_array(response, key="items", other_values=page_values):
+                count_page_items += 1
+                yield item
+        except json.JSONDecodeError as e:
+            _logger.exception("Failed to decode JSON response from Magento.")
+            raise ECommerceApiError(f"Failed to decode JSON response from Magento: {e}") from e
+        count_items += count_page_items
+        # Magento answers the last page again when asked for a page past the end.
+        if not count_page_items or count_items >= (page_values.get("total_count") or 0):
+            break
+        current_page += 1
+
+
 def make_request(ec_account, method, route, params=None, payload=None, **kwargs):
     """Send a request to the Magento REST API.
 
@@ -115,6 +144,21 @@ def make_request(ec_account, method, route, params=None, payload=None, **kwargs)
     :rtype dict
     :return: The JSON response from Magento or an error dictionary.
     """
+    response = send_request(ec_account, method, route, params, payload, **kwargs)
+    try:
+        return response.json()
+    except ValueError as e:
+        _logger.exception("Failed to decode JSON response from Magento.")
+        raise ECommerceApiError(f"Failed to decode JSON response from Magento: {e}") from e
+
+
+def send_request(ec_account, method, route, params=None, payload=None, stream=False, **kwargs):
+    """Send a request to the Magento REST API and return the successful response.
+
+    :param stream: Whether the body should only be downloaded when it is read from the response.
+    See `make_request` for the other parameters.
+    :rtype: requests.Response
+    """
     base_url = ec_account.magento_base_url.rstrip("/")  # Ensure no trailing slash
     # URL WITHOUT query (for signing)
     signing_url = url_join(base_url, f"rest/V1{route}")
@@ -141,16 +185,17 @@ def make_request(ec_account, method, route, params=None, payload=None, **kwargs)
         )
     try:
         # Magento REST API version: 2.4.8-admin
-        response = requests.request(method, request_url, headers=headers,  # params=params
-            json=payload, timeout=REQUEST_TIMEOUT)
+        response = ecommerce_request(ec_account, method, request_url, headers=headers,  # params=params
+            json=payload, timeout=REQUEST_TIMEOUT, stream=stream,
+            retry_count=0 if kwargs.get("refresh_token_on_401", True) else 1)
         response.raise_for_status()
-        return response.json()
+        return response
     except requests.exceptions.HTTPError as e:
         if ec_account.magento_auth_method == "token" and e.response.status_code == 401 and kwargs.get("refresh_token_on_401", True):
             _logger.exception("Unauthorized access to Magento API. Will try to fetch a new token if this is due to expired token.")
             access_token = get_admin_access_token(base_url, ec_account.magento_admin_username, ec_account.magento_admin_password)
             ec_account.magento_admin_access_token = access_token
-            return make_request(ec_account, method, route, params, payload, refresh_token_on_401=False)
+            return send_request(ec_account, method, route, params, payload, stream=stream, refresh_token_on_401=False)
         message = e.response.text
         with contextlib.suppress(json.JSONDecodeError):
             message = e.response.json().get("message") or message
@@ -161,6 +206,3 @@ def make_request(ec_account, method, route, params=None, payload=None, **kwargs)
     except requests.exceptions.RequestException as e:
         _logger.exception("Error calling Magento API")
         raise ECommerceApiError(f"Error calling Magento API: {e}") from e
-    except json.JSONDecodeError as e:
-        _logger.exception("Failed to decode JSON response from Magento.")
-        raise ECommerceApiError(f"Failed to decode JSON response from Magento: {e}") from e
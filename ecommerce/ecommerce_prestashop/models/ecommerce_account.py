@@ -54,7 +54,7 @@ class ECommerceAccount(models.Model):
         def match_store():
             """Match and assign the PrestaShop store (default or by name)."""
             store_name = (self.prestashop_store or '').strip().lower()
-            prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=1, endpoint=self.prestashop_url)
+            prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=1, endpoint=self.prestashop_url, account=self)
 
             # Case 1: No store name provided, fallback to default store
             if not store_name:
@@ -102,7 +102,7 @@ class ECommerceAccount(models.Model):
         self.ensure_one()
         if self.channel_code == 'prestashop':
             try:
-                prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, endpoint=self.prestashop_url)
+                prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, endpoint=self.prestashop_url, account=self)
                 prestashop_api._authenticate_connection()
                 match_store()
             except ECommerceApiError as error:
@@ -122,13 +122,14 @@ class ECommerceAccount(models.Model):
             webservice_key=self.webservice_key,
             store_id=self.prestashop_store_id,
             endpoint=self.prestashop_url,
+            account=self,
         )
-        response_products = prestashop_api._get_products(self.last_products_sync)
-        _logger.debug('Fetched %d products from PrestaShop', len(response_products) if response_products else 0)
+        # The catalog is decoded product by product while the products are synchronized.
+        return {'products': self._prestashop_iter_products(prestashop_api)}
 
-        if not response_products:
-            _logger.debug('No products returned from PrestaShop.')
-            return {'products': []}
+    def _prestashop_iter_products(self, prestashop_api):
+        """Yield the products of the catalog, including variant combinations, as they are received."""
+        response_products = prestashop_api._iter_products(self.last_products_sync)
 
         # --- Language handling --- #
         response_all_languages = prestashop_api._get_languages()
@@ -159,20 +160,19 @@ class ECommerceAccount(models.Model):
 
             return ''
 
-        # --- Results container --- #
-        products = []
-
+        count_products = 0
         for product in response_products:
+            count_products += 1
             product_id = product.get('id')
             product_type = product.get('product_type')
             product_name = get_multilang_value(product.get('name'))
 
             if product_type != 'combinations':  # --- Simple product ---
-                products.append({
+                yield {
                     'name': product_name,
                     'sku': product.get('reference'),
                     'ec_product_template_identifier': str(product_id),
-                })
+                }
             else:  # --- Product with combinations ---
                 combination_ids = [
                     c.get('id')
@@ -190,22 +190,21 @@ class ECommerceAccount(models.Model):
                         combination_ids,
                         get_multilang_value,
                     )
-                    products.extend(variants)
-
                     _logger.debug(
                         'Fetched %d variants for product ID %s in %.2f seconds',
                         len(variants),
                         product_id,
                         time.time() - start,
                     )
+                    yield from variants
 
-        return {'products': products}
+        _logger.debug('Fetched %d products from PrestaShop', count_products)
 
     def _fetch_orders_from_ecommerce(self):
         if self.channel_code != 'prestashop':
             return super()._fetch_orders_from_ecommerce()
         start = time.time()
-        response = self._fetch_orders_from_ecommerce_parallel(self.last_orders_sync)
+        response = self._fetch_orders_from_ecommerce_parallel(self._get_orders_sync_date(), self._get_orders_sync_date_to())
         end = time.time()
         _logger.debug('API Time: %s', end - start)
         return response
@@ -215,7 +214,7 @@ class ECommerceAccount(models.Model):
         if self.channel_code != 'prestashop':
             return super()._fetch_locations_from_ecommerce()
 
-        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url)
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
         response_shops = prestashop_api._get_locations()
 
         if not response_shops:
@@ -273,7 +272,7 @@ class ECommerceAccount(models.Model):
                 return prestashop_api._set_inventory(stock_available_id=stock_available_id, quantity=quantity)
             return None
 
-        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url)
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
 
         # Filter inventory for this PrestaShop store
         current_store_inventory = [
@@ -302,12 +301,17 @@ class ECommerceAccount(models.Model):
 
         return {}
 
+    def _get_api_secrets(self):
+        if self.channel_code != 'prestashop':
+            return super()._get_api_secrets()
+        return [self.webservice_key] if self.webservice_key else []
+
     def _get_product_url(self, offer):
         """Return the PrestaShop product URL for a given offer."""
         if self.channel_code != 'prestashop':
             return super()._get_product_url(offer)
 
-        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url)
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
         base_url = prestashop_api.client_endpoint
 
         if not offer:
@@ -342,37 +346,57 @@ class ECommerceAccount(models.Model):
             _logger.warning('Failed to extract database name from URL %s: %s', url, e)
         return None
 
-    def _fetch_orders_from_ecommerce_parallel(self, last_orders_sync):
+    def _fetch_orders_from_ecommerce_parallel(self, last_orders_sync, date_to=None):
         if self.channel_code != 'prestashop':
             return super()._fetch_orders_from_ecommerce()
 
-        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url)
-        response_orders = prestashop_api._get_orders(last_orders_sync)
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
+        response_orders = prestashop_api._get_orders(last_orders_sync, date_to=date_to)
         if not response_orders:
             _logger.debug('No orders returned from PrestaShop.')
             return {'orders': []}
 
-        orders = []
+        self.env['ecommerce.order.archive']._archive(self, [(so['id'], so) for so in response_orders if so.get('id')])
         with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(self._process_order, so) for so in response_orders if so.get('id')]
-            for future in as_completed(futures):
-                orders.append(future.result())
+            # Keep the orders sorted by update date.
+            orders = list(executor.map(self._process_order, [so for so in response_orders if so.get('id')]))
         return {'orders': orders}
 
+    def _fetch_order_stamps_from_ecommerce(self, date_from):
+        if self.channel_code != 'prestashop':
+            return super()._fetch_order_stamps_from_ecommerce(date_from)
+
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
+        response_orders = prestashop_api._get_order_stamps(date_from)
+        return [
+            {
+                'id': str(so['id']),
+                'order_ref': so.get('reference'),
+                'write_date': str(so.get('date_upd', '')),
+            } for so in response_orders if so.get('id')
+        ]
+
     def _fetch_order_from_ecommerce_by_order_ref(self, ecommerce_order_ref):
         if self.channel_code != 'prestashop':
             return super()._fetch_order_from_ecommerce_by_order_ref(ecommerce_order_ref)
 
-        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url)
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
         response_order = prestashop_api._get_order(ecommerce_order_ref)
         if isinstance(response_order, list) and len(response_order) == 0:
             err_msg = "Order not found in Prestashop."
             raise ECommerceApiError(err_msg)
         return self._process_order(response_order[0])
 
+    def _normalize_archived_order(self, payload):
+        if self.channel_code != 'prestashop':
+            return super()._normalize_archived_order(payload)
+        # The addresses, countries, states and carriers are not part of the order payload and are
+        # still fetched from PrestaShop.
+        return self._process_order(payload)
+
     def _process_order(self, so):
         tax_included = self.tax_included
-        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url)
+        prestashop_api = PrestashopAPI(webservice_key=self.webservice_key, store_id=self.prestashop_store_id, endpoint=self.prestashop_url, account=self)
 
         def get_country_code(country_id):
             if not country_id:
@@ -480,7 +504,7 @@ class ECommerceAccount(models.Model):
             'id': str(so['id']),
             'status': 'canceled' if get_order_status(so.get('current_state')) == 6 else 'confirmed',
             'reference': so.get('reference'),
-            'write_date': str(so.get('date_upd', '')),
+            'write_date': str(so['date_upd']) if so.get('date_upd') else False,
             'currency_code': get_currency_code(so.get('id_currency')),
             'customer_id': str(so.get('id_customer', '')),
             'financial_status': get_payment_status(so),
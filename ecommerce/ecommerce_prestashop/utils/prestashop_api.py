@@ -1,4 +1,5 @@
 import base64
+import json
 import logging
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
@@ -9,19 +10,24 @@ from odoo import _
 from odoo.exceptions import UserError, ValidationError
 
 from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils.json_stream import iter_response_json_array
+from odoo.addons.odoo_ecommerce.utils.request import ecommerce_request, get_account_ref
 
 _logger = logging.getLogger(__name__)
 
 
 class PrestashopAPI:
 
-    def __init__(self, webservice_key, endpoint, store_id=1):
+    def __init__(self, webservice_key, endpoint, store_id=1, account=None):
         """Initialize the PrestaShop API client.
 
         :params:
             webservice_key: Webservice key provided by PrestaShop.
             endpoint: API endpoint URL for PrestaShop push/pull operations.
+            account: `ecommerce.account` record whose circuit breaker guards the requests, if any.
         """
+        # Only keep a reference to the account as the client is shared with worker threads.
+        self.account_ref = get_account_ref(account) if account else None
         self.webservice_key = webservice_key
         self.store_id = store_id
         self.endpoint = self._get_base_url_without_database(endpoint)
@@ -75,7 +81,7 @@ class PrestashopAPI:
         b64_auth = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
         return {'Authorization': f'Basic {b64_auth}'}
 
-    def __api_request(self, method, url, headers, data=False, endpoint_include=False):
+    def __api_request(self, method, url, headers, data=False, endpoint_include=False, stream=False):
         """Make a request to the PrestaShop API.
 
         :params:
@@ -84,6 +90,7 @@ class PrestashopAPI:
             headers (dict): Optional headers.
             data (dict/str): Optional request payload.
             endpoint_include (bool): If True, use `url` as full path, otherwise join with self.endpoint.
+            stream (bool): If True, the body is not downloaded until it is read from the response.
 
         :rtype:
             requests.Response: Raw response object.
@@ -104,7 +111,9 @@ class PrestashopAPI:
         _logger.debug('Calling PrestaShop API: %s %s | data=%s', method, call_url, bool(data))
 
         try:
-            return requests.request(method, call_url, headers=headers, data=data, timeout=30)
+            if self.account_ref:
+                return ecommerce_request(self.account_ref, method, call_url, headers=headers, data=data, timeout=30, stream=stream)
+            return requests.request(method, call_url, headers=headers, data=data, timeout=30, stream=stream)
         except requests.exceptions.Timeout:
             _logger.error('PrestaShop API request timed out: %s', call_url)
             raise ECommerceApiError(_("Timeout while calling PrestaShop API"), error_code=408)
@@ -155,58 +164,90 @@ class PrestashopAPI:
             return True
 
         if isinstance(payload, dict) and 'errors' in payload:
-            errors = payload.get('errors', {})
-            if isinstance(errors, dict):
-                errors = [errors]
-            elif not isinstance(errors, list):
-                errors = [{'code': 600, 'message': str(errors)}]
+            self.__raise_payload_errors(payload.get('errors', {}))
 
-            error_messages = [f"[Code {e.get('code', 600)}] {e.get('message', 'Unknown error')}" for e in errors]
+        return True
 
-            for em in error_messages:
-                _logger.error('Prestashop API error: %s', em)
+    def __raise_payload_errors(self, errors):
+        """Raise the errors returned by PrestaShop in the payload of a response.
 
-            raise UserError(_('Prestashop Error:\n' + '\n'.join(error_messages)))
+        :raises:
+            UserError: Always, listing the PrestaShop errors.
+        """
+        if isinstance(errors, dict):
+            errors = [errors]
+        elif not isinstance(errors, list):
+            errors = [{'code': 600, 'message': str(errors)}]
 
-        return True
+        error_messages = [f"[Code {e.get('code', 600)}] {e.get('message', 'Unknown error')}" for e in errors]
+
+        for em in error_messages:
+            _logger.error('Prestashop API error: %s', em)
+
+        raise UserError(_('Prestashop Error:\n' + '\n'.join(error_messages)))
 
     def _xml_str_to_dict(self, xml_str):
         """Convert the XML type string to Dict"""
-        def etree_to_dict(elem):
-            result = {}
-            # Handle Attributes
-            if elem.attrib:
-                result.update({f"@{k}": v for k, v in elem.attrib.items()})
-
-            # Handle Children
-            children = list(elem)
-            if children:
-                # Regroup children by tag
-                children_result = {}
-                for child in children:
-                    child_dict = etree_to_dict(child)
-                    tag = child.tag
-                    if tag not in children_result:
-                        children_result[tag] = []
-                    children_result[tag].append(child_dict)
-
-                # Simplify single element lists
-                for k, v in children_result.items():
-                    if len(v) == 1:
-                        children_result[k] = v[0]
-                result.update(children_result)
-            else:
-                # Plain text
-                text = elem.text.strip() if elem.text else ''
-                if text:
-                    if result:
-                        result['#text'] = text
-                    else:
-                        result = text
-            return result
-
         root = ET.fromstring(xml_str)
-        return {root.tag: etree_to_dict(root)}
+        return {root.tag: self._xml_element_to_dict(root)}
+
+    def _xml_element_to_dict(self, elem):
+        """Convert an XML element and its children to Dict"""
+        result = {}
+        # Handle Attributes
+        if elem.attrib:
+            result.update({f"@{k}": v for k, v in elem.attrib.items()})
+
+        # Handle Children
+        children = list(elem)
+        if children:
+            # Regroup children by tag
+            children_result = {}
+            for child in children:
+                child_dict = self._xml_element_to_dict(child)
+                tag = child.tag
+                if tag not in children_result:
+                    children_result[tag] = []
+                children_result[tag].append(child_dict)
+
+            # Simplify single element lists
+            for k, v in children_result.items():
+                if len(v) == 1:
+                    children_result[k] = v[0]
+            result.update(children_result)
+        else:
+            # Plain text
+            text = elem.text.strip() if elem.text else ''
+            if text:
+                if result:
+                    result['#text'] = text
+                else:
+                    result = text
+        return result
+
+    def _iter_xml_records(self, xml_stream, container_tag):
+        """Yield the children of the `container_tag` element of an XML stream as Dict, as soon as
+        each of them is parsed.
+
+        Parsed records are removed from the tree, so the memory used does not depend on the number
+        of records of the document.
+
+        :params:
+            xml_stream: File-like object of the XML document.
+            container_tag (str): Tag of the element holding the records (e.g. 'products').
+        """
+        path = []
+        container = None
+        for event, elem in ET.iterparse(xml_stream, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == container_tag and container is None:
+                    container = elem
+                path.append(elem)
+                continue
+            path.pop()
+            if container is not None and path and path[-1] is container:
+                yield self._xml_element_to_dict(elem)
+                container.remove(elem)
 
     def __resource_request(
         self,
@@ -239,8 +280,26 @@ class PrestashopAPI:
             ECommerceApiError: If the response is invalid JSON or the API call fails.
         """
         headers = {'output_format': 'JSON'}
+        url = self.__build_resource_url(resource, resource_id, last_pull_date, display, default_filter, custom_filter)
+        response = self.__api_request(method=method.upper(), url=url, headers=headers, data=body)
+        self.__check_isvalid(response)
+
+        try:
+            payload = response.json()
+        except ValueError:
+            _logger.error('Invalid JSON response while fetching %s: %s', resource, response.text[:300])
+            raise ECommerceApiError(f"Invalid JSON response from PrestaShop when accessing {resource}")
+
+        if isinstance(payload, dict):
+            key = extract_resource if extract_resource else resource
+            return payload.get(key, [])
+        if isinstance(payload, list):
+            return payload
+        _logger.error('Unexpected response type while fetching %s: %s', resource, payload)
+        return []
 
-        # Build URL
+    def __build_resource_url(self, resource, resource_id=0, last_pull_date=None, display='full', default_filter=1, custom_filter=''):
+        """Build the relative URL of a PrestaShop resource, see `__resource_request` for the parameters."""
         url_resource_id = f'/{resource_id}' if str(resource_id) != '0' else ''
         url = f'/{resource}{url_resource_id}'
 
@@ -254,23 +313,43 @@ class PrestashopAPI:
             _logger.debug('Fetching PrestaShop resource: %s | url=%s', resource, url)
         else:
             _logger.debug('Updating PrestaShop resource: %s | url=%s', resource, url)
+        return url
 
-        response = self.__api_request(method=method.upper(), url=url, headers=headers, data=body)
-        self.__check_isvalid(response)
+    def __resource_stream(self, resource, last_pull_date=None, display='full', custom_filter=''):
+        """
+        Fetch a list of PrestaShop resources and yield the records as they are decoded from the
+        response, instead of loading the whole response in memory.
 
-        try:
-            payload = response.json()
-        except ValueError:
-            _logger.error('Invalid JSON response while fetching %s: %s', resource, response.text[:300])
-            raise ECommerceApiError(f"Invalid JSON response from PrestaShop when accessing {resource}")
+        :params:
+            See `__resource_request`.
 
-        if isinstance(payload, dict):
-            key = extract_resource if extract_resource else resource
-            return payload.get(key, [])
-        if isinstance(payload, list):
-            return payload
-        _logger.error('Unexpected response type while fetching %s: %s', resource, payload)
-        return []
+        :rtype:
+            generator[dict]: The resource records from PrestaShop.
+
+        :raises:
+            ECommerceApiError: If the response is invalid or the API call fails.
+        """
+        url = self.__build_resource_url(resource, last_pull_date=last_pull_date, display=display, custom_filter=custom_filter)
+        response = self.__api_request(method='GET', url=url, headers={'output_format': 'JSON'}, stream=True)
+        if response.status_code not in (200, 201):
+            self.__check_isvalid(response)  # Raises the error of the response.
+
+        content_type = response.headers.get('Content-Type', '').lower()
+        try:
+            if 'xml' in content_type:
+                response.raw.decode_content = True
+                try:
+                    yield from self._iter_xml_records(response.raw, resource)
+                finally:
+                    response.close()
+                return
+            other_values = {}
+            yield from iter_response_json_array(response, key=resource, other_values=other_values)
+            if 'errors' in other_values:
+                self.__raise_payload_errors(other_values['errors'])
+        except (json.JSONDecodeError, ET.ParseError) as error:
+            _logger.error('Invalid response while fetching %s: %s', resource, error)
+            raise ECommerceApiError(f"Invalid response from PrestaShop when accessing {resource}: {error}")
 
     # ===== API METHODS ===== #
 
@@ -301,6 +380,11 @@ class PrestashopAPI:
         default_active_filter = '&filter[active]=1'
         return self.__resource_request(resource='products', last_pull_date=last_pull_date, custom_filter=default_active_filter)
 
+    def _iter_products(self, last_pull_date=None):
+        """Same as `_get_products`, but yield the products as they are received."""
+        default_active_filter = '&filter[active]=1'
+        return self.__resource_stream(resource='products', last_pull_date=last_pull_date, custom_filter=default_active_filter)
+
     def _get_product(self, product_id, last_pull_date=None):
         return self.__resource_request(resource='products', resource_id=product_id)
 
@@ -310,8 +394,16 @@ class PrestashopAPI:
     def _get_product_combinations(self, combination_id, last_pull_date=None):
         return self.__resource_request(resource='combinations', resource_id=combination_id)
 
-    def _get_orders(self, last_pull_date=None):
-        return self.__resource_request(resource='orders', last_pull_date=last_pull_date)
+    def _get_orders(self, last_pull_date=None, date_to=None):
+        sort_filter = '&sort=[date_upd_ASC]'
+        if last_pull_date and date_to:
+            # Both bounds of the range are included.
+            date_range_filter = f'&filter[date_upd]=[{last_pull_date},{date_to}]&date=1'
+            return self.__resource_request(resource='orders', custom_filter=date_range_filter + sort_filter)
+        return self.__resource_request(resource='orders', last_pull_date=last_pull_date, custom_filter=sort_filter)
+
+    def _get_order_stamps(self, last_pull_date=None):
+        return self.__resource_request(resource='orders', last_pull_date=last_pull_date, display='[id,reference,date_upd]')
 
     def _get_order(self, order_id, last_pull_date=None):
         order_ref_filter = f'&filter[reference]={order_id}'
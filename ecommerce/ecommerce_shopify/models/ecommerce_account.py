@@ -5,6 +5,7 @@ from datetime import timedelta
 from odoo import fields, models
 from odoo.exceptions import UserError
 
+from odoo.addons.ecommerce_shopify import const
 from odoo.addons.ecommerce_shopify import utils_graphql as shopify_utils_graphql
 from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
 
@@ -96,17 +97,18 @@ class ecommerceAccount(models.Model):
         if self.channel_code != 'shopify':
             return super()._fetch_products_from_ecommerce()
         updated_at_min_date = (self.last_products_sync + timedelta(seconds=1)).isoformat() + 'Z'
-        response = shopify_utils_graphql.call_shopify_graphql_with_pagination(
+        products_pages = shopify_utils_graphql.iter_shopify_graphql_pages(
             account=self,
             endpoint='products',
             params={'updated_at_min': updated_at_min_date},
         )
-        return response
+        # Only one page of the catalog is kept in memory while the products are synchronized.
+        return {'products': (product for products_page in products_pages for product in products_page)}
 
     def _fetch_orders_from_ecommerce(self):
         if self.channel_code != 'shopify':
             return super()._fetch_orders_from_ecommerce()
-        updated_at_min_date = (self.last_orders_sync + timedelta(seconds=1)).isoformat() + 'Z'
+        updated_at_min_date = (self._get_orders_sync_date() + timedelta(seconds=1)).isoformat() + 'Z'
         result = shopify_utils_graphql.call_shopify_graphql_with_pagination(
             account=self,
             endpoint='orders',
@@ -114,6 +116,37 @@ class ecommerceAccount(models.Model):
         )   # fetch orders which are updated after this sync date.
         return result
 
+    def _fetch_orders_pages_from_ecommerce(self):
+        if self.channel_code != 'shopify':
+            return super()._fetch_orders_pages_from_ecommerce()
+        params = {'updated_at_min': (self._get_orders_sync_date() + timedelta(seconds=1)).isoformat() + 'Z'}
+        if date_to := self._get_orders_sync_date_to():
+            params['updated_at_max'] = date_to.isoformat() + 'Z'
+        return shopify_utils_graphql.iter_shopify_graphql_pages(
+            account=self,
+            endpoint='orders',
+            params=params,
+            on_page=lambda edges: self.env['ecommerce.order.archive']._archive(self, [
+                (edge['node']['id'].replace(const.GLOBAL_ORDER_ID, ''), edge['node']) for edge in edges
+            ]),
+        )   # fetch orders which are updated after this sync date.
+
+    def _normalize_archived_order(self, payload):
+        if self.channel_code != 'shopify':
+            return super()._normalize_archived_order(payload)
+        return shopify_utils_graphql._shopify_prepare_order_structure(payload)
+
+    def _fetch_order_stamps_from_ecommerce(self, date_from):
+        if self.channel_code != 'shopify':
+            return super()._fetch_order_stamps_from_ecommerce(date_from)
+        updated_at_min_date = (date_from + timedelta(seconds=1)).isoformat() + 'Z'
+        result = shopify_utils_graphql.call_shopify_graphql_with_pagination(
+            account=self,
+            endpoint='order_stamps',
+            params={'updated_at_min': updated_at_min_date},
+        )
+        return result['order_stamps']
+
     def _fetch_order_from_ecommerce_by_order_ref(self, ecommerce_order_ref):
         if self.channel_code != 'shopify':
             return super()._fetch_order_from_ecommerce_by_order_ref(ecommerce_order_ref)
@@ -136,13 +169,28 @@ class ecommerceAccount(models.Model):
     def _update_pickings_to_ecommerce(self, pickings):
         if self.channel_code != 'shopify':
             return super()._update_pickings_to_ecommerce(pickings)
-        for picking in pickings:
-            try:
-                fulfillment = self._update_picking_to_shopify(picking)
-            except ECommerceApiError as error:
+        # The fulfillments are created in batches; each one is post-processed as soon as it is known.
+        for picking, fulfillment_id, error in shopify_utils_graphql.iter_shopify_fulfillments_create(self, pickings):
+            if error:
                 self._post_process_after_picking_update_failed(picking, str(error))
             else:
-                self._post_process_after_picking_update_success(picking, fulfillment.get('id'))
+                self._post_process_after_picking_update_success(picking, fulfillment_id)
+
+    def _update_picking_to_shopify(self, picking):
+        """Create the fulfillment of a single picking on Shopify.
+
+        The pickings synchronized by `_update_pickings_to_ecommerce` are pushed in batches instead.
+
+        :param recordset picking: The picking, as a `stock.picking` record.
+        :return: The created fulfillment, with its `id`, which is None if the items of the picking
+                 were already fulfilled.
+        :rtype: dict
+        :raise ECommerceApiError: If the fulfillment could not be created.
+        """
+        for _picking, fulfillment_id, error in shopify_utils_graphql.iter_shopify_fulfillments_create(self, picking):
+            if error:
+                raise error
+            return {'id': fulfillment_id}
 
     def _update_inventory_to_ecommerce(self, inventory_data):
         if self.channel_code != 'shopify':
@@ -154,10 +202,10 @@ class ecommerceAccount(models.Model):
         )
         return response
 
-    def _update_picking_to_shopify(self, picking):
-        response = shopify_utils_graphql.call_shopify_graphql_mutation(
-            account=self,
-            endpoint='fulfillmentCreate',
-            params={'picking': picking},
-        )
-        return response
+    def _get_api_secrets(self):
+        if self.channel_code != 'shopify':
+            return super()._get_api_secrets()
+        return [secret for secret in (
+            self.shopify_client_secret,
+            self.shopify_access_token,
+        ) if secret]
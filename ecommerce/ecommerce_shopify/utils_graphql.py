@@ -2,25 +2,45 @@
 
 import logging
 import re
+from collections import defaultdict
 from datetime import datetime
 
 import pytz
 import requests
 
+from odoo.tools import split_every
+
 from odoo.addons.ecommerce_shopify import const
-from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils import ECommerceAccountWideError, ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils.pipeline import prefetch_pages
+from odoo.addons.odoo_ecommerce.utils.request import ecommerce_request, get_account_ref
 
 TIMEOUT = 30
 LIMIT = 10
 MAX_LIMIT = 250  # used for fetch nested objects.
+FULFILLMENT_BATCH_SIZE = 10  # Orders whose `fulfillmentCreate` fields are sent per mutation request.
 
 _logger = logging.getLogger(__name__)
 
 
 # === Graphql Final Request === #
-def _call_shopify_graphql_admin_api(headers, url, query):
+def _get_shopify_graphql_url(account):
+    """Return the GraphQL Admin API URL of the Shopify store of the account.
+
+    The `ecommerce_api_url` context key replaces the URL of the store when set, e.g. to run the
+    sync flows against the local `odoo_ecommerce.tools.mock_platforms.ShopifyMockServer`.
+
+    :param account: record of `ecommerce.account`.
+    :rtype: str
+    """
+    base_url = account.env.context.get('ecommerce_api_url') or f"https://{account.shopify_store}.myshopify.com"
+    return f"{base_url.rstrip('/')}/admin/api/{const.SHOPIFY_API_VERSION}/graphql.json"
+
+
+def _call_shopify_graphql_admin_api(account, headers, url, query):
     """Call shopify graphql api.
 
+    :param account: record of `ecommerce.account` or its `AccountRef`.
     :param dict headers: contain 2 key
         - X-Shopify-Access-Token (str): access token of shopify account.
         - Content-Type (str): 'application/json'
@@ -32,8 +52,10 @@ def _call_shopify_graphql_admin_api(headers, url, query):
     :rtype: dict
     """
     try:
-        response = requests.post(
-            url=url,
+        response = ecommerce_request(
+            account,
+            'POST',
+            url,
             headers=headers,
             timeout=TIMEOUT,
             json={'query': query},
@@ -57,10 +79,14 @@ def _handle_query_error(response, url):
     This method is called after each query is fetched from Shopify.
     If an error occurs while fetching data from Shopify, it is returned a list of errors under `errors` key,
     where each item is dictionary contain `message` key.
+    A throttled query is reported as an account-wide error since the whole query cost budget of the
+    store is exhausted.
     """
     if response.get('errors'):
         error_message = ", ".join([error.get('message') for error in response.get('errors')])
         _logger.error("Error occurred after fetch data from %s, error_description: %s", url, error_message)
+        if any((error.get('extensions') or {}).get('code') == 'THROTTLED' for error in response.get('errors')):
+            raise ECommerceAccountWideError(error_message, error_code=429)
         raise ECommerceApiError(error_message)
 
 
@@ -167,17 +193,22 @@ def _generate_shopify_order_by_id_query(order_id):
     return order_query
 
 
-def _generate_shopify_orders_query(updated_at_min, after):
+def _generate_shopify_orders_query(updated_at_min, after, updated_at_max=None):
     """Generate shopify order query
 
     :param str updated_at_min: The date after which the updated order should be fetched.
 
     :param str after: The pagination token used to fetch the next page.
+
+    :param str updated_at_max: The date until which the updated order should be fetched, if any.
     """
+    search_query = f"updated_at:>'{updated_at_min}'"
+    if updated_at_max:
+        search_query += f" AND updated_at:<='{updated_at_max}'"
     # not needed to query filter status:any for fetch all orders, it's by default fetch all orders like canceled and successfull.
     order_query = """
     query GetOrders {
-        orders(first: %s, sortKey: UPDATED_AT, %squery: \"updated_at:>\'%s\'\") {
+        orders(first: %s, sortKey: UPDATED_AT, %squery: \"%s\") {
             edges {
                 node {%s}
             }
@@ -187,7 +218,34 @@ def _generate_shopify_orders_query(updated_at_min, after):
             }
         }
     }
-    """ % (LIMIT, f'after: \"{after}\", ' if after else '', updated_at_min, _shopify_order_common_query())
+    """ % (LIMIT, f'after: \"{after}\", ' if after else '', search_query, _shopify_order_common_query())
+    return order_query
+
+
+def _generate_shopify_order_stamps_query(updated_at_min, after):
+    """Generate shopify order stamps query, which only fetches the identifier and the update date
+    of the orders, as many as allowed per page.
+
+    :param str updated_at_min: The date after which the updated order should be fetched.
+
+    :param str after: The pagination token used to fetch the next page.
+    """
+    order_query = """
+    query GetOrderStamps {
+        order_stamps: orders(first: %s, sortKey: UPDATED_AT, %squery: \"updated_at:>\'%s\'\") {
+            edges {
+                node {
+                    id
+                    updatedAt
+                }
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+        }
+    }
+    """ % (MAX_LIMIT, f'after: \"{after}\", ' if after else '', updated_at_min)
     return order_query
 
 
@@ -329,33 +387,61 @@ def _shopify_order_common_query():
     return order_query
 
 
-def _generate_shopify_fulfillmentCreate_query(picking, headers, request_url):
-    """Generate shopify mutation query for push fulfillment.
+def _generate_shopify_fulfillmentsCreate_query(fulfillment_mutations):
+    """Generate a shopify mutation query creating several fulfillments at once.
 
-    :param `stock.pikcing` picking: record set of stock.picking which will be updated.
-    :param dict headers: headers, used to make query request for fulfillment order.
-    :param str url: Graphql API url, used to make query request for fulfillment order.
+    Each fulfillment is created by its own `fulfillmentCreate` field, aliased `fulfillment<index>`;
+    the fields of a mutation are executed one after the other.
 
-    :return fulfillment_query: fulfillment query for push picking.
-    :rtype: str.
+    :param list fulfillment_mutations: `fulfillmentCreate` fields, see `_generate_shopify_fulfillment_mutation`.
+    :return: The mutation query.
+    :rtype: str
     """
+    return """
+    mutation createFulfillments {
+        %s
+    }
+    """ % ''.join(
+        f'fulfillment{index}: {fulfillment_mutation}' for index, fulfillment_mutation in enumerate(fulfillment_mutations)
+    )
+
 
-    # === Handle Fulfillment Order === #
-    fulfillment_order_query = _generate_shopify_fulfillment_order_query(picking.ecommerce_order_identifier)
-    fulfillment_order_response = _call_shopify_graphql_admin_api(headers, request_url, fulfillment_order_query)
+def _fetch_shopify_fulfillment_orders(account, headers, request_url, order_id):
+    """Fetch the fulfillment orders of a Shopify order.
+
+    :param account: record of `ecommerce.account`.
+    :param dict headers: headers of the request.
+    :param str request_url: Graphql API url.
+    :param str order_id: Shopify unique identifier of order.
+    :return: The fulfillment order nodes.
+    :rtype: list
+    """
+    fulfillment_order_query = _generate_shopify_fulfillment_order_query(order_id)
+    fulfillment_order_response = _call_shopify_graphql_admin_api(account, headers, request_url, fulfillment_order_query)
     _handle_query_error(fulfillment_order_response, request_url)
     if not fulfillment_order_response['data']['order']:
-        raise ECommerceApiError(f"There is no order exists on shopify, related to id {picking.ecommerce_order_identifier}")
+        raise ECommerceApiError(f"There is no order exists on shopify, related to id {order_id}")
+    return fulfillment_order_response['data']['order']['fulfillmentOrders']['nodes']
+
+
+def _generate_shopify_fulfillment_mutation(pickings, fulfillment_orders_data):
+    """Generate the `fulfillmentCreate` field pushing the pickings of an order as one fulfillment.
+
+    The quantities of the pickings are summed per order line and capped by the quantities left to
+    fulfill on the fulfillment orders, so that the items already fulfilled are not requested again.
 
+    :param `stock.picking` pickings: The pickings of the order to push.
+    :param list fulfillment_orders_data: The fulfillment orders of the order of the pickings, see
+                                         `_fetch_shopify_fulfillment_orders`.
+    :return: The field, or None if all the items of the pickings are already fulfilled.
+    :rtype: str
+    """
     # === Prepare Fulfillment Update Query === #
-    mapped_shopify_line_id = {
-        move_id.sale_line_id.ecommerce_line_identifier: int(move_id.quantity)
-        for move_id in picking.move_ids
-        if move_id.sale_line_id and
-        move_id.sale_line_id.ecommerce_line_identifier
-    }
+    quantities_by_line = defaultdict(int)
+    for move in pickings.move_ids:
+        if move.sale_line_id.ecommerce_line_identifier:
+            quantities_by_line[move.sale_line_id.ecommerce_line_identifier] += int(move.quantity)
 
-    fulfillment_orders_data = fulfillment_order_response['data']['order']['fulfillmentOrders']['nodes']
     fulfillment_orders_query = []
     for fulfillment_order_data in fulfillment_orders_data:
         if fulfillment_order_data['status'] in ['CANCELLED', 'CLOSED', 'INCOMPLETE', 'ON_HOLD', 'SCHEDULED']:
@@ -364,27 +450,37 @@ def _generate_shopify_fulfillmentCreate_query(picking, headers, request_url):
         fulfillment_line_items_data = fulfillment_order_data['lineItems']['nodes']
         for fulfillment_line_item_data in fulfillment_line_items_data:
             order_line_item_id = fulfillment_line_item_data['lineItem']['id'].replace(const.GLOBAL_LINE_ITEM_ID, '')
-            if order_line_item_id in mapped_shopify_line_id:
-                order_line_item_quantity = mapped_shopify_line_id[order_line_item_id]
-                fulfillment_order_line_items_query.append('{id: \"%s\" quantity: %s}' % (fulfillment_line_item_data['id'], order_line_item_quantity))
+            # A line may be split across the fulfillment orders of several locations.
+            quantity = min(quantities_by_line.get(order_line_item_id, 0), fulfillment_line_item_data['remainingQuantity'])
+            if quantity > 0:
+                quantities_by_line[order_line_item_id] -= quantity
+                fulfillment_order_line_items_query.append('{id: \"%s\" quantity: %s}' % (fulfillment_line_item_data['id'], quantity))
         if fulfillment_order_line_items_query:
             fulfillment_orders_query.append('{fulfillmentOrderId: \"%s\" fulfillmentOrderLineItems: [%s]}' % (fulfillment_order_data['id'], ''.join(fulfillment_order_line_items_query)))
+    if not fulfillment_orders_query:
+        return None
 
-    fulfillment_tracking_info_query = ''
-    fulfillment_tracking_info_query = 'trackingInfo: {'
+    carrier = pickings[0].carrier_id
     tracking_company = (
-        const.SHOPIFY_CARRIER_NAMES_MAPPING.get(picking.carrier_id.name)
-        or const.SHOPIFY_CARRIER_NAMES_MAPPING.get(picking.carrier_id.delivery_type)
+        const.SHOPIFY_CARRIER_NAMES_MAPPING.get(carrier.name)
+        or const.SHOPIFY_CARRIER_NAMES_MAPPING.get(carrier.delivery_type)
         or 'Other'
     )  # If either the delivery_type of the picking's carrier_id or the name of the picking's carrier_id exists on Shopify, then set it as the company; otherwise, set the company as Other.
+    tracking_numbers = list(dict.fromkeys(picking.carrier_tracking_ref for picking in pickings if picking.carrier_tracking_ref))
+    tracking_urls = list(dict.fromkeys(picking.carrier_tracking_url for picking in pickings if picking.carrier_tracking_url))
+    fulfillment_tracking_info_query = 'trackingInfo: {'
     fulfillment_tracking_info_query += f'company: \"{tracking_company}\"'
-    fulfillment_tracking_info_query += f'number: \"{picking.carrier_tracking_ref}\"'
-    if picking.carrier_tracking_url:
-        fulfillment_tracking_info_query += f'url: \"{picking.carrier_tracking_url}\"'
+    if len(tracking_numbers) > 1:  # The pickings shipped in several parcels.
+        fulfillment_tracking_info_query += 'numbers: [%s]' % ' '.join(f'\"{number}\"' for number in tracking_numbers)
+        if tracking_urls:
+            fulfillment_tracking_info_query += 'urls: [%s]' % ' '.join(f'\"{url}\"' for url in tracking_urls)
+    else:
+        fulfillment_tracking_info_query += f'number: \"{tracking_numbers[0] if tracking_numbers else ""}\"'
+        if tracking_urls:
+            fulfillment_tracking_info_query += f'url: \"{tracking_urls[0]}\"'
     fulfillment_tracking_info_query += '}'
 
-    fulfillment_push_query = """
-    mutation createFulfillment {
+    fulfillment_mutation = """
         fulfillmentCreate (
             fulfillment: {
                 lineItemsByFulfillmentOrder: [%s]
@@ -398,10 +494,9 @@ def _generate_shopify_fulfillmentCreate_query(picking, headers, request_url):
                 message
             }
         }
-    }
     """ % (''.join(fulfillment_orders_query), fulfillment_tracking_info_query)
 
-    return fulfillment_push_query
+    return fulfillment_mutation
 
 
 def _generate_shopify_fulfillment_order_query(order_id):
@@ -419,6 +514,7 @@ def _generate_shopify_fulfillment_order_query(order_id):
                     lineItems (first:%s) {
                         nodes {
                             id
+                            remainingQuantity
                             lineItem {
                                 id
                             }
@@ -489,7 +585,7 @@ def call_shopify_graphql_query(account, endpoint, params={}):
     :return response: response from shopify
     :rtype dict:
     """
-    request_url = f"https://{account.shopify_store}.myshopify.com/admin/api/{const.SHOPIFY_API_VERSION}/graphql.json"
+    request_url = _get_shopify_graphql_url(account)
     headers = {
         'X-Shopify-Access-Token': account.shopify_access_token,
         'Content-Type': 'application/json',
@@ -500,7 +596,7 @@ def call_shopify_graphql_query(account, endpoint, params={}):
     elif endpoint == 'order':
         order_id = params.get('order_id')
         query = _generate_shopify_order_by_id_query(order_id)
-    response = _call_shopify_graphql_admin_api(headers, request_url, query)
+    response = _call_shopify_graphql_admin_api(account, headers, request_url, query)
     _handle_query_error(response, request_url)
     res = response['data']
     if endpoint == 'order':
@@ -525,29 +621,50 @@ def call_shopify_graphql_with_pagination(account, endpoint, params={}):
         - 'locations' : Fetch locations from shopify.
         - 'products'  : Fetch products from shopify.
         - 'orders'    : Fetch orders from shopify.
+        - 'order_stamps' : Fetch the identifiers and update dates of orders from shopify.
 
     :return response: response from shopify
     :rtype dict:
     """
-    request_url = f"https://{account.shopify_store}.myshopify.com/admin/api/{const.SHOPIFY_API_VERSION}/graphql.json"
+    result_data = []
+    for page_data in iter_shopify_graphql_pages(account, endpoint, params):
+        result_data.extend(page_data)
+    return {endpoint: result_data}
+
+
+def iter_shopify_graphql_pages(account, endpoint, params={}, on_page=None):
+    """Call Shopify GraphQL Admin API with cursor-based pagination and yield the records page by page.
+
+    The next page is downloaded in a background thread while the current page is being processed
+    by the caller. The records are prepared in the caller's thread.
+
+    :param account: record of `ecommerce.account`
+    :param str endpoint: Resource to fetch from Shopify, see `call_shopify_graphql_with_pagination`.
+    :param on_page: Optional callable receiving the raw edges of each page, in the caller's thread,
+                    before the records are prepared.
+
+    :return: generator of the list of prepared records of each page.
+    """
+    request_url = _get_shopify_graphql_url(account)
     headers = {
         'X-Shopify-Access-Token': account.shopify_access_token,
         'Content-Type': 'application/json',
     }
-    result_data = []
-    has_next_page = True
-    next_page = ''
-    while has_next_page:
+    account_ref = get_account_ref(account)  # The records must not be used from the I/O thread.
+
+    def fetch_page(next_page):
         query_params = {'after': next_page}
         query_params.update(params)
         query = globals()[f'_generate_shopify_{endpoint}_query'](**query_params)
-        response = _call_shopify_graphql_admin_api(headers, request_url, query)
+        response = _call_shopify_graphql_admin_api(account_ref, headers, request_url, query)
         _handle_query_error(response, request_url)
-        edges = response['data'][endpoint]['edges']
-        result_data.extend(globals()[f'_shopify_prepare_{endpoint}_structure'](edges))
-        has_next_page = response['data'][endpoint]['pageInfo']['hasNextPage']
-        next_page = response['data'][endpoint]['pageInfo']['endCursor']
-    return {endpoint: result_data}
+        page_info = response['data'][endpoint]['pageInfo']
+        return response['data'][endpoint]['edges'], page_info['endCursor'] if page_info['hasNextPage'] else None
+
+    for edges in prefetch_pages(fetch_page, ''):
+        if on_page:
+            on_page(edges)
+        yield globals()[f'_shopify_prepare_{endpoint}_structure'](edges)
 
 
 # === Make Mutation Request === #
@@ -557,30 +674,91 @@ def call_shopify_graphql_mutation(account, endpoint, params={}):
     :param account: record of `ecommerce.account`
     :param str endpoint: objects for mutation on shopify.
         valid values:
-        - 'fulfillmentCreate'      : For create fulfillment on shopify.
         - 'inventorySetQuantities' : For update inventory on shopify.
 
     :return response: response from shopify
     :rtype dict:
     """
-    request_url = f"https://{account.shopify_store}.myshopify.com/admin/api/{const.SHOPIFY_API_VERSION}/graphql.json"
+    request_url = _get_shopify_graphql_url(account)
     headers = {
         'X-Shopify-Access-Token': account.shopify_access_token,
         'Content-Type': 'application/json',
     }
     request_query = ''
-    if endpoint == 'fulfillmentCreate':
-        picking = params.get('picking')
-        request_query = _generate_shopify_fulfillmentCreate_query(picking, headers, request_url)
-    elif endpoint == 'inventorySetQuantities':
+    if endpoint == 'inventorySetQuantities':
         inventory_data = params.get('inventory_data')
         request_query = _generate_shopify_inventorySetQuantities_query(inventory_data)
-    response = _call_shopify_graphql_admin_api(headers, request_url, request_query)
+    response = _call_shopify_graphql_admin_api(account, headers, request_url, request_query)
     _handle_mutation_error(endpoint, response, request_url)
-    res = {}
-    if endpoint == 'fulfillmentCreate':
-        res.update({'id': response['data'][endpoint]['fulfillment']['id'].replace(const.GLOBAL_FULFILLMENT_ID, '')})
-    return res
+    return {}
+
+
+def iter_shopify_fulfillments_create(account, pickings):
+    """Create the fulfillments of the pickings on Shopify with as few requests as possible.
+
+    The pickings of an order are pushed as a single fulfillment, see
+    `_generate_shopify_fulfillment_mutation`. The orders are processed by batches of
+    `FULFILLMENT_BATCH_SIZE`: the fulfillment orders of the orders of a batch are fetched right
+    before their fulfillments are created by a single mutation.
+
+    :param account: record of `ecommerce.account`
+    :param pickings: recordset of `stock.picking` to push, possibly of several orders.
+
+    :return: generator of `(picking, fulfillment_id, error)` tuples, where the `ECommerceApiError`
+             of the picking is set if it failed. The id of the fulfillment of an order is only given
+             with its first picking, as the picking identifiers are unique per account; it is None
+             for the other pickings, and for the pickings whose items were all already fulfilled.
+    :raise ECommerceAccountWideError: If Shopify throttles the requests or cannot be reached; the
+                                      results of the previous requests are yielded beforehand.
+    """
+    request_url = _get_shopify_graphql_url(account)
+    headers = {
+        'X-Shopify-Access-Token': account.shopify_access_token,
+        'Content-Type': 'application/json',
+    }
+    for orders_batch in split_every(FULFILLMENT_BATCH_SIZE, account._group_pickings_by_order(pickings)):
+        fulfillment_mutations = []
+        for order_id, order_pickings in orders_batch:
+            try:
+                fulfillment_orders_data = _fetch_shopify_fulfillment_orders(account, headers, request_url, order_id)
+            except ECommerceAccountWideError:
+                raise
+            except ECommerceApiError as error:
+                for picking in order_pickings:
+                    yield picking, None, error
+                continue
+            fulfillment_mutation = _generate_shopify_fulfillment_mutation(order_pickings, fulfillment_orders_data)
+            if not fulfillment_mutation:
+                _logger.info("The items of the deliveries of the order %s are already fulfilled on shopify.", order_id)
+                for picking in order_pickings:
+                    yield picking, None, None
+                continue
+            fulfillment_mutations.append((order_pickings, fulfillment_mutation))
+        if not fulfillment_mutations:
+            continue
+        query = _generate_shopify_fulfillmentsCreate_query([fulfillment_mutation for _pickings, fulfillment_mutation in fulfillment_mutations])
+        try:
+            response = _call_shopify_graphql_admin_api(account, headers, request_url, query)
+            _handle_query_error(response, request_url)
+        except ECommerceAccountWideError:
+            raise
+        except ECommerceApiError as error:
+            for order_pickings, _fulfillment_mutation in fulfillment_mutations:
+                for picking in order_pickings:
+                    yield picking, None, error
+            continue
+        for index, (order_pickings, _fulfillment_mutation) in enumerate(fulfillment_mutations):
+            result = response['data'].get(f'fulfillment{index}') or {}
+            if result.get('userErrors') or not result.get('fulfillment'):
+                error_message = ", ".join([error.get('message') for error in result.get('userErrors') or []])
+                _logger.error("Error occurred after mutation on %s, error_description: %s", request_url, error_message)
+                error = ECommerceApiError(error_message or "No fulfillment was created.")
+                for picking in order_pickings:
+                    yield picking, None, error
+            else:
+                yield order_pickings[0], result['fulfillment']['id'].replace(const.GLOBAL_FULFILLMENT_ID, ''), None
+                for picking in order_pickings[1:]:
+                    yield picking, None, None
 
 
 # === Prepare Response Structure === #
@@ -618,6 +796,18 @@ def _shopify_prepare_orders_structure(edges):
     return orders_data
 
 
+def _shopify_prepare_order_stamps_structure(edges):
+    order_stamps = []
+    for edge in edges:
+        order_id = edge['node']['id'].replace(const.GLOBAL_ORDER_ID, '')
+        order_stamps.append({
+            'id': order_id,
+            'order_ref': order_id,
+            'write_date': convert_iso_to_utc(edge['node']['updatedAt']),
+        })
+    return order_stamps
+
+
 def _shopify_prepare_order_structure(order_node):
     """Prepare shopify order structure from order data returned by shopify."""
     billing_address = order_node.get('billingAddress') or (order_node.get('customer') or {}).get('defaultAddress')
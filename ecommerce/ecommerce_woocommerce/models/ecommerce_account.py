@@ -1,5 +1,6 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+import json
 import logging
 import pprint
 from urllib.parse import urlencode
@@ -13,6 +14,9 @@ from odoo.exceptions import UserError
 
 from odoo.addons.ecommerce_woocommerce import const
 from odoo.addons.odoo_ecommerce.utils import ECommerceApiError
+from odoo.addons.odoo_ecommerce.utils.json_stream import iter_response_json_array
+from odoo.addons.odoo_ecommerce.utils.pipeline import prefetch_pages
+from odoo.addons.odoo_ecommerce.utils.request import ecommerce_request
 
 _logger = logging.getLogger(__name__)
 
@@ -89,17 +93,23 @@ class EcommerceAccount(models.Model):
         """Fetch and structure products from the WooCommerce store.
 
         Falls back to the parent implementation for non-WooCommerce channels.
+        The products are decoded one by one from the responses while they are synchronized.
 
         :return: Structured product data fetched from the ecommerce platform.
         :rtype: dict
         """
         if self.channel_code != 'woocommerce':
             return super()._fetch_products_from_ecommerce()
-        product_tmpls = self._wc_fetch_product_tmpl()
-        product_name_by_id = {
-            product['id']: product['name'] for product in product_tmpls
-        }
-        products = self._wc_fetch_products(product_tmpls=product_tmpls)
+        product_name_by_id = {}
+
+        def iter_product_tmpls():
+            for product_tmpl in self._wc_fetch_product_tmpl():
+                # Only the variations of the current template are fetched at that time.
+                product_name_by_id.clear()
+                product_name_by_id[product_tmpl['id']] = product_tmpl['name']
+                yield product_tmpl
+
+        products = self._wc_fetch_products(product_tmpls=iter_product_tmpls())
         structured_product = self._wc_build_structured(products, product_name_by_id)
 
         return {'products': structured_product}
@@ -110,33 +120,19 @@ class EcommerceAccount(models.Model):
         Retrieves simple and variable product types updated since the last
         products pull from the WooCommerce store.
 
-        :return: List of WooCommerce product templates.
-        :rtype: list
+        :return: Generator of WooCommerce product templates.
+        :rtype: generator
         """
         created_at_min_date = self._convert_odoo_date_to_wc_format(self.last_products_sync)
-        page = 1
-        per_page = 50
-        all_products = []
-
-        while True:
-            products = self._call_wc(
-                method='GET',
-                end_point='products',
-                params={
-                    'modified_after': created_at_min_date,
-                    'page': page,
-                    'per_page': per_page,
-                },
-            )
-            if not products:
-                break
-            # FIXME: Make separate requests for simple and variable product types
-            for product in products:
-                if product.get('type') in ['variable', 'simple']:
-                    all_products.append(product)
-
-            page += 1
-        return all_products
+        products = self._wc_iter_list(
+            end_point='products',
+            params={'modified_after': created_at_min_date},
+            per_page=50,
+        )
+        # FIXME: Make separate requests for simple and variable product types
+        for product in products:
+            if product.get('type') in ['variable', 'simple']:
+                yield product
 
     def _wc_fetch_products(self, product_tmpls):
         """Fetch WooCommerce products and their variations.
@@ -144,32 +140,19 @@ class EcommerceAccount(models.Model):
         Includes simple products directly and fetches variations
         for variable product templates.
 
-        :param list product_tmpls: List of WooCommerce product templates.
-        :return: List of simple products and product variations.
-        :rtype: list
+        :param product_tmpls: Iterable of WooCommerce product templates.
+        :return: Generator of simple products and product variations.
+        :rtype: generator
         """
-        response = []
         for product_tmpl in product_tmpls:
             if product_tmpl.get('type') == 'simple':
-                response.append(product_tmpl)
+                yield product_tmpl
                 continue
 
-            page = 1
-            per_page = 100
-            while True:
-                product_variations = self._call_wc(
-                    method='GET',
-                    end_point=f"products/{product_tmpl.get('id')}/variations",
-                    params={
-                        'page': page,
-                        'per_page': per_page,
-                    },
-                )
-                if not product_variations:
-                    break
-                response.extend(product_variations)
-                page += 1
-        return response
+            yield from self._wc_iter_list(
+                end_point=f"products/{product_tmpl.get('id')}/variations",
+                per_page=100,
+            )
 
     def _wc_build_structured(self, products, product_name_by_id):
         """Build structured product data from WooCommerce products.
@@ -177,26 +160,23 @@ class EcommerceAccount(models.Model):
         Formats product and variation data into a unified structure
         with SKU, name, and ecommerce identifiers.
 
-        :param list products: List of WooCommerce products and variations.
+        :param products: Iterable of WooCommerce products and variations.
         :param dict product_name_by_id: Mapping of product template IDs to names.
-        :return: Structured product data.
-        :rtype: list
+        :return: Generator of structured product data.
+        :rtype: generator
         """
-        structure_product = []
         for product in products:
             variant_name = (
                 product.get('name')
                 if product.get('type') == 'simple'
                 else f"{product_name_by_id.get(product.get('parent_id'), '')} ({product.get('name')})"
             )
-            product_data = {
+            yield {
                 'sku': product.get('sku') if product.get('sku') else None,
                 'name': variant_name,
                 'ec_product_identifier': product.get('id'),
                 'ec_product_template_identifier': product.get('parent_id'),
             }
-            structure_product.append(product_data)
-        return structure_product
 
     # orders
     def _fetch_orders_from_ecommerce(self):
@@ -210,31 +190,73 @@ class EcommerceAccount(models.Model):
         """
         if self.channel_code != 'woocommerce':
             return super()._fetch_orders_from_ecommerce()
-        created_at_min_date = self._convert_odoo_date_to_wc_format(self.last_orders_sync)
-
         structured_orders = []
-        page = 1
+        for orders_page in self._fetch_orders_pages_from_ecommerce():
+            structured_orders.extend(orders_page)
+        return {'orders': structured_orders}
+
+    def _fetch_orders_pages_from_ecommerce(self):
+        """Fetch and structure orders from the WooCommerce store page by page.
+
+        The next page is downloaded in a background thread while the current one is processed.
+        """
+        if self.channel_code != 'woocommerce':
+            return super()._fetch_orders_pages_from_ecommerce()
+        return self._wc_iter_orders_pages()
+
+    def _wc_iter_orders_pages(self):
+        date_params = {
+            'modified_after': self._convert_odoo_date_to_wc_format(self._get_orders_sync_date()),
+            'orderby': 'modified',
+            'order': 'asc',
+        }
+        if date_to := self._get_orders_sync_date_to():
+            date_params['modified_before'] = self._convert_odoo_date_to_wc_format(date_to)
+        url, auth = self._wc_get_request_target('orders')
+        account_ref = self._get_account_ref()  # The records must not be used from the I/O thread.
         per_page = 50  # WooCommerce allows up to 100
 
-        while True:
-            orders = self._call_wc(
-                method='GET',
-                end_point='orders',
+        def fetch_page(page):
+            response = ecommerce_request(
+                account_ref,
+                'GET',
+                url,
                 params={
-                    'modified_after': created_at_min_date,
+                    **date_params,
                     'page': page,
                     'per_page': per_page,
                 },
+                auth=auth,
+                timeout=10,
             )
-            if not orders:
-                break
-            for order in orders:
-                if order.get('status') not in ['checkout-draft', 'auto-draft']:
-                    structured_order = self._wc_build_order_structure(order)
-                    structured_orders.append(structured_order)
+            response.raise_for_status()
+            orders = response.json()
+            return orders, page + 1 if len(orders) == per_page else None
 
-            page += 1
-        return {'orders': structured_orders}
+        try:
+            for orders in prefetch_pages(fetch_page, 1):
+                orders = [order for order in orders if order.get('status') not in ['checkout-draft', 'auto-draft']]
+                self.env['ecommerce.order.archive']._archive(self, [(order['id'], order) for order in orders])
+                yield [self._wc_build_order_structure(order) for order in orders]
+        except requests.exceptions.RequestException as error:
+            raise self._wc_get_request_error(error) from error
+
+    def _fetch_order_stamps_from_ecommerce(self, date_from):
+        if self.channel_code != 'woocommerce':
+            return super()._fetch_order_stamps_from_ecommerce(date_from)
+        orders = self._wc_iter_list('orders', params={
+            'modified_after': self._convert_odoo_date_to_wc_format(date_from),
+            '_fields': 'id,status,date_modified_gmt',  # Only download the fields compared.
+        })
+        return [
+            {
+                'id': str(order['id']),
+                'order_ref': str(order['id']),
+                'write_date': self._convert_wc_date_to_odoo_format(order.get('date_modified_gmt')),
+            }
+            for order in orders
+            if order.get('status') not in ['checkout-draft', 'auto-draft']
+        ]
 
     def _fetch_order_from_ecommerce_by_order_ref(self, ecommerce_order_ref):
         if self.channel_code != 'woocommerce':
@@ -248,6 +270,11 @@ class EcommerceAccount(models.Model):
         structured_order = self._wc_build_order_structure(order)
         return structured_order
 
+    def _normalize_archived_order(self, payload):
+        if self.channel_code != 'woocommerce':
+            return super()._normalize_archived_order(payload)
+        return self._wc_build_order_structure(payload)
+
     def _wc_build_order_structure(self, order, **kwargs):
         """Build a structured order dictionary from a WooCommerce order.
 
@@ -266,6 +293,7 @@ class EcommerceAccount(models.Model):
             'status': const.ORDER_STATUS_MAPPING[order.get('status')],
             'currency_code': order.get('currency'),
             'reference': order.get('order_key'),
+            'write_date': self._convert_wc_date_to_odoo_format(order.get('date_modified_gmt')),
             'customer_id': order.get('customer_id'),
             'date_order': order.get('date_created', ''),
             'order_lines': self._wc_prepare_order_line_data(order_lines),
@@ -389,6 +417,14 @@ class EcommerceAccount(models.Model):
             updated_products.append(val['offer'].ec_product_identifier)
         return {}
 
+    def _get_api_secrets(self):
+        if self.channel_code != 'woocommerce':
+            return super()._get_api_secrets()
+        return [secret for secret in (
+            self.wc_consumer_key,
+            self.wc_consumer_secret,
+        ) if secret]
+
     def _get_product_url(self, offer):
         """Return the WooCommerce admin edit URL for the given product offer.
 
@@ -414,15 +450,15 @@ class EcommerceAccount(models.Model):
     ):
         """Send an authenticated request to the WooCommerce API and return the JSON response.
 
+        :raises ECommerceAccountWideError: If the store cannot be reached or is rate limiting.
         :raises ECommerceApiError: If the connection fails or an HTTP error occurs.
         :return: WooCommerce API response as JSON.
         :rtype: dict
         """
-        base_url = f'{self.wc_store_url}{const.wc_api_endpoint}'
-        url = url_join(base_url, end_point) if end_point else base_url
-        auth = HTTPBasicAuth(self.wc_consumer_key, self.wc_consumer_secret)
+        url, auth = self._wc_get_request_target(end_point)
         try:
-            response = requests.request(
+            response = ecommerce_request(
+                self,
                 method,
                 url,
                 params=params,
@@ -430,19 +466,66 @@ class EcommerceAccount(models.Model):
                 auth=auth,
                 timeout=10,
             )
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-            raise ECommerceApiError(self.env._("Could not establish the connection to the WooCommerce."))
-        try:
             response.raise_for_status()
             _logger.info("Request response: %s", pprint.pformat(response.json()))
-        except requests.exceptions.HTTPError as error:
-            raise ECommerceApiError(
+        except requests.exceptions.RequestException as error:
+            raise self._wc_get_request_error(error) from error
+        return response.json()
+
+    def _wc_iter_list(self, end_point, params=None, per_page=100):
+        """Yield the items of a paginated WooCommerce list endpoint as they are decoded from the
+        responses, without loading whole pages in memory.
+
+        :raises ECommerceApiError: If the connection fails, an HTTP error occurs or the response is invalid.
+        :return: Generator of the items of the list.
+        :rtype: generator
+        """
+        url, auth = self._wc_get_request_target(end_point)
+        page = 1
+        while True:
+            count_items = 0
+            try:
+                response = ecommerce_request(
+                    self,
+                    'GET',
+                    url,
+                    params={**(params or {}), 'page': page, 'per_page': per_page},
+                    auth=auth,
+                    timeout=10,
+                    stream=True,
+                )
+                response.raise_for_status()
+                for item in iter_response_json_array(response):
+                    count_items += 1
+                    yield item
+            except requests.exceptions.RequestException as error:
+                raise self._wc_get_request_error(error) from error
+            except json.JSONDecodeError as error:
+                raise ECommerceApiError(self.env._("Invalid response from WooCommerce: %s", error)) from error
+            if count_items < per_page:
+                break
+            page += 1
+
+    def _wc_get_request_target(self, end_point=False):
+        """Return the URL and the authentication of a request to the given WooCommerce endpoint."""
+        base_url = f'{self.wc_store_url}{const.wc_api_endpoint}'
+        url = url_join(base_url, end_point) if end_point else base_url
+        return url, HTTPBasicAuth(self.wc_consumer_key, self.wc_consumer_secret)
+
+    def _wc_get_request_error(self, error):
+        """Convert an exception raised by `requests` into an `ECommerceApiError`."""
+        if isinstance(error, requests.exceptions.HTTPError):
+            return ECommerceApiError(
                 self.env._(
                     "[http_error] %(error_message)s",
                     error_message=error,
                 ),
             )
-        return response.json()
+        return ECommerceApiError(self.env._("Could not establish the connection to the WooCommerce."))
+
+    def _convert_wc_date_to_odoo_format(self, wc_date):
+        """Convert a GMT date of WooCommerce, e.g. '2024-03-22T16:28:02', to the Odoo format."""
+        return wc_date.replace('T', ' ') if wc_date else False
 
     def _convert_odoo_date_to_wc_format(self, odoo_date):
         try:
@@ -2,7 +2,7 @@
 
 {
     'name': "eCommerce Engine",
-    'version': '19.0.1.0',
+    'version': '19.0.1.1',
     'category': "Sales/Sales",
     'summary': "The ecommerce engine used by ecommerce channel modules.",
     'description': """
@@ -27,6 +27,13 @@ enabling the synchronization of products, orders, inventory and other data acros
         'views/stock_picking_views.xml',
         'views/ecommerce_offer_views.xml',
         'views/ecommerce_location_views.xml',
+        'views/ecommerce_api_call_views.xml',
+        'views/ecommerce_sync_run_views.xml',
+        'views/ecommerce_order_backfill_views.xml',
+        'views/ecommerce_order_resync_views.xml',
+        'views/ecommerce_order_dead_letter_views.xml',
+        'views/ecommerce_order_archive_views.xml',
+        'views/ecommerce_outbox_event_views.xml',
 
         'wizards/ecommerce_recover_order_wizard_views.xml',
     ],
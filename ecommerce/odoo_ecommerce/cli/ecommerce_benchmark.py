@@ -0,0 +1,176 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import json
+import os
+import sys
+import time
+
+from odoo import SUPERUSER_ID, api, fields
+from odoo.cli.command import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+
+
+class EcommerceBenchmark(Command):
+    """Benchmark the E-commerce sync flows of accounts against synthetic data"""
+
+    name = 'ecommerce_benchmark'
+    epilog = """\
+The reports are printed as a JSON list, one per account; compare the reports of two module versions
+before upgrading, e.g.
+
+    odoo-bin ecommerce_benchmark orders -c odoo.conf -d copy_of_prod --account 3 --orders 2000 -o after.json
+    odoo-bin ecommerce_benchmark inventory -c odoo.conf -d copy_of_prod --account 3 --account 4 \\
+        --products 50000 --variants 3 --locations 10
+
+The inventory flow runs against the local stand-in of the platform of each account (see
+odoo_ecommerce/tools/mock_platforms). The created records are rolled back unless --commit is given:
+run it on a copy of the database.
+
+The fetch flow downloads and normalizes the orders of each account without processing them. With
+--record, the HTTP traffic is saved into one gzipped fixture per account, with the credentials
+scrubbed, to replay it offline with --replay, e.g.
+
+    odoo-bin ecommerce_benchmark fetch -c odoo.conf -d staging --account 3 --since 2026-01-01 --record fixtures/
+    odoo-bin ecommerce_benchmark fetch -c odoo.conf -d local --account 3 --since 2026-01-01 --replay fixtures/
+
+The guard flow checks that the SQL queries spent per order, offer, picking and inventory row stay
+within the budgets pinned in odoo_ecommerce/tools/benchmarks/query_budget.py and do not grow with
+the data size, and exits with status 1 otherwise, e.g. in a CI job:
+
+    odoo-bin ecommerce_benchmark guard -c odoo.conf -d test_db --account 3 --guard-flows orders,offers"""
+
+    def run(self, cmdargs):
+        self.parser.add_argument(
+            'flow', choices=['orders', 'inventory', 'fetch', 'guard'],
+            help="the sync flow to benchmark, or the query budgets to check",
+        )
+        self.parser.add_argument('-d', '--database', required=True)
+        self.parser.add_argument(
+            '--account', type=int, action='append', required=True, help="id of an ecommerce.account, repeatable",
+        )
+        self.parser.add_argument('--orders', type=int, default=500, help="number of generated orders")
+        self.parser.add_argument('--lines', type=int, default=3, help="maximum number of lines per order")
+        self.parser.add_argument('--products', type=int, default=200)
+        self.parser.add_argument('--variants', type=int, default=3, help="maximum number of variants per product")
+        self.parser.add_argument('--customers', type=int, default=100, help="number of returning customers")
+        self.parser.add_argument('--locations', type=int, default=2)
+        self.parser.add_argument('--currencies', default='USD,EUR', help="comma-separated currency codes")
+        self.parser.add_argument('--resend', type=float, default=0.0, help="share of the orders received twice")
+        self.parser.add_argument('--batch-size', type=int, default=100, help="orders between two flushes")
+        self.parser.add_argument('--latency', type=float, default=0.0, help="seconds added by the mock platforms")
+        self.parser.add_argument('--seed', type=int, default=0)
+        self.parser.add_argument('--since', help="fetch the orders updated since this date, instead of the last sync")
+        cassette = self.parser.add_mutually_exclusive_group()
+        cassette.add_argument('--record', metavar='DIR', help="save the HTTP traffic of the fetch flow into fixtures")
+        cassette.add_argument('--replay', metavar='DIR', help="answer the calls of the fetch flow from recorded fixtures")
+        self.parser.add_argument('--replay-timing', action='store_true', help="wait for the recorded latencies on replay")
+        self.parser.add_argument(
+            '--guard-flows', default='orders,offers,pickings,inventory', help="comma-separated flows checked by the guard",
+        )
+        self.parser.add_argument('--guard-size', type=int, default=10, help="number of units of the smallest guard run")
+        self.parser.add_argument('--commit', action='store_true', help="keep the created records")
+        self.parser.add_argument('-o', '--output', help="file to write the reports to, instead of stdout")
+        args, odoo_args = self.parser.parse_known_args(cmdargs)
+        if (args.record or args.replay) and args.flow != 'fetch':
+            self.parser.error("--record and --replay are only supported by the fetch flow")
+        if args.commit and args.flow != 'orders':
+            # The accounts would stay connected to the mock platforms, which stop with the command.
+            self.parser.error(f"--commit is not supported by the {args.flow} flow")
+        config.parse_config(['-d', args.database, *odoo_args], setup_logging=True)
+
+        reports = []
+        with Registry(args.database).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            for account_id in args.account:
+                account = env['ecommerce.account'].browse(account_id).exists()
+                if not account:
+                    sys.exit(f"No E-commerce account with id {account_id} in database {args.database}.")
+                if args.flow == 'guard':
+                    reports += self._run_guard(account, args)
+                else:
+                    benchmark = {
+                        'orders': self._run_orders, 'inventory': self._run_inventory, 'fetch': self._run_fetch,
+                    }[args.flow]
+                    report = benchmark(account, args)
+                    report['parameters'] = {
+                        key: value for key, value in vars(args).items() if key not in ('database', 'output')
+                    }
+                    reports.append(report)
+                if not args.commit:
+                    cr.rollback()
+                    env.invalidate_all()
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(reports, file, indent=2)
+        else:
+            json.dump(reports, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        if any(report.get('violations') for report in reports):
+            sys.exit(1)
+
+    def _get_store(self, args, orders=0):
+        # Imported once the addons path is set up by the configuration.
+        from odoo.addons.odoo_ecommerce.tools.mock_platforms import MockStore  # noqa: PLC0415
+
+        return MockStore(
+            products=args.products, variants=args.variants, locations=args.locations, orders=orders,
+            lines=args.lines, customers=args.customers if orders else 0,
+            currencies=tuple(args.currencies.split(',')), seed=args.seed,
+        )
+
+    def _run_orders(self, account, args):
+        from odoo.addons.odoo_ecommerce.tools.benchmarks import (  # noqa: PLC0415
+            iter_normalized_orders,
+            run_order_ingestion_benchmark,
+        )
+
+        store = self._get_store(args, orders=args.orders)
+        orders_data = list(iter_normalized_orders(store, tax_included=account.tax_included))
+        orders_data += orders_data[:int(len(orders_data) * args.resend)]
+        return run_order_ingestion_benchmark(account, orders_data, batch_size=args.batch_size)
+
+    def _run_inventory(self, account, args):
+        from odoo.addons.odoo_ecommerce.tools.benchmarks import (  # noqa: PLC0415
+            connect_to_mock_platform,
+            run_inventory_benchmark,
+            seed_inventory,
+        )
+        from odoo.addons.odoo_ecommerce.tools.mock_platforms import MOCK_SERVERS  # noqa: PLC0415
+
+        if account.channel_code not in MOCK_SERVERS:
+            sys.exit(f"No mock platform for the channel {account.channel_code} of account {account.id}.")
+        store = self._get_store(args)
+        with MOCK_SERVERS[account.channel_code](store=store, latency=args.latency, seed=args.seed) as server:
+            account = connect_to_mock_platform(account, server)
+            start = time.perf_counter()
+            seed_inventory(account, store)
+            seed_duration = time.perf_counter() - start
+            report = run_inventory_benchmark(account, server)
+        report['seed_duration'] = round(seed_duration, 3)
+        return report
+
+    def _run_fetch(self, account, args):
+        from odoo.addons.odoo_ecommerce.tools.benchmarks import run_fetch_benchmark  # noqa: PLC0415
+        from odoo.addons.odoo_ecommerce.utils.http_cassette import use_cassette  # noqa: PLC0415
+
+        date_from = fields.Datetime.to_datetime(args.since) if args.since else None
+        if not (args.record or args.replay):
+            return run_fetch_benchmark(account, date_from=date_from)
+        if args.record:
+            os.makedirs(args.record, exist_ok=True)
+        path = os.path.join(args.record or args.replay, f'{account.channel_code}_{account.id}.jsonl.gz')
+        mode = 'record' if args.record else 'replay'
+        with use_cassette(path, mode, secrets=account._get_api_secrets(), timing=args.replay_timing):
+            report = run_fetch_benchmark(account, date_from=date_from)
+        report['cassette'] = {'path': path, 'mode': mode}
+        return report
+
+    def _run_guard(self, account, args):
+        from odoo.addons.odoo_ecommerce.tools.benchmarks import QUERY_BUDGETS, check_query_budgets  # noqa: PLC0415
+
+        flows = args.guard_flows.split(',')
+        if unknown_flows := set(flows) - set(QUERY_BUDGETS):
+            self.parser.error(f"unknown guard flows: {', '.join(sorted(unknown_flows))}")
+        return check_query_budgets(account, flows=flows, size=args.guard_size, seed=args.seed)
@@ -0,0 +1,39 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import hmac
+import logging
+
+from werkzeug.exceptions import Forbidden, NotFound
+
+from odoo import http
+from odoo.http import request
+
+from odoo.addons.odoo_ecommerce.utils import metrics
+
+_logger = logging.getLogger(__name__)
+
+
+class ECommerceMetricsController(http.Controller):
+
+    @http.route('/ecommerce/metrics', type='http', auth='public', methods=['GET'], save_session=False)
+    def ecommerce_metrics(self, **kwargs):
+        """Expose the E-commerce sync metrics in the Prometheus text format.
+
+        The endpoint is disabled until the `odoo_ecommerce.metrics_token` system parameter is set.
+        The scraper must then send it as a bearer token: `Authorization: Bearer <token>`.
+        """
+        token = request.env['ir.config_parameter'].sudo().get_param('odoo_ecommerce.metrics_token')
+        if not token:
+            raise NotFound()
+        authorization = request.httprequest.headers.get('Authorization', '')
+        if not hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            _logger.warning("Rejected a request to the E-commerce metrics with an invalid token.")
+            raise Forbidden()
+
+        counters, histograms = metrics.collect(request.env.cr.dbname)
+        accounts = request.env['ecommerce.account'].sudo().with_context(active_test=False).search([])
+        gauges = accounts._get_metrics_gauges()
+        return request.make_response(
+            metrics.render(counters, histograms, gauges),
+            headers=[('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')],
+        )
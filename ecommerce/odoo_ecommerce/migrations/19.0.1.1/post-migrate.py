@@ -0,0 +1,21 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+
+def migrate(cr, version):
+    """Queue the delivery orders still waiting to be pushed to their platform in the outbox."""
+    cr.execute("""
+        INSERT INTO ecommerce_outbox_event (
+            ecommerce_account_id, event_type, picking_id, state, attempt_count, next_attempt_date,
+            create_uid, create_date, write_uid, write_date
+        )
+        SELECT picking.ec_account_id, 'picking', picking.id, 'pending', 0, NOW() AT TIME ZONE 'UTC',
+               1, NOW() AT TIME ZONE 'UTC', 1, NOW() AT TIME ZONE 'UTC'
+          FROM stock_picking picking
+          JOIN ecommerce_account account ON account.id = picking.ec_account_id
+          JOIN ecommerce_channel channel ON channel.id = account.ecommerce_channel_id
+         WHERE picking.state = 'done'
+           AND picking.ecommerce_sync_status = 'pending'
+           AND account.fulfilled_by = 'odoo'
+           AND channel.support_shipping
+      ORDER BY picking.id
+    """)
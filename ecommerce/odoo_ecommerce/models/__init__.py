@@ -2,9 +2,16 @@
 
 from . import delivery_carrier
 from . import ecommerce_account
+from . import ecommerce_api_call
 from . import ecommerce_channel
 from . import ecommerce_location
 from . import ecommerce_offer
+from . import ecommerce_order_archive
+from . import ecommerce_order_backfill
+from . import ecommerce_order_dead_letter
+from . import ecommerce_order_resync
+from . import ecommerce_outbox_event
+from . import ecommerce_sync_run
 from . import product_product
 from . import product_template
 from . import res_partner
@@ -13,3 +20,4 @@ from . import sale_order
 from . import sale_order_line
 from . import stock_move
 from . import stock_picking
+from . import stock_quant
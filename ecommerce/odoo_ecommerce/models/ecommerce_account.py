@@ -1,6 +1,8 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 import logging
+from contextlib import closing, contextmanager, suppress
+from datetime import timedelta
 
 import dateutil.parser
 import psycopg2
@@ -12,10 +14,46 @@ from odoo.modules.registry import Registry
 from odoo.service.model import PG_CONCURRENCY_EXCEPTIONS_TO_RETRY
 from odoo.tools import groupby
 
-from ..utils import ECommerceApiError, ensure_account_is_authenticated
+from ..utils import (
+    ECommerceAccountWideError,
+    ECommerceApiError,
+    ECommerceDataError,
+    ensure_account_is_authenticated,
+    ensure_account_is_reachable,
+    metrics,
+)
+from ..utils.concurrency import DeferredRetryQueue, call_with_concurrency_retry
+from ..utils.order_contract import ECommerceOrder
+from ..utils.order_lanes import (
+    DEFAULT_LANE_WEIGHTS,
+    DEFAULT_MAX_DEFERRED,
+    DRAIN_STEP_SIZE,
+    LANES,
+    OrderLanes,
+    get_order_lane,
+    run_weighted_fair,
+)
+from ..utils.order_reconcile import parse_write_date
+from ..utils.order_timer import OrderTimer, order_step
+from ..utils.request import AccountRef
+from ..utils.sync_run import SyncRunRecorder
 
 _logger = logging.getLogger(__name__)
 
+# Processing time and number of SQL queries above which an order is logged as slow, see
+# `_sync_orders_page`. Override them with the `odoo_ecommerce.slow_order_*` system parameters.
+DEFAULT_SLOW_ORDER_SECONDS = 2.0
+DEFAULT_SLOW_ORDER_QUERIES = 300
+# Adaptive polling, see `_schedule_next_poll`: the number of orders a poll aims to fetch, the weight
+# of the last poll in the smoothed order rate, and the default number of API calls per hour an
+# account may spend on polling, overridden by the `odoo_ecommerce.poll_api_budget` system parameter.
+ORDERS_PER_POLL = 20
+ORDERS_RATE_SMOOTHING = 0.5
+DEFAULT_POLL_API_BUDGET = 60
+# Number of hours before the last orders sync compared by `_reconcile_orders`, overridden by the
+# `odoo_ecommerce.reconcile_window_hours` system parameter.
+DEFAULT_RECONCILE_WINDOW_HOURS = 48
+
 
 class ECommerceAccount(models.Model):
     _name = 'ecommerce.account'
@@ -91,6 +129,18 @@ class ECommerceAccount(models.Model):
         string="Salesperson",
         default=lambda self: self.env.user,
     )
+    profile_next_run = fields.Boolean(
+        string="Profile Next Sync",
+        help="When enabled, the next orders or inventory synchronization of the account is profiled and"
+             " the profile is attached to its sync run. The option is disabled once the run starts.",
+        copy=False,
+    )
+    archive_order_payloads = fields.Boolean(
+        string="Archive Order Payloads",
+        help="When enabled, the orders received from the platform are archived as received, before"
+             " being normalized, so that they can be imported again without calling the platform.",
+        default=True,
+    )
     update_inventory = fields.Boolean(
         string="Update Inventory",
         help="When enabled, this option allows the inventory to be updated on the e-commerce platform.",
@@ -148,6 +198,37 @@ class ECommerceAccount(models.Model):
         default=fields.Datetime.now,
     )
 
+    # polling fields.
+    poll_interval_min = fields.Integer(
+        string="Minimum Polling Interval",
+        help="The shortest delay, in minutes, between two synchronizations of the account by the crons.",
+        required=True,
+        default=5,
+    )
+    poll_interval_max = fields.Integer(
+        string="Maximum Polling Interval",
+        help="The longest delay, in minutes, between two synchronizations of the account by the crons.",
+        required=True,
+        default=60,
+    )
+    poll_interval = fields.Integer(
+        string="Polling Interval",
+        help="The current delay, in minutes, between two synchronizations of the account by the crons,"
+             " adapted to the rate of its orders and to the API calls they cost.",
+        readonly=True,
+        default=60,
+        copy=False,
+    )
+    orders_rate = fields.Float(
+        string="Orders per Hour",
+        help="The smoothed number of orders created or updated per hour on the platform.",
+        readonly=True,
+        copy=False,
+    )
+    next_orders_sync = fields.Datetime(string="Next Orders Sync", readonly=True, copy=False)
+    next_pickings_sync = fields.Datetime(string="Next Pickings Sync", readonly=True, copy=False)
+    next_inventory_sync = fields.Datetime(string="Next Inventory Sync", readonly=True, copy=False)
+
     # count fields.
     offer_count = fields.Integer(string="E-commerce Offer Count", compute='_compute_offer_count')
     order_count = fields.Integer(string="E-commerce Order Count", compute='_compute_order_count')
@@ -157,6 +238,10 @@ class ECommerceAccount(models.Model):
         'UNIQUE(company_id, name)',
         "The name must be unique within the same company",
     )
+    _check_poll_intervals = models.Constraint(
+        'CHECK(poll_interval_min > 0 AND poll_interval_min <= poll_interval_max)',
+        "The minimum polling interval must be positive and not exceed the maximum polling interval.",
+    )
 
     # === ORM METHODS ===#
 
@@ -304,6 +389,9 @@ class ECommerceAccount(models.Model):
     def write(self, vals):
         result = super().write(vals)
         self._check_required_if_channel()
+        if {'update_inventory', 'location_id', 'support_location'} & vals.keys():
+            # The stock to publish changed without any stock move.
+            self.env['ecommerce.outbox.event']._enqueue_offers_inventory(self.ecommerce_offer_ids)
         return result
 
     def copy_data(self, default=None):
@@ -334,6 +422,98 @@ class ECommerceAccount(models.Model):
         except psycopg2.Error:
             pass
 
+    def _get_metrics_gauges(self):
+        """Return the gauges exposed by `/ecommerce/metrics` for the accounts, read from the database.
+
+        :return: The gauges, as `{(name, labels): value}` where `labels` is a tuple of `(label, value)` pairs.
+        :rtype: dict
+        """
+        gauges = {}
+        pending_events_data = self.env['ecommerce.outbox.event']._read_group(
+            [('ecommerce_account_id', 'in', self.ids), ('state', '=', 'pending')],
+            groupby=['ecommerce_account_id', 'event_type'],
+            aggregates=['__count'],
+        )
+        pending_events = {(account.id, event_type): count for account, event_type, count in pending_events_data}
+        now = fields.Datetime.now()
+        for account in self:
+            labels = (('account', str(account.id)), ('channel', account.channel_code))
+            gauges['ecommerce_queue_depth', (*labels, ('queue', 'pickings'))] = pending_events.get((account.id, 'picking'), 0)
+            gauges['ecommerce_queue_depth', (*labels, ('queue', 'inventory'))] = pending_events.get((account.id, 'inventory'), 0)
+            for flow, last_sync in (('orders', account.last_orders_sync), ('products', account.last_products_sync)):
+                if last_sync:
+                    gauges['ecommerce_last_successful_sync_age_seconds', (*labels, ('flow', flow))] = int((now - last_sync).total_seconds())
+        return gauges
+
+    def _get_account_ref(self):
+        """Return an ORM-free reference to the account, used to key its circuit breaker.
+
+        :rtype: AccountRef
+        """
+        self.ensure_one()
+        return AccountRef(self.env.cr.dbname, self._origin.id, self.channel_code)
+
+    @contextmanager
+    def _profile_sync_run(self, sync_run):
+        """Profile the sync run of the account during the `with` block if it was requested.
+
+        See `profile_next_run`; nothing is done when the option is disabled.
+
+        :param SyncRunRecorder sync_run: The recorder of the run, which logs the profile.
+        """
+        if not self.profile_next_run:
+            yield
+            return
+        self.profile_next_run = False
+        description = f"{self.ecommerce_channel_id.name} {sync_run.flow} sync of account {self.id}"
+        with sync_run.profiling(self.env.cr, description):
+            yield
+
+    @contextmanager
+    def _sync_lock(self, flow):
+        """Hold a Postgres advisory lock on the flow of the account during the `with` block.
+
+        Concurrent runs of the same flow on the same account (cron, manual sync, ...) would fetch
+        and process the same records and fail on each other's rows; the run that does not get the
+        lock is skipped instead of waiting. The lock belongs to the database session, so it is kept
+        across the commits of the run, and released at the end of the block.
+
+        :param str flow: The synchronized flow, e.g. 'orders'.
+        :return: Whether the lock was acquired; if not, the run must be skipped.
+        :rtype: bool
+        """
+        self.ensure_one()
+        cr = self.env.cr
+        lock_key = (f'ecommerce.account.{flow}', self.id)
+        cr.execute("SELECT pg_try_advisory_lock(hashtext(%s), %s)", lock_key)
+        if not cr.fetchone()[0]:
+            _logger.info(
+                "Skipping the %s sync of %s account with id %s: another run is in progress.",
+                flow, self.ecommerce_channel_id.name, self.id,
+            )
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            try:
+                cr.execute("SELECT pg_advisory_unlock(hashtext(%s), %s)", lock_key)
+            except psycopg2.errors.InFailedSqlTransaction:
+                # The failed transaction is lost anyway, but the lock must not outlive the run in
+                # the connection pool.
+                cr.rollback()
+                cr.execute("SELECT pg_advisory_unlock(hashtext(%s), %s)", lock_key)
+
+    def _get_api_secrets(self):
+        """Return the credentials of the account sent to the platform, to scrub from HTTP fixtures.
+
+        Override this method in ecommerce modules to list the values of their credential fields.
+
+        :return: The secrets, see `odoo_ecommerce.utils.http_cassette.HttpCassette`.
+        :rtype: list
+        """
+        return []
+
     # === ACTION METHODS ===#
 
     def action_archive(self):
@@ -420,6 +600,52 @@ class ECommerceAccount(models.Model):
             'context': {'create': False},
         }
 
+    def action_view_sync_runs(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_sync_run')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        action['context'] = {'create': False}
+        return action
+
+    def action_view_order_backfills(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_order_backfill')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        action['context'] = {'default_ecommerce_account_id': self.id, 'default_date_to': fields.Datetime.to_string(self.last_orders_sync)}
+        return action
+
+    def action_view_order_resyncs(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_order_resync')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        return action
+
+    def action_view_order_dead_letters(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_order_dead_letter')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        return action
+
+    def action_view_outbox_events(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_outbox_event')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        return action
+
+    def action_view_order_archives(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_order_archive')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        return action
+
+    def action_view_api_calls(self):
+        self.ensure_one()
+        self.env['ecommerce.api.call']._flush_buffer()
+        action = self.env['ir.actions.act_window']._for_xml_id('odoo_ecommerce.action_ecommerce_api_call')
+        action['domain'] = [('ecommerce_account_id', '=', self.id)]
+        action['context'] = {'search_default_group_by_endpoint': 1}
+        return action
+
     def action_sync_products(self):
         return self._sync_products()
 
@@ -482,54 +708,81 @@ class ECommerceAccount(models.Model):
         count_processed = 0
         count_failed = []
         for account in self:
-            try:
-                ensure_account_is_authenticated(account)
-                result = account._fetch_products_from_ecommerce()
-            except (ECommerceApiError, UserError) as error:
-                account.log_xml(
-                    "An error occurred while fetching products for %s account with id %s."
-                    "Error description: %s" %
-                    (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                    '_sync_products',
-                    'server',
-                )
-                continue  # skip this account and continue with the next one
-            products_data = result.get('products', [])
-            count_fetched += len(products_data)
-            for product_data in products_data:
+            with account._sync_lock('products') as locked:
+                if not locked:
+                    continue  # Another run of the flow is in progress for this account.
+                sync_run = SyncRunRecorder('products', watermark_from=account.last_products_sync)
                 try:
-                    processed_offer = None
-                    if auto_commit:
-                        with self.env.cr.savepoint():
-                            processed_offer = account._find_or_create_offer(product_data, auto_match=True)
-                    else:  # Avoid the savepoint in testing
-                        processed_offer = account._find_or_create_offer(product_data, auto_match=True)
-                    if processed_offer:
-                        count_processed += 1
-                except Exception as error:
-                    if modules.module.current_test:
-                        raise  # we are executing during testing, do not try to rollback
-                    if isinstance(error, PG_CONCURRENCY_EXCEPTIONS_TO_RETRY):
-                        account.log_xml(
-                            "A concurrency error occurred while processing the offer data "
-                            "with ec_product_identifier %s for %s account with id %s."
-                            "Error description: %s" %
-                            (product_data.get('ec_product_identifier'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                            '_sync_products',
-                        )
-                        raise
+                    ensure_account_is_authenticated(account)
+                    ensure_account_is_reachable(account)
+                    with sync_run.phase('fetch'):
+                        result = account._fetch_products_from_ecommerce()
+                    # The products may be a generator decoding the response of the platform as they are
+                    # consumed, so fetching errors can also be raised while iterating over them.
+                    products = DeferredRetryQueue(sync_run.iter_phase(result.get('products', [])))
+                    for product_data in products:
+                        if not products.retrying:
+                            count_fetched += 1
+                            sync_run.count_fetched += 1
+                        try:
+                            processed_offer = None
+                            with sync_run.phase('process'):
+                                if auto_commit:
+                                    def process_offer():
+                                        with self.env.cr.savepoint():
+                                            return account._find_or_create_offer(product_data, auto_match=True)
+                                    processed_offer = call_with_concurrency_retry(self.env.cr, process_offer)
+                                else:  # Avoid the savepoint in testing
+                                    processed_offer = account._find_or_create_offer(product_data, auto_match=True)
+                            if processed_offer:
+                                count_processed += 1
+                                sync_run.count_processed += 1
+                        except ECommerceAccountWideError:
+                            if not modules.module.current_test:
+                                self.env.cr.rollback()
+                            raise  # the remaining products would fail the same way
+                        except Exception as error:
+                            if modules.module.current_test:
+                                raise  # we are executing during testing, do not try to rollback
+                            self.env.cr.rollback()
+                            if isinstance(error, PG_CONCURRENCY_EXCEPTIONS_TO_RETRY) and products.defer(product_data):
+                                account.log_xml(
+                                    "A concurrency error occurred while processing the offer data "
+                                    "with ec_product_identifier %s for %s account with id %s; it is deferred to the end of the run."
+                                    "Error description: %s" %
+                                    (product_data.get('ec_product_identifier'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                                    '_sync_products',
+                                )
+                                continue
+                            account.log_xml(
+                                "Error occurred while processing the product data "
+                                "with ec_product_identifier '%s' for %s account with id '%s'."
+                                "Error description: %s" %
+                                (product_data.get('ec_product_identifier'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                                '_sync_products',
+                            )
+                            count_failed.append(product_data.get('ec_product_identifier'))
+                            sync_run.count_failed += 1
+                        if auto_commit:
+                            with sync_run.phase('commit'):
+                                self.env.cr.commit()
+                except ECommerceAccountWideError as error:
+                    account._log_account_wide_error(error, '_sync_products')
+                    self.env['ecommerce.sync.run']._log_run(account, sync_run, 'interrupted', error=error)
+                    continue  # Keep the sync date unchanged when the account was interrupted.
+                except (ECommerceApiError, UserError) as error:
                     account.log_xml(
-                        "Error occurred while processing the product data "
-                        "with ec_product_identifier '%s' for %s account with id '%s'."
+                        "An error occurred while fetching products for %s account with id %s."
                         "Error description: %s" %
-                        (product_data.get('ec_product_identifier'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                        (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
                         '_sync_products',
+                        'server',
                     )
-                    self.env.cr.rollback()
-                    count_failed.append(product_data.get('ec_product_identifier'))
-                if auto_commit:
-                    self.env.cr.commit()
-            account.last_products_sync = fields.Datetime.now()
+                    self.env['ecommerce.sync.run']._log_run(account, sync_run, 'failed', error=error)
+                    continue  # skip this account and continue with the next one
+                account.last_products_sync = fields.Datetime.now()
+                self.env['ecommerce.sync.run']._log_run(account, sync_run, watermark_to=account.last_products_sync)
+        self.env['ecommerce.api.call']._flush_buffer()
         message = "No products found."
         if count_fetched:
             message = f"Fetched: {count_fetched} | Processed: {count_processed} | Failed: {len(count_failed)}"
@@ -547,6 +800,11 @@ class ECommerceAccount(models.Model):
     def _sync_orders(self, auto_commit=True):
         """Synchronize the account's sales orders that were recently updated on E-commerce Platform.
 
+        The accounts are synchronized together, page by page, with `_iter_sync_orders`: within an
+        account, the new orders are processed before the updates, and across accounts, an account
+        processing new orders is given more turns than an account catching up on updates, see
+        `odoo_ecommerce.utils.order_lanes`.
+
         Note: This method is called by the `ir_cron_ecommerce_sync_orders` cron.
 
         :param bool auto_commit: Whether the database cursor should be committed as soon as an order
@@ -557,86 +815,399 @@ class ECommerceAccount(models.Model):
             ('active', '=', True),
             ('state', '=', 'connected'),
         ])
-        accounts = self.filtered(domain) if self else self.search(domain)
+        accounts = self.filtered(domain) if self else self.search(domain & self._get_poll_due_domain('orders'))
         for account in accounts:
             if account.support_location:
                 account.action_sync_locations()
-        count_fetched = 0
+        sync_runs = []
+        # The profiled runs are not interleaved with the others, whose queries would be profiled too.
+        profiled_accounts = accounts.filtered('profile_next_run')
+        for account in profiled_accounts:
+            run_weighted_fair([account.with_prefetch()._iter_sync_orders(sync_runs, auto_commit)])
+        run_weighted_fair([
+            # Avoid pre-fetching after each cache invalidation.
+            account.with_prefetch()._iter_sync_orders(sync_runs, auto_commit)
+            for account in accounts - profiled_accounts
+        ])
+        self.env['ecommerce.api.call']._flush_buffer()
+        count_fetched = sum(sync_run.count_fetched for sync_run in sync_runs)
+        count_processed = sum(sync_run.count_processed for sync_run in sync_runs)
+        count_failed = sum(sync_run.count_failed for sync_run in sync_runs)
+        message = "No orders found."
+        if count_fetched:
+            message = f"Fetched: {count_fetched} | Processed: {count_processed} | Failed: {count_failed} | Not confirmed: {count_fetched - count_processed - count_failed}"
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'warning' if count_failed else 'success',
+                'title': self.env._("Order Sync Summary") if count_fetched else "",
+                'message': self.env._(message),
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    def _iter_sync_orders(self, sync_runs, auto_commit=True):
+        """Synchronize the orders of the account recently updated on E-commerce Platform, one page
+        at a time.
+
+        The orders of each fetched page are queued in their priority lane and processed by weighted
+        round-robin over the lanes. Up to `odoo_ecommerce.order_lanes_max_deferred` updates and
+        cancellations may be held back to process the new orders of the next pages first; they are
+        all processed before the sync date of the account is moved forward, and fetched again by
+        the next run if this one is interrupted.
+
+        The recorder of the run is created when the run starts, and only times the steps of the
+        account, not the turns of the runs interleaved with it.
+
+        :param list sync_runs: The list to append the `SyncRunRecorder` of the run to, updated with
+                               its timings and counters.
+        :param bool auto_commit: Whether the database cursor should be committed as soon as an order
+                                 is successfully synchronized.
+        :return: A generator yielding the cost of each step, for `run_weighted_fair`: the number of
+                 processed orders, each divided by the weight of its lane.
+        """
+        self.ensure_one()
+        with self._sync_lock('orders') as locked:
+            if not locked:
+                return  # Another run of the flow is in progress for this account.
+            sync_run = SyncRunRecorder('orders', watermark_from=self.last_orders_sync)
+            sync_runs.append(sync_run)
+            lane_weights, max_deferred = self._get_order_lanes_settings()
+            lanes = OrderLanes(lane_weights)
+            count_pages = 0
+            with self._profile_sync_run(sync_run):
+                try:
+                    ensure_account_is_authenticated(self)
+                    ensure_account_is_reachable(self)
+                    # The next page is downloaded in the background while the current one is processed.
+                    with closing(self._fetch_orders_pages_from_ecommerce()) as orders_pages:
+                        for orders_data in sync_run.iter_phase(orders_pages):
+                            count_pages += 1
+                            sync_run.count_fetched += len(orders_data)
+                            # Hold back the orders in their compact contract rather than as the dicts of the page.
+                            self._normalize_orders_page(orders_data, sync_run)
+                            self._queue_orders_by_lane(orders_data, lanes, sync_run)
+                            cost = self._sync_orders_lanes(lanes, max_deferred, auto_commit, sync_run)
+                            with sync_run.paused():  # The other accounts take their turn.
+                                yield cost
+                    while lanes:  # Process the held back orders.
+                        cost = self._sync_orders_lanes(lanes, max(len(lanes) - DRAIN_STEP_SIZE, 0), auto_commit, sync_run)
+                        with sync_run.paused():
+                            yield cost
+                except ECommerceAccountWideError as error:
+                    self._log_account_wide_error(error, '_sync_orders')
+                    self.env['ecommerce.sync.run']._log_run(self, sync_run, 'interrupted', error=error)
+                    self._schedule_next_poll('orders', sync_run, 'interrupted')
+                    if auto_commit:
+                        self.env.cr.commit()
+                    return  # Keep the sync date unchanged when the account was interrupted.
+                except (ECommerceApiError, UserError) as error:
+                    self.log_xml(
+                        "An error occurred while fetching orders for %s account with id %s."
+                        "Error description: %s" %
+                        (self.ecommerce_channel_id.name, self.id, str(error).split('DETAIL')[0]),
+                        '_sync_orders',
+                        'server',
+                    )
+                    self.env['ecommerce.sync.run']._log_run(self, sync_run, 'failed', error=error)
+                    self._schedule_next_poll('orders', sync_run, 'failed')
+                    if auto_commit:
+                        self.env.cr.commit()
+                    return  # skip this account and continue with the next one
+                self.last_orders_sync = fields.Datetime.now()
+                self.env['ecommerce.sync.run']._log_run(self, sync_run, watermark_to=self.last_orders_sync)
+                self._schedule_next_poll('orders', sync_run, api_calls=count_pages)
+                if auto_commit:
+                    # The runs of the other accounts go on with the same cursor, and roll it back
+                    # when one of their orders fails.
+                    self.env.cr.commit()
+
+    def _get_order_lanes_settings(self):
+        """Return the weights of the priority lanes of the orders and the maximum number of held
+        back orders, see `odoo_ecommerce.utils.order_lanes`.
+
+        :return: The weight of each lane and the maximum number of held back orders.
+        :rtype: tuple
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        return (
+            {
+                lane: max(int(ICP.get_param(f'odoo_ecommerce.order_lane_weight_{lane}', weight)), 1)
+                for lane, weight in DEFAULT_LANE_WEIGHTS.items()
+            },
+            int(ICP.get_param('odoo_ecommerce.order_lanes_max_deferred', DEFAULT_MAX_DEFERRED)),
+        )
+
+    def _queue_orders_by_lane(self, orders_data, lanes, sync_run):
+        """Queue the orders of a fetched page in their priority lane.
+
+        :param list orders_data: The orders of the page, normalized by `_normalize_orders_page`.
+        :param OrderLanes lanes: The lanes of the run.
+        :param SyncRunRecorder sync_run: The recorder of the run.
+        :return: None
+        """
+        with sync_run.phase('normalize'):
+            known_identifiers = set(self.env['sale.order'].search_fetch([
+                ('ecommerce_account_id', '=', self.id),
+                ('ecommerce_order_identifier', 'in', [str(order_data.get('id')) for order_data in orders_data]),
+            ], ['ecommerce_order_identifier']).mapped('ecommerce_order_identifier'))
+        count_by_lane = dict.fromkeys(LANES, 0)
+        for order_data in orders_data:
+            lane = get_order_lane(order_data, known_identifiers)
+            lanes.push(lane, order_data)
+            count_by_lane[lane] += 1
+        for lane, count in count_by_lane.items():
+            if count:
+                metrics.inc(
+                    self.env.cr.dbname, 'ecommerce_order_lane_total',
+                    {'channel': self.channel_code, 'lane': lane}, count,
+                )
+
+    def _sync_orders_lanes(self, lanes, max_deferred, auto_commit, sync_run):
+        """Process the queued orders by weighted round-robin over their lanes, see `OrderLanes.drain`.
+
+        :param OrderLanes lanes: The lanes of the run.
+        :param int max_deferred: The number of updates and cancellations that may be held back.
+        :param bool auto_commit: Whether the database cursor should be committed as soon as an order
+                                 is successfully synchronized.
+        :param SyncRunRecorder sync_run: The recorder of the run.
+        :return: The cost of the processed orders, each divided by the weight of its lane.
+        :rtype: float
+        """
+        orders_data = []
+        cost = 0.0
+        for lane, order_data in lanes.drain(max_deferred):
+            orders_data.append(order_data)
+            cost += 1 / lanes.weights[lane]
+        if orders_data:
+            self._sync_orders_page(orders_data, auto_commit, sync_run=sync_run)
+        self.env['ecommerce.api.call']._flush_buffer()
+        return cost
+
+    def _normalize_orders_page(self, orders_data, sync_run):
+        """Swap the dicts of a page of orders for their compact contract, in place.
+
+        The orders that do not follow the contract are left as is; their error is reported when
+        they are processed by `_sync_orders_page`.
+
+        :param list orders_data: The orders of the page, in the format of `_fetch_orders_from_ecommerce`.
+        :param SyncRunRecorder sync_run: The recorder of the run.
+        :return: None
+        """
+        with sync_run.phase('normalize'):
+            for index, order_data in enumerate(orders_data):
+                with suppress(ECommerceDataError):
+                    orders_data[index] = ECommerceOrder.from_dict(order_data)
+
+    def _sync_orders_page(self, orders_data, auto_commit=True, sync_run=None):
+        """Process a page of orders fetched from the E-commerce platform.
+
+        :param list orders_data: The orders of the page, normalized by `_normalize_orders_page`.
+        :param bool auto_commit: Whether the database cursor should be committed as soon as an order
+                                 is successfully synchronized.
+        :param SyncRunRecorder sync_run: The recorder of the current run, updated with the
+                                         timings and counters of the page.
+        :return: The number of processed orders and the list of identifiers of the failed orders.
+        :rtype: tuple
+        :raise ECommerceAccountWideError: If the account became unreachable, after rolling back the
+                                          current order.
+        """
+        self.ensure_one()
+        sync_run = sync_run or SyncRunRecorder('orders')
         count_processed = 0
-        count_failed = []
-        for account in accounts:
-            account = account.with_prefetch()  # Avoid pre-fetching after each cache invalidation.
+        failed_ids = []
+        slow_order_seconds, slow_order_queries = self._get_slow_order_thresholds()
+        for order_data in orders_data:
             try:
-                ensure_account_is_authenticated(account)
-                result = account._fetch_orders_from_ecommerce()
-            except (ECommerceApiError, UserError) as error:
-                account.log_xml(
-                    "An error occurred while fetching orders for %s account with id %s."
-                    "Error description: %s" %
-                    (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                    '_sync_orders',
-                    'server',
-                )
-                continue  # skip this account and continue with the next one
-            orders_data = result.get('orders') or []
-            count_fetched += len(orders_data)
-            for order_data in orders_data:
-                try:
-                    processed_order = None
+                processed_order = None
+                if not isinstance(order_data, ECommerceOrder):
+                    order_data = ECommerceOrder.from_dict(order_data)  # Raise the contract error of the order.
+                with sync_run.phase('process'), OrderTimer(self.env.cr) as order_timer:
                     if auto_commit:
-                        with self.env.cr.savepoint():
-                            processed_order = account._process_order_data(order_data)
+                        def process_order():
+                            with self.env.cr.savepoint():
+                                return self._process_order_data(order_data)
+                        processed_order = call_with_concurrency_retry(self.env.cr, process_order)
                     else:  # Avoid the savepoint in testing
-                        processed_order = account._process_order_data(order_data)
-                    if processed_order:
-                        count_processed += 1
-                except Exception as error:
-                    if modules.module.current_test:
-                        raise  # we are executing during testing, do not try to rollback
-                    if isinstance(error, PG_CONCURRENCY_EXCEPTIONS_TO_RETRY):
-                        account.log_xml(
-                            "A concurrency error occurred while processing the order data "
-                            "with ec_order_identifier %s for %s account with id %s."
-                            "Error description: %s" %
-                            (order_data.get('id'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                            '_sync_orders',
-                        )
-                        raise
+                        processed_order = self._process_order_data(order_data)
+                metrics.observe(
+                    self.env.cr.dbname, 'ecommerce_order_process_duration_seconds',
+                    {'channel': self.channel_code}, order_timer.duration,
+                )
+                if order_timer.duration >= slow_order_seconds or order_timer.queries >= slow_order_queries:
+                    _logger.warning(
+                        "Slow order %s (id %s) of %s account with id %s: %.2fs and %s queries for %s lines."
+                        " Steps: %s",
+                        order_data.get('reference'), order_data.get('id'), self.ecommerce_channel_id.name, self.id,
+                        order_timer.duration, order_timer.queries, len(order_data.get('order_lines') or ()),
+                        order_timer.format_steps(),
+                    )
+                if processed_order:
+                    count_processed += 1
+                    sync_run.count_processed += 1
+            except ECommerceAccountWideError:
+                if not modules.module.current_test:
                     self.env.cr.rollback()
-                    account._handle_sync_failure(
+                raise  # the remaining orders would fail the same way
+            except Exception as error:
+                if modules.module.current_test:
+                    raise  # we are executing during testing, do not try to rollback
+                self.env.cr.rollback()
+                # Keep the normalized order to retry it without fetching it again.
+                self.env['ecommerce.order.dead.letter']._store(self, order_data, error)
+                if isinstance(error, PG_CONCURRENCY_EXCEPTIONS_TO_RETRY):
+                    # The error is transient: the failed order is retried later by the
+                    # `ir_cron_ecommerce_retry_dead_letters` cron, after a backoff.
+                    self.log_xml(
+                        "A concurrency error occurred while processing the order data "
+                        "with ec_order_identifier %s for %s account with id %s; it will be retried later."
+                        "Error description: %s" %
+                        (order_data.get('id'), self.ecommerce_channel_id.name, self.id, str(error).split('DETAIL')[0]),
+                        '_sync_orders',
+                    )
+                else:
+                    self._handle_sync_failure(
                         flow='order_sync', data={'ec_order_ref': order_data.get('reference')}, error_messages=str(error).split('DETAIL')[0],
                     )
-                    account.log_xml(
+                    self.log_xml(
                         "Error occurred while processing the order data "
                         "with ec_order_identifier %s for %s account with id %s. "
                         "Error description: %s" %
-                        (order_data.get("id"), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                        (order_data.get("id"), self.ecommerce_channel_id.name, self.id, str(error).split('DETAIL')[0]),
                         '_sync_orders',
                         'server',
                     )
-                    count_failed.append(order_data.get("id"))
-                    continue  # Skip these order data and resume with the next ones.
-                if auto_commit:
+                failed_ids.append(order_data.get("id"))
+                sync_run.count_failed += 1
+                if auto_commit:  # Keep the stored order if the next one is rolled back.
                     self.env.cr.commit()
-            account.last_orders_sync = fields.Datetime.now()
-        message = "No orders found."
-        if count_fetched:
-            message = f"Fetched: {count_fetched} | Processed: {count_processed} | Failed: {len(count_failed)} | Not confirmed: {count_fetched - count_processed - len(count_failed)}"
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'type': 'warning' if count_failed else 'success',
-                'title': self.env._("Order Sync Summary") if count_fetched else "",
-                'message': self.env._(message),
-                'next': {'type': 'ir.actions.act_window_close'},
-            },
-        }
+                continue  # Skip these order data and resume with the next ones.
+            if auto_commit:
+                with sync_run.phase('commit'):
+                    self.env.cr.commit()
+        return count_processed, failed_ids
+
+    def _get_slow_order_thresholds(self):
+        """Return the processing time and the number of SQL queries above which an order is logged as slow.
+
+        :return: The thresholds, in seconds and queries.
+        :rtype: tuple
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        return (
+            float(ICP.get_param('odoo_ecommerce.slow_order_seconds', DEFAULT_SLOW_ORDER_SECONDS)),
+            int(ICP.get_param('odoo_ecommerce.slow_order_queries', DEFAULT_SLOW_ORDER_QUERIES)),
+        )
+
+    @api.model
+    def _get_poll_due_domain(self, flow):
+        """Return the domain of the accounts due to be polled by the cron of the given flow.
+
+        :param str flow: 'orders', 'pickings' or 'inventory'.
+        :rtype: Domain
+        """
+        field_name = f'next_{flow}_sync'
+        return Domain(field_name, '=', False) | Domain(field_name, '<=', fields.Datetime.now())
+
+    def _schedule_next_poll(self, flow, sync_run=None, state='done', api_calls=1):
+        """Set the date from which the cron of the given flow polls the account again.
+
+        The polling interval is adapted after each orders synchronization so that a poll fetches
+        about `ORDERS_PER_POLL` orders at the smoothed order rate of the account, without spending
+        more than the `odoo_ecommerce.poll_api_budget` API calls per hour, within the bounds of the
+        account. It is doubled when the platform could not be reached. The pickings and inventory
+        updates follow the interval of the orders, as they change with the orders of the account.
+
+        :param str flow: 'orders', 'pickings' or 'inventory'.
+        :param SyncRunRecorder sync_run: The recorder of the orders synchronization that just ended.
+        :param str state: The outcome of the orders synchronization, see `ecommerce.sync.run.state`.
+        :param int api_calls: The number of pages of orders requested by the synchronization.
+        :return: None
+        """
+        self.ensure_one()
+        now = fields.Datetime.now()
+        if flow == 'orders' and state == 'interrupted':
+            self.poll_interval = min(self.poll_interval * 2, self.poll_interval_max)
+        elif flow == 'orders' and state == 'done' and sync_run and sync_run.watermark_from:
+            elapsed_hours = max((now - sync_run.watermark_from).total_seconds() / 3600, 1 / 60)
+            self.orders_rate = (
+                ORDERS_RATE_SMOOTHING * sync_run.count_fetched / elapsed_hours
+                + (1 - ORDERS_RATE_SMOOTHING) * self.orders_rate
+            )
+            api_budget = int(self.env['ir.config_parameter'].sudo().get_param(
+                'odoo_ecommerce.poll_api_budget', DEFAULT_POLL_API_BUDGET,
+            ))
+            interval = ORDERS_PER_POLL * 60 / self.orders_rate if self.orders_rate else self.poll_interval_max
+            interval = max(interval, max(api_calls, 1) * 60 / api_budget)
+            self.poll_interval = round(min(max(interval, self.poll_interval_min), self.poll_interval_max))
+        self[f'next_{flow}_sync'] = now + timedelta(minutes=self.poll_interval)
+
+    def _reconcile_orders(self, auto_commit=True):
+        """Synchronize again the recent orders that `_sync_orders` missed or did not update.
+
+        Only the identifiers and update dates of the orders updated on the platform during the
+        window before the last orders sync are fetched, see `_fetch_order_stamps_from_ecommerce`.
+        The orders missing or stale locally are queued as `ecommerce.order.resync` records and
+        fetched again one by one.
+
+        Note: This method is called by the `ir_cron_ecommerce_reconcile_orders` cron.
+
+        :param bool auto_commit: Whether the database cursor should be committed as soon as an order
+                                 is successfully synchronized.
+        :return: None
+        """
+        domain = Domain([
+            ('active', '=', True),
+            ('state', '=', 'connected'),
+        ])
+        accounts = self.filtered(domain) if self else self.search(domain)
+        window_hours = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.reconcile_window_hours', DEFAULT_RECONCILE_WINDOW_HOURS,
+        ))
+        Resync = self.env['ecommerce.order.resync']
+        for account in accounts:
+            with account._sync_lock('reconcile') as locked:
+                if not locked:
+                    continue  # Another run of the flow is in progress for this account.
+                date_from = account.last_orders_sync - timedelta(hours=window_hours)
+                sync_run = SyncRunRecorder('reconcile', watermark_from=date_from)
+                try:
+                    ensure_account_is_authenticated(account)
+                    ensure_account_is_reachable(account)
+                    with sync_run.phase('fetch'):
+                        order_stamps = account._fetch_order_stamps_from_ecommerce(date_from)
+                    sync_run.count_fetched = len(order_stamps)
+                    with sync_run.phase('normalize'):
+                        Resync._enqueue(account, order_stamps)
+                    with sync_run.phase('process'):
+                        resyncs = Resync.search([
+                            ('ecommerce_account_id', '=', account.id),
+                            ('state', '=', 'pending'),
+                            '|', ('next_retry_date', '=', False), ('next_retry_date', '<=', fields.Datetime.now()),
+                        ])
+                        sync_run.count_processed, sync_run.count_failed = resyncs._process(auto_commit)
+                except ECommerceAccountWideError as error:
+                    account._log_account_wide_error(error, '_reconcile_orders')
+                    self.env['ecommerce.sync.run']._log_run(account, sync_run, 'interrupted', error=error)
+                    continue  # The pending orders are synchronized by the next reconciliation.
+                except (ECommerceApiError, UserError) as error:
+                    account.log_xml(
+                        "An error occurred while reconciling orders for %s account with id %s. "
+                        "Error description: %s" %
+                        (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                        '_reconcile_orders',
+                        'server',
+                    )
+                    self.env['ecommerce.sync.run']._log_run(account, sync_run, 'failed', error=error)
+                    continue
+                self.env['ecommerce.sync.run']._log_run(account, sync_run, watermark_to=account.last_orders_sync)
+        self.env['ecommerce.api.call']._flush_buffer()
 
     def _sync_order_by_reference(self, ecommerce_order_ref):
         ensure_account_is_authenticated(self)
         try:
-            result = self._fetch_order_from_ecommerce_by_order_ref(ecommerce_order_ref)
+            result = ECommerceOrder.from_dict(self._fetch_order_from_ecommerce_by_order_ref(ecommerce_order_ref))
         except ECommerceApiError as error:
             raise UserError(self.env._("Error during fetching orders from %s account: %s", self.name, str(error).split('DETAIL')[0])) from error
         self._process_order_data(result)
@@ -660,53 +1231,61 @@ class ECommerceAccount(models.Model):
         count_processed = 0
         count_failed = []
         for account in self:
-            try:
-                ensure_account_is_authenticated(account)
-                result = account._fetch_locations_from_ecommerce()
-            except (ECommerceApiError, UserError) as error:
-                account.log_xml(
-                    "An error occurred while fetching locations for %s account with id %s."
-                    "Error description: %s" %
-                    (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                    '_sync_locations',
-                    'server',
-                )
-                continue  # skip this account and continue with the next one
-            locations_data = result.get('locations', [])
-            count_fetched += len(locations_data)
-            for location_data in locations_data:
+            with account._sync_lock('locations') as locked:
+                if not locked:
+                    continue  # Another run of the flow is in progress for this account.
                 try:
-                    proccessed_location = None
-                    if auto_commit:
-                        with self.env.cr.savepoint():
+                    ensure_account_is_authenticated(account)
+                    ensure_account_is_reachable(account)
+                    result = account._fetch_locations_from_ecommerce()
+                except (ECommerceApiError, UserError) as error:
+                    account.log_xml(
+                        "An error occurred while fetching locations for %s account with id %s."
+                        "Error description: %s" %
+                        (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                        '_sync_locations',
+                        'server',
+                    )
+                    continue  # skip this account and continue with the next one
+                locations_data = result.get('locations', [])
+                count_fetched += len(locations_data)
+                locations = DeferredRetryQueue(locations_data)
+                for location_data in locations:
+                    try:
+                        proccessed_location = None
+                        if auto_commit:
+                            def process_location():
+                                with self.env.cr.savepoint():
+                                    return account._find_or_create_location(location_data.get('id'), location_data.get('name'))
+                            proccessed_location = call_with_concurrency_retry(self.env.cr, process_location)
+                        else:  # Avoid the savepoint in testing
                             proccessed_location = account._find_or_create_location(location_data.get('id'), location_data.get('name'))
-                    else:  # Avoid the savepoint in testing
-                        proccessed_location = account._find_or_create_location(location_data.get('id'), location_data.get('name'))
-                    if proccessed_location:
-                        count_processed += 1
-                except Exception as error:
-                    if modules.module.current_test:
-                        raise  # we are executing during testing, do not try to rollback
-                    if isinstance(error, PG_CONCURRENCY_EXCEPTIONS_TO_RETRY):
+                        if proccessed_location:
+                            count_processed += 1
+                    except Exception as error:
+                        if modules.module.current_test:
+                            raise  # we are executing during testing, do not try to rollback
+                        self.env.cr.rollback()
+                        if isinstance(error, PG_CONCURRENCY_EXCEPTIONS_TO_RETRY) and locations.defer(location_data):
+                            account.log_xml(
+                                "A concurrency error occurred while processing the location data "
+                                "with id %s for %s account with id %s; it is deferred to the end of the run."
+                                "Error description: %s" %
+                                (location_data.get('id'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                                '_sync_locations',
+                            )
+                            continue
                         account.log_xml(
-                            "A concurrency error occurred while processing the location data "
-                            "with id %s for %s account with id %s."
+                            "Error occurred while processing the location data "
+                            "with id '%s' for %s account with id '%s'. "
                             "Error description: %s" %
                             (location_data.get('id'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
                             '_sync_locations',
                         )
-                        raise
-                    account.log_xml(
-                        "Error occurred while processing the location data "
-                        "with id '%s' for %s account with id '%s'. "
-                        "Error description: %s" %
-                        (location_data.get('id'), account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                        '_sync_locations',
-                    )
-                    self.env.cr.rollback()
-                    count_failed.append(location_data.get('id'))
-                if auto_commit:
-                    self.env.cr.commit()
+                        count_failed.append(location_data.get('id'))
+                    if auto_commit:
+                        self.env.cr.commit()
+        self.env['ecommerce.api.call']._flush_buffer()
         message = "No locations found."
         if count_fetched:
             message = f"Fetched: {count_fetched} | Processed: {count_processed} | Failed: {len(count_failed)}"
@@ -724,6 +1303,9 @@ class ECommerceAccount(models.Model):
     def _update_pickings(self):
         """Update the pickings created in case of fulfilled by odoo to the E-commerce platform.
 
+        The pickings to update are popped from the `ecommerce.outbox.event` queue, where they are
+        added when they are validated. The failed ones are retried with a backoff.
+
         Note: This method is called by the `ir_cron_ecommerce_update_pickings` cron.
 
         :return: None
@@ -734,29 +1316,53 @@ class ECommerceAccount(models.Model):
             ('fulfilled_by', '=', 'odoo'),
             ('support_shipping', '=', True),
         ])
-        accounts = self.filtered(domain) if self else self.search(domain)
+        accounts = self.filtered(domain) if self else self.search(domain & self._get_poll_due_domain('pickings'))
+        Outbox = self.env['ecommerce.outbox.event']
         count_total = 0
         count_success = 0
         count_failed = 0
         for account in accounts:
-            pickings = self.env['stock.picking'].search([
-                ('state', '=', 'done'),
-                ('sale_id.ecommerce_account_id', '=', account.id),
-                ('ecommerce_sync_status', '=', 'pending'),
-            ])
-            count_total += len(pickings)
-            try:
-                ensure_account_is_authenticated(account)
-            except UserError:
-                count_failed += len(pickings)
-                account.log_xml(
-                    "skip updating pickings for the account with id %s because the account is not authenticated." % account, id,
-                    '_update_pickings',
-                )
-                continue
-            account._update_pickings_to_ecommerce(pickings)
-            count_success += len(pickings.filtered(lambda d: d.ecommerce_sync_status == 'done'))
-            count_failed += len(pickings.filtered(lambda d: d.ecommerce_sync_status == 'error'))
+            with account._sync_lock('pickings') as locked:
+                if not locked:
+                    continue  # Another run of the flow is in progress for this account.
+                account._schedule_next_poll('pickings')
+                sync_run = SyncRunRecorder('pickings')
+                with sync_run.phase('fetch'):
+                    events = Outbox._pop(account, 'picking')
+                    pickings = events.picking_id.filtered(
+                        lambda picking: picking.state == 'done' and picking.ecommerce_sync_status != 'done',
+                    )
+                count_total += len(pickings)
+                sync_run.count_fetched = len(pickings)
+                try:
+                    ensure_account_is_authenticated(account)
+                except UserError:
+                    count_failed += len(pickings)
+                    account.log_xml(
+                        "skip updating pickings for the account with id %s because the account is not authenticated." % account, id,
+                        '_update_pickings',
+                    )
+                    continue
+                run_state, run_error = 'done', None
+                try:
+                    ensure_account_is_reachable(account)
+                    with sync_run.phase('process'):
+                        account._update_pickings_to_ecommerce(pickings)
+                except ECommerceAccountWideError as error:
+                    account._log_account_wide_error(error, '_update_pickings')  # Pending pickings are retried later.
+                    run_state, run_error = 'interrupted', error
+                events.filtered(
+                    lambda event: event.picking_id not in pickings or event.picking_id.ecommerce_sync_status == 'done',
+                )._mark_done()
+                events.filtered(
+                    lambda event: event.picking_id in pickings and event.picking_id.ecommerce_sync_status == 'error',
+                )._schedule_retry(self.env._("The delivery could not be updated on %s.", account.ecommerce_channel_id.name))
+                sync_run.count_processed = len(pickings.filtered(lambda d: d.ecommerce_sync_status == 'done'))
+                sync_run.count_failed = len(pickings.filtered(lambda d: d.ecommerce_sync_status == 'error'))
+                count_success += sync_run.count_processed
+                count_failed += sync_run.count_failed
+                self.env['ecommerce.sync.run']._log_run(account, sync_run, run_state, error=run_error)
+        self.env['ecommerce.api.call']._flush_buffer()
         message = "No pickings found for update."
         if count_total:
             message = f"Total: {count_total} | Updated: {count_success} | Failed: {count_failed}"
@@ -799,9 +1405,14 @@ class ECommerceAccount(models.Model):
                 )
                 continue
             pickings_rs = self.env['stock.picking'].browse([d.id for d in pickings])
-            account._update_pickings_to_ecommerce(pickings_rs)
+            try:
+                ensure_account_is_reachable(account)
+                account._update_pickings_to_ecommerce(pickings_rs)
+            except ECommerceAccountWideError as error:
+                account._log_account_wide_error(error, '_update_pickings_to_ecommerce_via_pickings')
             count_success += len(pickings_rs.filtered(lambda d: d.ecommerce_sync_status == 'done'))
             count_failed += len(pickings_rs.filtered(lambda d: d.ecommerce_sync_status == 'error'))
+        self.env['ecommerce.api.call']._flush_buffer()
         message = "No pickings found for update."
         if count_total:
             message = f"Total: {count_total} | Updated: {count_success} | Failed: {count_failed}"
@@ -816,54 +1427,77 @@ class ECommerceAccount(models.Model):
         }
 
     def _update_inventory(self):
+        """Push the stock of the synchronized offers to the E-commerce platforms.
+
+        The cron only pushes the products whose stock changed, popped from the
+        `ecommerce.outbox.event` queue; a manual update pushes the whole inventory of the accounts.
+
+        Note: This method is called by the `ir_cron_ecommerce_update_inventory` cron.
+
+        :return: None
+        """
         domain = Domain([
             ('active', '=', True),
             ('state', '=', 'connected'),
             ('update_inventory', '=', True),
         ])
-        accounts = self.filtered(domain) if self else self.search(domain)
+        accounts = self.filtered(domain) if self else self.search(domain & self._get_poll_due_domain('inventory'))
+        full_update = bool(self)
+        Outbox = self.env['ecommerce.outbox.event']
         notification_type = 'success'
         for account in accounts:
-            try:
-                ensure_account_is_authenticated(account)
-            except UserError:
-                account.log_xml(
-                    "Skipping pickings update for the account with id %s because the account is not authenticated." % account.id,
-                    '_update_inventory',
-                )
-                continue  # skip this account and continue with the next one
-            locations = account.ecommerce_location_ids.filtered(lambda location: location.sync_stock)
-            offers = account.ecommerce_offer_ids.filtered(lambda offer: offer.sync_stock)
-            inventory_data = []
-            for offer in offers:
-                if not account.support_location:
-                    inventory_data.append({
-                        'offer': offer,
-                        'quantity': offer.matched_product_id.free_qty,
-                    })
-                    continue
-                for location in locations:
-                    quantity = offer.matched_product_id.with_context(location=location.matched_location_id.id).free_qty
-                    inventory_data.append({
-                        'offer': offer,
-                        'location': location,
-                        'quantity': quantity,
-                    })
-            if inventory_data:
+            with account._sync_lock('inventory') as locked:
+                if not locked:
+                    continue  # Another run of the flow is in progress for this account.
+                account._schedule_next_poll('inventory')
                 try:
-                    account._update_inventory_to_ecommerce(inventory_data)
-                except ECommerceApiError as error:
-                    account._handle_sync_failure(
-                        flow='inventory_update', error_messages=str(error).split('DETAIL')[0],
-                    )
+                    ensure_account_is_authenticated(account)
+                except UserError:
                     account.log_xml(
-                        "Error occurred while updating inventory on %s account with id %s. "
-                        "Error description: %s" %
-                        (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
-                        'update_inventory',
-                        'server',
+                        "Skipping pickings update for the account with id %s because the account is not authenticated." % account.id,
+                        '_update_inventory',
                     )
-                    notification_type = 'warning'
+                    continue  # skip this account and continue with the next one
+                sync_run = SyncRunRecorder('inventory')
+                with account._profile_sync_run(sync_run):
+                    try:
+                        ensure_account_is_reachable(account)
+                    except ECommerceAccountWideError as error:
+                        account._log_account_wide_error(error, '_update_inventory')
+                        self.env['ecommerce.sync.run']._log_run(account, sync_run, 'interrupted', error=error)
+                        notification_type = 'warning'
+                        continue  # The queued changes are sent by the next run.
+                    with sync_run.phase('fetch'):
+                        events = Outbox._pop(account, 'inventory')
+                        inventory_data = account._prepare_inventory_data(None if full_update else events.product_id)
+                    sync_run.count_fetched = len(inventory_data)
+                    run_state, run_error = 'done', None
+                    if inventory_data:
+                        try:
+                            with sync_run.phase('process'):
+                                account._update_inventory_to_ecommerce(inventory_data)
+                            sync_run.count_processed = len(inventory_data)
+                            events._mark_done()
+                        except ECommerceApiError as error:
+                            run_state, run_error = 'interrupted' if isinstance(error, ECommerceAccountWideError) else 'failed', error
+                            sync_run.count_failed = len(inventory_data)
+                            if not isinstance(error, ECommerceAccountWideError):  # Otherwise, retried by the next run.
+                                events._schedule_retry(error)
+                            account._handle_sync_failure(
+                                flow='inventory_update', error_messages=str(error).split('DETAIL')[0],
+                            )
+                            account.log_xml(
+                                "Error occurred while updating inventory on %s account with id %s. "
+                                "Error description: %s" %
+                                (account.ecommerce_channel_id.name, account.id, str(error).split('DETAIL')[0]),
+                                'update_inventory',
+                                'server',
+                            )
+                            notification_type = 'warning'
+                    else:
+                        events._mark_done()  # The products are no longer synchronized.
+                    self.env['ecommerce.sync.run']._log_run(account, sync_run, run_state, error=run_error)
+        self.env['ecommerce.api.call']._flush_buffer()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -874,6 +1508,36 @@ class ECommerceAccount(models.Model):
             },
         }
 
+    def _prepare_inventory_data(self, products=None):
+        """Compute the quantities to send to the E-commerce platform by `_update_inventory`.
+
+        :param recordset products: The products to send, as `product.product` records, or None to
+                                   send all the synchronized offers.
+        :return: The inventory data, in the format of `_update_inventory_to_ecommerce`.
+        :rtype: list
+        """
+        self.ensure_one()
+        locations = self.ecommerce_location_ids.filtered(lambda location: location.sync_stock)
+        offers = self.ecommerce_offer_ids.filtered(
+            lambda offer: offer.sync_stock and (products is None or offer.matched_product_id in products),
+        )
+        inventory_data = []
+        for offer in offers:
+            if not self.support_location:
+                inventory_data.append({
+                    'offer': offer,
+                    'quantity': offer.matched_product_id.free_qty,
+                })
+                continue
+            for location in locations:
+                quantity = offer.matched_product_id.with_context(location=location.matched_location_id.id).free_qty
+                inventory_data.append({
+                    'offer': offer,
+                    'location': location,
+                    'quantity': quantity,
+                })
+        return inventory_data
+
     # === FIND OR CREATE METHODS === #
 
     def _find_or_create_offer(self, product_data, auto_match=True):
@@ -884,10 +1548,24 @@ class ECommerceAccount(models.Model):
         :return: The ecommerce offer.
         :rtype: recordset of `ecommerce.offer`
         """
-        offer = self.ecommerce_offer_ids.filtered(
-            lambda offer: offer.sku == (product_data.get("sku") or None))
+        # Search rather than filter `ecommerce_offer_ids`, which would read all the offers of the
+        # account for each synchronized product.
+        offer = self.env['ecommerce.offer'].search([
+            ('ecommerce_account_id', '=', self.id),
+            ('sku', '=', product_data.get('sku') or False),
+        ])
         if offer:
-            offer.write(product_data)
+            # The offers are shared by all the orders of their products: only write the values that
+            # changed, so that orders imported in parallel do not lock the same rows.
+            changed_values = {}
+            for fname, value in product_data.items():
+                field = offer._fields.get(fname)
+                if field is None:
+                    continue  # Keys of the connector that are not offer fields, ignored by `write` too.
+                if field.convert_to_record(field.convert_to_cache(value, offer), offer) != offer[fname]:
+                    changed_values[fname] = value
+            if changed_values:
+                offer.write(changed_values)
         else:
             offer = self.env['ecommerce.offer'].with_context(tracking_disable=True).create({
                 **product_data,
@@ -1180,24 +1858,29 @@ class ECommerceAccount(models.Model):
         If no matching sales order is found, a new one is created if it is in a 'synchronizable' state.
         If the matching sales order already exists and the E-commerce order was canceled, the order is cancelled.
 
-        :param dict order_data: The order data to process.
+        :param order_data: The order data to process, as an `ECommerceOrder` mapping or a dict.
         :return: The matching ecommerce order, if any, as a `sale.order` record.
         :rtype: recordset of `sale.order`
         """
         self.ensure_one()
 
         ecommerce_order_identifier = order_data.get('id')
-        order = self.sale_order_ids.filtered(lambda order:
-            order.ecommerce_order_identifier == str(ecommerce_order_identifier))
+        with order_step('lookup'):
+            order = self.env['sale.order'].search([
+                ('ecommerce_account_id', '=', self.id),
+                ('ecommerce_order_identifier', '=', str(ecommerce_order_identifier)),
+            ])
         status = order_data.get('status') or 'confirmed'  # Default to `confirmed`
         fulfillments = order_data.get('fulfillments')
         if not order:  # order not found.
             if status == 'confirmed':
                 order = self._create_order_from_data(order_data)
                 if self.fulfilled_by == 'ecommerce' and fulfillments:
-                    location_id = self._get_order_location(order_data)
-                    self._find_or_create_moves(order, location_id, fulfillments)
-                order.with_context(mail_notrack=True).action_lock()
+                    with order_step('fulfillments'):
+                        location_id = self._get_order_location(order_data)
+                        self._find_or_create_moves(order, location_id, fulfillments)
+                with order_step('lock'):
+                    order.with_context(mail_notrack=True).action_lock()
                 _logger.info(
                     "Created a new sales order with order reference %(ref)s for %(code)s account"
                     " with id %(id)s.", {'ref': ecommerce_order_identifier, 'code': self.channel_code, 'id': self.id},
@@ -1211,10 +1894,12 @@ class ECommerceAccount(models.Model):
                 )
         else:  # The sales order already exists
             if self.fulfilled_by == 'ecommerce' and fulfillments:
-                location_id = self._get_order_location(order_data)
-                self._find_or_create_moves(order, location_id, fulfillments)
+                with order_step('fulfillments'):
+                    location_id = self._get_order_location(order_data)
+                    self._find_or_create_moves(order, location_id, fulfillments)
             if status == 'canceled' and order.state != 'cancel':
-                order.with_context(canceled_by_ecommerce=True)._action_cancel()
+                with order_step('cancel'):
+                    order.with_context(canceled_by_ecommerce=True)._action_cancel()
                 _logger.info(
                     "Cancelled sales order with order reference %(ref)s for %(code)s account with id"
                     " %(id)s.", {'ref': ecommerce_order_identifier, 'code': self.channel_code, 'id': self.id},
@@ -1226,9 +1911,13 @@ class ECommerceAccount(models.Model):
                 )
         if self.fulfilled_by == 'odoo' and fulfillments:
             order._create_activity_resolve_fulfillment_conflict(self.user_id.id)
+        write_date = parse_write_date(order_data.get('write_date'))
+        if order and write_date and (not order.ecommerce_write_date or write_date > order.ecommerce_write_date):
+            order.ecommerce_write_date = write_date  # Compared by `_reconcile_orders`.
 
         try:
-            self._auto_create_invoice_and_payment(order, order_data)
+            with order_step('invoicing'):
+                self._auto_create_invoice_and_payment(order, order_data)
         except UserError as user_error:
             self.log_xml(
                 "Error occurred while creating an invoice with sale order id %s on %s account with id %s. "
@@ -1247,9 +1936,10 @@ class ECommerceAccount(models.Model):
         :rtype: record of `sale.order`
         """
         order_vals = self._prepare_order_values(order_data)
-        return self.env['sale.order'].with_context(
-            mail_create_nosubscribe=True,
-        ).with_company(self.company_id).create(order_vals)
+        with order_step('order_create'):
+            return self.env['sale.order'].with_context(
+                mail_create_nosubscribe=True,
+            ).with_company(self.company_id).create(order_vals)
 
     def _prepare_order_values(self, order_data):
         ecommerce_order_identifier = order_data.get('id')
@@ -1258,16 +1948,21 @@ class ECommerceAccount(models.Model):
             currency = self.env['res.currency'].with_context(active_test=False).search(
                 [('name', '=', currency_code)], limit=1,
             )
-            currency.write({'active': True}) #required while creating a payment with this currency, as inactive currencies cannot be used.
+            if currency and not currency.active:
+                # Required while creating a payment with this currency, as inactive currencies cannot be used.
+                # Only written once, as the currency row is shared by all the orders.
+                currency.write({'active': True})
         else:
             currency = self.company_id.currency_id
-        contact_partner, delivery_partner = self._find_or_create_partners_from_data(order_data)
+        with order_step('partners'):
+            contact_partner, delivery_partner = self._find_or_create_partners_from_data(order_data)
         fiscal_position = self.env['account.fiscal.position'].with_company(
             self.company_id,
         )._get_fiscal_position(contact_partner, delivery_partner)
-        order_lines_values = self._prepare_order_lines_values(
-            order_data, currency, fiscal_position,
-        )
+        with order_step('order_lines'):
+            order_lines_values = self._prepare_order_lines_values(
+                order_data, currency, fiscal_position,
+            )
         order_vals = {
             'origin': f"{self.ecommerce_channel_id.name} Order # {ecommerce_order_identifier}",
             'state': 'sale',
@@ -1522,9 +2217,10 @@ class ECommerceAccount(models.Model):
 
         :param picking: Record of `stock.picking` that was updated.
         :param identifier: E-commerce picking identifier returned by the E-commerce
-                        after a successful update.
+                        after a successful update, or None if the picking was shipped with
+                        another picking of the order, which holds the identifier.
         """
-        picking.ecommerce_picking_identifier = str(identifier)
+        picking.ecommerce_picking_identifier = str(identifier) if identifier else False
         picking.ecommerce_sync_status = 'done'
         _logger.info(
             "Picking %s updated successfully to %s.",
@@ -1560,6 +2256,9 @@ class ECommerceAccount(models.Model):
         """Override this method in each ecommerce module to
         fetch products from the ecommerce and return them.
 
+        The products can be given as a generator, e.g. decoding the response of the platform with
+        `odoo_ecommerce.utils.json_stream`, to keep the memory independent of the catalog size.
+
         This method should return a dictionary with the following structure:
         {
             "products": [{
@@ -1579,6 +2278,9 @@ class ECommerceAccount(models.Model):
         """Override this method in ecommerce modules to
         fetch orders from the ecommerce and return them in following common format.
 
+        The sync engine validates each order against this format and converts it into the compact
+        `odoo_ecommerce.utils.order_contract.ECommerceOrder` mapping before `_process_order_data`.
+
         :return: An order structure dictionary with the following keys:
         "orders": list of orders sorted by write_date in ascending order
             - id (str): Unique identifier for the order on the ecommerce platform.
@@ -1667,6 +2369,58 @@ class ECommerceAccount(models.Model):
         """
         return {}
 
+    def _get_orders_sync_date(self):
+        """Return the date after which `_fetch_orders_from_ecommerce` fetches the updated orders.
+
+        This is the last sync date of the account, unless an older date is given with the
+        `ecommerce_orders_date_from` context key, as done by `ecommerce.order.backfill`.
+
+        :rtype: datetime
+        """
+        return self.env.context.get('ecommerce_orders_date_from') or self.last_orders_sync
+
+    def _get_orders_sync_date_to(self):
+        """Return the date until which `_fetch_orders_from_ecommerce` fetches the updated orders.
+
+        There is no upper bound, unless one is given with the `ecommerce_orders_date_to` context
+        key, as done by `ecommerce.order.backfill` to fetch one window of the history at a time.
+        Connectors must then only fetch the orders updated until this date (included), sorted by
+        ascending update date.
+
+        :rtype: datetime or None
+        """
+        return self.env.context.get('ecommerce_orders_date_to')
+
+    def _fetch_orders_pages_from_ecommerce(self):
+        """Override this method in ecommerce modules supporting pagination to fetch the orders
+        page by page, as soon as each page is received.
+
+        Connectors should download the next page in the background with
+        `odoo_ecommerce.utils.pipeline.prefetch_pages` while the current page is being processed.
+        The download must not use the ORM; the normalization of the orders of a page happens in
+        the generator, within the cron thread.
+
+        By default, all the orders returned by `_fetch_orders_from_ecommerce` are yielded as a
+        single page.
+
+        :return: A generator of lists of orders in the format of `_fetch_orders_from_ecommerce`.
+        """
+        yield self._fetch_orders_from_ecommerce().get('orders') or []
+
+    def _normalize_archived_order(self, payload):
+        """Override this method in ecommerce modules archiving the orders they receive to convert
+        an archived payload into the format of `_fetch_orders_from_ecommerce`.
+
+        The payloads are archived by the connectors with `ecommerce.order.archive._archive`.
+
+        :param dict payload: The order, as archived by the connector.
+        :return: The order in the format of `_fetch_orders_from_ecommerce`.
+        :rtype: dict
+        """
+        raise UserError(self.env._(
+            "The orders of %s accounts cannot be replayed from their archived payloads.", self.ecommerce_channel_id.name,
+        ))
+
     def _fetch_order_from_ecommerce_by_order_ref(self, ecommerce_order_ref):
         """Override this method in the ecommerce modules to
         fetch orders from the ecommerce by order reference and
@@ -1676,6 +2430,23 @@ class ECommerceAccount(models.Model):
         """
         return {}
 
+    def _fetch_order_stamps_from_ecommerce(self, date_from):
+        """Override this method in ecommerce modules to fetch the identifiers and update dates of
+        the orders updated on the ecommerce since the given date, for `_reconcile_orders`.
+
+        Only the requested fields should be downloaded, in as few calls as the platform allows;
+        the accounts of modules that do not override it are not reconciled.
+
+        :param datetime date_from: The date after which the updated orders are fetched.
+        :return: The stamps of the orders, in any order, as a list of dictionaries:
+            - id (str): Unique identifier for the order on the ecommerce platform.
+            - order_ref (str): The reference of the order accepted by
+                               `_fetch_order_from_ecommerce_by_order_ref`.
+            - write_date (str): Last updated date of the order in '%Y-%m-%d %H:%M:%S' format.
+        :rtype: list
+        """
+        return []
+
     def _fetch_locations_from_ecommerce(self):
         """ Override this method in ecommerce module to
         fetch locations from the ecommerce and return them.
@@ -1700,12 +2471,16 @@ class ECommerceAccount(models.Model):
         Note:
             Each e-commerce platform must implement this logic appropriately.
 
+            The pickings of the account are given all at once, possibly for several orders.
+
             - If your E-commerce platform supports updating multiple pickings at once:
-                * Update all pickings in a single request.
+                * Update all pickings in a single request, or in batches.
                 * After processing, call `_post_process_after_picking_update_success` for successful pickings.
                 * Call `_post_process_after_picking_update_failed` for failed pickings.
 
             - If your E-commerce platform does not support updating multiple pickings at once:
+                * Group the pickings with `_group_pickings_by_order` to fetch or update the data
+                  shared by the pickings of an order only once.
                 * Update each picking individually.
                 * On success, call `_post_process_after_picking_update_success`.
                 * On failure, call `_post_process_after_picking_update_failed`.
@@ -1713,9 +2488,28 @@ class ECommerceAccount(models.Model):
             - If an error occurs for a single picking:
                 * Do not raise the error at the base level.
                 * Catch the error and call `_post_process_after_picking_update_failed` for that picking.
+
+            - If an `ECommerceAccountWideError` occurs, raise it after post-processing the pickings
+              already updated, so that they are not pushed twice.
         """
         return {}
 
+    @api.model
+    def _group_pickings_by_order(self, pickings):
+        """Group the pickings to update to the E-commerce platform by E-commerce order.
+
+        :param recordset pickings: The pickings, as `stock.picking` records.
+        :return: The E-commerce identifier of each order with its pickings, oldest first.
+        :rtype: list[tuple(str, recordset)]
+        """
+        return [
+            (order_identifier, self.env['stock.picking'].union(*order_pickings))
+            for order_identifier, order_pickings in groupby(
+                pickings.sorted('id'),
+                key=lambda picking: picking.ecommerce_order_identifier,
+            )
+        ]
+
     def _update_inventory_to_ecommerce(self, inventory_data):
         """
         Override this method in each ecommerce model and implement the logic for updating inventory.
@@ -1736,6 +2530,20 @@ class ECommerceAccount(models.Model):
         """
         return {}
 
+    def _log_account_wide_error(self, error, func):
+        """Log that the flow stopped for this account because of an account-wide error.
+
+        No failure mail is sent as the circuit breaker of the account already prevents the flood of
+        failing calls, and the skipped records are picked up again by the next run.
+        """
+        self.log_xml(
+            "Stopped synchronizing %s account with id %s because of an account-wide error. "
+            "Error description: %s" %
+            (self.ecommerce_channel_id.name, self.id, str(error).split('DETAIL')[0]),
+            func,
+            'server',
+        )
+
     def _handle_sync_failure(self, flow, data={}, error_messages=False, email_template_xmlid=None):
         """Send a mail to the responsible persons to report a synchronization failure.
 
@@ -0,0 +1,107 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+from datetime import timedelta
+
+import psycopg2
+
+from odoo import SUPERUSER_ID, api, fields, models
+from odoo.modules.registry import Registry
+
+from odoo.addons.odoo_ecommerce.utils.api_ledger import pop_api_calls
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 14
+GC_BATCH_SIZE = 10000
+
+
+class ECommerceApiCall(models.Model):
+    """Ledger of the calls sent to the E-commerce platforms.
+
+    The calls are buffered in memory by the transport (see `utils.request.ecommerce_request`) and
+    written in batches by `_flush_buffer` once the sync flows are done with an account or a page.
+    The ledger is pruned daily according to the `odoo_ecommerce.api_call_retention_days` parameter.
+    """
+    _name = 'ecommerce.api.call'
+    _description = "E-commerce API Call"
+    _order = 'date desc, id desc'
+    _log_access = False  # The ledger is append-only; `date` is enough.
+
+    date = fields.Datetime(string="Date", required=True, readonly=True, index=True)
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete='cascade',
+    )
+    channel_code = fields.Char(string="Channel", readonly=True)
+    method = fields.Char(string="Method", readonly=True)
+    endpoint = fields.Char(string="Endpoint", readonly=True, index=True)
+    status_code = fields.Integer(string="Status", readonly=True, aggregator=None, help="0 if no response was received.")
+    latency = fields.Float(string="Latency (ms)", readonly=True, aggregator='avg', digits=(16, 1))
+    request_size = fields.Integer(string="Request Size (bytes)", readonly=True)
+    response_size = fields.Integer(string="Response Size (bytes)", readonly=True)
+    retry_count = fields.Integer(string="Retries", readonly=True)
+    is_error = fields.Boolean(string="Failed", readonly=True)
+    error = fields.Char(string="Error", readonly=True)
+
+    @api.model
+    def _flush_buffer(self):
+        """Write the calls buffered by this worker for the current database.
+
+        The calls are written with a separate cursor, like `ecommerce.account.log_xml`, so they are
+        kept even when the current transaction is rolled back.
+
+        :return: None
+        """
+        db_name = self.env.cr.dbname
+        calls = pop_api_calls(db_name)
+        if not calls:
+            return
+        vals_list = [{
+            'ecommerce_account_id': account_id,
+            'channel_code': channel_code,
+            'method': method,
+            'endpoint': endpoint,
+            'status_code': status_code,
+            'latency': latency,
+            'request_size': request_size,
+            'response_size': response_size,
+            'retry_count': retry_count,
+            'is_error': bool(error) or not 200 <= status_code < 400,
+            'error': error,
+            'date': date,
+        } for (
+            account_id, channel_code, method, endpoint, status_code, latency, request_size, response_size,
+            retry_count, error, date,
+        ) in calls]
+        try:
+            with Registry(db_name).cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                env['ecommerce.api.call'].create(vals_list)
+        except psycopg2.Error:
+            _logger.warning("Could not write %s E-commerce API calls to the ledger.", len(vals_list), exc_info=True)
+
+    @api.autovacuum
+    def _gc_api_calls(self):
+        """Delete the calls older than the retention period, in batches."""
+        retention_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.api_call_retention_days', DEFAULT_RETENTION_DAYS,
+        ))
+        limit_date = fields.Datetime.now() - timedelta(days=retention_days)
+        count_deleted = 0
+        while True:
+            self.env.cr.execute(
+                """
+                DELETE FROM ecommerce_api_call
+                 WHERE id IN (SELECT id FROM ecommerce_api_call WHERE date < %s LIMIT %s)
+                """,
+                (limit_date, GC_BATCH_SIZE),
+            )
+            count_deleted += self.env.cr.rowcount
+            if self.env.cr.rowcount < GC_BATCH_SIZE:
+                break
+        _logger.info("Deleted %s E-commerce API calls older than %s days.", count_deleted, retention_days)
@@ -30,6 +30,21 @@ class ECommerceLocation(models.Model):
         string="Stock Synchronization", compute='_compute_sync_stock', store=True, readonly=False,
     )
 
+    # === CRUD METHODS === #
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        locations = super().create(vals_list)
+        self.env['ecommerce.outbox.event']._enqueue_offers_inventory(locations.ecommerce_account_id.ecommerce_offer_ids)
+        return locations
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {'matched_location_id', 'sync_stock'} & vals.keys():
+            # The stock to publish in the location changed without any stock move.
+            self.env['ecommerce.outbox.event']._enqueue_offers_inventory(self.ecommerce_account_id.ecommerce_offer_ids)
+        return result
+
     @api.depends('ecommerce_account_id.update_inventory')
     def _compute_sync_stock(self):
         for offer in self:
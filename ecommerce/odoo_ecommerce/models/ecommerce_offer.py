@@ -52,6 +52,21 @@ class ECommerceOffer(models.Model):
         "The combination of ecommerce product id and ecommerce product template id must be unique among offers of same ecommerce account.",
     )
 
+    # === CRUD METHODS === #
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        offers = super().create(vals_list)
+        self.env['ecommerce.outbox.event']._enqueue_offers_inventory(offers)
+        return offers
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {'matched_product_id', 'sync_stock', 'ecommerce_account_id'} & vals.keys():
+            # The stock of the newly synchronized product was never pushed.
+            self.env['ecommerce.outbox.event']._enqueue_offers_inventory(self)
+        return result
+
     @api.depends('ecommerce_account_id.update_inventory', 'matched_product_id.is_storable')
     def _compute_sync_stock(self):
         for offer in self:
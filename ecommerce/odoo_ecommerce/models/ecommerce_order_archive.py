@@ -0,0 +1,187 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import base64
+import json
+import logging
+import zlib
+from datetime import timedelta
+
+from odoo import api, fields, models, modules
+from odoo.tools import groupby
+
+from ..utils import ECommerceAccountWideError
+from ..utils.order_contract import ECommerceOrder
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 30
+GC_BATCH_SIZE = 10000
+COMPRESSION_LEVEL = 6  # zlib level; higher levels barely shrink JSON further and cost more CPU.
+
+
+class ECommerceOrderArchive(models.Model):
+    """Append-only archive of the raw order payloads received from the E-commerce platforms.
+
+    The connectors archive each order as received, before normalizing it, with `_archive`. The
+    payloads are stored as zlib-compressed JSON and indexed by account, order identifier and
+    reception date. They can be normalized and imported again with `_replay`, e.g. after fixing
+    a mapping, without calling the platforms. The archive is pruned daily according to the
+    `odoo_ecommerce.order_archive_retention_days` parameter.
+    """
+    _name = 'ecommerce.order.archive'
+    _description = "E-commerce Order Payload"
+    _order = 'received_date desc, id desc'
+    _log_access = False  # The archive is append-only; `received_date` is enough.
+
+    received_date = fields.Datetime(string="Received On", required=True, readonly=True, index=True)
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        readonly=True,
+        ondelete='cascade',
+    )
+    ecommerce_order_identifier = fields.Char(string="E-commerce Order ID", required=True, readonly=True)
+    payload = fields.Binary(string="Compressed Payload", attachment=False, readonly=True)
+    payload_size = fields.Integer(string="Size (bytes)", readonly=True, help="The size of the uncompressed payload.")
+    payload_text = fields.Text(string="Payload", compute='_compute_payload_text')
+
+    _account_order_idx = models.Index('(ecommerce_account_id, ecommerce_order_identifier, received_date)')
+
+    @api.depends('payload')
+    def _compute_payload_text(self):
+        for archive in self:
+            archive.payload_text = json.dumps(archive._get_payload(), indent=2, sort_keys=True)
+
+    # === BUSINESS METHODS === #
+
+    @api.model
+    def _archive(self, account, payloads):
+        """Archive the raw payloads of orders received from the platform.
+
+        :param recordset account: The account, as an `ecommerce.account` record.
+        :param list payloads: The orders, as `(identifier, payload)` pairs where `payload` is the
+                              JSON-serializable order as received from the platform.
+        :return: None
+        """
+        if not payloads or not account.archive_order_payloads:
+            return
+        received_date = fields.Datetime.now()
+        vals_list = []
+        for identifier, payload in payloads:
+            data = json.dumps(payload, separators=(',', ':'), default=str).encode()
+            vals_list.append({
+                'received_date': received_date,
+                'ecommerce_account_id': account.id,
+                'ecommerce_order_identifier': str(identifier),
+                'payload': base64.b64encode(zlib.compress(data, COMPRESSION_LEVEL)),
+                'payload_size': len(data),
+            })
+        self.sudo().create(vals_list)
+
+    def _get_payload(self):
+        """Return the raw payload of the order, as received from the platform.
+
+        :rtype: dict
+        """
+        self.ensure_one()
+        if not self.payload:
+            return {}
+        return json.loads(zlib.decompress(base64.b64decode(self.payload)))
+
+    def _replay(self, auto_commit=True):
+        """Normalize the archived payloads again and process them with `_process_order_data`.
+
+        The payloads are replayed oldest first, so that the last archived version of each order
+        is the last one processed.
+
+        :param bool auto_commit: Whether the database cursor should be committed after each order.
+        :return: The number of processed and failed orders.
+        :rtype: tuple(int, int)
+        """
+        count_processed = count_failed = 0
+        archives = self.sorted(lambda archive: (archive.received_date, archive.id))
+        for account, account_archives in groupby(archives, key=lambda archive: archive.ecommerce_account_id):
+            for archive in account_archives:
+                try:
+                    order_data = ECommerceOrder.from_dict(account._normalize_archived_order(archive._get_payload()))
+                    if auto_commit:
+                        with self.env.cr.savepoint():
+                            account._process_order_data(order_data)
+                    else:  # Avoid the savepoint in testing
+                        account._process_order_data(order_data)
+                    count_processed += 1
+                except ECommerceAccountWideError:
+                    raise
+                except Exception as error:
+                    if modules.module.current_test:
+                        raise
+                    count_failed += 1
+                    _logger.warning(
+                        "Could not replay order %s of %s account with id %s received on %s: %s",
+                        archive.ecommerce_order_identifier, account.ecommerce_channel_id.name, account.id,
+                        archive.received_date, error,
+                    )
+                if auto_commit:
+                    self.env.cr.commit()
+        return count_processed, count_failed
+
+    @api.model
+    def _replay_orders(self, account, date_from=None, date_to=None):
+        """Replay the last archived payload of each order of the account received in the period.
+
+        :param recordset account: The account, as an `ecommerce.account` record.
+        :param datetime date_from: The start of the period, if any.
+        :param datetime date_to: The end of the period, if any.
+        :return: The number of processed and failed orders.
+        :rtype: tuple(int, int)
+        """
+        query = """
+            SELECT DISTINCT ON (ecommerce_order_identifier) id
+              FROM ecommerce_order_archive
+             WHERE ecommerce_account_id = %s
+               AND received_date >= %s
+               AND received_date <= %s
+          ORDER BY ecommerce_order_identifier, received_date DESC, id DESC
+        """
+        self.env.cr.execute(query, (
+            account.id, date_from or fields.Datetime.to_datetime('1970-01-01'), date_to or fields.Datetime.now(),
+        ))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])._replay()
+
+    @api.autovacuum
+    def _gc_order_archives(self):
+        """Delete the payloads older than the retention period, in batches."""
+        retention_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.order_archive_retention_days', DEFAULT_RETENTION_DAYS,
+        ))
+        limit_date = fields.Datetime.now() - timedelta(days=retention_days)
+        count_deleted = 0
+        while True:
+            self.env.cr.execute(
+                """
+                DELETE FROM ecommerce_order_archive
+                 WHERE id IN (SELECT id FROM ecommerce_order_archive WHERE received_date < %s LIMIT %s)
+                """,
+                (limit_date, GC_BATCH_SIZE),
+            )
+            count_deleted += self.env.cr.rowcount
+            if self.env.cr.rowcount < GC_BATCH_SIZE:
+                break
+        _logger.info("Deleted %s E-commerce order payloads older than %s days.", count_deleted, retention_days)
+
+    # === ACTION METHODS === #
+
+    def action_replay(self):
+        """Normalize and import the selected payloads again."""
+        count_processed, count_failed = self._replay()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'warning' if count_failed else 'success',
+                'title': self.env._("Order Replay Summary"),
+                'message': self.env._("Processed: %(processed)s | Failed: %(failed)s", processed=count_processed, failed=count_failed),
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
@@ -0,0 +1,231 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+from contextlib import closing
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+
+from ..utils import (
+    ECommerceAccountWideError,
+    ECommerceApiError,
+    ensure_account_is_authenticated,
+    ensure_account_is_reachable,
+)
+from ..utils.sync_run import SyncRunRecorder
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_BUDGET = 300  # Seconds of processing per cron run.
+DEFAULT_THROTTLE = 1.0  # Seconds to wait between two pages of orders.
+
+
+class ECommerceOrderBackfill(models.Model):
+    """Import of the historical orders of an account, window by window and oldest first.
+
+    The period is split into windows of `window_days` days, processed by the
+    `ir_cron_ecommerce_backfill_orders` cron alongside the live synchronization of the account, which
+    is left untouched, but never runs at the same time. Each window fetches the orders updated
+    between its start and its end with `_fetch_orders_pages_from_ecommerce`, whose orders are sorted
+    by update date. The progress is committed with the orders as a checkpoint, from which the
+    backfill resumes after a restart, an unreachable platform or the end of the time budget of the
+    cron.
+    """
+    _name = 'ecommerce.order.backfill'
+    _description = "E-commerce Order Backfill"
+    _order = 'id desc'
+
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        index=True,
+        ondelete='cascade',
+    )
+    date_from = fields.Datetime(string="From", required=True)
+    date_to = fields.Datetime(
+        string="Until",
+        help="Orders updated after this date are left to the live synchronization of the account.",
+        required=True,
+        default=fields.Datetime.now,
+    )
+    window_days = fields.Integer(string="Window (days)", required=True, default=7)
+    state = fields.Selection(
+        string="Status",
+        selection=[
+            ('pending', "Pending"),
+            ('running', "Running"),
+            ('paused', "Paused"),
+            ('done', "Done"),
+            ('failed', "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        default='pending',
+        copy=False,
+    )
+    checkpoint = fields.Datetime(
+        string="Imported Until",
+        help="The orders updated before this date have been imported.",
+        readonly=True,
+        copy=False,
+    )
+    progress = fields.Float(string="Progress", compute='_compute_progress')
+    count_fetched = fields.Integer(string="Fetched", readonly=True, copy=False)
+    count_processed = fields.Integer(string="Processed", readonly=True, copy=False)
+    count_failed = fields.Integer(string="Failed", readonly=True, copy=False)
+    error = fields.Text(string="Last Error", readonly=True, copy=False)
+
+    _check_dates = models.Constraint(
+        'CHECK(date_from < date_to)',
+        "The start of the backfill must be before its end.",
+    )
+    _check_window_days = models.Constraint(
+        'CHECK(window_days > 0)',
+        "The window of a backfill must last at least one day.",
+    )
+
+    @api.depends('state', 'date_from', 'date_to', 'checkpoint')
+    def _compute_progress(self):
+        for backfill in self:
+            if backfill.state == 'done':
+                backfill.progress = 100.0
+            elif backfill.checkpoint and backfill.date_from and backfill.date_to:
+                total = (backfill.date_to - backfill.date_from).total_seconds()
+                backfill.progress = min(100.0, (backfill.checkpoint - backfill.date_from).total_seconds() * 100 / total)
+            else:
+                backfill.progress = 0.0
+
+    # === CRUD METHODS === #
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        backfills = super().create(vals_list)
+        self.env.ref('odoo_ecommerce.ir_cron_ecommerce_backfill_orders')._trigger()
+        return backfills
+
+    # === ACTION METHODS === #
+
+    def action_pause(self):
+        self.filtered(lambda backfill: backfill.state in ('pending', 'running')).state = 'paused'
+
+    def action_resume(self):
+        self.filtered(lambda backfill: backfill.state in ('paused', 'failed')).write({'state': 'running', 'error': False})
+        self.env.ref('odoo_ecommerce.ir_cron_ecommerce_backfill_orders')._trigger()
+
+    # === BUSINESS METHODS === #
+
+    @api.model
+    def _cron_process_backfills(self):
+        """Process the pending backfills, oldest first, until the time budget of the run is spent.
+
+        Note: This method is called by the `ir_cron_ecommerce_backfill_orders` cron, which is
+        triggered again right away while backfills are left.
+
+        :return: None
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        time_budget = int(ICP.get_param('odoo_ecommerce.backfill_time_budget', DEFAULT_TIME_BUDGET))
+        throttle = float(ICP.get_param('odoo_ecommerce.backfill_throttle', DEFAULT_THROTTLE))
+        deadline = time.monotonic() + time_budget
+        backfills = self.search([
+            ('state', 'in', ('pending', 'running')),
+            ('ecommerce_account_id.active', '=', True),
+            ('ecommerce_account_id.state', '=', 'connected'),
+        ], order='id')
+        for backfill in backfills:
+            backfill._process(deadline, throttle)
+            if time.monotonic() >= deadline:
+                break
+        if self.search_count([('state', 'in', ('pending', 'running'))], limit=1) and time.monotonic() >= deadline:
+            self.env.ref('odoo_ecommerce.ir_cron_ecommerce_backfill_orders')._trigger()
+
+    def _process(self, deadline, throttle):
+        """Process the windows of the backfill until it is done or the deadline is reached.
+
+        The backfill is skipped while the orders of the account are being synchronized, and resumed
+        by the next run of the cron.
+
+        :param float deadline: The `time.monotonic` value after which no new page is fetched.
+        :param float throttle: The number of seconds to wait between two pages of orders.
+        :return: None
+        """
+        self.ensure_one()
+        with self.ecommerce_account_id._sync_lock('orders') as locked:
+            if locked:
+                self._process_windows(deadline, throttle)
+
+    def _process_windows(self, deadline, throttle):
+        """Process the windows of the backfill, see `_process`."""
+        account = self.ecommerce_account_id
+        if self.state == 'pending':
+            self.write({'state': 'running', 'checkpoint': self.date_from})
+            self.env.cr.commit()  # Not to lose the checkpoint when a failed order is rolled back.
+        sync_run = SyncRunRecorder('backfill', watermark_from=self.checkpoint)
+        try:
+            ensure_account_is_authenticated(account)
+            ensure_account_is_reachable(account)
+            while self.checkpoint < self.date_to and time.monotonic() < deadline:
+                self._process_window(sync_run, deadline, throttle)
+        except ECommerceAccountWideError as error:
+            account._log_account_wide_error(error, '_process_backfill')
+            self.error = str(error)  # Resumed by the next run of the cron.
+            self.env['ecommerce.sync.run']._log_run(account, sync_run, 'interrupted', error=error)
+            self.env.cr.commit()
+            return
+        except (ECommerceApiError, UserError) as error:
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'error': str(error).split('DETAIL')[0]})
+            self.env['ecommerce.sync.run']._log_run(account, sync_run, 'failed', error=error)
+            self.env.cr.commit()
+            return
+        if self.checkpoint >= self.date_to:
+            self.state = 'done'
+            _logger.info("Backfill %s of E-commerce account %s is done.", self.id, account.id)
+        self.env['ecommerce.sync.run']._log_run(account, sync_run, watermark_to=self.checkpoint)
+        self.env.cr.commit()
+
+    def _process_window(self, sync_run, deadline, throttle):
+        """Import the orders of the window starting at the checkpoint, and move the checkpoint.
+
+        Before the end of the window, the checkpoint is moved to the last imported update date
+        after each page; orders updated during the same second are imported again on resume,
+        which is harmless as existing orders are only updated.
+
+        :param SyncRunRecorder sync_run: The recorder of the current run of the backfill.
+        :param float deadline: The `time.monotonic` value after which no new page is fetched.
+        :param float throttle: The number of seconds to wait between two pages of orders.
+        :return: None
+        """
+        window_end = min(self.checkpoint + timedelta(days=self.window_days), self.date_to)
+        account = self.ecommerce_account_id.with_context(
+            ecommerce_orders_date_from=self.checkpoint,
+            ecommerce_orders_date_to=window_end,
+        )
+        with closing(account._fetch_orders_pages_from_ecommerce()) as orders_pages:
+            for orders_data in sync_run.iter_phase(orders_pages):
+                # The connectors not supporting the end of the window leave its later orders to the next windows.
+                window_orders = [
+                    order_data for order_data in orders_data
+                    if not order_data.get('write_date') or fields.Datetime.to_datetime(order_data['write_date']) <= window_end
+                ]
+                write_dates = [order_data['write_date'] for order_data in window_orders if order_data.get('write_date')]
+                sync_run.count_fetched += len(window_orders)
+                account._normalize_orders_page(window_orders, sync_run)
+                count_processed, failed_ids = account._sync_orders_page(window_orders, sync_run=sync_run)
+                self.write({
+                    'count_fetched': self.count_fetched + len(window_orders),
+                    'count_processed': self.count_processed + count_processed,
+                    'count_failed': self.count_failed + len(failed_ids),
+                })
+                if write_dates:
+                    last_date = fields.Datetime.to_datetime(max(write_dates)) - timedelta(seconds=1)
+                    self.checkpoint = max(self.checkpoint, last_date)
+                self.env.cr.commit()
+                if time.monotonic() >= deadline:
+                    return  # Resumed from the checkpoint by the next run.
+                time.sleep(throttle)
+        self.checkpoint = window_end
+        self.env.cr.commit()
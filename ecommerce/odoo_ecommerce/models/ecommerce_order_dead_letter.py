@@ -0,0 +1,223 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import json
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models, modules
+
+from ..utils import ECommerceAccountWideError, ECommerceDataError
+from ..utils.concurrency import call_with_concurrency_retry
+from ..utils.order_contract import ECommerceOrder
+from ..utils.order_reconcile import parse_write_date
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 5  # Minutes before the first automatic retry, doubled after each attempt.
+RETRY_BATCH_SIZE = 200  # Orders retried per run of the cron.
+DONE_RETENTION_DAYS = 7
+
+
+class ECommerceOrderDeadLetter(models.Model):
+    """Orders whose processing failed, kept with their normalized payload to be processed again.
+
+    When `_process_order_data` fails in `ecommerce.account._sync_orders_page`, the normalized order
+    is stored here instead of being discarded. The `ir_cron_ecommerce_retry_dead_letters` cron
+    processes it again from the stored payload, without calling the platform, with an exponential
+    backoff, until it succeeds or `odoo_ecommerce.dead_letter_max_attempts` attempts were made.
+    Orders that do not follow the order contract are not retried automatically, as they would fail
+    the same way.
+    """
+    _name = 'ecommerce.order.dead.letter'
+    _description = "E-commerce Failed Order"
+    _order = 'id desc'
+
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete='cascade',
+    )
+    ecommerce_order_identifier = fields.Char(string="E-commerce Order ID", required=True, readonly=True)
+    ecommerce_order_ref = fields.Char(string="E-commerce Order Reference", readonly=True)
+    payload = fields.Json(string="Payload", readonly=True)
+    payload_text = fields.Text(string="Normalized Order", compute='_compute_payload_text')
+    state = fields.Selection(
+        string="Status",
+        selection=[
+            ('pending', "Pending"),
+            ('done', "Recovered"),
+            ('abandoned', "Abandoned"),
+        ],
+        required=True,
+        readonly=True,
+        default='pending',
+    )
+    error_class = fields.Char(string="Error Type", readonly=True)
+    error = fields.Text(string="Error", readonly=True)
+    attempt_count = fields.Integer(string="Attempts", readonly=True, default=1)
+    next_retry_date = fields.Datetime(string="Next Retry", readonly=True, index=True)
+    sale_order_id = fields.Many2one(comodel_name='sale.order', string="Sales Order", readonly=True)
+
+    _unique_account_order = models.Constraint(
+        'UNIQUE(ecommerce_account_id, ecommerce_order_identifier)',
+        "An order can only be stored once per E-commerce account.",
+    )
+
+    @api.depends('payload')
+    def _compute_payload_text(self):
+        for letter in self:
+            letter.payload_text = json.dumps(letter.payload, indent=2, sort_keys=True) if letter.payload else False
+
+    # === BUSINESS METHODS === #
+
+    @api.model
+    def _store(self, account, order_data, error):
+        """Store an order whose processing failed, or update the stored one with the new failure.
+
+        :param recordset account: The account of the order, as an `ecommerce.account` record.
+        :param order_data: The order, as an `ECommerceOrder` mapping or the dict of the connector.
+        :param Exception error: The error raised while processing the order.
+        :return: The stored order.
+        :rtype: record of `ecommerce.order.dead.letter`
+        """
+        identifier = str(order_data.get('id'))
+        payload = order_data.to_dict() if isinstance(order_data, ECommerceOrder) else dict(order_data)
+        letter = self.search([
+            ('ecommerce_account_id', '=', account.id),
+            ('ecommerce_order_identifier', '=', identifier),
+        ])
+        values = {
+            'ecommerce_order_ref': order_data.get('reference'),
+            # Values that are not JSON serializable, such as dates, are stored as strings.
+            'payload': json.loads(json.dumps(payload, default=str)),
+        }
+        if letter:
+            letter.write({**values, 'state': 'pending', 'attempt_count': letter.attempt_count + 1})
+        else:
+            letter = self.create({
+                **values,
+                'ecommerce_account_id': account.id,
+                'ecommerce_order_identifier': identifier,
+            })
+        letter._schedule_retry(error)
+        return letter
+
+    def _schedule_retry(self, error):
+        """Record the last failure and plan the next automatic retry, if any.
+
+        :param Exception error: The error raised by the last attempt.
+        :return: None
+        """
+        max_attempts = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.dead_letter_max_attempts', DEFAULT_MAX_ATTEMPTS,
+        ))
+        for letter in self:
+            retryable = not isinstance(error, ECommerceDataError) and letter.attempt_count < max_attempts
+            letter.write({
+                'state': 'pending' if retryable else 'abandoned',
+                'error_class': type(error).__name__,
+                'error': str(error).split('DETAIL')[0],
+                'next_retry_date': retryable and fields.Datetime.now() + timedelta(
+                    minutes=RETRY_BASE_DELAY * 2 ** (letter.attempt_count - 1),
+                ),
+            })
+
+    @api.model
+    def _cron_retry(self):
+        """Process again the stored orders whose next retry is due.
+
+        Note: This method is called by the `ir_cron_ecommerce_retry_dead_letters` cron.
+
+        :return: None
+        """
+        letters = self.search([
+            ('state', '=', 'pending'),
+            ('next_retry_date', '<=', fields.Datetime.now()),
+            ('ecommerce_account_id.active', '=', True),
+            ('ecommerce_account_id.state', '=', 'connected'),
+        ], order='next_retry_date', limit=RETRY_BATCH_SIZE)
+        letters._retry()
+        if len(letters) == RETRY_BATCH_SIZE:
+            self.env.ref('odoo_ecommerce.ir_cron_ecommerce_retry_dead_letters')._trigger()
+
+    def _retry(self, auto_commit=True):
+        """Process the stored orders again with `_process_order_data`, from their payload.
+
+        An order updated locally after the stored payload, e.g. by a later synchronization, is
+        considered recovered without being processed again. The orders of an account are skipped
+        while its orders are being synchronized, and postponed to a next run of the cron.
+
+        :param bool auto_commit: Whether the database cursor should be committed after each order.
+        :return: The number of recovered orders.
+        :rtype: int
+        """
+        count_recovered = 0
+        for account, letters in self.grouped('ecommerce_account_id').items():
+            with account._sync_lock('orders') as locked:
+                if not locked:
+                    # The live synchronization would process the same orders; retry them later.
+                    letters.filtered(lambda letter: letter.state == 'pending').next_retry_date = (
+                        fields.Datetime.now() + timedelta(minutes=RETRY_BASE_DELAY)
+                    )
+                    continue
+                for letter in letters:
+                    try:
+                        order_data = ECommerceOrder.from_dict(letter.payload)
+                        order = self.env['sale.order'].search([
+                            ('ecommerce_account_id', '=', account.id),
+                            ('ecommerce_order_identifier', '=', letter.ecommerce_order_identifier),
+                        ])
+                        write_date = parse_write_date(order_data.get('write_date'))
+                        if not (order.ecommerce_write_date and write_date and order.ecommerce_write_date > write_date):
+                            if auto_commit:
+                                def process_order():
+                                    with self.env.cr.savepoint():
+                                        return account._process_order_data(order_data)
+                                order = call_with_concurrency_retry(self.env.cr, process_order)
+                            else:  # Avoid the savepoint in testing
+                                order = account._process_order_data(order_data)
+                        letter.write({'state': 'done', 'sale_order_id': order.id, 'next_retry_date': False})
+                        count_recovered += 1
+                    except ECommerceAccountWideError as error:  # e.g. an open circuit breaker.
+                        letter._schedule_retry(error)
+                    except Exception as error:
+                        if modules.module.current_test:
+                            raise
+                        letter.attempt_count += 1
+                        letter._schedule_retry(error)
+                        _logger.warning(
+                            "Retry %s of order %s of %s account with id %s failed: %s",
+                            letter.attempt_count, letter.ecommerce_order_identifier,
+                            account.ecommerce_channel_id.name, account.id, error,
+                        )
+                    if auto_commit:
+                        self.env.cr.commit()
+        return count_recovered
+
+    # === ACTION METHODS === #
+
+    def action_retry(self):
+        """Retry the selected orders now, including the abandoned ones."""
+        letters = self.filtered(lambda letter: letter.state != 'done')
+        count_recovered = letters._retry()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'success' if count_recovered == len(letters) else 'warning',
+                'message': self.env._("%(recovered)s of %(total)s orders recovered.", recovered=count_recovered, total=len(letters)),
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
+
+    @api.autovacuum
+    def _gc_dead_letters(self):
+        """Delete the orders recovered more than a week ago."""
+        self.search([
+            ('state', '=', 'done'),
+            ('write_date', '<', fields.Datetime.now() - timedelta(days=DONE_RETENTION_DAYS)),
+        ]).unlink()
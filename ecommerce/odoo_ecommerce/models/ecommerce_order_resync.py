@@ -0,0 +1,223 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models, modules
+from odoo.tools import split_every
+
+from ..utils import ECommerceAccountWideError, ECommerceDataError
+from ..utils.order_contract import ECommerceOrder
+from ..utils.order_reconcile import diff_order_stamps, parse_write_date
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 5  # Minutes before the first automatic retry, doubled after each attempt.
+RETRY_BATCH_SIZE = 200  # Orders retried per run of the cron.
+DONE_RETENTION_DAYS = 7
+
+
+class ECommerceOrderResync(models.Model):
+    """Queue of the platform orders found missing or stale by the reconciliation of an account.
+
+    The reconciliation (see `ecommerce.account._reconcile_orders`) only downloads the identifiers
+    and update dates of the recent orders of the platform. The orders that differ from the local
+    ones are queued here and synchronized again one by one with
+    `_fetch_order_from_ecommerce_by_order_ref`, instead of downloading every order again.
+
+    An order that fails to synchronize is retried by the `ir_cron_ecommerce_retry_order_resyncs`
+    cron with an exponential backoff, until it succeeds or
+    `odoo_ecommerce.order_resync_max_attempts` attempts were made. Orders that do not follow the
+    order contract are not retried automatically, as they would fail the same way.
+    """
+    _name = 'ecommerce.order.resync'
+    _description = "E-commerce Order Resync"
+    _order = 'id'
+
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete='cascade',
+    )
+    ecommerce_order_identifier = fields.Char(string="E-commerce Order ID", required=True, readonly=True)
+    ecommerce_order_ref = fields.Char(
+        string="E-commerce Order Reference",
+        help="The reference used to fetch the order from the platform.",
+        required=True,
+        readonly=True,
+    )
+    remote_write_date = fields.Datetime(string="Updated On Platform", readonly=True)
+    reason = fields.Selection(
+        string="Reason",
+        selection=[
+            ('missing', "Missing"),
+            ('stale', "Outdated"),
+        ],
+        required=True,
+        readonly=True,
+    )
+    state = fields.Selection(
+        string="Status",
+        selection=[
+            ('pending', "Pending"),
+            ('done', "Done"),
+            ('failed', "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        default='pending',
+        index=True,
+    )
+    attempt_count = fields.Integer(string="Attempts", readonly=True)
+    next_retry_date = fields.Datetime(string="Next Retry", readonly=True, index=True)
+    sale_order_id = fields.Many2one(comodel_name='sale.order', string="Sales Order", readonly=True)
+    error = fields.Text(string="Error", readonly=True)
+
+    @api.model
+    def _enqueue(self, account, order_stamps):
+        """Queue the orders of the platform that are missing or stale locally.
+
+        Only the orders updated before the last orders sync of the account are compared; the
+        more recent ones are left to the next run of `_sync_orders`. An order already queued for
+        the same update date, whatever the outcome, is not queued again: the failed ones are
+        retried by `_cron_retry`.
+
+        :param recordset account: The account, as an `ecommerce.account` record.
+        :param list order_stamps: The stamps of the orders, as returned by
+                                  `_fetch_order_stamps_from_ecommerce`.
+        :return: The queued orders.
+        :rtype: recordset of `ecommerce.order.resync`
+        """
+        stamps = {}
+        for stamp in order_stamps:
+            write_date = parse_write_date(stamp.get('write_date'))
+            if write_date and write_date > account.last_orders_sync:
+                continue
+            stamps[str(stamp['id'])] = (stamp.get('order_ref') or str(stamp['id']), write_date)
+        local_stamps = []
+        for identifiers in split_every(1000, list(stamps)):
+            orders = self.env['sale.order'].search_fetch([
+                ('ecommerce_account_id', '=', account.id),
+                ('ecommerce_order_identifier', 'in', identifiers),
+            ], ['ecommerce_order_identifier', 'ecommerce_write_date'])
+            local_stamps += [(order.ecommerce_order_identifier, order.ecommerce_write_date) for order in orders]
+        missing, stale = diff_order_stamps(
+            [(identifier, write_date) for identifier, (_order_ref, write_date) in stamps.items()], local_stamps,
+        )
+        reasons = dict.fromkeys(missing, 'missing') | dict.fromkeys(stale, 'stale')
+        queued = {
+            (resync.ecommerce_order_identifier, resync.remote_write_date)
+            for resync in self.search_fetch([
+                ('ecommerce_account_id', '=', account.id),
+                ('ecommerce_order_identifier', 'in', list(reasons)),
+            ], ['ecommerce_order_identifier', 'remote_write_date'])
+        }
+        return self.create([{
+            'ecommerce_account_id': account.id,
+            'ecommerce_order_identifier': identifier,
+            'ecommerce_order_ref': stamps[identifier][0],
+            'remote_write_date': stamps[identifier][1],
+            'reason': reason,
+        } for identifier, reason in reasons.items() if (identifier, stamps[identifier][1]) not in queued])
+
+    def _process(self, auto_commit=True):
+        """Synchronize the queued orders again from the platform, one by one.
+
+        :param bool auto_commit: Whether the database cursor should be committed after each order.
+        :return: The number of synchronized and failed orders.
+        :rtype: tuple(int, int)
+        :raise ECommerceAccountWideError: If the platform cannot be reached; the orders left stay
+                                          pending for the next run.
+        """
+        count_processed = count_failed = 0
+        for resync in self.filtered(lambda resync: resync.state == 'pending'):
+            account = resync.ecommerce_account_id
+            try:
+                order_data = ECommerceOrder.from_dict(
+                    account._fetch_order_from_ecommerce_by_order_ref(resync.ecommerce_order_ref),
+                )
+                if auto_commit:
+                    with self.env.cr.savepoint():
+                        order = account._process_order_data(order_data)
+                else:  # Avoid the savepoint in testing
+                    order = account._process_order_data(order_data)
+                resync.write({'state': 'done', 'sale_order_id': order.id, 'error': False, 'next_retry_date': False})
+                count_processed += 1
+            except ECommerceAccountWideError:
+                raise
+            except Exception as error:
+                if modules.module.current_test:
+                    raise
+                resync.attempt_count += 1
+                resync._schedule_retry(error)
+                count_failed += 1
+                _logger.warning(
+                    "Could not resynchronize order %s of %s account with id %s: %s",
+                    resync.ecommerce_order_identifier, account.ecommerce_channel_id.name, account.id, error,
+                )
+            if auto_commit:
+                self.env.cr.commit()
+        return count_processed, count_failed
+
+    def _schedule_retry(self, error):
+        """Record the last failure and plan the next automatic retry, if any.
+
+        :param Exception error: The error raised by the last attempt.
+        :return: None
+        """
+        max_attempts = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.order_resync_max_attempts', DEFAULT_MAX_ATTEMPTS,
+        ))
+        for resync in self:
+            retryable = not isinstance(error, ECommerceDataError) and resync.attempt_count < max_attempts
+            resync.write({
+                'state': 'pending' if retryable else 'failed',
+                'error': str(error).split('DETAIL')[0],
+                'next_retry_date': retryable and fields.Datetime.now() + timedelta(
+                    minutes=RETRY_BASE_DELAY * 2 ** (resync.attempt_count - 1),
+                ),
+            })
+
+    @api.model
+    def _cron_retry(self):
+        """Synchronize again the queued orders whose next retry is due.
+
+        Note: This method is called by the `ir_cron_ecommerce_retry_order_resyncs` cron.
+
+        :return: None
+        """
+        resyncs = self.search([
+            ('state', '=', 'pending'),
+            ('next_retry_date', '<=', fields.Datetime.now()),
+            ('ecommerce_account_id.active', '=', True),
+            ('ecommerce_account_id.state', '=', 'connected'),
+        ], order='next_retry_date', limit=RETRY_BATCH_SIZE)
+        interrupted = False
+        for account, account_resyncs in resyncs.grouped('ecommerce_account_id').items():
+            with account._sync_lock('reconcile') as locked:
+                if not locked:
+                    continue  # The reconciliation of the account processes its pending orders.
+                try:
+                    account_resyncs._process()
+                except ECommerceAccountWideError as error:
+                    account._log_account_wide_error(error, '_cron_retry_order_resyncs')
+                    interrupted = True  # The orders left are retried by the next run of the cron.
+        if len(resyncs) == RETRY_BATCH_SIZE and not interrupted:
+            self.env.ref('odoo_ecommerce.ir_cron_ecommerce_retry_order_resyncs')._trigger()
+
+    def action_retry(self):
+        resyncs = self.filtered(lambda resync: resync.state == 'failed')
+        resyncs.write({'state': 'pending', 'error': False, 'next_retry_date': False})
+        resyncs._process()
+
+    @api.autovacuum
+    def _gc_order_resyncs(self):
+        """Delete the orders synchronized again more than a week ago."""
+        self.search([
+            ('state', '=', 'done'),
+            ('write_date', '<', fields.Datetime.now() - timedelta(days=DONE_RETENTION_DAYS)),
+        ]).unlink()
@@ -0,0 +1,246 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+DEFAULT_MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 5  # Minutes before the first retry, doubled after each attempt.
+DONE_RETENTION_DAYS = 7
+INVENTORY_PRECOMMIT_KEY = 'ecommerce.outbox.inventory_product_ids'
+
+
+class ECommerceOutboxEvent(models.Model):
+    """Transactional outbox of the changes to push to the E-commerce platforms.
+
+    The events are written in the transaction that validates a delivery order or changes the stock
+    of a product, so they are committed if and only if the change is. The dispatchers
+    (`ecommerce.account._update_pickings` and `_update_inventory`) pop the due events of an account
+    in order from a partial index, instead of searching the changed records, and keep their retry
+    state here.
+    """
+    _name = 'ecommerce.outbox.event'
+    _description = "E-commerce Outbox Event"
+    _order = 'id'
+
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        readonly=True,
+        ondelete='cascade',
+    )
+    event_type = fields.Selection(
+        string="Type",
+        selection=[
+            ('picking', "Delivery"),
+            ('inventory', "Inventory"),
+        ],
+        required=True,
+        readonly=True,
+    )
+    picking_id = fields.Many2one(comodel_name='stock.picking', string="Delivery", readonly=True, ondelete='cascade')
+    product_id = fields.Many2one(comodel_name='product.product', string="Product", readonly=True, ondelete='cascade')
+    state = fields.Selection(
+        string="Status",
+        selection=[
+            ('pending', "Pending"),
+            ('done', "Done"),
+            ('failed', "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        default='pending',
+    )
+    attempt_count = fields.Integer(string="Attempts", readonly=True)
+    next_attempt_date = fields.Datetime(string="Next Attempt", required=True, readonly=True, default=fields.Datetime.now)
+    error = fields.Text(string="Error", readonly=True)
+
+    _pending_idx = models.Index("(ecommerce_account_id, event_type, next_attempt_date, id) WHERE state = 'pending'")
+    _picking_idx = models.Index("(picking_id) WHERE picking_id IS NOT NULL")
+
+    # === BUSINESS METHODS === #
+
+    @api.model
+    def _enqueue_pickings(self, pickings):
+        """Queue the delivery orders to push to their platform.
+
+        :param recordset pickings: The validated delivery orders, as `stock.picking` records.
+        :return: None
+        """
+        pickings = pickings.filtered(
+            lambda picking: picking.support_update_picking and picking.ecommerce_sync_status != 'done',
+        )
+        if not pickings:
+            return
+        queued_picking_ids = set(self.search([
+            ('picking_id', 'in', pickings.ids),
+            ('state', '=', 'pending'),
+        ]).picking_id.ids)
+        self.sudo().create([{
+            'ecommerce_account_id': picking.ec_account_id.id,
+            'event_type': 'picking',
+            'picking_id': picking.id,
+        } for picking in pickings if picking.id not in queued_picking_ids])
+
+    @api.model
+    def _cron_enqueue_missed_pickings(self):
+        """Queue the delivery orders that are waiting to be pushed without an event.
+
+        The delivery orders are queued when validated with `stock.picking._action_done`; the ones
+        validated otherwise are caught up here. The delivery orders whose events failed are only
+        queued again with `action_retry`.
+
+        Note: This method is called once a day by the `ir_cron_ecommerce_enqueue_missed_pickings`
+        cron, so that the dispatcher only pops the queue.
+
+        :return: None
+        """
+        pickings = self.env['stock.picking'].search([
+            ('ec_account_id', '!=', False),
+            ('state', '=', 'done'),
+            ('ecommerce_sync_status', '=', 'pending'),
+        ])
+        if not pickings:
+            return
+        queued_pickings = self.search([('event_type', '=', 'picking'), ('picking_id', 'in', pickings.ids)]).picking_id
+        self._enqueue_pickings(pickings - queued_pickings)
+
+    @api.model
+    def _enqueue_inventory(self, products):
+        """Queue the stock of the products to push to the platforms, when the transaction commits.
+
+        The stock of a product changes many times in a transaction, e.g. once per move line, so
+        the products are collected and their events written once, before the commit.
+
+        :param recordset products: The products whose stock changed, as `product.product` records.
+        :return: None
+        """
+        data = self.env.cr.precommit.data
+        if INVENTORY_PRECOMMIT_KEY not in data:
+            data[INVENTORY_PRECOMMIT_KEY] = set()
+            self.env.cr.precommit.add(self._flush_inventory_events)
+        data[INVENTORY_PRECOMMIT_KEY].update(products.ids)
+
+    @api.model
+    def _enqueue_offers_inventory(self, offers):
+        """Queue the stock of the offers to push to their platform, whether it changed or not.
+
+        Called when the stock to publish for an offer changes without any stock move, e.g. when it
+        is created or matched, or when the locations of its account change.
+
+        :param recordset offers: The offers, as `ecommerce.offer` records.
+        :return: None
+        """
+        self._create_inventory_events(offers.sudo().filtered(
+            lambda offer: offer.sync_stock
+            and offer.ecommerce_account_id.active
+            and offer.ecommerce_account_id.update_inventory
+        ))
+
+    def _flush_inventory_events(self):
+        """Write the inventory events of the products collected by `_enqueue_inventory`.
+
+        Only one pending event is kept per account and product.
+
+        :return: None
+        """
+        product_ids = self.env.cr.precommit.data.pop(INVENTORY_PRECOMMIT_KEY, set())
+        if not product_ids:
+            return
+        self._create_inventory_events(self.env['ecommerce.offer'].sudo().search([
+            ('matched_product_id', 'in', list(product_ids)),
+            ('sync_stock', '=', True),
+            ('ecommerce_account_id.active', '=', True),
+            ('ecommerce_account_id.update_inventory', '=', True),
+        ]))
+
+    def _create_inventory_events(self, offers):
+        """Create the inventory events of the offers that have no pending one.
+
+        :param recordset offers: The synchronized offers, as `ecommerce.offer` records.
+        :return: None
+        """
+        if not offers:
+            return
+        queued = {
+            (event.ecommerce_account_id.id, event.product_id.id)
+            for event in self.sudo().search([
+                ('event_type', '=', 'inventory'),
+                ('product_id', 'in', offers.matched_product_id.ids),
+                ('state', '=', 'pending'),
+            ])
+        }
+        pending = {(offer.ecommerce_account_id.id, offer.matched_product_id.id) for offer in offers} - queued
+        self.sudo().create([{
+            'ecommerce_account_id': account_id,
+            'event_type': 'inventory',
+            'product_id': product_id,
+        } for account_id, product_id in sorted(pending)])
+
+    @api.model
+    def _pop(self, account, event_type):
+        """Return the due events of the account, in order, locking them for the current transaction.
+
+        The events locked by another dispatcher are skipped rather than waited for.
+
+        :param recordset account: The account, as an `ecommerce.account` record.
+        :param str event_type: The type of the events, see `event_type`.
+        :return: The events.
+        :rtype: recordset of `ecommerce.outbox.event`
+        """
+        self.env.cr.execute(
+            """
+            SELECT id
+              FROM ecommerce_outbox_event
+             WHERE ecommerce_account_id = %s
+               AND event_type = %s
+               AND state = 'pending'
+               AND next_attempt_date <= %s
+          ORDER BY id
+               FOR UPDATE SKIP LOCKED
+            """,
+            (account.id, event_type, fields.Datetime.now()),
+        )
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def _mark_done(self):
+        self.write({'state': 'done', 'error': False})
+
+    def _schedule_retry(self, error):
+        """Record the failure of the events and plan their next attempt, if any.
+
+        :param error: The error of the last attempt.
+        :return: None
+        """
+        max_attempts = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.outbox_max_attempts', DEFAULT_MAX_ATTEMPTS,
+        ))
+        now = fields.Datetime.now()
+        for event in self:
+            attempt_count = event.attempt_count + 1
+            event.write({
+                'state': 'pending' if attempt_count < max_attempts else 'failed',
+                'attempt_count': attempt_count,
+                'next_attempt_date': now + timedelta(minutes=RETRY_BASE_DELAY * 2 ** (attempt_count - 1)),
+                'error': str(error).split('DETAIL')[0],
+            })
+
+    # === ACTION METHODS === #
+
+    def action_retry(self):
+        """Queue the failed events again, to be dispatched by the next run of their dispatcher."""
+        self.filtered(lambda event: event.state == 'failed').write({
+            'state': 'pending',
+            'attempt_count': 0,
+            'next_attempt_date': fields.Datetime.now(),
+            'error': False,
+        })
+
+    @api.autovacuum
+    def _gc_outbox_events(self):
+        """Delete the events dispatched more than a week ago."""
+        self.search([
+            ('state', '=', 'done'),
+            ('write_date', '<', fields.Datetime.now() - timedelta(days=DONE_RETENTION_DAYS)),
+        ]).unlink()
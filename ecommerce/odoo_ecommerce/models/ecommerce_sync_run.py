@@ -0,0 +1,174 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+from datetime import timedelta
+
+import psycopg2
+
+from odoo import SUPERUSER_ID, api, fields, models
+from odoo.modules.registry import Registry
+
+from odoo.addons.odoo_ecommerce.utils import metrics
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 30
+GC_BATCH_SIZE = 10000
+
+
+class ECommerceSyncRun(models.Model):
+    """History of the synchronizations of the E-commerce accounts, one record per account and flow.
+
+    The phases are timed by `utils.sync_run.SyncRunRecorder`:
+
+    - fetch: waiting for the platform data (products, orders pages) or reading the Odoo data to push
+      (pickings, stock quantities);
+    - normalize: converting the platform data to the normalized contract;
+    - process: creating/updating the Odoo records, or pushing the data to the platform;
+    - commit: committing the processed records.
+    """
+    _name = 'ecommerce.sync.run'
+    _description = "E-commerce Sync Run"
+    _order = 'start_date desc, id desc'
+
+    ecommerce_account_id = fields.Many2one(
+        comodel_name='ecommerce.account',
+        string="E-commerce Account",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete='cascade',
+    )
+    flow = fields.Selection(
+        string="Flow",
+        selection=[
+            ('products', "Products"),
+            ('orders', "Orders"),
+            ('pickings', "Pickings"),
+            ('inventory', "Inventory"),
+            ('backfill', "Order Backfill"),
+            ('reconcile', "Order Reconciliation"),
+        ],
+        required=True,
+        readonly=True,
+    )
+    state = fields.Selection(
+        string="Status",
+        selection=[
+            ('done', "Done"),
+            ('interrupted', "Interrupted"),
+            ('failed', "Failed"),
+        ],
+        required=True,
+        readonly=True,
+        help="Interrupted: the account became unreachable during the run.\n"
+             "Failed: the data could not be fetched from the platform.",
+    )
+    start_date = fields.Datetime(string="Start", required=True, readonly=True, index=True)
+    end_date = fields.Datetime(string="End", readonly=True)
+    duration = fields.Float(string="Duration (s)", readonly=True, aggregator='avg')
+    fetch_duration = fields.Float(string="Fetch (s)", readonly=True, aggregator='avg')
+    normalize_duration = fields.Float(string="Normalize (s)", readonly=True, aggregator='avg')
+    process_duration = fields.Float(string="Process (s)", readonly=True, aggregator='avg')
+    commit_duration = fields.Float(string="Commit (s)", readonly=True, aggregator='avg')
+    count_fetched = fields.Integer(string="Fetched", readonly=True)
+    count_processed = fields.Integer(string="Processed", readonly=True)
+    count_failed = fields.Integer(string="Failed", readonly=True)
+    throughput = fields.Float(
+        string="Throughput (records/s)",
+        compute='_compute_throughput',
+        store=True,
+        aggregator='avg',
+    )
+    watermark_from = fields.Datetime(string="Changes From", readonly=True)
+    watermark_to = fields.Datetime(string="Changes Until", readonly=True)
+    error = fields.Text(string="Error", readonly=True)
+    # Only set when the run was profiled, see `ecommerce.account.profile_next_run`.
+    profile_id = fields.Many2one(
+        comodel_name='ir.profile',
+        string="Profile",
+        readonly=True,
+        ondelete='set null',
+        groups='base.group_system',
+    )
+    query_count = fields.Integer(string="SQL Queries", readonly=True)
+    queries_per_record = fields.Float(
+        string="Queries per Record",
+        compute='_compute_per_record',
+        store=True,
+        aggregator='avg',
+    )
+    duration_per_record = fields.Float(
+        string="Time per Record (ms)",
+        compute='_compute_per_record',
+        store=True,
+        aggregator='avg',
+    )
+
+    @api.depends('count_processed', 'duration')
+    def _compute_throughput(self):
+        for run in self:
+            run.throughput = run.count_processed / run.duration if run.duration else 0.0
+
+    @api.depends('query_count', 'duration', 'count_fetched', 'profile_id')
+    def _compute_per_record(self):
+        for run in self:
+            if run.profile_id and run.count_fetched:
+                run.queries_per_record = run.query_count / run.count_fetched
+                run.duration_per_record = run.duration * 1000 / run.count_fetched
+            else:
+                run.queries_per_record = run.duration_per_record = 0.0
+
+    @api.model
+    def _log_run(self, account, recorder, state='done', watermark_to=None, error=None):
+        """Save the run recorded by `recorder` for the given account.
+
+        The run is saved with a separate cursor, like `ecommerce.account.log_xml`, so it is kept
+        when the current transaction is rolled back by a failing record. It is also added to the
+        metrics exposed by `/ecommerce/metrics`.
+
+        :param account: The `ecommerce.account` record that was synchronized.
+        :param SyncRunRecorder recorder: The recorder of the run.
+        :param str state: The outcome of the run.
+        :param datetime watermark_to: The new sync date of the account, if it was moved forward.
+        :param error: The error that interrupted the run, if any.
+        :return: None
+        """
+        vals = {
+            **recorder.get_values(state, watermark_to=watermark_to, error=error),
+            'ecommerce_account_id': account.id,
+        }
+        db_name = self.env.cr.dbname
+        labels = {'account': str(account.id), 'channel': account.channel_code, 'flow': recorder.flow}
+        metrics.inc(db_name, 'ecommerce_sync_runs_total', {**labels, 'state': state})
+        for outcome in ('fetched', 'processed', 'failed'):
+            metrics.inc(db_name, 'ecommerce_sync_records_total', {**labels, 'outcome': outcome}, vals[f'count_{outcome}'])
+        metrics.observe(db_name, 'ecommerce_sync_run_duration_seconds', labels, vals['duration'])
+        metrics.dump(db_name, force=True)
+        try:
+            with Registry(db_name).cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                env['ecommerce.sync.run'].create(vals)
+        except psycopg2.Error:
+            _logger.warning("Could not save the %s sync run of E-commerce account %s.", recorder.flow, account.id, exc_info=True)
+
+    @api.autovacuum
+    def _gc_sync_runs(self):
+        """Delete the runs older than the retention period, in batches."""
+        retention_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odoo_ecommerce.sync_run_retention_days', DEFAULT_RETENTION_DAYS,
+        ))
+        limit_date = fields.Datetime.now() - timedelta(days=retention_days)
+        count_deleted = 0
+        while True:
+            self.env.cr.execute(
+                """
+                DELETE FROM ecommerce_sync_run
+                 WHERE id IN (SELECT id FROM ecommerce_sync_run WHERE start_date < %s LIMIT %s)
+                """,
+                (limit_date, GC_BATCH_SIZE),
+            )
+            count_deleted += self.env.cr.rowcount
+            if self.env.cr.rowcount < GC_BATCH_SIZE:
+                break
+        _logger.info("Deleted %s E-commerce sync runs older than %s days.", count_deleted, retention_days)
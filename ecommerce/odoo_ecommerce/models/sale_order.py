@@ -12,6 +12,10 @@ class SaleOrder(models.Model):
     ec_order_ref = fields.Char(
         string="E-commerce Order Reference",
         readonly=True, copy=False)
+    ecommerce_write_date = fields.Datetime(
+        string="E-commerce Update Date",
+        help="The last update date of the order on the E-commerce platform that was synchronized.",
+        readonly=True, copy=False)
 
     ecommerce_account_id = fields.Many2one(
         comodel_name='ecommerce.account',
@@ -36,10 +36,10 @@ class StockPicking(models.Model):
         "E-commerce picking identifier should be unique per ecommerce account.",
     )
 
-    @api.depends('state')
+    @api.depends('state', 'ec_account_id')
     def _compute_support_update_picking(self):
         for picking in self:
-            ecommerce_account_id = picking.sale_id and picking.sale_id.ecommerce_account_id
+            ecommerce_account_id = picking.ec_account_id
             picking.support_update_picking = (
                 picking.state == 'done' and
                 ecommerce_account_id and
@@ -61,6 +61,12 @@ class StockPicking(models.Model):
 
     # === BUSINESS METHODS ===#
 
+    def _action_done(self):
+        res = super()._action_done()
+        # Queue the validated delivery orders in the same transaction, see `ecommerce.outbox.event`.
+        self.env['ecommerce.outbox.event']._enqueue_pickings(self.sudo().filtered('ec_account_id'))
+        return res
+
     def _check_carrier_details_compliance(self):
         """ Check that a picking has a `carrier_tracking_ref`.
 
@@ -0,0 +1,21 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+
+
+class StockQuant(models.Model):
+    _inherit = 'stock.quant'
+
+    @api.model
+    def _update_available_quantity(self, product_id, location_id, *args, **kwargs):
+        res = super()._update_available_quantity(product_id, location_id, *args, **kwargs)
+        if location_id.usage == 'internal':  # The stock of the other locations is not published.
+            self.env['ecommerce.outbox.event']._enqueue_inventory(product_id)
+        return res
+
+    @api.model
+    def _update_reserved_quantity(self, product_id, location_id, *args, **kwargs):
+        res = super()._update_reserved_quantity(product_id, location_id, *args, **kwargs)
+        if location_id.usage == 'internal':
+            self.env['ecommerce.outbox.event']._enqueue_inventory(product_id)
+        return res
@@ -0,0 +1,14 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Benchmarks of the sync flows against synthetic data, reported as JSON to compare module versions.
+
+Run them with `odoo-bin ecommerce_benchmark`, see `odoo_ecommerce/cli/ecommerce_benchmark.py`.
+"""
+
+from .common import PhaseProfiler, capture_api_calls, disable_run_logging, patch_model_method
+from .fetch import run_fetch_benchmark
+from .inventory import run_inventory_benchmark, seed_inventory
+from .mock_accounts import connect_to_mock_platform, get_mock_location_identifier, prepare_mock_offer_values
+from .orders import run_order_ingestion_benchmark
+from .payloads import iter_normalized_orders, normalize_mock_order
+from .query_budget import QUERY_BUDGETS, check_query_budget, check_query_budgets
@@ -0,0 +1,205 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import platform
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+import psutil
+
+from odoo import fields, release
+
+from odoo.addons.odoo_ecommerce.utils.api_ledger import pop_api_calls
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_logger = logging.getLogger(__name__)
+
+
+def get_rss():
+    """Return the current resident set size of the process, in kilobytes."""
+    return psutil.Process().memory_info().rss // 1024
+
+
+def get_peak_rss():
+    """Return the peak resident set size of the process, in kilobytes, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if platform.system() == 'Darwin' else peak  # Bytes on macOS
+
+
+def get_percentiles(values, ratios=(0.5, 0.9, 0.99)):
+    """Return the given percentiles and the maximum of the values, rounded to the millisecond.
+
+    :param list values: The measured durations, in seconds.
+    :rtype: dict
+    """
+    if not values:
+        return {}
+    values = sorted(values)
+    result = {
+        f'p{int(ratio * 100)}': round(values[min(len(values) - 1, int(ratio * len(values)))], 3)
+        for ratio in ratios
+    }
+    result['max'] = round(values[-1], 3)
+    return result
+
+
+def get_environment_info(env):
+    """Return the versions of Odoo and of the E-commerce modules, to compare benchmark reports.
+
+    :rtype: dict
+    """
+    modules = env['ir.module.module'].search_read([
+        ('state', '=', 'installed'),
+        '|', ('name', '=', 'odoo_ecommerce'), ('name', '=like', 'ecommerce_%'),
+    ], ['name', 'latest_version'])
+    return {
+        'date': fields.Datetime.to_string(fields.Datetime.now()),
+        'odoo_version': release.version,
+        'python_version': platform.python_version(),
+        'database': env.cr.dbname,
+        'modules': {module['name']: module['latest_version'] for module in modules},
+    }
+
+
+@contextmanager
+def patch_model_method(records, name, function):
+    """Replace a method of the model of `records` during the `with` block.
+
+    The method is replaced on the registry class of the model, hence for every record of the model
+    in the process: only use this in a process dedicated to the benchmark.
+
+    :param recordset records: A recordset of the patched model.
+    :param str name: The name of the method.
+    :param function: The replacing function.
+    """
+    model_class = type(records)
+    original = model_class.__dict__.get(name)
+    setattr(model_class, name, function)
+    try:
+        yield
+    finally:
+        if original is None:
+            delattr(model_class, name)
+        else:
+            setattr(model_class, name, original)
+
+
+@contextmanager
+def capture_api_calls(env):
+    """Collect the calls sent by the transport instead of writing them to the `ecommerce.api.call` ledger.
+
+    The calls to the local stand-ins of the platforms would only pollute the ledger, which is also
+    written with a separate cursor that cannot see the records created by the benchmark.
+
+    :return: The list the calls are appended to, as returned by `utils.api_ledger.pop_api_calls`.
+    :rtype: list
+    """
+    calls = []
+
+    def _flush_buffer(self):
+        calls.extend(pop_api_calls(self.env.cr.dbname))
+
+    with patch_model_method(env['ecommerce.api.call'], '_flush_buffer', _flush_buffer):
+        try:
+            yield calls
+        finally:
+            calls.extend(pop_api_calls(env.cr.dbname))
+
+
+@contextmanager
+def disable_run_logging(env):
+    """Do not save the sync runs, the API calls and the logs of the flows run during the `with` block.
+
+    They are written with separate cursors, hence left in the database when the benchmark rolls its
+    transaction back. The logs are only sent to the Python logger.
+    """
+    def _log_run(self, account, recorder, state='done', watermark_to=None, error=None):
+        recorder.stop_profiling()
+
+    def log_xml(self, message, func, type='client', level='Error', name=''):
+        _logger.info("%s (%s): %s", func, level, message)
+
+    with (
+        patch_model_method(env['ecommerce.sync.run'], '_log_run', _log_run),
+        patch_model_method(env['ecommerce.account'], 'log_xml', log_xml),
+        capture_api_calls(env),
+    ):
+        yield
+
+
+class PhaseProfiler:
+    """Measure the time and the SQL queries spent in each phase of a flow.
+
+    A phase is either a `with measure(phase)` block or a method of a model instrumented with
+    `instrument`. The measures of a phase exclude those of the phases nested in it, so that the
+    phases of a run add up to its total.
+
+    :param cr: The cursor whose queries are counted.
+    """
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.phases = {}  # {phase: {'calls': int, 'duration': float, 'queries': int}}
+        self._nested = []  # [duration, queries] of the nested phases of each running phase.
+
+    @contextmanager
+    def measure(self, phase):
+        """Add the time and the queries of the `with` block to the given phase."""
+        start = time.perf_counter()
+        start_queries = self.cr.sql_log_count
+        self._nested.append([0.0, 0])
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            queries = self.cr.sql_log_count - start_queries
+            nested_duration, nested_queries = self._nested.pop()
+            stats = self.phases.setdefault(phase, {'calls': 0, 'duration': 0.0, 'queries': 0})
+            stats['calls'] += 1
+            stats['duration'] += duration - nested_duration
+            stats['queries'] += queries - nested_queries
+            if self._nested:
+                self._nested[-1][0] += duration
+                self._nested[-1][1] += queries
+
+    @contextmanager
+    def instrument(self, records, phase_by_method):
+        """Measure the calls to the given methods of the model of `records` during the `with` block.
+
+        See `patch_model_method` for the scope of the instrumentation.
+
+        :param recordset records: A recordset of the instrumented model.
+        :param dict phase_by_method: The phase of each instrumented method, by method name.
+        """
+        with ExitStack() as stack:
+            for name, phase in phase_by_method.items():
+                method = getattr(type(records), name)
+                stack.enter_context(patch_model_method(records, name, self._wrap(method, phase)))
+            yield self
+
+    def _wrap(self, method, phase):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.measure(phase):
+                return method(*args, **kwargs)
+        return wrapper
+
+    def get_report(self):
+        """Return the measures of the phases, rounded for the report.
+
+        :rtype: dict
+        """
+        return {
+            phase: {
+                'calls': stats['calls'],
+                'duration': round(stats['duration'], 3),
+                'queries': stats['queries'],
+            } for phase, stats in self.phases.items()
+        }
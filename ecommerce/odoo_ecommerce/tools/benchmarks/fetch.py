@@ -0,0 +1,73 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import time
+from contextlib import closing
+
+from odoo import fields
+
+from odoo.addons.odoo_ecommerce.utils.order_contract import ECommerceOrder
+
+from .common import PhaseProfiler, capture_api_calls, get_environment_info, get_peak_rss, get_rss
+
+
+def run_fetch_benchmark(account, date_from=None):
+    """Fetch the orders of the account with `_fetch_orders_pages_from_ecommerce` and normalize them.
+
+    Nothing is processed: the benchmark isolates the download and the decoding of the orders, and
+    is meant to run offline against the fixtures of `utils.http_cassette`. The report splits the
+    duration into:
+
+    - `fetch`: the time waiting for each page of orders, i.e. the calls to the platform and the
+      normalization of their payloads by the connector;
+    - `api`: the sum of the latencies of the calls, as seen by the transport. Pages downloaded in
+      the background overlap with the processing of the previous ones, so it may exceed `fetch`;
+    - `decode`: `fetch` without `api`, i.e. the normalization by the connector;
+    - `contract`: the conversion of the orders into `ECommerceOrder`.
+
+    :param recordset account: The account to fetch the orders of, as an `ecommerce.account` record.
+    :param datetime date_from: The date to fetch the orders updated since, instead of the last
+                               sync date of the account. Pin it to replay a fixture.
+    :return: The report of the benchmark, JSON serializable.
+    :rtype: dict
+    """
+    account.ensure_one()
+    cr = account.env.cr
+    if date_from:
+        account.last_orders_sync = date_from
+    profiler = PhaseProfiler(cr)
+    count_orders = count_pages = 0
+    rss_before = get_rss()
+    start = time.perf_counter()
+    with capture_api_calls(account.env) as api_calls, closing(account._fetch_orders_pages_from_ecommerce()) as pages:
+        while True:
+            with profiler.measure('fetch'):
+                orders_data = next(pages, None)
+            if orders_data is None:
+                break
+            count_pages += 1
+            count_orders += len(orders_data)
+            with profiler.measure('contract'):
+                for order_data in orders_data:
+                    ECommerceOrder.from_dict(order_data)
+    duration = time.perf_counter() - start
+    phases = profiler.get_report()
+    fetch_duration = phases.get('fetch', {}).get('duration', 0.0)
+    api_duration = sum(call[5] for call in api_calls) / 1000  # The latencies are in milliseconds.
+    return {
+        'benchmark': 'order_fetch',
+        **get_environment_info(account.env),
+        'account': {'id': account.id, 'channel': account.channel_code},
+        'date_from': fields.Datetime.to_string(account.last_orders_sync),
+        'orders': count_orders,
+        'pages': count_pages,
+        'duration': round(duration, 3),
+        'orders_per_second': round(count_orders / duration, 2) if duration else None,
+        'fetch_duration': fetch_duration,
+        'api_duration': round(api_duration, 3),
+        'decode_duration': round(max(fetch_duration - api_duration, 0.0), 3),
+        'contract_duration': phases.get('contract', {}).get('duration', 0.0),
+        'api_calls': len(api_calls),
+        'response_bytes': sum(call[7] for call in api_calls),
+        'memory_kb': {'rss_before': rss_before, 'rss_after': get_rss(), 'peak_rss': get_peak_rss()},
+        'phases': phases,
+    }
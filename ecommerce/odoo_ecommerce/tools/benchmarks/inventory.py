@@ -0,0 +1,143 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+
+from odoo.tools import split_every
+
+from .common import (
+    PhaseProfiler,
+    capture_api_calls,
+    get_environment_info,
+    get_peak_rss,
+    get_rss,
+)
+from .mock_accounts import get_mock_location_identifier, prepare_mock_offer_values
+
+_logger = logging.getLogger(__name__)
+
+INVENTORY_PHASES = {  # {method of `ecommerce.account`: phase}
+    '_prepare_inventory_data': 'quantities',
+    '_update_inventory_to_ecommerce': 'push',
+}
+
+
+def seed_inventory(account, store, batch_size=1000):
+    """Create the offers, locations and stock of the products of a mock store for the given account.
+
+    One storable product and one offer are created per variant of the store, and one internal stock
+    location and one E-commerce location per location of the store, holding the quantities of the
+    store. The offers and locations the account already had are excluded from the inventory sync.
+
+    :param recordset account: The account to seed, as an `ecommerce.account` record, already
+                              connected to the mock platform serving `store`.
+    :param MockStore store: The store generating the catalog, see `tools.mock_platforms.MockStore`.
+    :param int batch_size: The number of records created at once.
+    :return: The created offers.
+    :rtype: recordset of `ecommerce.offer`
+    """
+    account.ensure_one()
+    env = account.env
+    account.update_inventory = True
+    account.ecommerce_offer_ids.sync_stock = False
+    account.ecommerce_location_ids.sync_stock = False
+
+    stock_locations = env['stock.location'].create([{
+        'name': f"Benchmark {location['name']}",
+        'usage': 'internal',
+        'location_id': account.location_id.id,
+        'company_id': account.company_id.id,
+    } for location in store.locations])
+    env['ecommerce.location'].create([{
+        'name': location['name'],
+        'ecommerce_location_identifier': get_mock_location_identifier(account, location, index),
+        'ecommerce_account_id': account.id,
+        'matched_location_id': stock_location.id,
+        'sync_stock': True,
+    } for index, (location, stock_location) in enumerate(zip(store.locations, stock_locations), 1)])
+
+    variants = [(product, variant) for product in store.products for variant in product['variants']]
+    offers = env['ecommerce.offer']
+    for batch in split_every(batch_size, variants):
+        products = env['product.product'].create([{
+            'name': f"{product['name']} {variant['name']}" if variant['name'] != 'Default Title' else product['name'],
+            'default_code': variant['sku'],
+            'is_storable': True,
+            'company_id': account.company_id.id,
+        } for product, variant in batch])
+        offers |= env['ecommerce.offer'].with_context(tracking_disable=True).create([{
+            **prepare_mock_offer_values(account, product, variant),
+            'ecommerce_account_id': account.id,
+            'matched_product_id': odoo_product.id,
+        } for (product, variant), odoo_product in zip(batch, products)])
+        env['stock.quant'].sudo().create([{
+            'product_id': odoo_product.id,
+            'location_id': stock_location.id,
+            'quantity': store.quantities[(variant['id'], location['id'])],
+        } for (_product, variant), odoo_product in zip(batch, products)
+            for location, stock_location in zip(store.locations, stock_locations)])
+        env.flush_all()
+        env.invalidate_all()
+    _logger.info("Benchmark: seeded %s offers on %s locations for account %s.", len(offers), len(stock_locations), account.id)
+    return offers
+
+
+def run_inventory_benchmark(account, server):
+    """Push the inventory of the account to its mock platform with `_update_inventory` and measure it.
+
+    The report splits the duration of the push into:
+
+    - `quantities`: the computation of the quantities to send (`_prepare_inventory_data`);
+    - `api`: the sum of the latencies of the calls sent by the connector, as seen by the transport;
+    - `payload_build`: the rest of `_update_inventory_to_ecommerce`, i.e. mapping the offers and
+      locations to the payloads of the platform and decoding the responses. Connectors sending
+      their calls in parallel get an `api` time above the wall time of the push, hence a
+      `payload_build` time of 0.
+
+    :param recordset account: The account to benchmark, as an `ecommerce.account` record,
+                              connected to `server` and seeded with `seed_inventory`.
+    :param MockPlatformServer server: The running mock platform of the account.
+    :return: The report of the benchmark, JSON serializable.
+    :rtype: dict
+    """
+    account.ensure_one()
+    cr = account.env.cr
+    profiler = PhaseProfiler(cr)
+    count_offers = len(account.ecommerce_offer_ids.filtered('sync_stock'))
+    count_locations = len(account.ecommerce_location_ids.filtered('sync_stock')) if account.support_location else 0
+    count_server_calls = len(server.calls)
+    rss_before = get_rss()
+    start_queries = cr.sql_log_count
+    start = time.perf_counter()
+    with profiler.instrument(account, INVENTORY_PHASES), capture_api_calls(account.env) as api_calls:
+        account._update_inventory()
+    duration = time.perf_counter() - start
+    phases = profiler.get_report()
+    push_duration = phases.get('push', {}).get('duration', 0.0)
+    api_duration = sum(call[5] for call in api_calls) / 1000  # The latencies are in milliseconds.
+    server_calls = server.calls[count_server_calls:]
+    count_items = count_offers * count_locations if account.support_location else count_offers
+    return {
+        'benchmark': 'inventory_push',
+        **get_environment_info(account.env),
+        'account': {
+            'id': account.id,
+            'channel': account.channel_code,
+            'support_location': account.support_location,
+        },
+        'offers': count_offers,
+        'locations': count_locations,
+        'items': count_items,
+        'duration': round(duration, 3),
+        'items_per_second': round(count_items / duration, 2) if duration else None,
+        'quantities_duration': phases.get('quantities', {}).get('duration', 0.0),
+        'quantities_queries': phases.get('quantities', {}).get('queries', 0),
+        'payload_build_duration': round(max(push_duration - api_duration, 0.0), 3),
+        'api_duration': round(api_duration, 3),
+        'api_calls': len(api_calls),
+        'api_batches': sum(1 for call in api_calls if call[2] != 'GET'),
+        'api_errors': sum(1 for _method, _path, status in server_calls if status >= 400),
+        'queries': cr.sql_log_count - start_queries,
+        'memory_kb': {'rss_before': rss_before, 'rss_after': get_rss(), 'peak_rss': get_peak_rss()},
+        'phases': phases,
+    }
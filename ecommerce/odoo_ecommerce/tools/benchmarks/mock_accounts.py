@@ -0,0 +1,119 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Connection of the E-commerce accounts to the local stand-ins of their platform.
+
+The connection values and the identifiers of the offers and locations of each platform are kept
+here, with the mock servers of `odoo_ecommerce.tools.mock_platforms`, rather than on the
+`ecommerce.account` model used in production.
+"""
+
+
+def _get_shopify_connection_values(server):
+    return {
+        'shopify_authorization_type': 'self_access',
+        'shopify_store': 'mock',
+        'shopify_access_token': server.access_token,
+    }
+
+
+def _get_bigcommerce_connection_values(server):
+    return {
+        'bigcommerce_store_hash': server.store_hash,
+        'bigcommerce_access_token': server.access_token,
+    }
+
+
+def _get_woocommerce_connection_values(server):
+    return {
+        'wc_store_url': server.url,
+        'wc_consumer_key': server.consumer_key,
+        'wc_consumer_secret': server.consumer_secret,
+    }
+
+
+def _get_prestashop_connection_values(server):
+    return {
+        'prestashop_url': f'{server.url}/admin_mock',  # The admin folder is replaced by `/api`.
+        'webservice_key': server.webservice_key,
+        'prestashop_store_id': 1,
+    }
+
+
+def _get_magento_connection_values(server):
+    return {
+        'magento_base_url': server.url,
+        'magento_auth_method': 'token',
+        'magento_admin_username': server.admin_username,
+        'magento_admin_password': server.admin_password,
+        'magento_admin_access_token': server.admin_token,
+        'magento_store_view_code': 'default',
+    }
+
+
+CONNECTION_VALUES = {
+    'shopify': _get_shopify_connection_values,
+    'bigcommerce': _get_bigcommerce_connection_values,
+    'woocommerce': _get_woocommerce_connection_values,
+    'prestashop': _get_prestashop_connection_values,
+    'magento': _get_magento_connection_values,
+}
+
+
+def connect_to_mock_platform(account, server):
+    """Point the account to the local stand-in of its platform.
+
+    The connection values are written in the current transaction; roll it back to restore the real
+    ones. The platforms whose API URL is not stored on the account (Shopify, BigCommerce) read it
+    from the `ecommerce_api_url` context key, so that the other accounts of the database keep
+    calling their real platform.
+
+    :param recordset account: The account, as an `ecommerce.account` record.
+    :param MockPlatformServer server: The running server of `odoo_ecommerce.tools.mock_platforms`
+                                      matching the channel of the account.
+    :return: The account, with the context to run the flows with.
+    :rtype: record of `ecommerce.account`
+    """
+    account.ensure_one()
+    get_values = CONNECTION_VALUES.get(account.channel_code)
+    account.write({**(get_values(server) if get_values else {}), 'state': 'connected'})
+    return account.with_context(ecommerce_api_url=server.url)
+
+
+def prepare_mock_offer_values(account, product, variant):
+    """Return the values of the `ecommerce.offer` of a variant of the mock platform.
+
+    :param recordset account: The account, as an `ecommerce.account` record.
+    :param dict product: The product of the `MockStore`.
+    :param dict variant: The variant of the product to create the offer of.
+    :rtype: dict
+    """
+    values = {
+        'name': product['name'],
+        'sku': variant['sku'],
+        'ec_product_identifier': str(variant['id']),
+        'ec_product_template_identifier': str(product['id']),
+    }
+    is_simple_product = variant['name'] == 'Default Title'
+    if account.channel_code == 'shopify':
+        values['shopify_inventory_item_id'] = str(variant['inventory_item_id'])
+    elif account.channel_code == 'woocommerce' and is_simple_product:
+        # Simple products have no variation: the offer is identified by the product.
+        values.update(ec_product_identifier=str(product['id']), ec_product_template_identifier=None)
+    elif account.channel_code == 'prestashop' and is_simple_product:
+        values['ec_product_identifier'] = None  # Products without combination.
+    return values
+
+
+def get_mock_location_identifier(account, location, index):
+    """Return the `ecommerce_location_identifier` of a location of the mock platform.
+
+    :param recordset account: The account, as an `ecommerce.account` record.
+    :param dict location: The location of the `MockStore`.
+    :param int index: The position of the location in the store, starting at 1.
+    :rtype: str
+    """
+    if account.channel_code == 'prestashop':
+        return str(index)  # The locations are the shops of the multistore.
+    if account.channel_code == 'magento':
+        return location['code']  # Magento sources are identified by their code.
+    return str(location['id'])
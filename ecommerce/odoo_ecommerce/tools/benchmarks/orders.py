@@ -0,0 +1,92 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+
+from odoo.tools import split_every
+
+from odoo.addons.odoo_ecommerce.utils.order_contract import ECommerceOrder
+
+from .common import PhaseProfiler, get_environment_info, get_peak_rss, get_percentiles, get_rss
+
+_logger = logging.getLogger(__name__)
+
+ORDER_PHASES = {  # {method of `ecommerce.account`: phase}
+    '_find_or_create_partners_from_data': 'partners',
+    '_prepare_order_lines_values': 'order_lines',
+    '_create_order_from_data': 'order_create',
+    '_find_or_create_moves': 'fulfillments',
+    '_auto_create_invoice_and_payment': 'invoicing',
+}
+
+
+def run_order_ingestion_benchmark(account, orders_data, batch_size=100):
+    """Process the given orders with `_process_order_data` and measure the throughput of the account.
+
+    The orders are processed like `_sync_orders_page` does, each in a savepoint, and the
+    environment is flushed and invalidated after each batch as after the commit of a page. Nothing
+    is committed: the caller decides whether to keep the created records.
+
+    The report lists the time and the SQL queries spent in each phase:
+
+    - `normalize`: the conversion into `ECommerceOrder`;
+    - `partners`, `order_lines`, `order_create`, `fulfillments`, `invoicing`: the steps of
+      `_process_order_data`, see `ORDER_PHASES`;
+    - `process`: the rest of `_process_order_data` (existing order lookup, locking, cancellation);
+    - `flush`: the writes delayed until the end of each batch.
+
+    :param recordset account: The account processing the orders, as an `ecommerce.account` record.
+    :param list orders_data: The orders, in the format of `_fetch_orders_from_ecommerce`.
+    :param int batch_size: The number of orders between two flushes, like a page of the sync.
+    :return: The report of the benchmark, JSON serializable.
+    :rtype: dict
+    """
+    account.ensure_one()
+    cr = account.env.cr
+    profiler = PhaseProfiler(cr)
+    latencies = []
+    count_processed = count_failed = 0
+    rss_before = get_rss()
+    start_queries = cr.sql_log_count
+    start = time.perf_counter()
+    with profiler.instrument(account, ORDER_PHASES):
+        for batch in split_every(batch_size, orders_data):
+            for order_data in batch:
+                order_start = time.perf_counter()
+                try:
+                    with profiler.measure('normalize'):
+                        order_data = ECommerceOrder.from_dict(order_data)
+                    with profiler.measure('process'), cr.savepoint():
+                        order = account._process_order_data(order_data)
+                except Exception:
+                    _logger.exception("Benchmark: failed to process order %s.", order_data.get('id'))
+                    count_failed += 1
+                else:
+                    count_processed += bool(order)
+                latencies.append(time.perf_counter() - order_start)
+            with profiler.measure('flush'):
+                account.env.flush_all()
+            account.env.invalidate_all()
+    duration = time.perf_counter() - start
+    queries = cr.sql_log_count - start_queries
+    count_orders = len(latencies)
+    return {
+        'benchmark': 'order_ingestion',
+        **get_environment_info(account.env),
+        'account': {
+            'id': account.id,
+            'channel': account.channel_code,
+            'fulfilled_by': account.fulfilled_by,
+            'tax_included': account.tax_included,
+        },
+        'orders': count_orders,
+        'processed': count_processed,
+        'failed': count_failed,
+        'duration': round(duration, 3),
+        'orders_per_second': round(count_orders / duration, 2) if duration else None,
+        'queries': queries,
+        'queries_per_order': round(queries / count_orders, 2) if count_orders else None,
+        'order_duration': get_percentiles(latencies),
+        'memory_kb': {'rss_before': rss_before, 'rss_after': get_rss(), 'peak_rss': get_peak_rss()},
+        'phases': profiler.get_report(),
+    }
@@ -0,0 +1,95 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def iter_normalized_orders(store, tax_included=False):
+    """Yield the orders of a mock store in the normalized format of `_fetch_orders_from_ecommerce`.
+
+    The orders cover the cases met in production: several lines with or without discount,
+    shipping lines, fulfillments, registered customers ordering several times and guest customers,
+    several currencies and locations, and canceled and unpaid orders.
+
+    :param MockStore store: The store generating the orders, see `tools.mock_platforms.MockStore`.
+    :param bool tax_included: Whether the prices include the taxes, as per `ecommerce.account.tax_included`.
+    :return: The normalized orders, sorted by update date.
+    :rtype: iterator of dict
+    """
+    for order in store.orders:
+        yield normalize_mock_order(store, order, tax_included=tax_included)
+
+
+def normalize_mock_order(store, order, tax_included=False):
+    """Convert an order of a mock store into the normalized order format.
+
+    :param MockStore store: The store of the order.
+    :param dict order: The order, as generated by `MockStore`.
+    :param bool tax_included: Whether the prices include the taxes.
+    :return: The normalized order.
+    :rtype: dict
+    """
+    customer = store.get_customer(order)
+    address = {
+        'name': f"{customer['first_name']} {customer['last_name']}",
+        'email': customer['email'],
+        'phone': customer['phone'],
+        'street': customer['street'],
+        'street2': customer['street2'],
+        'zip': customer['zip'],
+        'city': customer['city'],
+        'state_code': customer['state_code'],
+        'country_code': customer['country_code'],
+        'customer_id': str(customer['id'] or ''),
+    }
+    shipping = order['shipping']
+    return {
+        'id': str(order['id']),
+        'reference': order['reference'],
+        'create_date': order['created_at'].strftime(DATE_FORMAT),
+        'write_date': order['updated_at'].strftime(DATE_FORMAT),
+        'date_order': order['created_at'].strftime(DATE_FORMAT),
+        'status': 'canceled' if order['canceled'] else 'confirmed',
+        'financial_status': 'PAID' if order['paid'] else None,
+        'currency_code': order['currency'],
+        'location_id': str(order['location_id'] or ''),
+        'customer_id': str(customer['id'] or ''),
+        'billing_address': address,
+        'shipping_address': dict(address),
+        'order_lines': [{
+            'id': str(line['id']),
+            'description': f"{line['name']} - {line['variant_name']}" if line['variant_name'] else line['name'],
+            'product_data': {
+                'name': line['name'],
+                'sku': line['sku'],
+                'ec_product_identifier': str(line['variant_id']),
+                'ec_product_template_identifier': str(line['product_id']),
+            },
+            'qty_ordered': line['quantity'],
+            'price_unit': line['price'],
+            'price_subtotal': round(
+                line['price'] * line['quantity'] + (line['tax'] if tax_included else 0), 2,
+            ),
+            'tax_amount': line['tax'],
+            'discount_amount': line['discount'],
+            'discount_tax': 0.0,
+        } for line in order['lines']],
+        'shipping_lines': [{
+            'id': str(shipping['id']),
+            'description': shipping['title'],
+            'shipping_code': shipping['code'],
+            'price_unit': round(shipping['price'] + (shipping['tax'] if tax_included else 0), 2),
+            'tax_amount': shipping['tax'],
+        }],
+        'fulfillments': [{
+            'ecommerce_picking_identifier': str(fulfillment['id']),
+            'status': 'confirmed',
+            'line_items': [{
+                'ecommerce_line_identifier': str(line['line_id']),
+                'ecommerce_move_identifier': str(line['id']),
+                'quantity': line['quantity'],
+            } for line in fulfillment['lines']],
+            'carrier_id': fulfillment['tracking_company'],
+            'tracking_number': fulfillment['tracking_number'],
+            'location_id': str(fulfillment['location_id'] or ''),
+        } for fulfillment in order['fulfillments']],
+    }
@@ -0,0 +1,188 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+
+from odoo.addons.odoo_ecommerce.tools.mock_platforms import MOCK_SERVERS, MockStore
+
+from .common import disable_run_logging
+from .inventory import run_inventory_benchmark, seed_inventory
+from .mock_accounts import connect_to_mock_platform
+from .orders import run_order_ingestion_benchmark
+from .payloads import iter_normalized_orders
+
+_logger = logging.getLogger(__name__)
+
+# The number of SQL queries each flow spends per processed unit, beyond the queries it spends once
+# per run, as reported in `queries_per_unit` by the guard on the synthetic data. Set them again
+# from the report when a flow gets cheaper, so that it cannot silently regress.
+# The margin is the number of queries per unit allowed above it: enough for the noise of the caches,
+# not for a new query per order line (the synthetic orders have 2 lines on average) or per offer.
+QUERY_BUDGETS = {  # {flow: (unit, queries per unit, margin)}
+    'orders': ('order', 45, 1.5),
+    'offers': ('offer', 6, 0.5),
+    'pickings': ('picking', 12, 1.5),
+    'inventory': ('inventory row', 0.1, 0.4),
+}
+# The share by which the queries per unit may vary between two data sizes before the flow is
+# considered to scale with the data size, on top of one query of noise.
+GROWTH_TOLERANCE = 0.25
+
+
+def check_query_budgets(account, flows=None, size=10, scales=(1, 2, 4), seed=0):
+    """Check the SQL queries spent per unit by the sync flows of an account, see `check_query_budget`.
+
+    :param recordset account: The account to check, as an `ecommerce.account` record.
+    :param list flows: The flows to check, among the keys of `QUERY_BUDGETS`. All if not given.
+    :return: The result of each flow.
+    :rtype: list
+    """
+    return [
+        check_query_budget(account, flow, size=size, scales=scales, seed=seed)
+        for flow in flows or QUERY_BUDGETS
+    ]
+
+
+def check_query_budget(account, flow, size=10, scales=(1, 2, 4), seed=0):
+    """Run a sync flow of an account on increasing data sizes and check the SQL queries it spends.
+
+    The flow is run once per scale on `size * scale` units of synthetic data, after a first run
+    warming up the caches, and the transaction is rolled back after each run. The queries spent
+    per unit are measured between two consecutive runs, which leaves out the queries spent once
+    per run. The flow violates its budget when:
+
+    - it spends more queries per unit than allowed by `QUERY_BUDGETS`, e.g. after adding a query
+      per order line;
+    - it spends more queries per unit on larger data sizes, e.g. after reading all the offers of
+      the account for each synchronized offer.
+
+    :param recordset account: The account to check, as an `ecommerce.account` record. The flows
+                              other than `orders` run against the mock platform of its channel.
+    :param str flow: The flow to check, as a key of `QUERY_BUDGETS`.
+    :param int size: The number of units of the smallest run.
+    :param tuple scales: The increasing multipliers of `size` to run the flow with.
+    :param int seed: The seed of the synthetic data.
+    :return: The result of the check, JSON serializable, with the violations of the budget.
+    :rtype: dict
+    """
+    account.ensure_one()
+    unit, budget, margin = QUERY_BUDGETS[flow]
+    budget += margin
+    result = {'flow': flow, 'account': account.id, 'unit': unit, 'budget': budget}
+    if flow != 'orders' and account.channel_code not in MOCK_SERVERS:
+        return {**result, 'skipped': f"no mock platform for the channel {account.channel_code}"}
+    if flow == 'pickings' and not account.support_shipping:
+        return {**result, 'skipped': f"the channel {account.channel_code} does not support shipping"}
+
+    env = account.env
+    measure = FLOW_MEASURES[flow]
+    runs = []
+    for scale in (scales[0], *scales):
+        try:
+            with disable_run_logging(env):
+                queries, units = measure(account, size * scale, seed)
+        finally:
+            env.cr.rollback()
+            env.invalidate_all()
+        runs.append({'units': units, 'queries': queries})
+    runs = runs[1:]  # Drop the warm-up run.
+
+    violations = []
+    queries_per_unit = []
+    for previous, run in zip(runs, runs[1:]):
+        if run['units'] <= previous['units']:
+            violations.append(f"the run on {run['units']} {unit}s did not process more than the previous one")
+            continue
+        marginal = (run['queries'] - previous['queries']) / (run['units'] - previous['units'])
+        queries_per_unit.append(round(marginal, 2))
+        if marginal > budget:
+            violations.append(
+                f"{marginal:.1f} queries per {unit} between {previous['units']} and {run['units']} "
+                f"{unit}s, above the budget of {budget}"
+            )
+    for marginal in queries_per_unit[1:]:
+        if marginal > queries_per_unit[0] * (1 + GROWTH_TOLERANCE) + 1:
+            violations.append(
+                f"the queries per {unit} grow with the data size: {queries_per_unit[0]} then {marginal}"
+            )
+    if violations:
+        _logger.warning("Query budget of the %s flow exceeded for account %s: %s", flow, account.id, violations)
+    return {**result, 'runs': runs, 'queries_per_unit': queries_per_unit, 'violations': violations}
+
+
+# === MEASURES === #
+# Each measure runs a flow on about `size` units and returns the queries it spent and the number
+# of processed units. The caller rolls the created records back.
+
+def _measure_orders(account, size, seed):
+    store = MockStore(products=size, variants=2, locations=1, orders=size, customers=size // 2, seed=seed)
+    orders_data = list(iter_normalized_orders(store, tax_included=account.tax_included))
+    report = run_order_ingestion_benchmark(account, orders_data, batch_size=size)
+    return report['queries'], report['processed']
+
+
+def _measure_offers(account, size, seed):
+    env = account.env
+    store = MockStore(products=size, variants=1, locations=1, orders=0, customers=0, seed=seed)
+    with MOCK_SERVERS[account.channel_code](store=store, seed=seed) as server:
+        account = connect_to_mock_platform(account, server)
+        count_offers = len(account.ecommerce_offer_ids)
+        start_queries = env.cr.sql_log_count
+        account._sync_products(auto_commit=False)
+        queries = env.cr.sql_log_count - start_queries
+    env.invalidate_all()
+    return queries, len(account.ecommerce_offer_ids) - count_offers
+
+
+def _measure_pickings(account, size, seed):
+    env = account.env
+    store = MockStore(products=size, variants=1, locations=1, orders=size, customers=size // 2, seed=seed)
+    with MOCK_SERVERS[account.channel_code](store=store, seed=seed) as server:
+        account = connect_to_mock_platform(account, server)
+        pickings = _seed_pickings(account, store)
+        start_queries = env.cr.sql_log_count
+        account._update_pickings_to_ecommerce(pickings)
+        queries = env.cr.sql_log_count - start_queries
+    return queries, len(pickings)
+
+
+def _seed_pickings(account, store):
+    """Create the orders of the store still to ship and validate their delivery orders.
+
+    :return: The validated delivery orders, to send to the platform.
+    :rtype: recordset of `stock.picking`
+    """
+    env = account.env
+    account.fulfilled_by = 'odoo'
+    orders = env['sale.order']
+    for order_data in iter_normalized_orders(store, tax_included=account.tax_included):
+        if order_data['status'] == 'confirmed' and not order_data['fulfillments']:
+            orders |= account._process_order_data(order_data)
+    pickings = orders.picking_ids.filtered(
+        lambda picking: picking.picking_type_code == 'outgoing' and picking.state not in ('done', 'cancel')
+    )
+    for move in pickings.move_ids:
+        move.quantity = move.product_uom_qty
+    pickings.move_ids.picked = True
+    for picking in pickings:
+        picking.carrier_tracking_ref = f'1Z{picking.id:010d}'
+    pickings._action_done()
+    env.flush_all()
+    env.invalidate_all()
+    return pickings
+
+
+def _measure_inventory(account, size, seed):
+    store = MockStore(products=size, variants=1, locations=2, orders=0, customers=0, seed=seed)
+    with MOCK_SERVERS[account.channel_code](store=store, seed=seed) as server:
+        account = connect_to_mock_platform(account, server)
+        seed_inventory(account, store)
+        report = run_inventory_benchmark(account, server)
+    return report['queries'], report['items']
+
+
+FLOW_MEASURES = {
+    'orders': _measure_orders,
+    'offers': _measure_offers,
+    'pickings': _measure_pickings,
+    'inventory': _measure_inventory,
+}
@@ -0,0 +1,22 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Local stand-ins for the APIs of the E-commerce platforms, to load-test the sync flows offline.
+
+The servers only depend on the standard library, so they can also be run outside of Odoo with
+`python -m odoo.addons.odoo_ecommerce.tools.mock_platforms <channel>`.
+"""
+
+from .bigcommerce import BigCommerceMockServer
+from .data import MockStore
+from .magento import MagentoMockServer
+from .prestashop import PrestaShopMockServer
+from .server import MockPlatformServer, MockRequest
+from .shopify import ShopifyMockServer
+from .woocommerce import WooCommerceMockServer
+
+MOCK_SERVERS = {
+    server_class.channel_code: server_class
+    for server_class in (
+        BigCommerceMockServer, MagentoMockServer, PrestaShopMockServer, ShopifyMockServer, WooCommerceMockServer,
+    )
+}
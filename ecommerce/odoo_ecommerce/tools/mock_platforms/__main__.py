@@ -0,0 +1,56 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Run a mock platform server until interrupted, e.g.::
+
+    python -m odoo.addons.odoo_ecommerce.tools.mock_platforms shopify --port 8070 --orders 5000 --latency 0.2
+"""
+
+import argparse
+import logging
+import time
+
+from . import MOCK_SERVERS, MockStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the API of an E-commerce platform.")
+    parser.add_argument('channel', choices=sorted(MOCK_SERVERS))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help="0 to pick a free port")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--products', type=int, default=20)
+    parser.add_argument('--variants', type=int, default=3, help="maximum number of variants per product")
+    parser.add_argument('--locations', type=int, default=2)
+    parser.add_argument('--orders', type=int, default=50)
+    parser.add_argument('--lines', type=int, default=3, help="maximum number of lines per order")
+    parser.add_argument('--customers', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds waited before each response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="maximum random seconds added to the latency")
+    parser.add_argument('--max-page-size', type=int, help="largest page returned by the server")
+    parser.add_argument('--rate-limit', type=float, default=0, help="requests per second, 0 for unlimited")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of the requests that fail")
+    parser.add_argument('--error-status', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    store = MockStore(
+        products=args.products, variants=args.variants, locations=args.locations, orders=args.orders,
+        lines=args.lines, customers=args.customers, seed=args.seed,
+    )
+    options = {'max_page_size': args.max_page_size} if args.max_page_size else {}
+    server = MOCK_SERVERS[args.channel](
+        store=store, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        rate_limit=args.rate_limit, error_rate=args.error_rate, error_status=args.error_status, seed=args.seed,
+        **options,
+    )
+    with server:
+        print(f"{args.channel} mock server listening on {server.url}")  # noqa: T201
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
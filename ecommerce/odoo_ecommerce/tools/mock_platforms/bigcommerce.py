@@ -0,0 +1,288 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import math
+import uuid
+from datetime import datetime
+from email.utils import format_datetime
+
+from .server import MockPlatformServer
+
+STATUSES = {  # {status_id: status}, as in the `status` of the v2 orders.
+    1: 'Pending',
+    2: 'Shipped',
+    5: 'Cancelled',
+    7: 'Awaiting Payment',
+    11: 'Awaiting Fulfillment',
+}
+
+
+def _format_rfc2822(date):
+    return format_datetime(date).replace('-0000', '+0000')
+
+
+def _parse_iso(date):
+    return date and datetime.strptime(date[:19], '%Y-%m-%dT%H:%M:%S')
+
+
+class BigCommerceMockServer(MockPlatformServer):
+    """Stand-in for the BigCommerce REST API (`/stores/<store_hash>/v2|v3/...`).
+
+    Like BigCommerce, the v2 endpoints (store, orders, shipments) return plain lists paginated
+    with `page` and `limit`, and an empty 204 response past the last page; the v3 endpoints
+    (catalog, inventory) wrap the records in `data` with the pagination in `meta`.
+
+    Point the account to the server with `tools.benchmarks.connect_to_mock_platform`.
+
+    :param str store_hash: The expected store hash.
+    :param str access_token: The expected `X-Auth-Token` header.
+    """
+
+    channel_code = 'bigcommerce'
+
+    def __init__(self, *args, store_hash='mockstore', access_token='mock-token', **kwargs):
+        self.store_hash = store_hash
+        self.access_token = access_token
+        self.status_by_order = {}  # Statuses set with `PUT orders/<id>`.
+        super().__init__(*args, **kwargs)
+
+    def _get_routes(self):
+        prefix = r'/stores/\w+'
+        return [
+            ('GET', prefix + r'/v2/store', self._get_store),
+            ('GET', prefix + r'/v3/catalog/products', self._get_products),
+            ('GET', prefix + r'/v3/inventory/locations', self._get_locations),
+            ('PUT', prefix + r'/v3/inventory/adjustments/absolute', self._set_quantities),
+            ('GET', prefix + r'/v2/orders', self._get_orders),
+            ('GET', prefix + r'/v2/orders/(?P<order_id>\d+)', self._get_order),
+            ('PUT', prefix + r'/v2/orders/(?P<order_id>\d+)', self._update_order),
+            ('GET', prefix + r'/v2/orders/(?P<order_id>\d+)/shipments', self._get_shipments),
+            ('POST', prefix + r'/v2/orders/(?P<order_id>\d+)/shipments', self._create_shipment),
+        ]
+
+    def _check_auth(self, request):
+        return (
+            request.path.startswith(f'/stores/{self.store_hash}/')
+            and request.headers.get('X-Auth-Token') == self.access_token
+        )
+
+    def _get_error_response(self, request, status, message):
+        return status, {'status': status, 'title': message, 'type': 'https://developer.bigcommerce.com/api-docs/getting-started/api-status-codes'}
+
+    def _get_rate_limited_response(self, request):
+        return 429, {'status': 429, 'title': "Too many requests"}, {'X-Rate-Limit-Time-Reset-Ms': '1000'}
+
+    # === Helpers === #
+
+    def _paginate(self, request, records):
+        limit = self._get_page_size(request.query.get('limit'))
+        page = int(request.query.get('page') or 1)
+        page_records = records[(page - 1) * limit:page * limit]
+        return page_records, {
+            'total': len(records),
+            'count': len(page_records),
+            'per_page': limit,
+            'current_page': page,
+            'total_pages': max(1, math.ceil(len(records) / limit)),
+        }
+
+    def _get_path_order(self, request):
+        return self.store.get_order(request.match.group('order_id'))
+
+    # === Handlers === #
+
+    def _get_store(self, request):
+        return 200, {'id': self.store_hash, 'name': "Mock Store", 'domain': 'mock.example.com', 'currency': 'USD'}
+
+    def _get_products(self, request):
+        date_from = _parse_iso(request.query.get('date_modified:min'))
+        products = list(self.store.iter_updated(self.store.products, date_from))
+        page, pagination = self._paginate(request, products)
+        include_variants = 'variants' in request.query.get('include', '')
+        return 200, {
+            'data': [self._render_product(product, include_variants) for product in page],
+            'meta': {'pagination': pagination},
+        }
+
+    def _get_locations(self, request):
+        page, pagination = self._paginate(request, self.store.locations)
+        return 200, {
+            'data': [{
+                'id': location['id'],
+                'code': location['code'],
+                'label': location['name'],
+                'enabled': True,
+            } for location in page],
+            'meta': {'pagination': pagination},
+        }
+
+    def _set_quantities(self, request):
+        for item in request.json()['items']:
+            variant_id = item.get('variant_id')
+            if not variant_id:
+                product = self.store.get_product(item['product_id'])
+                if not product:
+                    return self._get_error_response(request, 422, f"Product {item['product_id']} not found")
+                variant_id = product['variants'][0]['id']
+            elif not self.store.get_variant(variant_id)[1]:
+                return self._get_error_response(request, 422, f"Variant {variant_id} not found")
+            self.store.set_quantity(variant_id, item['location_id'], item['quantity'])
+        return 200, {'transaction_id': str(uuid.UUID(int=self._random.getrandbits(128)))}
+
+    def _get_orders(self, request):
+        date_from = _parse_iso(request.query.get('min_date_modified'))
+        orders = list(self.store.iter_updated(self.store.orders, date_from))
+        page, _pagination = self._paginate(request, orders)
+        if not page:
+            return 204, None
+        include_consignments = 'consignments' in request.query.get('include', '')
+        return 200, [self._render_order(order, include_consignments) for order in page]
+
+    def _get_order(self, request):
+        order = self._get_path_order(request)
+        if not order:
+            return self._get_error_response(request, 404, "The requested resource was not found.")
+        return 200, self._render_order(order, 'consignments' in request.query.get('include', ''))
+
+    def _update_order(self, request):
+        order = self._get_path_order(request)
+        if not order:
+            return self._get_error_response(request, 404, "The requested resource was not found.")
+        status_id = request.json().get('status_id')
+        if status_id:
+            self.status_by_order[order['id']] = int(status_id)
+        return 200, self._render_order(order, False)
+
+    def _get_shipments(self, request):
+        order = self._get_path_order(request)
+        if not order:
+            return self._get_error_response(request, 404, "The requested resource was not found.")
+        page, _pagination = self._paginate(request, order['fulfillments'])
+        if not page:
+            return 204, None
+        return 200, [self._render_shipment(order, fulfillment) for fulfillment in page]
+
+    def _create_shipment(self, request):
+        order = self._get_path_order(request)
+        if not order:
+            return self._get_error_response(request, 404, "The requested resource was not found.")
+        values = request.json()
+        if values.get('order_address_id') != order['shipping']['id']:
+            return self._get_error_response(request, 400, "The field 'order_address_id' is invalid.")
+        quantities = {item['order_product_id']: item['quantity'] for item in values.get('items', [])}
+        fulfillment = self.store.add_fulfillment(
+            order, quantities, values.get('shipping_provider') or '', values.get('tracking_number') or '',
+        )
+        return 201, self._render_shipment(order, fulfillment)
+
+    # === Rendering === #
+
+    def _render_product(self, product, include_variants):
+        values = {
+            'id': product['id'],
+            'name': product['name'],
+            'sku': product['sku'],
+            'is_visible': True,
+            'date_modified': product['updated_at'].strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+        }
+        if include_variants:
+            values['variants'] = [{
+                'id': variant['id'],
+                'product_id': product['id'],
+                'sku': variant['sku'],
+                'option_values': [] if variant['name'] == 'Default Title' else [
+                    {'label': variant['name'], 'option_display_name': "Option"},
+                ],
+            } for variant in product['variants']]
+        return values
+
+    def _get_status_id(self, order):
+        if order['id'] in self.status_by_order:
+            return self.status_by_order[order['id']]
+        if order['canceled']:
+            return 5
+        if order['fulfillments']:
+            return 2
+        return 11 if order['paid'] else 7
+
+    def _render_order(self, order, include_consignments):
+        customer = self.store.get_customer(order)
+        status_id = self._get_status_id(order)
+        shipping = order['shipping']
+        total = self.store.get_order_total(order)
+        values = {
+            'id': order['id'],
+            'status_id': status_id,
+            'status': STATUSES[status_id],
+            'is_deleted': False,
+            'customer_id': customer['id'] or 0,
+            'date_created': _format_rfc2822(order['created_at']),
+            'date_modified': _format_rfc2822(order['updated_at']),
+            'currency_code': order['currency'],
+            'base_shipping_cost': f"{shipping['price']:.4f}",
+            'shipping_cost_tax': f"{shipping['tax']:.4f}",
+            'payment_status': 'captured' if order['paid'] else 'pending',
+            'total_inc_tax': f'{total:.4f}',
+            'refunded_amount': '0.0000',
+            'billing_address': {
+                'first_name': customer['first_name'],
+                'last_name': customer['last_name'],
+                'company': '',
+                'street_1': customer['street'],
+                'street_2': customer['street2'],
+                'city': customer['city'],
+                'state': customer['state_code'],
+                'zip': customer['zip'],
+                'country_iso2': customer['country_code'],
+                'phone': customer['phone'],
+                'email': customer['email'],
+            },
+        }
+        if include_consignments:
+            shipped = {}
+            for fulfillment in order['fulfillments']:
+                for line in fulfillment['lines']:
+                    shipped[line['line_id']] = shipped.get(line['line_id'], 0) + line['quantity']
+            values['consignments'] = [{'shipping': [{
+                **values['billing_address'],
+                'id': shipping['id'],
+                'shipping_method': shipping['title'],
+                'base_cost': shipping['price'],
+                'cost_ex_tax': shipping['price'],
+                'cost_inc_tax': round(shipping['price'] + shipping['tax'], 2),
+                'cost_tax': shipping['tax'],
+                'handling_cost_ex_tax': 0,
+                'handling_cost_inc_tax': 0,
+                'handling_cost_tax': 0,
+                'line_items': [{
+                    'id': line['id'],
+                    'name': line['name'],
+                    'sku': line['sku'],
+                    'product_id': line['product_id'],
+                    'variant_id': line['variant_id'],
+                    'quantity': line['quantity'],
+                    'quantity_shipped': shipped.get(line['id'], 0),
+                    'quantity_refunded': 0,
+                    'price_ex_tax': line['price'],
+                    'price_inc_tax': round(line['price'] + line['tax'] / line['quantity'], 2),
+                    'total_ex_tax': round(line['price'] * line['quantity'], 2),
+                    'total_inc_tax': round(line['price'] * line['quantity'] + line['tax'], 2),
+                    'total_tax': line['tax'],
+                    'applied_discounts': [{'amount': line['discount']}] if line['discount'] else [],
+                } for line in order['lines']],
+            }]}]
+        return values
+
+    def _render_shipment(self, order, fulfillment):
+        lines = {line['id']: line for line in order['lines']}
+        return {
+            'id': fulfillment['id'],
+            'order_id': order['id'],
+            'order_address_id': order['shipping']['id'],
+            'tracking_number': fulfillment['tracking_number'],
+            'shipping_provider': fulfillment['tracking_company'],
+            'items': [{
+                'order_product_id': line['line_id'],
+                'product_id': lines[line['line_id']]['product_id'] if line['line_id'] in lines else 0,
+                'quantity': line['quantity'],
+            } for line in fulfillment['lines']],
+        }
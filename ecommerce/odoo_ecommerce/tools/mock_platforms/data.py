@@ -0,0 +1,254 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import itertools
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+FIRST_NAMES = ('Alice', 'Bruno', 'Chloé', 'David', 'Emma', 'Farid', 'Gina', 'Hugo', 'Ines', 'Jonas')
+LAST_NAMES = ('Martin', 'Dubois', 'Smith', 'Garcia', 'Müller', 'Rossi', 'Nguyen', 'Kowalski')
+CITIES = (
+    ('Brussels', '1000', 'BE', ''),
+    ('New York', '10001', 'US', 'NY'),
+    ('San Francisco', '94103', 'US', 'CA'),
+    ('Lyon', '69001', 'FR', ''),
+    ('Toronto', 'M5H 2N2', 'CA', 'ON'),
+)
+OPTION_VALUES = ('S', 'M', 'L', 'XL', 'Red', 'Blue', 'Green', 'Black')
+SHIPPING_METHODS = (('flatrate', 'Flat Rate'), ('freeshipping', 'Free Shipping'), ('ups', 'UPS Ground'))
+
+
+class MockStore:
+    """Synthetic store shared by the mock platform servers, in a platform independent shape.
+
+    The data is generated deterministically from `seed`; the platform servers render it in the
+    format of their API. The records are plain dicts:
+
+    - products: `{id, name, sku, updated_at, variants: [{id, name, sku, inventory_item_id}]}`,
+      a product without options having a single variant named `Default Title`;
+    - locations: `{id, code, name}`;
+    - customers: `{id, first_name, last_name, email, phone, street, street2, zip, city, state_code, country_code}`;
+    - orders: `{id, reference, created_at, updated_at, currency, customer_id, canceled, paid,
+      location_id, lines, shipping, fulfillments}`, ordered by `updated_at`. The lines are
+      `{id, product_id, variant_id, sku, name, variant_name, quantity, price, tax, discount}` and the
+      fulfillments `{id, location_id, tracking_company, tracking_number, lines: [{id, line_id, quantity}]}`;
+    - quantities: `{(variant_id, location_id): quantity}`.
+
+    The ids are unique across all the records, so that a wrong lookup never succeeds by chance.
+
+    :param int products: The number of products.
+    :param int variants: The maximum number of variants of a product (at least 1).
+    :param int locations: The number of locations.
+    :param int orders: The number of orders.
+    :param int lines: The maximum number of lines of an order.
+    :param int customers: The number of registered customers; a tenth of the orders are guest orders.
+    :param tuple currencies: The currencies of the orders.
+    :param datetime start_date: The creation date of the first order; the orders span 30 days.
+    :param int seed: The seed of the random generator.
+    """
+
+    def __init__(
+        self, products=20, variants=3, locations=2, orders=50, lines=3, customers=10,
+        currencies=('USD', 'EUR'), start_date=datetime(2026, 1, 1), seed=0,
+    ):
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1001)
+        self.lock = threading.RLock()  # For the write endpoints, the servers being multi-threaded.
+        self.start_date = start_date
+        self.locations = [
+            {'id': self.next_id(), 'code': f'loc{index}', 'name': f"Warehouse {index}"}
+            for index in range(1, locations + 1)
+        ]
+        self.products = [self._generate_product(index, variants) for index in range(1, products + 1)]
+        self.customers = [self._generate_customer() for _index in range(customers)]
+        self.orders = [
+            self._generate_order(index, lines, currencies, orders) for index in range(1, orders + 1)
+        ]
+        self.quantities = {
+            (variant['id'], location['id']): self._random.randint(0, 100)
+            for product in self.products
+            for variant in product['variants']
+            for location in self.locations
+        }
+        self.orders.sort(key=lambda order: (order['updated_at'], order['id']))
+        self._orders_by_id = {str(order['id']): order for order in self.orders}
+        self._products_by_id = {str(product['id']): product for product in self.products}
+        self._customers_by_id = {customer['id']: customer for customer in self.customers}
+        self._variants_by_id = {
+            str(variant['id']): (product, variant) for product in self.products for variant in product['variants']
+        }
+        self._variants_by_sku = {variant['sku']: variant_id for variant_id, (_product, variant) in self._variants_by_id.items()}
+
+    def next_id(self):
+        return next(self._ids)
+
+    # === Generation === #
+
+    def _generate_product(self, index, max_variants):
+        count_variants = self._random.randint(1, max(1, max_variants))
+        product = {
+            'id': self.next_id(),
+            'name': f"Product {index}",
+            'sku': f'SKU-{index:05d}',
+            'updated_at': self.start_date - timedelta(days=self._random.randint(1, 90)),
+        }
+        if count_variants == 1:
+            product['variants'] = [{
+                'id': self.next_id(),
+                'name': 'Default Title',
+                'sku': product['sku'],
+                'inventory_item_id': self.next_id(),
+            }]
+        else:
+            product['variants'] = [{
+                'id': self.next_id(),
+                'name': value,
+                'sku': f"{product['sku']}-{value.upper()}",
+                'inventory_item_id': self.next_id(),
+            } for value in self._random.sample(OPTION_VALUES, count_variants)]
+        return product
+
+    def _generate_customer(self):
+        first_name = self._random.choice(FIRST_NAMES)
+        last_name = self._random.choice(LAST_NAMES)
+        city, zip_code, country_code, state_code = self._random.choice(CITIES)
+        customer_id = self.next_id()
+        return {
+            'id': customer_id,
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': f'{first_name.lower()}.{customer_id}@example.com',
+            'phone': f'+1555{customer_id:07d}',
+            'street': f"{self._random.randint(1, 999)} Main Street",
+            'street2': self._random.choice(('', '', 'Suite 2')),
+            'zip': zip_code,
+            'city': city,
+            'state_code': state_code,
+            'country_code': country_code,
+        }
+
+    def get_guest_customer(self, order_id):
+        """Return the address of a guest order, which has no customer record."""
+        return {
+            'id': None,
+            'first_name': "Guest",
+            'last_name': str(order_id),
+            'email': f'guest.{order_id}@example.com',
+            'phone': '',
+            'street': "1 Station Road",
+            'street2': '',
+            'zip': '1000',
+            'city': 'Brussels',
+            'state_code': '',
+            'country_code': 'BE',
+        }
+
+    def _generate_order(self, index, max_lines, currencies, count_orders):
+        order_id = self.next_id()
+        created_at = self.start_date + timedelta(minutes=index * 30 * 24 * 60 // max(count_orders, 1))
+        lines = []
+        for product in self._random.sample(self.products, min(len(self.products), self._random.randint(1, max_lines))):
+            variant = self._random.choice(product['variants'])
+            price = round(self._random.uniform(5, 200), 2)
+            quantity = self._random.randint(1, 5)
+            lines.append({
+                'id': self.next_id(),
+                'product_id': product['id'],
+                'variant_id': variant['id'],
+                'sku': variant['sku'],
+                'name': product['name'],
+                'variant_name': '' if variant['name'] == 'Default Title' else variant['name'],
+                'quantity': quantity,
+                'price': price,
+                'tax': round(price * quantity * 0.21, 2),
+                'discount': round(price * quantity * 0.1, 2) if self._random.random() < 0.2 else 0.0,
+            })
+        code, title = self._random.choice(SHIPPING_METHODS)
+        shipping_price = 0.0 if code == 'freeshipping' else round(self._random.uniform(3, 15), 2)
+        order = {
+            'id': order_id,
+            'reference': f'#{1000 + index}',
+            'created_at': created_at,
+            'updated_at': created_at + timedelta(minutes=self._random.randint(0, 600)),
+            'currency': self._random.choice(currencies),
+            'customer_id': self._random.choice(self.customers)['id'] if self.customers and self._random.random() > 0.1 else None,
+            'canceled': self._random.random() < 0.05,
+            'paid': self._random.random() < 0.8,
+            'location_id': self._random.choice(self.locations)['id'] if self.locations else None,
+            'lines': lines,
+            'shipping': {
+                'id': self.next_id(),
+                'code': code,
+                'title': title,
+                'price': shipping_price,
+                'tax': round(shipping_price * 0.21, 2),
+            },
+            'fulfillments': [],
+        }
+        if order['paid'] and not order['canceled'] and self._random.random() < 0.3:
+            self._add_fulfillment(order, {line['id']: line['quantity'] for line in lines}, 'UPS', f'1Z{order_id:010d}')
+        return order
+
+    # === Lookups and writes === #
+
+    def iter_updated(self, records, date_from=None, key='updated_at'):
+        """Yield the records updated strictly after `date_from` (a naive UTC datetime), if given."""
+        for record in records:
+            if not date_from or record[key] > date_from:
+                yield record
+
+    def get_order(self, order_id):
+        return self._orders_by_id.get(str(order_id))
+
+    def get_product(self, product_id):
+        return self._products_by_id.get(str(product_id))
+
+    def get_customer(self, order):
+        return self._customers_by_id.get(order['customer_id']) or self.get_guest_customer(order['id'])
+
+    def get_variant(self, variant_id):
+        """Return the product and the variant of the given variant id, or `(None, None)`."""
+        return self._variants_by_id.get(str(variant_id), (None, None))
+
+    def get_variant_by_sku(self, sku):
+        """Same as `get_variant`, for the given SKU."""
+        return self.get_variant(self._variants_by_sku.get(sku))
+
+    def get_order_total(self, order):
+        return round(
+            sum(line['price'] * line['quantity'] + line['tax'] - line['discount'] for line in order['lines'])
+            + order['shipping']['price'] + order['shipping']['tax'],
+            2,
+        )
+
+    def _add_fulfillment(self, order, quantities_by_line, tracking_company='', tracking_number=''):
+        fulfillment = {
+            'id': self.next_id(),
+            'location_id': order['location_id'],
+            'tracking_company': tracking_company,
+            'tracking_number': tracking_number,
+            'lines': [
+                {'id': self.next_id(), 'line_id': line_id, 'quantity': quantity}
+                for line_id, quantity in quantities_by_line.items() if quantity
+            ],
+        }
+        order['fulfillments'].append(fulfillment)
+        return fulfillment
+
+    def add_fulfillment(self, order, quantities_by_line, tracking_company='', tracking_number='', updated_at=None):
+        """Ship the given quantities of the order lines and mark the order as updated.
+
+        :param dict order: The order to ship.
+        :param dict quantities_by_line: The shipped quantity of each line id.
+        :return: The created fulfillment.
+        :rtype: dict
+        """
+        with self.lock:
+            fulfillment = self._add_fulfillment(order, quantities_by_line, tracking_company, tracking_number)
+            order['updated_at'] = updated_at or datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+            self.orders.sort(key=lambda order: (order['updated_at'], order['id']))
+        return fulfillment
+
+    def set_quantity(self, variant_id, location_id, quantity):
+        with self.lock:
+            self.quantities[(int(variant_id), int(location_id))] = quantity
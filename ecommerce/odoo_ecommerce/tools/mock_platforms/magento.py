@@ -0,0 +1,360 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import base64
+import hashlib
+import hmac
+import re
+from urllib.parse import quote, unquote
+
+from .server import MockPlatformServer
+
+API_PATH = '/rest/V1'
+FILTER_RE = re.compile(r'searchCriteria\[filterGroups\]\[(\d+)\]\[filters\]\[(\d+)\]\[(field|conditionType|value)\]')
+OAUTH_PARAM_RE = re.compile(r'(\w+)="([^"]*)"')
+STORE_VIEW = {'id': 1, 'code': 'default', 'name': "Default Store View", 'website_id': 1, 'store_group_id': 1}
+
+
+def _percent_encode(value):
+    return quote(str(value), safe='~')
+
+
+def _format_date(date):
+    return date.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _match_condition(record_value, condition, value):
+    """Return whether the value of a record field satisfies a searchCriteria filter."""
+    if condition == 'in':
+        return str(record_value) in value.split(',')
+    if condition == 'nin':
+        return str(record_value) not in value.split(',')
+    if isinstance(record_value, bool):
+        record_value = int(record_value)
+    if isinstance(record_value, (int, float)):
+        value = float(value)
+    else:
+        record_value = '' if record_value is None else str(record_value)
+    if condition == 'eq':
+        return record_value == value
+    if condition == 'neq':
+        return record_value != value
+    if condition in ('from', 'gteq'):
+        return record_value >= value
+    if condition in ('to', 'lteq'):
+        return record_value <= value
+    if condition == 'gt':
+        return record_value > value
+    if condition == 'lt':
+        return record_value < value
+    raise ValueError(f"Unsupported condition type {condition}")
+
+
+class MagentoMockServer(MockPlatformServer):
+    """Stand-in for the Magento 2 REST API (`/rest/V1/...`).
+
+    The requests are authenticated either with the admin token (`Authorization: Bearer`), which
+    is issued by `POST /rest/V1/integration/admin/token`, or with an OAuth 1.0a HMAC-SHA256
+    signature, which is verified like Magento does: over the URL without its query string and the
+    query parameters. The `searchCriteria` filters (`eq`, `neq`, `in`, `nin`, `from`, `to`, `gt`,
+    `lt`, `gteq`, `lteq`) and pagination are applied; like Magento, a page past the end returns the
+    last page again.
+
+    Each variant of a store product is a Magento simple product. The store has a single website,
+    store and store view (`default`), and one inventory source per store location.
+
+    Point the connector to the server by setting the base URL of the account to `url`.
+    """
+
+    channel_code = 'magento'
+    default_page_size = 20
+
+    def __init__(
+        self, *args, admin_username='admin', admin_password='admin123', admin_token='mock-admin-token',
+        consumer_key='mock-consumer-key', consumer_secret='mock-consumer-secret',
+        access_token='mock-access-token', access_token_secret='mock-access-token-secret', max_page_size=300,
+        **kwargs,
+    ):
+        self.admin_username = admin_username
+        self.admin_password = admin_password
+        self.admin_token = admin_token
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.access_token = access_token
+        self.access_token_secret = access_token_secret
+        super().__init__(*args, max_page_size=max_page_size, **kwargs)
+
+    def _get_routes(self):
+        return [
+            ('POST', API_PATH + r'/integration/admin/token', self._get_admin_token),
+            ('GET', API_PATH + r'/store/storeViews', lambda request: (200, [STORE_VIEW])),
+            ('GET', API_PATH + r'/store/storeGroups', lambda request: (200, [
+                {'id': 1, 'name': "Main Website Store", 'website_id': 1, 'default_store_id': 1},
+            ])),
+            ('GET', API_PATH + r'/store/websites', lambda request: (200, [
+                {'id': 0, 'code': 'admin', 'name': "Admin"},
+                {'id': 1, 'code': 'base', 'name': "Main Website"},
+            ])),
+            ('GET', API_PATH + r'/products', self._get_products),
+            ('GET', API_PATH + r'/inventory/sources', self._get_sources),
+            ('POST', API_PATH + r'/inventory/source-items', self._set_source_items),
+            ('GET', API_PATH + r'/orders', self._get_orders),
+            ('POST', API_PATH + r'/order/(\d+)/ship', self._ship_order),
+            ('GET', API_PATH + r'/shipments', self._get_shipments),
+            ('GET', API_PATH + r'/shipment/(\d+)', self._get_shipment),
+        ]
+
+    # === Authentication === #
+
+    def _check_auth(self, request):
+        if request.path == API_PATH + '/integration/admin/token':
+            return True
+        authorization = request.headers.get('Authorization') or ''
+        if authorization.startswith('Bearer '):
+            return authorization.removeprefix('Bearer ') == self.admin_token
+        if authorization.startswith('OAuth '):
+            return self._check_oauth_signature(request, authorization)
+        return False
+
+    def _check_oauth_signature(self, request, authorization):
+        oauth_params = {key: unquote(value) for key, value in OAUTH_PARAM_RE.findall(authorization)}
+        signature = oauth_params.pop('oauth_signature', '')
+        if (
+            oauth_params.get('oauth_consumer_key') != self.consumer_key
+            or oauth_params.get('oauth_token') != self.access_token
+            or oauth_params.get('oauth_signature_method') != 'HMAC-SHA256'
+        ):
+            return False
+        encoded_params = '&'.join(
+            f'{_percent_encode(key)}={_percent_encode(value)}'
+            for key, value in sorted({**oauth_params, **request.query}.items())
+        )
+        base_string = '&'.join([
+            request.method,
+            _percent_encode(f"http://{request.headers['Host']}{request.path}"),
+            _percent_encode(encoded_params),
+        ])
+        key = f'{_percent_encode(self.consumer_secret)}&{_percent_encode(self.access_token_secret)}'
+        expected = base64.b64encode(hmac.new(key.encode(), base_string.encode(), hashlib.sha256).digest()).decode()
+        return hmac.compare_digest(signature, expected)
+
+    def _get_error_response(self, request, status, message):
+        if status == 401:
+            message = "The consumer isn't authorized to access %resources."
+        return status, {'message': message, 'parameters': []}
+
+    def _get_admin_token(self, request):
+        credentials = request.json()
+        if (credentials.get('username'), credentials.get('password')) != (self.admin_username, self.admin_password):
+            return 401, {'message': "The account sign-in was incorrect or your account is disabled temporarily."}
+        return 200, self.admin_token
+
+    # === Search === #
+
+    def _search(self, request, records, get_fields, render):
+        """Filter and paginate `records` according to the searchCriteria of the request.
+
+        :param list records: The records to search.
+        :param get_fields: A function returning the filterable fields of a record, as a dict.
+        :param render: A function rendering a record of the page.
+        """
+        groups = {}
+        for param, value in request.query.items():
+            if match := FILTER_RE.fullmatch(param):
+                group, index, key = match.groups()
+                groups.setdefault(group, {}).setdefault(index, {})[key] = value
+        matching = [
+            record for record in records
+            if all(
+                any(
+                    _match_condition(get_fields(record).get(search_filter['field']), search_filter.get('conditionType', 'eq'), search_filter['value'])
+                    for search_filter in group.values()
+                ) for group in groups.values()
+            )
+        ]
+        page_size = self._get_page_size(request.query.get('searchCriteria[pageSize]'))
+        last_page = max(1, -(-len(matching) // page_size))
+        current_page = min(int(request.query.get('searchCriteria[currentPage]') or 1), last_page)
+        return 200, {
+            'items': [render(record) for record in matching[(current_page - 1) * page_size:current_page * page_size]],
+            'search_criteria': {'page_size': page_size, 'current_page': current_page},
+            'total_count': len(matching),
+        }
+
+    # === Handlers === #
+
+    def _get_products(self, request):
+        simple_products = [(product, variant) for product in self.store.products for variant in product['variants']]
+        return self._search(
+            request, simple_products,
+            lambda record: {
+                'status': 1,
+                'type_id': 'simple',
+                'sku': record[1]['sku'],
+                'updated_at': _format_date(record[0]['updated_at']),
+            },
+            lambda record: self._render_product(*record),
+        )
+
+    def _get_sources(self, request):
+        return self._search(
+            request, self.store.locations,
+            lambda location: {'enabled': True, 'source_code': location['code']},
+            lambda location: {'source_code': location['code'], 'name': location['name'], 'enabled': True},
+        )
+
+    def _set_source_items(self, request):
+        locations_by_code = {location['code']: location for location in self.store.locations}
+        for item in request.json()['sourceItems']:
+            _product, variant = self.store.get_variant_by_sku(item['sku'])
+            location = locations_by_code.get(item['source_code'])
+            if not variant or not location:
+                return 400, {'message': f"Invalid source item {item['sku']} / {item['source_code']}.", 'parameters': []}
+            self.store.set_quantity(variant['id'], location['id'], item['quantity'])
+        return 200, []
+
+    def _get_orders(self, request):
+        return self._search(
+            request, self.store.orders,
+            lambda order: {
+                'entity_id': order['id'],
+                'increment_id': order['reference'].lstrip('#'),
+                'store_id': STORE_VIEW['id'],
+                'updated_at': _format_date(order['updated_at']),
+            },
+            self._render_order,
+        )
+
+    def _get_shipments(self, request):
+        shipments = [(order, fulfillment) for order in self.store.orders for fulfillment in order['fulfillments']]
+        return self._search(
+            request, shipments,
+            lambda record: {'order_id': record[0]['id'], 'entity_id': record[1]['id']},
+            lambda record: self._render_shipment(*record),
+        )
+
+    def _get_shipment(self, request):
+        shipment_id = int(request.match.group(1))
+        for order in self.store.orders:
+            for fulfillment in order['fulfillments']:
+                if fulfillment['id'] == shipment_id:
+                    return 200, self._render_shipment(order, fulfillment)
+        return 404, {'message': "The entity that was requested doesn't exist. Verify the entity and try again.", 'parameters': []}
+
+    def _ship_order(self, request):
+        order = self.store.get_order(request.match.group(1))
+        if not order:
+            return 404, {'message': "The entity that was requested doesn't exist. Verify the entity and try again.", 'parameters': []}
+        values = request.json()
+        line_ids = {line['id'] for line in order['lines']}
+        quantities = {item['order_item_id']: item['qty'] for item in values.get('items', [])}
+        if not quantities or not set(quantities) <= line_ids:
+            return 400, {'message': "Shipment Document Validation Error(s):\nThe order does not allow a shipment to be created.", 'parameters': []}
+        track = (values.get('tracks') or [{}])[0]
+        fulfillment = self.store.add_fulfillment(order, quantities, track.get('carrier_code', ''), track.get('track_number', ''))
+        return 200, str(fulfillment['id'])
+
+    # === Rendering === #
+
+    def _render_product(self, product, variant):
+        return {
+            'id': variant['id'],
+            'sku': variant['sku'],
+            'name': product['name'] if variant['name'] == 'Default Title' else f"{product['name']}-{variant['name']}",
+            'status': 1,
+            'type_id': 'simple',
+            'visibility': 4,
+            'updated_at': _format_date(product['updated_at']),
+            'extension_attributes': {'website_ids': [STORE_VIEW['website_id']]},
+        }
+
+    def _render_address(self, customer, address_type):
+        return {
+            'address_type': address_type,
+            'firstname': customer['first_name'],
+            'lastname': customer['last_name'],
+            'email': customer['email'],
+            'telephone': customer['phone'],
+            'street': [street for street in (customer['street'], customer['street2']) if street],
+            'postcode': customer['zip'],
+            'city': customer['city'],
+            'region': customer['state_code'] or None,
+            'region_code': customer['state_code'] or None,
+            'country_id': customer['country_code'],
+        }
+
+    def _render_order(self, order):
+        customer = self.store.get_customer(order)
+        shipping = order['shipping']
+        total = self.store.get_order_total(order)
+        if order['canceled']:
+            state = 'canceled'
+        elif order['fulfillments']:
+            state = 'complete'
+        else:
+            state = 'processing' if order['paid'] else 'new'
+        return {
+            'entity_id': order['id'],
+            'increment_id': order['reference'].lstrip('#'),
+            'created_at': _format_date(order['created_at']),
+            'updated_at': _format_date(order['updated_at']),
+            'base_currency_code': order['currency'],
+            'order_currency_code': order['currency'],
+            'state': state,
+            'status': 'pending' if state == 'new' else state,
+            'base_grand_total': total,
+            'base_total_paid': total if order['paid'] else 0,
+            'base_total_refunded': 0,
+            'customer_id': customer['id'],
+            'customer_email': customer['email'],
+            'customer_is_guest': int(not customer['id']),
+            'store_id': STORE_VIEW['id'],
+            'billing_address': self._render_address(customer, 'billing'),
+            'items': [{
+                'item_id': line['id'],
+                'product_id': line['variant_id'],
+                'sku': line['sku'],
+                'name': f"{line['name']}-{line['variant_name']}" if line['variant_name'] else line['name'],
+                'product_type': 'simple',
+                'qty_ordered': line['quantity'],
+                'base_price': line['price'],
+                'base_price_incl_tax': round(line['price'] + line['tax'] / line['quantity'], 2),
+                'base_tax_amount': line['tax'],
+                'base_discount_amount': line['discount'],
+                'base_discount_tax_compensation_amount': 0,
+                'base_row_total': round(line['price'] * line['quantity'], 2),
+                'base_row_total_incl_tax': round(line['price'] * line['quantity'] + line['tax'], 2),
+            } for line in order['lines']],
+            'shipping_description': f"{shipping['title']} - {shipping['code']}",
+            'base_shipping_amount': shipping['price'],
+            'base_shipping_tax_amount': shipping['tax'],
+            'base_shipping_discount_amount': 0,
+            'base_shipping_discount_tax_compensation_amnt': 0,
+            'extension_attributes': {
+                'shipping_assignments': [{
+                    'shipping': {
+                        'address': self._render_address(customer, 'shipping'),
+                        'method': f"{shipping['code']}_{shipping['code']}",
+                    },
+                }],
+            },
+        }
+
+    def _render_shipment(self, order, fulfillment):
+        lines = {line['id']: line for line in order['lines']}
+        location_codes = {location['id']: location['code'] for location in self.store.locations}
+        return {
+            'entity_id': fulfillment['id'],
+            'order_id': order['id'],
+            'items': [{
+                'entity_id': line['id'],
+                'order_item_id': line['line_id'],
+                'qty': line['quantity'],
+                'sku': lines[line['line_id']]['sku'] if line['line_id'] in lines else '',
+            } for line in fulfillment['lines']],
+            'tracks': [{
+                'carrier_code': fulfillment['tracking_company'].lower() or 'custom',
+                'title': fulfillment['tracking_company'],
+                'track_number': fulfillment['tracking_number'],
+            }] if fulfillment['tracking_number'] else [],
+            'extension_attributes': {'source_code': location_codes.get(fulfillment['location_id'])},
+        }
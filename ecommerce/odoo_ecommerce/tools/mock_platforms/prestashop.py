@@ -0,0 +1,370 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import base64
+import re
+import xml.etree.ElementTree as ET
+
+from .data import CITIES, OPTION_VALUES, SHIPPING_METHODS
+from .server import MockPlatformServer
+
+API_PATH = '/api'
+FILTER_RE = re.compile(r'filter\[(\w+)\]')
+LANGUAGES = [{'id': 1, 'iso_code': 'en', 'name': "English"}, {'id': 2, 'iso_code': 'fr', 'name': "Français"}]
+RESOURCES = (
+    'addresses', 'carriers', 'combinations', 'configurations', 'countries', 'currencies', 'customers', 'languages',
+    'order_histories', 'order_states', 'orders', 'product_option_values', 'products', 'shops', 'states',
+    'stock_availables',
+)
+ORDER_STATES = {2: "Payment accepted", 4: "Shipped", 6: "Canceled", 10: "Awaiting bank wire payment"}
+
+
+def _format_date(date):
+    return date.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _multilang(value):
+    return [{'id': str(language['id']), 'value': value} for language in LANGUAGES]
+
+
+def _singular(name):
+    if name.endswith('ies'):
+        return name[:-3] + 'y'
+    if name.endswith('sses'):
+        return name[:-2]
+    return name[:-1]
+
+
+def _match_filter(record_value, value):
+    """Return whether the value of a record field satisfies a PrestaShop `filter[field]` value."""
+    record_value = '' if record_value is None else str(record_value)
+    if match := re.fullmatch(r'([<>])\[(.*)\]', value):
+        operator, bound = match.groups()
+        return record_value > bound if operator == '>' else record_value < bound
+    if match := re.fullmatch(r'\[(.*)\]', value):
+        if ',' in match.group(1):
+            low, high = match.group(1).split(',', 1)
+            return low <= record_value <= high
+        return record_value in match.group(1).split('|')
+    return record_value == value
+
+
+class PrestaShopMockServer(MockPlatformServer):
+    """Stand-in for the PrestaShop webservice (`/api/<resource>[/<id>]`), authenticated with HTTP
+    Basic using the webservice key as user name.
+
+    The responses are in JSON when requested with `output_format=JSON` (query parameter or header),
+    in XML otherwise, or always in XML when `xml_responses` is set to exercise the XML parsing of
+    the connector. The `filter[field]` parameters (`value`, `[a|b]`, `[low,high]`, `>[value]`,
+    `<[value]`) and the `limit` parameter (`count` or `offset,count`) are applied; like
+    PrestaShop, the lists are not paginated unless `limit` is given.
+
+    The shops are the store locations, numbered from 1, and a product with several variants is a
+    product with combinations, one per variant. The stock availables have the ids of the inventory
+    items of the variants.
+
+    Point the connector to the server by setting the PrestaShop URL of the account to
+    `<url>/<admin folder>`, the API being served at the root of the server like PrestaShop does.
+
+    :param str webservice_key: The expected webservice key.
+    :param bool xml_responses: Whether to answer in XML even when JSON is requested.
+    """
+
+    channel_code = 'prestashop'
+
+    def __init__(self, *args, webservice_key='MOCKWEBSERVICEKEY', xml_responses=False, **kwargs):
+        self.webservice_key = webservice_key
+        self.xml_responses = xml_responses
+        self.state_by_order = {}  # States set with `POST order_histories`.
+        super().__init__(*args, **kwargs)
+        currencies = sorted({order['currency'] for order in self.store.orders})
+        self.currency_ids = {code: index for index, code in enumerate(currencies, 1)}
+        self.country_ids = {code: index for index, code in enumerate(sorted({city[2] for city in CITIES}), 1)}
+        self.state_ids = {code: index for index, code in enumerate(sorted({city[3] for city in CITIES if city[3]}), 1)}
+        self.carrier_ids = {code: index for index, (code, _title) in enumerate(SHIPPING_METHODS, 1)}
+        self.variant_id_by_stock_available = {
+            variant['inventory_item_id']: variant['id'] for product in self.store.products for variant in product['variants']
+        }
+
+    def _get_routes(self):
+        return [
+            ('GET', API_PATH + r'/?', self._get_api),
+            ('GET', API_PATH + r'/(\w+)(?:/(\d+))?', self._get_resource),
+            ('PATCH', API_PATH + r'/stock_availables/(\d+)', self._update_stock_available),
+            ('PUT', API_PATH + r'/stock_availables/(\d+)', self._update_stock_available),
+            ('POST', API_PATH + r'/order_histories', self._create_order_history),
+        ]
+
+    def _check_auth(self, request):
+        expected = base64.b64encode(f'{self.webservice_key}:'.encode()).decode()
+        return request.headers.get('Authorization') == f'Basic {expected}'
+
+    def _get_error_response(self, request, status, message):
+        return self._respond(request, status, {'errors': [{'code': status, 'message': message}]})
+
+    def _get_rate_limited_response(self, request):
+        status, payload, headers = self._get_error_response(request, 429, "Too many requests")
+        return status, payload, {**headers, 'Retry-After': '1'}
+
+    # === Encoding === #
+
+    def _respond(self, request, status, payload, json_payload=None):
+        """Return the response with the given payload, in the format requested.
+
+        :param dict payload: The payload, as `{resource: records}` or `{element: values}`.
+        :param json_payload: The payload to send instead in JSON, if it differs from the XML one.
+        """
+        wants_json = 'JSON' in (request.query.get('output_format'), request.headers.get('output_format'))
+        if wants_json and not self.xml_responses:
+            return status, payload if json_payload is None else json_payload, {'Content-Type': 'application/json;charset=utf-8'}
+        root = ET.Element('prestashop', {'xmlns:xlink': 'http://www.w3.org/1999/xlink'})
+        for key, value in payload.items():
+            self._append_xml(root, key, value)
+        return status, ET.tostring(root, encoding='unicode', xml_declaration=True), {'Content-Type': 'text/xml;charset=utf-8'}
+
+    def _append_xml(self, parent, tag, value):
+        element = ET.SubElement(parent, tag)
+        if isinstance(value, list) and value and isinstance(value[0], dict) and 'value' in value[0]:
+            for translation in value:  # Multilang field.
+                ET.SubElement(element, 'language', {'id': translation['id']}).text = str(translation['value'])
+        elif isinstance(value, list):
+            for item in value:
+                self._append_xml(element, _singular(tag), item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                self._append_xml(element, key, item)
+        elif value is not None:
+            element.text = str(value)
+
+    def _get_body(self, request, resource):
+        """Return the fields of the `resource` element of the XML body of a write request."""
+        element = ET.fromstring(request.text()).find(resource)
+        return {child.tag: (child.text or '').strip() for child in element}
+
+    # === Handlers === #
+
+    def _get_api(self, request):
+        return self._respond(request, 200, {'api': {resource: {'description': resource} for resource in RESOURCES}})
+
+    def _get_resource(self, request):
+        resource, resource_id = request.match.groups()
+        if resource not in RESOURCES:
+            return self._get_error_response(request, 400, f"Resource of type \"{resource}\" does not exists. Did you mean: \"products\"?")
+        records = getattr(self, f'_get_{resource}')(request, resource_id)
+        if resource_id:
+            records = [record for record in records if str(record['id']) == resource_id]
+            if not records:
+                return self._get_error_response(request, 404, f"Id {resource_id} of {resource} not found")
+        for param, value in request.query.items():
+            if match := FILTER_RE.fullmatch(param):
+                records = [record for record in records if _match_filter(record.get(match.group(1)), value)]
+        if limit := request.query.get('limit'):
+            offset, count = limit.split(',') if ',' in limit else (0, limit)
+            records = records[int(offset):int(offset) + int(count)]
+        return self._respond(request, 200, {resource: records}, json_payload=None if records else [])
+
+    def _update_stock_available(self, request):
+        stock_available_id = int(request.match.group(1))
+        values = self._get_body(request, 'stock_available')
+        shop_id = int(request.query.get('id_shop') or 1)
+        _product, variant = self._get_variant_by_stock_available(stock_available_id)
+        if not variant or shop_id > len(self.store.locations):
+            return self._get_error_response(request, 404, f"Id {stock_available_id} of stock_availables not found")
+        self.store.set_quantity(variant['id'], self.store.locations[shop_id - 1]['id'], int(values['quantity']))
+        return self._respond(request, 200, {'stock_available': self._render_stock_available(variant, shop_id)})
+
+    def _create_order_history(self, request):
+        values = self._get_body(request, 'order_histories')
+        order = self.store.get_order(values['id_order'])
+        if not order or int(values['id_order_state']) not in ORDER_STATES:
+            return self._get_error_response(request, 400, "Invalid order history")
+        self.state_by_order[order['id']] = int(values['id_order_state'])
+        history_id = self.store.next_id()
+        return self._respond(request, 201, {'order_history': {'id': history_id, **values}})
+
+    # === Resources === #
+
+    def _get_variant_by_stock_available(self, stock_available_id):
+        return self.store.get_variant(self.variant_id_by_stock_available.get(stock_available_id))
+
+    def _has_combinations(self, product):
+        return not (len(product['variants']) == 1 and product['variants'][0]['name'] == 'Default Title')
+
+    def _get_products(self, request, resource_id=None):
+        products = [self.store.get_product(resource_id)] if resource_id else self.store.products
+        return [{
+            'id': product['id'],
+            'id_shop_default': '1',
+            'reference': product['sku'],
+            'product_type': 'combinations' if self._has_combinations(product) else 'standard',
+            'active': '1',
+            'date_upd': _format_date(product['updated_at']),
+            'name': _multilang(product['name']),
+            'associations': {
+                'combinations': [
+                    {'id': str(variant['id'])} for variant in product['variants']
+                ] if self._has_combinations(product) else [],
+                'stock_availables': [{
+                    'id': str(variant['inventory_item_id']),
+                    'id_product_attribute': str(variant['id']) if self._has_combinations(product) else '0',
+                } for variant in product['variants']],
+            },
+        } for product in products if product]
+
+    def _get_combinations(self, request, resource_id=None):
+        if resource_id:
+            variants = [self.store.get_variant(resource_id)]
+        else:
+            variants = [(product, variant) for product in self.store.products for variant in product['variants']]
+        return [{
+            'id': variant['id'],
+            'id_product': str(product['id']),
+            'reference': variant['sku'],
+            'associations': {
+                'product_option_values': [{'id': str(OPTION_VALUES.index(variant['name']) + 1)}],
+            },
+        } for product, variant in variants if variant and self._has_combinations(product)]
+
+    def _get_product_option_values(self, request, resource_id=None):
+        return [
+            {'id': index, 'name': _multilang(value)}
+            for index, value in enumerate(OPTION_VALUES, 1)
+        ]
+
+    def _render_stock_available(self, variant, shop_id):
+        product, _variant = self.store.get_variant(variant['id'])
+        return {
+            'id': variant['inventory_item_id'],
+            'id_product': str(product['id']),
+            'id_product_attribute': str(variant['id']) if self._has_combinations(product) else '0',
+            'id_shop': str(shop_id),
+            'quantity': str(self.store.quantities.get((variant['id'], self.store.locations[shop_id - 1]['id']), 0)),
+        }
+
+    def _get_stock_availables(self, request, resource_id=None):
+        shop_id = int(request.query.get('id_shop') or 1)
+        return [
+            self._render_stock_available(variant, shop_id)
+            for product in self.store.products for variant in product['variants']
+        ]
+
+    def _get_shops(self, request, resource_id=None):
+        return [
+            {'id': index, 'name': location['name'], 'active': '1'}
+            for index, location in enumerate(self.store.locations, 1)
+        ]
+
+    def _get_configurations(self, request, resource_id=None):
+        return [
+            {'id': 1, 'name': 'PS_SHOP_DEFAULT', 'value': '1', 'id_shop': ''},
+            {'id': 2, 'name': 'PS_LANG_DEFAULT', 'value': '1', 'id_shop': '1'},
+        ]
+
+    def _get_languages(self, request, resource_id=None):
+        return LANGUAGES
+
+    def _get_currencies(self, request, resource_id=None):
+        return [{'id': currency_id, 'iso_code': code} for code, currency_id in self.currency_ids.items()]
+
+    def _get_countries(self, request, resource_id=None):
+        return [{'id': country_id, 'iso_code': code} for code, country_id in self.country_ids.items()]
+
+    def _get_states(self, request, resource_id=None):
+        return [{'id': state_id, 'iso_code': code} for code, state_id in self.state_ids.items()]
+
+    def _get_carriers(self, request, resource_id=None):
+        return [{'id': self.carrier_ids[code], 'name': title} for code, title in SHIPPING_METHODS]
+
+    def _get_order_states(self, request, resource_id=None):
+        return [{'id': state_id, 'name': _multilang(name)} for state_id, name in ORDER_STATES.items()]
+
+    def _get_order_customers(self):
+        """Return the customer of each order, guest orders having a customer with the order id."""
+        return {order['id']: self.store.get_customer(order) for order in self.store.orders}
+
+    def _get_customers(self, request, resource_id=None):
+        customers = {}
+        for order_id, customer in self._get_order_customers().items():
+            customer_id = customer['id'] or order_id
+            customers[customer_id] = {
+                'id': customer_id,
+                'email': customer['email'],
+                'firstname': customer['first_name'],
+                'lastname': customer['last_name'],
+                'is_guest': '0' if customer['id'] else '1',
+            }
+        return list(customers.values())
+
+    def _get_addresses(self, request, resource_id=None):
+        addresses = {}
+        for order_id, customer in self._get_order_customers().items():
+            customer_id = customer['id'] or order_id
+            addresses[customer_id] = {
+                'id': customer_id,
+                'id_customer': str(customer_id),
+                'firstname': customer['first_name'],
+                'lastname': customer['last_name'],
+                'address1': customer['street'],
+                'address2': customer['street2'],
+                'postcode': customer['zip'],
+                'city': customer['city'],
+                'phone': customer['phone'],
+                'id_state': str(self.state_ids.get(customer['state_code'], 0)),
+                'id_country': str(self.country_ids[customer['country_code']]),
+            }
+        return list(addresses.values())
+
+    def _get_order_histories(self, request, resource_id=None):
+        return []
+
+    def _get_order_state(self, order):
+        if order['id'] in self.state_by_order:
+            return self.state_by_order[order['id']]
+        if order['canceled']:
+            return 6
+        if order['fulfillments']:
+            return 4
+        return 2 if order['paid'] else 10
+
+    def _get_orders(self, request, resource_id=None):
+        orders = []
+        for order in [self.store.get_order(resource_id)] if resource_id else self.store.orders:
+            if not order:
+                continue
+            customer = self.store.get_customer(order)
+            customer_id = str(customer['id'] or order['id'])
+            shipping = order['shipping']
+            total = self.store.get_order_total(order)
+            discount = sum(line['discount'] for line in order['lines'])
+            orders.append({
+                'id': order['id'],
+                'reference': order['reference'].lstrip('#'),
+                'current_state': str(self._get_order_state(order)),
+                'date_add': _format_date(order['created_at']),
+                'date_upd': _format_date(order['updated_at']),
+                'id_currency': str(self.currency_ids[order['currency']]),
+                'id_customer': customer_id,
+                'id_shop': '1',
+                'id_address_invoice': customer_id,
+                'id_address_delivery': customer_id,
+                'id_carrier': str(self.carrier_ids[shipping['code']]),
+                'invoice_number': str(order['id']) if order['paid'] else '0',
+                'shipping_number': order['fulfillments'][0]['tracking_number'] if order['fulfillments'] else '',
+                'total_paid_tax_incl': f'{total:.6f}',
+                'total_shipping_tax_incl': f"{shipping['price'] + shipping['tax']:.6f}",
+                'total_shipping_tax_excl': f"{shipping['price']:.6f}",
+                'total_discounts_tax_incl': f'{discount:.6f}',
+                'total_discounts_tax_excl': f'{discount:.6f}',
+                'associations': {
+                    'order_rows': [{
+                        'id': str(line['id']),
+                        'product_id': str(line['product_id']),
+                        'product_attribute_id': str(line['variant_id']) if line['variant_name'] else '0',
+                        'product_quantity': line['quantity'],
+                        'product_name': f"{line['name']} - {line['variant_name']}" if line['variant_name'] else line['name'],
+                        'product_reference': line['sku'],
+                        'unit_price_tax_incl': f"{line['price'] + line['tax'] / line['quantity']:.6f}",
+                        'unit_price_tax_excl': f"{line['price']:.6f}",
+                    } for line in order['lines']],
+                },
+            })
+        return orders
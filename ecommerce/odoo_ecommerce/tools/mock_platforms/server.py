@@ -0,0 +1,252 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .data import MockStore
+
+_logger = logging.getLogger(__name__)
+
+
+class MockRequest:
+    """A request received by a mock platform server.
+
+    :param str method: The HTTP method, in upper case.
+    :param str path: The path of the URL, without the query string.
+    :param dict query: The query parameters; the last value wins for repeated parameters.
+    :param headers: The HTTP headers (`email.message.Message`, case-insensitive).
+    :param bytes body: The raw body of the request.
+    """
+
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.match = None  # The match of the route pattern, set by `MockPlatformServer.dispatch`.
+
+    def json(self):
+        return json.loads(self.body or b'null')
+
+    def text(self):
+        return self.body.decode('utf-8')
+
+
+class MockPlatformServer:
+    """Local stand-in for the API of an E-commerce platform, to run the sync flows without a real store.
+
+    The server answers in a background thread on `url` from the data of a `MockStore`, which is
+    modified by the write endpoints (shipments, stock quantities). Each platform subclass declares
+    its routes in `_get_routes` and checks the credentials in `_check_auth`.
+
+    The behavior of the platform can be degraded with:
+
+    - `latency` and `jitter`: seconds waited before each response, `jitter` being a random extra;
+    - `max_page_size`: the largest page returned, whatever the page size requested by the client;
+    - `rate_limit`: requests per second allowed (token bucket of `rate_limit` tokens), the other
+      requests are rejected like the platform does (HTTP 429, or a THROTTLED error for Shopify);
+    - `error_rate` and `error_status`: share of the requests failing with the given HTTP status;
+      `fail_next` makes the next requests fail deterministically.
+
+    Usage::
+
+        with ShopifyMockServer(store=MockStore(orders=500), latency=0.05) as server:
+            account = connect_to_mock_platform(account, server)
+            account._sync_orders()
+            assert server.count_calls('POST') == 50
+
+    :param MockStore store: The data served; a default store is generated when not given.
+    :param str host: The interface to listen on.
+    :param int port: The port to listen on, 0 to pick a free one.
+    :param int seed: The seed of the random generator used for the jitter and the errors.
+    """
+
+    channel_code = None
+    default_page_size = 50  # Used when the client does not request a page size.
+
+    def __init__(
+        self, store=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, max_page_size=250,
+        rate_limit=0, error_rate=0.0, error_status=500, seed=0,
+    ):
+        self.store = store or MockStore(seed=seed)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.max_page_size = max_page_size
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls = []  # (method, path, status) of each request received.
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit
+        self._tokens_date = time.monotonic()
+        self._failures = []  # Statuses of the next requests to fail.
+        self._routes = [
+            (method, re.compile(pattern + '$'), handler) for method, pattern, handler in self._get_routes()
+        ]
+        self._httpd = None
+        self._thread = None
+
+    # === Lifecycle === #
+
+    @property
+    def url(self):
+        """The base URL of the running server, without trailing slash."""
+        return f'http://{self.host}:{self.port}'
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                url = urlsplit(self.path)
+                request = MockRequest(
+                    self.command, url.path, dict(parse_qsl(url.query, keep_blank_values=True)),
+                    self.headers, self.rfile.read(length) if length else b'',
+                )
+                status, body, headers = server.dispatch(request)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                _logger.debug("%s mock: %s", server.channel_code, format % args)
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name=f'{self.channel_code}-mock', daemon=True,
+        )
+        self._thread.start()
+        _logger.info("%s mock server listening on %s", self.channel_code, self.url)
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    # === Fault injection === #
+
+    def fail_next(self, count=1, status=None):
+        """Make the next `count` requests fail with the given HTTP status (`error_status` by default)."""
+        with self._lock:
+            self._failures.extend([status or self.error_status] * count)
+
+    def count_calls(self, method=None, path=None):
+        """Return the number of requests received, optionally filtered by method and path regex."""
+        return sum(
+            1 for call_method, call_path, _status in self.calls
+            if (not method or call_method == method) and (not path or re.search(path, call_path))
+        )
+
+    def _take_token(self):
+        """Consume a token of the rate limit bucket, return whether the request is allowed."""
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._tokens_date) * self.rate_limit)
+            self._tokens_date = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _pop_failure(self):
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self.error_status
+        return None
+
+    # === Dispatch === #
+
+    def dispatch(self, request):
+        """Answer the request, return its status, encoded body and headers."""
+        if self.latency or self.jitter:
+            with self._lock:
+                jitter = self._random.uniform(0, self.jitter)
+            time.sleep(self.latency + jitter)
+        if not self._take_token():
+            response = self._get_rate_limited_response(request)
+        elif (status := self._pop_failure()) is not None:
+            response = self._get_error_response(request, status, "Injected error")
+        elif not self._check_auth(request):
+            response = self._get_error_response(request, 401, "Invalid credentials")
+        else:
+            response = self._route(request)
+        status, payload, headers = response if len(response) == 3 else (*response, {})
+        with self._lock:
+            self.calls.append((request.method, request.path, status))
+        return (status, *self._encode(payload, headers))
+
+    def _route(self, request):
+        for method, pattern, handler in self._routes:
+            if method == request.method and (match := pattern.match(request.path)):
+                request.match = match
+                try:
+                    return handler(request)
+                except (KeyError, ValueError) as error:
+                    _logger.debug("%s mock: invalid request %s", self.channel_code, request.path, exc_info=True)
+                    return self._get_error_response(request, 400, f"Invalid request: {error}")
+        return self._get_error_response(request, 404, f"No route for {request.method} {request.path}")
+
+    def _encode(self, payload, headers):
+        headers = dict(headers)
+        if payload is None:
+            return b'', headers
+        if isinstance(payload, str):
+            headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+            return payload.encode('utf-8'), headers
+        headers.setdefault('Content-Type', 'application/json')
+        return json.dumps(payload).encode('utf-8'), headers
+
+    def _get_page_size(self, requested):
+        return max(1, min(int(requested or self.default_page_size), self.max_page_size))
+
+    # === Platform specific hooks === #
+
+    def _get_routes(self):
+        """Return the routes of the platform, as `(method, path regex, handler)` tuples.
+
+        The handlers receive the `MockRequest` and return a `(status, payload)` or
+        `(status, payload, headers)` tuple; a dict or list payload is sent as JSON.
+        """
+        raise NotImplementedError()
+
+    def _check_auth(self, request):
+        return True
+
+    def _get_error_response(self, request, status, message):
+        return status, {'errors': message}
+
+    def _get_rate_limited_response(self, request):
+        return 429, {'errors': "Too many requests"}, {'Retry-After': '1'}
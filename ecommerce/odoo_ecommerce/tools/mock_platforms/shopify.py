@@ -0,0 +1,244 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import re
+from datetime import datetime
+
+from .server import MockPlatformServer
+
+GID = 'gid://shopify/%s/%s'
+
+ROOT_FIELD_RE = re.compile(r'\b(shop|order|orders|products|locations|fulfillmentCreate|inventorySetQuantities)\s*[({]')
+FIRST_RE = re.compile(r'first:\s*(\d+)')
+AFTER_RE = re.compile(r'after:\s*"([^"]*)"')
+UPDATED_AT_RE = re.compile(r"updated_at:>'([^']*)'")
+ORDER_ID_RE = re.compile(r'order\(id:\s*"gid://shopify/Order/(\d+)"')
+LINE_ITEM_RE = re.compile(r'\{\s*id:\s*"gid://shopify/FulfillmentOrderLineItem/(\d+)"\s*quantity:\s*(\d+)\s*\}')
+QUANTITY_RE = re.compile(
+    r'inventoryItemId:\s*"gid://shopify/InventoryItem/(\d+)"\s*'
+    r'locationId:\s*"gid://shopify/Location/(\d+)"\s*quantity:\s*(-?\d+)'
+)
+TRACKING_RE = re.compile(r'company:\s*"([^"]*)"\s*numbers?:\s*\[?\s*"([^"]*)"')
+FULFILLMENT_ALIAS_RE = re.compile(r'(\w+):\s*fulfillmentCreate\s*\(')
+
+
+def _format_date(date):
+    return date.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _money(amount):
+    return {'shopMoney': {'amount': f'{amount:.2f}'}}
+
+
+class ShopifyMockServer(MockPlatformServer):
+    """Stand-in for the Shopify GraphQL Admin API (`POST /admin/api/<version>/graphql.json`).
+
+    The queries sent by `ecommerce_shopify.utils_graphql` are recognized by their root field
+    (`shop`, `order`, `orders`, `products`, `locations`, `fulfillmentCreate`,
+    `inventorySetQuantities`) and their arguments are parsed with regular expressions; the
+    selection sets are ignored and the full nodes are returned. The cursors are the offsets of the
+    next records.
+
+    The fulfillment orders of an order have the ids of the order lines, so that `fulfillmentCreate`
+    can map them back. Aliased `fulfillmentCreate` fields are executed in order, like Shopify does
+    for the fields of a mutation. Like Shopify, the rate limit and the errors of the GraphQL API
+    are reported in the `errors` key of a 200 response.
+
+    Point the account to the server with `tools.benchmarks.connect_to_mock_platform`.
+
+    :param str access_token: The expected `X-Shopify-Access-Token` header.
+    """
+
+    channel_code = 'shopify'
+
+    def __init__(self, *args, access_token='mock-token', **kwargs):
+        self.access_token = access_token
+        super().__init__(*args, **kwargs)
+
+    def _get_routes(self):
+        return [('POST', r'/admin/api/[\w-]+/graphql\.json', self._graphql)]
+
+    def _check_auth(self, request):
+        return request.headers.get('X-Shopify-Access-Token') == self.access_token
+
+    def _get_error_response(self, request, status, message):
+        if status == 401:
+            return 401, {'errors': "[API] Invalid API key or access token (unrecognized login or wrong password)"}
+        return status, {'errors': [{'message': message}]}
+
+    def _get_rate_limited_response(self, request):
+        return 200, {'errors': [{'message': "Throttled", 'extensions': {'code': 'THROTTLED'}}]}
+
+    # === GraphQL === #
+
+    def _graphql(self, request):
+        query = request.json()['query']
+        root = ROOT_FIELD_RE.search(query)
+        if not root:
+            return 200, {'errors': [{'message': "Unsupported query"}]}
+        field = root.group(1)
+        if field == 'shop':
+            data = {'name': "Mock Store"}
+        elif field == 'order':
+            data = self._get_order(query)
+        elif field in ('orders', 'products', 'locations'):
+            data = self._get_connection(field, query)
+        elif field == 'fulfillmentCreate':
+            aliases = list(FULFILLMENT_ALIAS_RE.finditer(query))
+            if aliases:
+                bounds = [alias.start() for alias in aliases[1:]] + [len(query)]
+                return 200, {'data': {
+                    alias.group(1): self._create_fulfillment(query[alias.start():end])
+                    for alias, end in zip(aliases, bounds)
+                }, 'extensions': {'cost': {'requestedQueryCost': 10 * len(aliases)}}}
+            data = self._create_fulfillment(query)
+        else:
+            data = self._set_quantities(query)
+        return 200, {'data': {field: data}, 'extensions': {'cost': {'requestedQueryCost': 1}}}
+
+    def _get_connection(self, field, query):
+        first = self._get_page_size((match := FIRST_RE.search(query)) and match.group(1))
+        offset = int((match := AFTER_RE.search(query)) and match.group(1) or 0)
+        if field == 'locations':
+            records = self.store.locations
+            render = self._render_location
+        else:
+            date_from = (match := UPDATED_AT_RE.search(query)) and datetime.strptime(match.group(1)[:19], '%Y-%m-%dT%H:%M:%S')
+            records = list(self.store.iter_updated(getattr(self.store, field), date_from))
+            render = self._render_order if field == 'orders' else self._render_product
+        page = records[offset:offset + first]
+        has_next_page = offset + first < len(records)
+        return {
+            'edges': [{'cursor': str(offset + index + 1), 'node': render(record)} for index, record in enumerate(page)],
+            'pageInfo': {'hasNextPage': has_next_page, 'endCursor': str(offset + len(page)) if page else None},
+        }
+
+    def _get_order(self, query):
+        order = self.store.get_order(ORDER_ID_RE.search(query).group(1))
+        if not order:
+            return None
+        if 'fulfillmentOrders' not in query:
+            return self._render_order(order)
+        shipped = {}
+        for fulfillment in order['fulfillments']:
+            for line in fulfillment['lines']:
+                shipped[line['line_id']] = shipped.get(line['line_id'], 0) + line['quantity']
+        return {'fulfillmentOrders': {'nodes': [{
+            'id': GID % ('FulfillmentOrder', order['id']),
+            'status': 'CLOSED' if order['canceled'] else 'OPEN',
+            'lineItems': {'nodes': [{
+                'id': GID % ('FulfillmentOrderLineItem', line['id']),
+                'remainingQuantity': line['quantity'] - shipped.get(line['id'], 0),
+                'lineItem': {'id': GID % ('LineItem', line['id'])},
+            } for line in order['lines'] if shipped.get(line['id'], 0) < line['quantity']]},
+        }]}}
+
+    def _create_fulfillment(self, query):
+        order = self.store.get_order(re.search(r'gid://shopify/FulfillmentOrder/(\d+)', query).group(1))
+        quantities = {int(line_id): int(quantity) for line_id, quantity in LINE_ITEM_RE.findall(query)}
+        if not order or not quantities:
+            return {'fulfillment': None, 'userErrors': [{'message': "Invalid fulfillment order line items."}]}
+        company, number = (match := TRACKING_RE.search(query)) and match.groups() or ('', '')
+        fulfillment = self.store.add_fulfillment(order, quantities, company, number)
+        return {'fulfillment': {'id': GID % ('Fulfillment', fulfillment['id'])}, 'userErrors': []}
+
+    def _set_quantities(self, query):
+        variant_by_item = {
+            variant['inventory_item_id']: variant['id']
+            for product in self.store.products for variant in product['variants']
+        }
+        errors = []
+        for item_id, location_id, quantity in QUANTITY_RE.findall(query):
+            if int(item_id) not in variant_by_item:
+                errors.append({'message': f"The inventory item {item_id} could not be found."})
+                continue
+            self.store.set_quantity(variant_by_item[int(item_id)], location_id, int(quantity))
+        return {'userErrors': errors}
+
+    # === Rendering === #
+
+    def _render_location(self, location):
+        return {'id': GID % ('Location', location['id']), 'name': location['name']}
+
+    def _render_product(self, product):
+        return {
+            'id': GID % ('Product', product['id']),
+            'title': product['name'],
+            'variants': {'nodes': [{
+                'id': GID % ('ProductVariant', variant['id']),
+                'inventoryItem': {'id': GID % ('InventoryItem', variant['inventory_item_id'])},
+                'sku': variant['sku'],
+                'title': variant['name'],
+            } for variant in product['variants']]},
+        }
+
+    def _render_address(self, customer):
+        return {
+            'address1': customer['street'],
+            'address2': customer['street2'],
+            'city': customer['city'],
+            'countryCodeV2': customer['country_code'],
+            'firstName': customer['first_name'],
+            'lastName': customer['last_name'],
+            'phone': customer['phone'],
+            'provinceCode': customer['state_code'] or None,
+            'zip': customer['zip'],
+        }
+
+    def _render_order(self, order):
+        customer = self.store.get_customer(order)
+        address = self._render_address(customer)
+        shipping = order['shipping']
+        return {
+            'billingAddress': address,
+            'cancelledAt': _format_date(order['updated_at']) if order['canceled'] else None,
+            'currencyCode': order['currency'],
+            'createdAt': _format_date(order['created_at']),
+            'customer': {
+                'defaultAddress': address,
+                'defaultEmailAddress': {'emailAddress': customer['email']},
+                'id': GID % ('Customer', customer['id']),
+            } if customer['id'] else None,
+            'displayFinancialStatus': 'PAID' if order['paid'] else 'PENDING',
+            'fulfillments': [{
+                'fulfillmentLineItems': {'nodes': [{
+                    'id': GID % ('FulfillmentLineItem', line['id']),
+                    'lineItem': {'id': GID % ('LineItem', line['line_id'])},
+                    'quantity': line['quantity'],
+                } for line in fulfillment['lines']]},
+                'id': GID % ('Fulfillment', fulfillment['id']),
+                'location': {'id': GID % ('Location', fulfillment['location_id'])},
+                'status': 'SUCCESS',
+                'trackingInfo': [{'company': fulfillment['tracking_company'], 'number': fulfillment['tracking_number']}],
+            } for fulfillment in order['fulfillments']],
+            'id': GID % ('Order', order['id']),
+            'lineItems': {'nodes': [{
+                'discountAllocations': [{'allocatedAmountSet': _money(line['discount'])}] if line['discount'] else [],
+                'id': GID % ('LineItem', line['id']),
+                'name': f"{line['name']} - {line['variant_name']}" if line['variant_name'] else line['name'],
+                'originalUnitPriceSet': _money(line['price']),
+                'product': {'id': GID % ('Product', line['product_id'])},
+                'quantity': line['quantity'],
+                'sku': line['sku'],
+                'taxLines': [{'priceSet': _money(line['tax']), 'rate': 0.21}],
+                'title': line['name'],
+                'variant': {
+                    'id': GID % ('ProductVariant', line['variant_id']),
+                    'inventoryItem': {'id': GID % ('InventoryItem', self._get_inventory_item_id(line['variant_id']))},
+                },
+                'variantTitle': line['variant_name'] or None,
+            } for line in order['lines']]},
+            'name': order['reference'],
+            'shippingAddress': address,
+            'shippingLines': {'nodes': [{
+                'discountAllocations': [],
+                'id': GID % ('ShippingLine', shipping['id']),
+                'originalPriceSet': _money(shipping['price']),
+                'taxLines': [{'priceSet': _money(shipping['tax']), 'rate': 0.21}],
+                'title': shipping['title'],
+            }]},
+            'updatedAt': _format_date(order['updated_at']),
+        }
+
+    def _get_inventory_item_id(self, variant_id):
+        _product, variant = self.store.get_variant(variant_id)
+        return variant['inventory_item_id'] if variant else variant_id
@@ -0,0 +1,210 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import base64
+import math
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+from .server import MockPlatformServer
+
+API_PATH = '/wp-json/wc/v3'
+
+
+def _format_date(date):
+    return date.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _is_simple(product):
+    return len(product['variants']) == 1 and product['variants'][0]['name'] == 'Default Title'
+
+
+class WooCommerceMockServer(MockPlatformServer):
+    """Stand-in for the WooCommerce REST API v3 (`/wp-json/wc/v3/`), authenticated with HTTP Basic.
+
+    A product with a single `Default Title` variant is a simple product, identified by the product
+    id; the other products are variable products whose variations are the variants. WooCommerce
+    has no locations: the quantities are set on the first location of the store.
+
+    Point the connector to the server by setting the store URL of the account to `url`.
+
+    :param str consumer_key: The expected consumer key.
+    :param str consumer_secret: The expected consumer secret.
+    """
+
+    channel_code = 'woocommerce'
+    default_page_size = 10
+
+    def __init__(self, *args, consumer_key='ck_mock', consumer_secret='cs_mock', max_page_size=100, **kwargs):
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        super().__init__(*args, max_page_size=max_page_size, **kwargs)
+
+    def _get_routes(self):
+        return [
+            ('GET', API_PATH + r'/?', lambda request: (200, {'routes': {}})),
+            ('GET', API_PATH + r'/products', self._get_products),
+            ('GET', API_PATH + r'/products/(\d+)/variations', self._get_variations),
+            ('PUT', API_PATH + r'/products/(\d+)', self._update_product),
+            ('PUT', API_PATH + r'/products/(\d+)/variations/(\d+)', self._update_variation),
+            ('GET', API_PATH + r'/orders', self._get_orders),
+            ('GET', API_PATH + r'/orders/(\d+)', self._get_order),
+        ]
+
+    def _check_auth(self, request):
+        expected = base64.b64encode(f'{self.consumer_key}:{self.consumer_secret}'.encode()).decode()
+        return request.headers.get('Authorization') == f'Basic {expected}'
+
+    def _get_error_response(self, request, status, message):
+        return status, {'code': 'woocommerce_rest_error', 'message': message, 'data': {'status': status}}
+
+    # === Helpers === #
+
+    def _paginate(self, request, records):
+        per_page = self._get_page_size(request.query.get('per_page'))
+        page = int(request.query.get('page') or 1)
+        headers = {
+            'X-WP-Total': str(len(records)),
+            'X-WP-TotalPages': str(math.ceil(len(records) / per_page)),
+        }
+        return records[(page - 1) * per_page:page * per_page], headers
+
+    def _get_date_from(self, request):
+        date = request.query.get('modified_after')
+        return date and datetime.strptime(date[:19], '%Y-%m-%dT%H:%M:%S')
+
+    def _get_body(self, request):
+        if 'json' in (request.headers.get('Content-Type') or ''):
+            return request.json()
+        return dict(parse_qsl(request.text()))
+
+    # === Handlers === #
+
+    def _get_products(self, request):
+        products = list(self.store.iter_updated(self.store.products, self._get_date_from(request)))
+        page, headers = self._paginate(request, products)
+        return 200, [self._render_product(product) for product in page], headers
+
+    def _get_variations(self, request):
+        product = self.store.get_product(request.match.group(1))
+        if not product:
+            return self._get_error_response(request, 404, "Invalid ID.")
+        variations = [] if _is_simple(product) else product['variants']
+        page, headers = self._paginate(request, variations)
+        return 200, [self._render_variation(product, variant) for variant in page], headers
+
+    def _update_product(self, request):
+        product = self.store.get_product(request.match.group(1))
+        if not product:
+            return self._get_error_response(request, 404, "Invalid ID.")
+        self._set_quantity(product['variants'][0], self._get_body(request))
+        return 200, self._render_product(product)
+
+    def _update_variation(self, request):
+        product = self.store.get_product(request.match.group(1))
+        variant_product, variant = self.store.get_variant(request.match.group(2))
+        if not product or variant_product is not product:
+            return self._get_error_response(request, 404, "Invalid ID.")
+        self._set_quantity(variant, self._get_body(request))
+        return 200, self._render_variation(product, variant)
+
+    def _set_quantity(self, variant, values):
+        if self.store.locations and 'stock_quantity' in values:
+            self.store.set_quantity(variant['id'], self.store.locations[0]['id'], int(float(values['stock_quantity'])))
+
+    def _get_orders(self, request):
+        orders = list(self.store.iter_updated(self.store.orders, self._get_date_from(request)))
+        page, headers = self._paginate(request, orders)
+        return 200, [self._render_order(order) for order in page], headers
+
+    def _get_order(self, request):
+        order = self.store.get_order(request.match.group(1))
+        if not order:
+            return self._get_error_response(request, 404, "Invalid ID.")
+        return 200, self._render_order(order)
+
+    # === Rendering === #
+
+    def _render_product(self, product):
+        simple = _is_simple(product)
+        return {
+            'id': product['id'],
+            'name': product['name'],
+            'type': 'simple' if simple else 'variable',
+            'sku': product['sku'],
+            'parent_id': 0,
+            'date_modified_gmt': _format_date(product['updated_at']),
+            'variations': [] if simple else [variant['id'] for variant in product['variants']],
+        }
+
+    def _render_variation(self, product, variant):
+        return {
+            'id': variant['id'],
+            'name': variant['name'],
+            'sku': variant['sku'],
+            'parent_id': product['id'],
+            'stock_quantity': self.store.quantities.get((variant['id'], self.store.locations[0]['id'])) if self.store.locations else None,
+        }
+
+    def _render_address(self, customer):
+        return {
+            'first_name': customer['first_name'],
+            'last_name': customer['last_name'],
+            'company': '',
+            'address_1': customer['street'],
+            'address_2': customer['street2'],
+            'city': customer['city'],
+            'state': customer['state_code'],
+            'postcode': customer['zip'],
+            'country': customer['country_code'],
+            'email': customer['email'],
+            'phone': customer['phone'],
+        }
+
+    def _render_order(self, order):
+        customer = self.store.get_customer(order)
+        if order['canceled']:
+            status = 'cancelled'
+        elif order['fulfillments']:
+            status = 'completed'
+        else:
+            status = 'processing' if order['paid'] else 'pending'
+        shipping = order['shipping']
+        line_items = []
+        for line in order['lines']:
+            product, _variant = self.store.get_variant(line['variant_id'])
+            simple = _is_simple(product)
+            subtotal = line['price'] * line['quantity']
+            line_items.append({
+                'id': line['id'],
+                'name': f"{line['name']} - {line['variant_name']}" if line['variant_name'] else line['name'],
+                'sku': line['sku'],
+                'product_id': line['product_id'],
+                'variation_id': 0 if simple else line['variant_id'],
+                'quantity': line['quantity'],
+                'subtotal': f'{subtotal:.2f}',
+                'subtotal_tax': f"{line['tax']:.2f}",
+                'total': f"{subtotal - line['discount']:.2f}",
+                'total_tax': f"{line['tax'] * (1 - line['discount'] / subtotal):.2f}",
+            })
+        return {
+            'id': order['id'],
+            'status': status,
+            'currency': order['currency'],
+            'order_key': f"wc_order_{order['id']}",
+            'number': order['reference'].lstrip('#'),
+            'customer_id': customer['id'] or 0,
+            'date_created': _format_date(order['created_at']),
+            'date_modified_gmt': _format_date(order['updated_at']),
+            'payment_method_title': 'Credit Card' if order['paid'] else 'Cash on delivery',
+            'total': f'{self.store.get_order_total(order):.2f}',
+            'billing': self._render_address(customer),
+            'shipping': self._render_address(customer),
+            'line_items': line_items,
+            'shipping_lines': [{
+                'id': shipping['id'],
+                'method_id': shipping['code'],
+                'method_title': shipping['title'],
+                'total': f"{shipping['price']:.2f}",
+                'total_tax': f"{shipping['tax']:.2f}",
+            }],
+        }
@@ -0,0 +1,58 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo.exceptions import UserError
+
+from .circuit_breaker import get_circuit_breaker
+
+
+def ecommerce_checks_and_cleanup(env, channel_code):
+    """checks and cleanup data related to the given ecommerce channel during module uninstallation."""
+    account = env['ecommerce.account'].search([('channel_code', '=', channel_code)])
+    if account:
+        raise UserError(env._("Please uninstall the ecommerce account(s) related to %s module before uninstalling it.", channel_code))
+    env['ecommerce.channel'].search([('code', '=', channel_code)]).unlink()
+
+
+def ensure_account_is_authenticated(account):
+    """Ensure that the ecommerce account is authenticated and ready to use."""
+    account.ensure_one()
+    if account.state == 'disconnected':
+        raise UserError(account.env._("The %s account is disconnected. Please connect it first.", account.ecommerce_channel_id.name))
+    return True
+
+
+def ensure_account_is_reachable(account):
+    """Ensure that the requests to the ecommerce account are not suspended by its circuit breaker."""
+    account.ensure_one()
+    breaker = get_circuit_breaker(account._get_account_ref())
+    if breaker.is_open():
+        raise ECommerceAccountWideError(account.env._(
+            "Requests to the %(channel)s account are suspended for %(seconds)s seconds after repeated failures: %(error)s",
+            channel=account.ecommerce_channel_id.name, seconds=breaker.retry_after(), error=breaker.last_error,
+        ))
+    return True
+
+
+class ECommerceApiError(Exception):
+    """Custom exception for ECommerce API request errors.
+
+    :param int error_code: The HTTP status code of the failed request, if any.
+    """
+
+    def __init__(self, *args, error_code=None):
+        super().__init__(*args)
+        self.error_code = error_code
+
+
+class ECommerceAccountWideError(ECommerceApiError):
+    """Custom exception for account-wide ECommerce errors like Rate Limits, Authentication issues, API downtime, etc.
+
+    Raising it tells the sync flows that every other call to the same account would fail as well, so
+    the remaining records of the account are skipped instead of failing one by one.
+    """
+    pass
+
+
+class ECommerceDataError(ECommerceApiError):
+    """Custom exception for E-commerce data that does not follow the normalized order contract."""
+    pass
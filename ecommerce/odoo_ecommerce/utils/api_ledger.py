@@ -0,0 +1,81 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import re
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+MAX_BUFFERED_CALLS = 10000  # Per database; the oldest calls are dropped when nobody flushes the buffer.
+
+# Path segments identifying a single resource, replaced by `:id` to aggregate the calls per endpoint.
+_ID_SEGMENT_RE = re.compile(r'^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{24,})$', re.IGNORECASE)
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def normalize_endpoint(url):
+    """Return the path of the given URL without its query string and resource identifiers.
+
+    e.g. `https://shop.example.com/wp-json/wc/v3/orders/42?page=2` -> `/wp-json/wc/v3/orders/:id`
+    """
+    path = urlsplit(url).path or '/'
+    return '/'.join(':id' if _ID_SEGMENT_RE.match(segment) else segment for segment in path.split('/'))
+
+
+def get_body_size(body):
+    """Return the size in bytes of a prepared request body, or 0 if it cannot be known cheaply."""
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return 0
+
+
+def record_api_call(account_ref, method, url, status_code, latency, request_size=0, response_size=0,
+                    retry_count=0, error=None):
+    """Buffer an outbound call to an E-commerce platform in the memory of the worker.
+
+    It only takes a lock and appends a tuple, so it can be called for every request, including from
+    the I/O threads. The calls are written by `ecommerce.api.call._flush_buffer`.
+
+    :param AccountRef account_ref: The account the call was made for.
+    :param str method: The HTTP method.
+    :param str url: The URL of the request.
+    :param int status_code: The HTTP status of the response, or 0 if no response was received.
+    :param float latency: The time until the response headers were received, in milliseconds.
+    :param int request_size: The size of the request body, in bytes.
+    :param int response_size: The size of the response body, in bytes, when known.
+    :param int retry_count: The number of previous attempts of the same call.
+    :param str error: The error raised instead of receiving a response, if any.
+    :return: None
+    """
+    call = (
+        account_ref.account_id,
+        account_ref.channel_code,
+        method.upper(),
+        normalize_endpoint(url),
+        status_code,
+        latency,
+        request_size,
+        response_size,
+        retry_count,
+        error and str(error)[:500],
+        datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    with _buffers_lock:
+        buffer = _buffers.get(account_ref.dbname)
+        if buffer is None:
+            buffer = _buffers[account_ref.dbname] = deque(maxlen=MAX_BUFFERED_CALLS)
+        buffer.append(call)
+
+
+def pop_api_calls(dbname):
+    """Remove and return the calls buffered for the given database.
+
+    :return: The calls, as tuples in the order of the arguments of `record_api_call`, followed by
+             the date of the call.
+    :rtype: list
+    """
+    with _buffers_lock:
+        buffer = _buffers.pop(dbname, None)
+    return list(buffer or ())
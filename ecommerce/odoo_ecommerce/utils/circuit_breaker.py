@@ -0,0 +1,124 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 3  # Consecutive account-wide failures before the circuit opens.
+COOLDOWN = 60  # Seconds before the first probe request is let through an open circuit.
+MAX_COOLDOWN = 900  # Upper bound of the cooldown, doubled after each failed probe.
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Per-account circuit breaker shielding the sync flows from a dead E-commerce platform.
+
+    - closed: requests flow normally; consecutive account-wide failures are counted.
+    - open: requests are short-circuited until the cooldown expires.
+    - half_open: a single probe request is let through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_cooldown=MAX_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+        self.last_error = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _cooldown_elapsed(self):
+        return time.monotonic() - self.opened_at >= self.cooldown
+
+    def is_open(self):
+        """Return whether requests are currently rejected without reaching the platform."""
+        with self._lock:
+            if self.state == OPEN:
+                return not self._cooldown_elapsed()
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def retry_after(self):
+        """Return the number of seconds before the next probe request is allowed."""
+        with self._lock:
+            if self.state != OPEN:
+                return 0
+            return max(0, int(self.cooldown - (time.monotonic() - self.opened_at)))
+
+    def allow_request(self):
+        """Return whether a request may be sent, switching to half-open when a probe is due."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._cooldown_elapsed():
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                _logger.info("Circuit %s is half-open, sending a probe request.", self.name)
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                _logger.info("Circuit %s is closed again.", self.name)
+            self.state = CLOSED
+            self.failure_count = 0
+            self.cooldown = self.base_cooldown
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failure_count += 1
+            self.last_error = str(error)
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == CLOSED and self.failure_count >= self.failure_threshold:
+                self._open()
+
+    def release_probe(self):
+        """Let a new probe through when the probe in flight ended without a success or a failure."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        _logger.warning(
+            "Circuit %s is open for %s seconds after %s account-wide failures. Last error: %s",
+            self.name, self.cooldown, self.failure_count, self.last_error,
+        )
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(account_ref):
+    """Return the circuit breaker of the given account, creating it on first use.
+
+    Breakers live in the memory of the worker, which is enough to stop a cron run from waiting
+    out the timeout of every call made to a platform that is down.
+
+    :param AccountRef account_ref: The reference of the `ecommerce.account` record.
+    :rtype: CircuitBreaker
+    """
+    key = (account_ref.dbname, account_ref.account_id)
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(key)
+        if breaker is None:
+            breaker = _circuit_breakers[key] = CircuitBreaker(
+                f"{account_ref.channel_code}-{account_ref.account_id}@{account_ref.dbname}",
+            )
+        return breaker
@@ -0,0 +1,73 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import random
+import time
+
+from odoo.service.model import PG_CONCURRENCY_EXCEPTIONS_TO_RETRY
+
+_logger = logging.getLogger(__name__)
+
+MAX_TRIES = 3
+BASE_DELAY = 0.5  # Seconds; the upper bound of the random delay doubles after each try.
+
+
+def call_with_concurrency_retry(cr, func, max_tries=MAX_TRIES):
+    """Call `func`, retrying it when it fails on a concurrent update of the same rows.
+
+    Like `odoo.service.model.retrying`, the transaction is rolled back before each new try, since
+    a serialization failure would happen again in the same snapshot, and the next try is delayed by
+    a random duration ("full jitter") so that the workers that collided do not collide again.
+    The caller must therefore have committed everything it wants to keep before calling it.
+
+    :param cr: The database cursor of the transaction.
+    :param callable func: The function to call, without arguments.
+    :param int max_tries: The maximum number of calls.
+    :return: The result of `func`.
+    :raise: The concurrency error of the last try if all of them failed.
+    """
+    for tryno in range(1, max_tries + 1):
+        try:
+            return func()
+        except PG_CONCURRENCY_EXCEPTIONS_TO_RETRY as error:
+            if tryno == max_tries:
+                raise
+            cr.rollback()
+            wait_time = random.uniform(0.0, BASE_DELAY * 2 ** (tryno - 1))
+            _logger.info(
+                "%s, try %s/%s in %.3f seconds.", type(error).__name__, tryno + 1, max_tries, wait_time,
+            )
+            time.sleep(wait_time)
+
+
+class DeferredRetryQueue:
+    """Iterate over records, then once more over the records deferred while iterating.
+
+    A record failing on a concurrency error even after `call_with_concurrency_retry` is deferred to
+    the end of the batch rather than aborting it: the rows it contends on are likely released by
+    then, and the rest of the batch keeps flowing in the meantime.
+
+    :param iterable items: The records of the batch.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.deferred = []
+        self.retrying = False  # Whether the deferred records are being iterated over.
+
+    def __iter__(self):
+        yield from self.items
+        self.retrying = True
+        deferred, self.deferred = self.deferred, []
+        yield from deferred
+
+    def defer(self, item):
+        """Defer a record to the end of the batch, unless it already was.
+
+        :return: Whether the record was deferred.
+        :rtype: bool
+        """
+        if self.retrying:
+            return False
+        self.deferred.append(item)
+        return True
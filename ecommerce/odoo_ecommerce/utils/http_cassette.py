@@ -0,0 +1,245 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Record the HTTP traffic of the connectors into fixture files and replay it offline.
+
+While a cassette is active, every call sent through `utils.request.ecommerce_request` is either
+recorded into it or answered from it, for the whole process. Activate them in processes dedicated
+to profiling only, e.g. with `odoo-bin ecommerce_benchmark fetch --record/--replay`.
+"""
+
+import base64
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+_logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+REDACTED = 'REDACTED'
+# Headers and query parameters carrying credentials on any of the supported platforms.
+SENSITIVE_HEADERS = {
+    'authorization', 'proxy-authorization', 'cookie', 'set-cookie',
+    'x-shopify-access-token', 'x-auth-token', 'x-auth-client',
+}
+SENSITIVE_PARAMS = {
+    'access_token', 'client_secret', 'consumer_key', 'consumer_secret', 'key', 'oauth_consumer_key',
+    'oauth_nonce', 'oauth_signature', 'oauth_timestamp', 'oauth_token', 'password', 'token', 'ws_key',
+}
+# Shorter secrets are not replaced in the bodies, where they would match unrelated values.
+MIN_SECRET_LENGTH = 6
+
+_active_cassette = None
+
+
+class CassetteMissError(Exception):
+    """Raised when a replayed call has no recorded response left in the cassette."""
+
+
+class HttpCassette:
+    """A fixture file of request/response pairs, as gzipped JSON lines.
+
+    The first line holds the metadata of the recording, and each following line an interaction:
+    `{method, url, request_body, status_code, reason, headers, body, encoding, latency}`. The
+    credentials are scrubbed before anything is written: the values of `SENSITIVE_HEADERS` and
+    `SENSITIVE_PARAMS`, the user info of the URLs and every occurrence of the given secrets.
+
+    The calls are replayed in the order they were recorded: each call gets the first unused
+    response recorded for the same method and URL, or else for the same method and path, to
+    tolerate query parameters computed from the current time.
+
+    :param str path: The path of the fixture file.
+    :param str mode: 'record' or 'replay'.
+    :param list secrets: The credentials of the account to scrub, see
+                         `ecommerce.account._get_api_secrets`.
+    :param bool timing: Whether replayed calls wait for the recorded latency.
+    """
+
+    def __init__(self, path, mode, secrets=(), timing=False):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.secrets = sorted(
+            {secret for secret in secrets if secret and len(secret) >= MIN_SECRET_LENGTH}, key=len, reverse=True,
+        )
+        self.interactions = []
+        self._by_url = defaultdict(deque)  # {(method, url): interactions}
+        self._by_path = defaultdict(deque)  # {(method, path): interactions}
+        self._lock = threading.Lock()  # Connectors may send their calls from several threads.
+        if mode == 'replay':
+            self._load()
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    # === SCRUBBING === #
+
+    def scrub(self, text):
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    def scrub_url(self, url):
+        parts = urlsplit(url)
+        netloc = parts.netloc.rpartition('@')[2]  # Drop the credentials of basic authentication.
+        query = urlencode([
+            (key, REDACTED if key.lower() in SENSITIVE_PARAMS else value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        ])
+        return self.scrub(urlunsplit((parts.scheme, netloc, parts.path, query, '')))
+
+    def scrub_headers(self, headers):
+        return {
+            key: REDACTED if key.lower() in SENSITIVE_HEADERS else self.scrub(str(value))
+            for key, value in headers.items()
+        }
+
+    def _encode_body(self, body):
+        if body is None:
+            return None, None
+        if isinstance(body, str):
+            body = body.encode()
+        try:
+            return self.scrub(body.decode('utf-8')), 'utf-8'
+        except (UnicodeDecodeError, AttributeError):  # Binary or streamed bodies are kept as is.
+            return base64.b64encode(body).decode() if isinstance(body, bytes) else None, 'base64'
+
+    # === RECORDING === #
+
+    def record(self, method, url, kwargs, response, latency):
+        """Add a call sent to the platform to the cassette.
+
+        :param str method: The HTTP method.
+        :param str url: The URL of the call, before the query parameters of `kwargs` are added.
+        :param dict kwargs: The keyword arguments of `requests.request`.
+        :param requests.Response response: The response of the platform. Its body is read.
+        :param float latency: The duration of the call, in milliseconds.
+        """
+        prepared = _prepare_request(method, url, kwargs)
+        request_body, _encoding = self._encode_body(prepared.body)
+        body, encoding = self._encode_body(response.content)
+        interaction = {
+            'method': prepared.method,
+            'url': self.scrub_url(prepared.url),
+            'request_body': request_body,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': self.scrub_headers(response.headers),
+            'body': body,
+            'encoding': encoding,
+            'latency': round(latency / 1000, 4),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as file:
+            file.write(json.dumps({'version': FORMAT_VERSION, 'interactions': len(self.interactions)}) + '\n')
+            for interaction in self.interactions:
+                file.write(json.dumps(interaction) + '\n')
+        _logger.info("Recorded %s HTTP calls into %s.", len(self.interactions), self.path)
+
+    # === REPLAYING === #
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as file:
+            header = json.loads(next(file))
+            if header.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported version {header.get('version')} of the cassette {self.path}")
+            for line in file:
+                interaction = json.loads(line)
+                interaction['used'] = False
+                self.interactions.append(interaction)
+                self._by_url[interaction['method'], interaction['url']].append(interaction)
+                self._by_path[interaction['method'], urlsplit(interaction['url']).path].append(interaction)
+
+    def _pop(self, queue):
+        while queue and queue[0]['used']:
+            queue.popleft()
+        if queue:
+            queue[0]['used'] = True
+            return queue.popleft()
+        return None
+
+    def replay(self, method, url, **kwargs):
+        """Return the recorded response of a call instead of sending it.
+
+        :return: The response, as built by `requests`.
+        :rtype: requests.Response
+        :raise CassetteMissError: If no response is left for the call.
+        """
+        prepared = _prepare_request(method, url, kwargs)
+        scrubbed_url = self.scrub_url(prepared.url)
+        with self._lock:
+            interaction = (
+                self._pop(self._by_url[prepared.method, scrubbed_url])
+                or self._pop(self._by_path[prepared.method, urlsplit(scrubbed_url).path])
+            )
+        if interaction is None:
+            raise CassetteMissError(f"No recorded response left for {prepared.method} {scrubbed_url} in {self.path}")
+        if self.timing:
+            time.sleep(interaction['latency'])
+        body = interaction['body'] or ''
+        content = base64.b64decode(body) if interaction['encoding'] == 'base64' else body.encode()
+        response = requests.Response()
+        response.status_code = interaction['status_code']
+        response.reason = interaction['reason']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = prepared.url
+        response.request = prepared
+        response.elapsed = timedelta(seconds=interaction['latency'])
+        response.raw = io.BytesIO(content)
+        response._content = content
+        response._content_consumed = True
+        return response
+
+
+def _prepare_request(method, url, kwargs):
+    """Build the request `requests.request` would send, without sending it."""
+    return requests.Request(
+        method=method.upper(), url=url, headers=kwargs.get('headers'), params=kwargs.get('params'),
+        data=kwargs.get('data'), json=kwargs.get('json'), auth=kwargs.get('auth'),
+    ).prepare()
+
+
+def get_active_cassette():
+    """Return the cassette recording or replaying the calls of the process, if any.
+
+    :rtype: HttpCassette or None
+    """
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(path, mode, secrets=(), timing=False):
+    """Record or replay the calls of the connectors during the `with` block, see `HttpCassette`.
+
+    A recorded cassette is saved when the block exits, even on error.
+
+    :return: The active cassette.
+    :rtype: HttpCassette
+    """
+    global _active_cassette  # noqa: PLW0603
+    if _active_cassette is not None:
+        raise RuntimeError(f"The cassette {_active_cassette.path} is already active")
+    cassette = HttpCassette(path, mode, secrets=secrets, timing=timing)
+    _active_cassette = cassette
+    try:
+        yield cassette
+    finally:
+        _active_cassette = None
+        if mode == 'record':
+            cassette.save()
@@ -0,0 +1,153 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import codecs
+import json
+
+CHUNK_SIZE = 64 * 1024  # Size of the chunks read from the response body, in bytes.
+
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+class _JsonStream:
+    """Buffer over a stream of JSON text chunks, decoding one value at a time.
+
+    Only the part of the document that is not yet decoded is kept in memory, so the memory used
+    depends on the size of the largest value decoded at once instead of the size of the document.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+
+    def _read(self, min_size):
+        """Append at least `min_size` characters to the buffer, unless the stream ends before.
+
+        :return: Whether some characters were appended.
+        :rtype: bool
+        """
+        if self._exhausted:
+            return False
+        if self._pos > len(self._buffer) // 2:  # Drop the decoded part of the buffer.
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        parts = []
+        size = 0
+        for chunk in self._chunks:
+            text = chunk if isinstance(chunk, str) else self._utf8.decode(chunk)
+            parts.append(text)
+            size += len(text)
+            if size >= min_size:
+                break
+        else:
+            self._exhausted = True
+            parts.append(self._utf8.decode(b'', final=True))
+        text = ''.join(parts)
+        self._buffer += text
+        return bool(text)
+
+    def peek(self):
+        """Skip the whitespaces and return the next character, or an empty string at the end."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read(CHUNK_SIZE):
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buffer, self._pos)
+        self._pos += 1
+
+    def decode(self):
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # The value is probably truncated: at least double the pending text before retrying,
+                # to keep the decoding linear for values spanning many chunks.
+                if self._read(max(len(self._buffer) - self._pos, CHUNK_SIZE)):
+                    continue
+                raise
+            if end == len(self._buffer) and self._read(CHUNK_SIZE):
+                continue  # A number at the end of the buffer may go on in the next chunk.
+            self._pos = end
+            return value
+
+
+def _iter_array(stream):
+    stream.expect('[')
+    if stream.peek() == ']':
+        stream.expect(']')
+        return
+    while True:
+        yield stream.decode()
+        if stream.peek() != ',':
+            break
+        stream.expect(',')
+    stream.expect(']')
+
+
+def iter_json_array(chunks, key=None, other_values=None):
+    """Yield the items of a JSON array as soon as they are decoded from the given text chunks.
+
+    The array is either the top-level value of the document, or the value of `key` in the
+    top-level object. A top-level array is also accepted when `key` is given, as some platforms
+    answer `[]` instead of an object when nothing matches. If the value of `key` is not an array,
+    it is yielded as a single item, unless it is null.
+
+    :param chunks: Iterable of `bytes` (UTF-8) or `str` chunks of the JSON document.
+    :param str key: The key of the array in the top-level object, if any.
+    :param dict other_values: If given, filled with the other values of the top-level object as
+                              they are decoded. The values placed after the array are only
+                              available once the iteration is over.
+    :return: A generator of the decoded items.
+    :raise json.JSONDecodeError: If the document is not valid JSON.
+    """
+    stream = _JsonStream(chunks)
+    char = stream.peek()
+    if char == '[':
+        yield from _iter_array(stream)
+    elif char == '{' and key is not None:
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            name = stream.decode()
+            stream.expect(':')
+            if name == key and stream.peek() == '[':
+                yield from _iter_array(stream)
+            else:
+                value = stream.decode()  # Also skips the values that are not needed.
+                if name == key:
+                    if value is not None:
+                        yield value
+                elif other_values is not None:
+                    other_values[name] = value
+            if stream.peek() != ',':
+                break
+            stream.expect(',')
+        stream.expect('}')
+    elif char:
+        raise json.JSONDecodeError(
+            "Expecting an array" if key is None else "Expecting an object or an array", stream._buffer, stream._pos,
+        )
+
+
+def iter_response_json_array(response, key=None, other_values=None):
+    """Yield the items of the JSON array of a streamed response as they are received.
+
+    The response should be requested with `stream=True`; it is closed once the iteration is over.
+    See `iter_json_array` for the parameters.
+    """
+    try:
+        yield from iter_json_array(response.iter_content(CHUNK_SIZE), key=key, other_values=other_values)
+    finally:
+        response.close()
@@ -0,0 +1,297 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""In-memory sync metrics, exposed in the Prometheus text format by `/ecommerce/metrics`.
+
+Each worker keeps its own counters and histograms in memory, which only costs a lock and a dict
+update per observation. To share them across the workers without any database write, each worker
+dumps its metrics to a JSON file in the data directory at most every `DUMP_INTERVAL` seconds; the
+endpoint sums the files of all the workers.
+
+The files are keyed on worker slots rather than on pids: a worker claims the first slot whose lock
+file is free and holds it until it stops, and a recycled worker claims the slot of the stopped one
+back and resumes its counters, so the number of files stays bounded by the number of concurrent
+workers. The slots left unclaimed for `STALE_FILE_AGE` are folded into the retired file before
+being removed, so that the counters never decrease.
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+try:
+    import fcntl
+except ImportError:  # Windows, where the server runs in a single process.
+    fcntl = None
+
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+DUMP_INTERVAL = 15  # Minimum number of seconds between two dumps of the metrics of a worker.
+STALE_FILE_AGE = 7 * 24 * 3600  # Age in seconds after which an unclaimed slot is folded into the retired file.
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)  # In seconds.
+RETIRED_FILE_NAME = 'retired'
+SLOT_PREFIX = 'worker-'
+
+METRICS_HELP = {
+    'ecommerce_api_requests_total': ('counter', "Requests sent to the E-commerce platforms."),
+    'ecommerce_api_request_duration_seconds': ('histogram', "Latency of the requests sent to the E-commerce platforms."),
+    'ecommerce_sync_runs_total': ('counter', "Sync runs, per account, flow and outcome."),
+    'ecommerce_sync_records_total': ('counter', "Records fetched, processed and failed by the sync runs."),
+    'ecommerce_sync_run_duration_seconds': ('histogram', "Duration of the sync runs."),
+    'ecommerce_order_process_duration_seconds': ('histogram', "Time spent processing each synchronized order."),
+    'ecommerce_order_lane_total': ('counter', "Orders fetched by the orders sync, per priority lane."),
+    'ecommerce_queue_depth': ('gauge', "Records waiting to be synchronized with the E-commerce platform."),
+    'ecommerce_last_successful_sync_age_seconds': ('gauge', "Seconds since the last complete sync of the account."),
+}
+
+_metrics = {}  # {dbname: {'counters': {key: value}, 'histograms': {key: [buckets..., sum, count]}}}
+_last_dumps = {}
+_slots = {}  # {dbname: (pid, slot name, locked file)}
+_lock = threading.Lock()
+_slot_lock = threading.Lock()
+
+
+def _get_metrics_dir(dbname):
+    return os.path.join(config['data_dir'], 'ecommerce_metrics', dbname)
+
+
+def _get_key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+def _get_db_metrics(dbname):
+    db_metrics = _metrics.get(dbname)
+    if db_metrics is None:
+        db_metrics = _metrics[dbname] = {'counters': {}, 'histograms': {}}
+    return db_metrics
+
+
+def _read_metrics_file(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def _write_metrics_file(path, content):
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.replace(f'{path}.tmp', path)  # Atomic, so the endpoint never reads a partial file.
+
+
+def _merge_metrics(db_metrics, other_metrics):
+    """Add the counters and histograms of `other_metrics` to `db_metrics`, both as dumped."""
+    counters = db_metrics.setdefault('counters', {})
+    for key, value in other_metrics.get('counters', {}).items():
+        counters[key] = counters.get(key, 0) + value
+    histograms = db_metrics.setdefault('histograms', {})
+    for key, values in other_metrics.get('histograms', {}).items():
+        total = histograms.setdefault(key, [0] * len(values))
+        for index, value in enumerate(values):
+            total[index] += value
+
+
+def _list_metrics_files(metrics_dir):
+    try:
+        return [file_name for file_name in os.listdir(metrics_dir) if file_name.endswith('.json')]
+    except FileNotFoundError:
+        return []
+
+
+def _try_lock(path):
+    """Open and lock the file at `path` without blocking.
+
+    :return: The locked file, or None if another worker holds the lock.
+    """
+    lock_file = open(path, 'a')  # noqa: SIM115
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _claim_slot(dbname, metrics_dir):
+    """Return the name of the slot of this worker, claiming the first free one if needed.
+
+    The metrics left in the file of a reclaimed slot by the stopped worker are resumed, so that its
+    counters carry on from where they were.
+    """
+    with _slot_lock:
+        slot = _slots.get(dbname)
+        if slot and slot[0] == os.getpid():  # A forked worker inherits the slot of its parent.
+            return slot[1]
+        if fcntl is None:
+            _slots[dbname] = (os.getpid(), f'{os.getpid()}-{int(time.time())}', None)
+            return _slots[dbname][1]
+        for index in itertools.count():
+            slot_name = f'{SLOT_PREFIX}{index}'
+            lock_file = _try_lock(os.path.join(metrics_dir, f'{slot_name}.lock'))
+            if lock_file:
+                break
+        _slots[dbname] = (os.getpid(), slot_name, lock_file)  # Held until the worker stops.
+        try:
+            previous_metrics = _read_metrics_file(os.path.join(metrics_dir, f'{slot_name}.json'))
+        except (OSError, ValueError):
+            previous_metrics = {}
+        with _lock:
+            _merge_metrics(_get_db_metrics(dbname), previous_metrics)
+        return slot_name
+
+
+def _retire_stale_files(metrics_dir, file_names):
+    """Fold the files of the slots left unclaimed for `STALE_FILE_AGE` into the retired file."""
+    retired_path = os.path.join(metrics_dir, f'{RETIRED_FILE_NAME}.json')
+    for file_name in file_names:
+        slot_name = file_name.removesuffix('.json')
+        if slot_name == RETIRED_FILE_NAME:
+            continue
+        path = os.path.join(metrics_dir, file_name)
+        slot_lock_file = retired_lock_file = None
+        try:
+            if time.time() - os.path.getmtime(path) <= STALE_FILE_AGE:
+                continue
+            if fcntl and slot_name.startswith(SLOT_PREFIX):
+                slot_lock_file = _try_lock(os.path.join(metrics_dir, f'{slot_name}.lock'))
+                if not slot_lock_file:
+                    continue  # Claimed by a running worker.
+            if fcntl:
+                retired_lock_file = open(os.path.join(metrics_dir, f'{RETIRED_FILE_NAME}.lock'), 'a')  # noqa: SIM115
+                fcntl.flock(retired_lock_file, fcntl.LOCK_EX)
+            try:
+                retired_metrics = _read_metrics_file(retired_path)
+            except FileNotFoundError:
+                retired_metrics = {}
+            _merge_metrics(retired_metrics, _read_metrics_file(path))
+            _write_metrics_file(retired_path, json.dumps(retired_metrics))
+            os.unlink(path)
+        except (OSError, ValueError):
+            _logger.warning("Could not retire the E-commerce metrics file %s.", path, exc_info=True)
+        finally:
+            for lock_file in (retired_lock_file, slot_lock_file):
+                if lock_file:
+                    lock_file.close()
+
+
+def inc(dbname, name, labels, value=1):
+    """Increment the counter `name` with the given labels.
+
+    :param str dbname: The database the metric belongs to.
+    :param str name: The name of the counter, declared in `METRICS_HELP`.
+    :param dict labels: The labels of the counter, as strings.
+    :param float value: The increment.
+    :return: None
+    """
+    key = _get_key(name, labels)
+    with _lock:
+        counters = _get_db_metrics(dbname)['counters']
+        counters[key] = counters.get(key, 0) + value
+    dump(dbname)
+
+
+def observe(dbname, name, labels, value):
+    """Add an observation to the histogram `name` with the given labels.
+
+    See `inc` for the parameters; the buckets are `DURATION_BUCKETS`.
+    """
+    key = _get_key(name, labels)
+    with _lock:
+        histograms = _get_db_metrics(dbname)['histograms']
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [0] * (len(DURATION_BUCKETS) + 3)
+        histogram[bisect_left(DURATION_BUCKETS, value)] += 1  # The bucket after the last one is +Inf.
+        histogram[-2] += value
+        histogram[-1] += 1
+    dump(dbname)
+
+
+def dump(dbname, force=False):
+    """Write the metrics of this worker to the file of its slot, unless they were written recently.
+
+    :param str dbname: The database whose metrics to write.
+    :param bool force: Whether to write them regardless of the last dump.
+    :return: None
+    """
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _last_dumps.get(dbname, 0) < DUMP_INTERVAL:
+            return
+        _last_dumps[dbname] = now
+    metrics_dir = _get_metrics_dir(dbname)
+    path = metrics_dir
+    try:
+        os.makedirs(metrics_dir, exist_ok=True)
+        path = os.path.join(metrics_dir, f'{_claim_slot(dbname, metrics_dir)}.json')
+        with _lock:
+            content = json.dumps(_metrics.get(dbname) or {})
+        _write_metrics_file(path, content)
+    except OSError:
+        _logger.warning("Could not write the E-commerce metrics to %s.", path, exc_info=True)
+
+
+def collect(dbname):
+    """Return the metrics of all the workers, summed with the retired ones.
+
+    :return: The counters and the histograms, as `{(name, labels): value}` dictionaries where
+             `labels` is a tuple of `(label, value)` pairs.
+    :rtype: tuple
+    """
+    dump(dbname, force=True)
+    metrics_dir = _get_metrics_dir(dbname)
+    _retire_stale_files(metrics_dir, _list_metrics_files(metrics_dir))
+    total_metrics = {}
+    for file_name in _list_metrics_files(metrics_dir):
+        try:
+            _merge_metrics(total_metrics, _read_metrics_file(os.path.join(metrics_dir, file_name)))
+        except (OSError, ValueError):
+            continue  # Retired or being replaced by another worker.
+    counters = {}
+    histograms = {}
+    for key, value in total_metrics.get('counters', {}).items():
+        name, labels = json.loads(key)
+        counters[(name, tuple(map(tuple, labels)))] = value
+    for key, values in total_metrics.get('histograms', {}).items():
+        name, labels = json.loads(key)
+        histograms[(name, tuple(map(tuple, labels)))] = values
+    return counters, histograms
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (label, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for label, value in labels
+    )
+    return '{%s}' % ','.join(f'{label}="{value}"' for label, value in escaped)
+
+
+def render(counters, histograms, gauges):
+    """Render the metrics in the Prometheus text exposition format.
+
+    :param dict counters: The counters, as returned by `collect`.
+    :param dict histograms: The histograms, as returned by `collect`.
+    :param dict gauges: The gauges, in the same format as the counters.
+    :rtype: str
+    """
+    samples_by_name = {}
+    for (name, labels), value in sorted((*counters.items(), *gauges.items())):
+        samples_by_name.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+    for (name, labels), values in sorted(histograms.items()):
+        samples = samples_by_name.setdefault(name, [])
+        cumulated = 0
+        for bound, count in zip((*DURATION_BUCKETS, '+Inf'), values[:-2]):
+            cumulated += count
+            samples.append(f'{name}_bucket{_format_labels((*labels, ("le", bound)))} {cumulated}')
+        samples.append(f'{name}_sum{_format_labels(labels)} {values[-2]}')
+        samples.append(f'{name}_count{_format_labels(labels)} {values[-1]}')
+    lines = []
+    for name, samples in sorted(samples_by_name.items()):
+        metric_type, metric_help = METRICS_HELP.get(name, ('untyped', name))
+        lines += [f'# HELP {name} {metric_help}', f'# TYPE {name} {metric_type}', *samples]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,187 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Compact representation of the normalized order contract described in
+`ecommerce.account._fetch_orders_from_ecommerce`.
+
+Connectors keep building plain dictionaries; the sync engine converts them with
+`ECommerceOrder.from_dict` as soon as they are received. The conversion validates the payload and
+stores the known keys in `__slots__` instead of one dictionary per order, line, address and
+fulfillment. The records are read-only mappings, so `order_data.get('reference')` and
+`order_data['order_lines']` keep working in existing overrides. Keys that are not part of the
+contract (connector-specific values such as `utm_data`) are kept aside and remain readable.
+"""
+
+from collections.abc import Mapping
+
+from odoo.addons.odoo_ecommerce.utils import ECommerceDataError
+
+
+class _ContractRecord(Mapping):
+    """Read-only mapping storing the keys of the contract in slots.
+
+    A slot that is not set behaves like a missing key, so `get(key, default)` keeps returning the
+    default for keys the connector did not provide.
+    """
+    __slots__ = ('_extra',)
+
+    _fields = ()  # The keys of the contract, stored in slots.
+    _required_fields = ()  # The keys that must be set to a non-empty value.
+    _float_fields = ()  # The keys whose value must be convertible to a float, when set.
+    _record_fields = {}  # The keys holding a nested record, mapped to its class.
+    _record_list_fields = {}  # The keys holding a list of nested records, mapped to their class.
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        """Validate the given data and convert it into a record.
+
+        :param dict data: The data to convert, following the normalized order contract.
+        :param str path: The location of the data in the order, used in error messages.
+        :return: The record, or `data` itself if it is already a record of this class.
+        :raise ECommerceDataError: If the data does not follow the contract.
+        """
+        if isinstance(data, cls):
+            return data
+        path = path or cls.__name__
+        if not isinstance(data, Mapping):
+            raise ECommerceDataError(f"{path} must be a dictionary, got {type(data).__name__}.")
+        record = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            if key not in cls._fields:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if key in cls._record_fields and value:
+                value = cls._record_fields[key].from_dict(value, f"{path}.{key}")
+            elif key in cls._record_list_fields and value:
+                if not isinstance(value, (list, tuple)):
+                    raise ECommerceDataError(f"{path}.{key} must be a list, got {type(value).__name__}.")
+                record_class = cls._record_list_fields[key]
+                value = [record_class.from_dict(item, f"{path}.{key}[{index}]") for index, item in enumerate(value)]
+            elif key in cls._float_fields and value not in (None, False, ''):
+                try:
+                    float(value)
+                except (TypeError, ValueError):
+                    raise ECommerceDataError(f"{path}.{key} must be a number, got {value!r}.") from None
+            setattr(record, key, value)
+        record._extra = extra
+        for key in cls._required_fields:
+            if data.get(key) in (None, False, ''):
+                raise ECommerceDataError(f"{path}.{key} is required.")
+        return record
+
+    def to_dict(self):
+        """Return the record as plain dictionaries, as built by the connector."""
+        result = {}
+        for key, value in self.items():
+            if isinstance(value, _ContractRecord):
+                value = value.to_dict()
+            elif isinstance(value, list) and key in self._record_list_fields:
+                value = [item.to_dict() if isinstance(item, _ContractRecord) else item for item in value]
+            result[key] = value
+        return result
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self._fields:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _key in self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+class ECommerceAddress(_ContractRecord):
+    __slots__ = _fields = (
+        'name', 'email', 'phone', 'street', 'street2', 'zip', 'city', 'state_code', 'country_code',
+        'is_company', 'vat', 'customer_id', 'company_name',
+    )
+
+
+class ECommerceProductData(_ContractRecord):
+    __slots__ = _fields = ('name', 'sku', 'ec_product_identifier', 'ec_product_template_identifier')
+
+
+class ECommerceOrderLine(_ContractRecord):
+    __slots__ = _fields = (
+        'id', 'description', 'product_data', 'uom', 'display_type',
+        'qty_ordered', 'qty_shipped', 'qty_delivered', 'qty_returned', 'qty_refunded', 'qty_canceled',
+        'price_unit', 'price_subtotal', 'price_total', 'discount_amount', 'discount_tax', 'tax_amount',
+        'tax_percent',
+    )
+    _required_fields = ('product_data',)
+    _float_fields = _fields[5:]
+    _record_fields = {'product_data': ECommerceProductData}
+
+
+class ECommerceShippingLine(_ContractRecord):
+    __slots__ = _fields = (
+        'id', 'description', 'shipping_code', 'price_unit', 'discount_amount', 'discount_tax', 'tax_amount',
+    )
+    _float_fields = _fields[3:]
+
+
+class ECommerceDiscountLine(_ContractRecord):
+    __slots__ = _fields = ('description', 'price_unit', 'tax_amount')
+    _float_fields = ('price_unit', 'tax_amount')
+
+
+class ECommerceFulfillmentLine(_ContractRecord):
+    __slots__ = _fields = ('ecommerce_line_identifier', 'ecommerce_move_identifier', 'quantity')
+    _float_fields = ('quantity',)
+
+
+class ECommerceFulfillment(_ContractRecord):
+    __slots__ = _fields = (
+        'ecommerce_picking_identifier', 'status', 'line_items', 'carrier_id', 'tracking_number',
+        'location_id', 'shipping_address',
+    )
+    _record_fields = {'shipping_address': ECommerceAddress}
+    _record_list_fields = {'line_items': ECommerceFulfillmentLine}
+
+
+class ECommerceOrder(_ContractRecord):
+    __slots__ = _fields = (
+        'id', 'reference', 'create_date', 'write_date', 'date_order', 'status', 'financial_status',
+        'currency_code', 'location_id', 'customer_id',
+        'shipping_price', 'shipping_tax_amount', 'shipping_discount', 'shipping_discount_tax',
+        'billing_address', 'shipping_address', 'other_addresses',
+        'order_lines', 'shipping_lines', 'discount_lines', 'fulfillments',
+    )
+    _required_fields = ('id',)
+    _float_fields = ('shipping_price', 'shipping_tax_amount', 'shipping_discount', 'shipping_discount_tax')
+    _record_fields = {
+        'billing_address': ECommerceAddress,
+        'shipping_address': ECommerceAddress,
+    }
+    _record_list_fields = {
+        'other_addresses': ECommerceAddress,
+        'order_lines': ECommerceOrderLine,
+        'shipping_lines': ECommerceShippingLine,
+        'discount_lines': ECommerceDiscountLine,
+        'fulfillments': ECommerceFulfillment,
+    }
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        record = super().from_dict(data, path)
+        if record.get('status') not in (None, False, 'confirmed', 'canceled'):
+            raise ECommerceDataError(
+                f"{path or cls.__name__}.status must be 'confirmed' or 'canceled', got {record['status']!r}.",
+            )
+        return record
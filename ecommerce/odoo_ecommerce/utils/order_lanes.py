@@ -0,0 +1,133 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+"""Priority lanes of the orders synchronized by `ecommerce.account._sync_orders`.
+
+The fetched orders are classified into lanes: the new paid orders, the other new orders, the
+cancellations and the updates of the orders already synchronized. Within an account, the orders are
+processed by weighted round-robin over the lanes, so that a flood of updates (e.g. when catching up
+after an outage) does not delay the new orders the warehouse has to pick. Across accounts, the runs
+are interleaved page by page by `run_weighted_fair`, each run being charged less for the orders of
+the urgent lanes.
+"""
+
+import heapq
+from collections import deque
+
+LANE_NEW_PAID = 'new_paid'
+LANE_NEW_CONFIRMED = 'new_confirmed'
+LANE_CANCELLATION = 'cancellation'
+LANE_UPDATE = 'update'
+LANES = (LANE_NEW_PAID, LANE_NEW_CONFIRMED, LANE_CANCELLATION, LANE_UPDATE)
+NEW_ORDER_LANES = (LANE_NEW_PAID, LANE_NEW_CONFIRMED)
+
+# The number of orders processed from each lane for 1 update, overridden by the
+# `odoo_ecommerce.order_lane_weight_<lane>` system parameters.
+DEFAULT_LANE_WEIGHTS = {
+    LANE_NEW_PAID: 8,
+    LANE_NEW_CONFIRMED: 4,
+    LANE_CANCELLATION: 2,
+    LANE_UPDATE: 1,
+}
+# The number of fetched updates and cancellations that may be held back while the next pages are
+# fetched, overridden by the `odoo_ecommerce.order_lanes_max_deferred` system parameter.
+DEFAULT_MAX_DEFERRED = 1000
+# The number of held back orders processed per step once all the pages were fetched.
+DRAIN_STEP_SIZE = 100
+
+
+def get_order_lane(order_data, known_identifiers):
+    """Return the lane of a fetched order.
+
+    :param order_data: The order, as an `ECommerceOrder` mapping or the dict of the connector.
+    :param set known_identifiers: The E-commerce identifiers of the orders already synchronized.
+    :return: One of `LANES`.
+    :rtype: str
+    """
+    if order_data.get('status') == 'canceled':
+        return LANE_CANCELLATION
+    if str(order_data.get('id')) in known_identifiers:
+        return LANE_UPDATE
+    if order_data.get('financial_status') == 'PAID':
+        return LANE_NEW_PAID
+    return LANE_NEW_CONFIRMED
+
+
+class OrderLanes:
+    """FIFO queues of orders, one per lane, popped by smooth weighted round-robin.
+
+    At each pop, every non-empty lane earns its weight in credit and the lane with the most credit
+    is popped and pays the total of the weights, as in the weighted round-robin of nginx. The lanes
+    are thus interleaved evenly in the proportion of their weights, and no lane starves.
+
+    :param dict weights: The weight of each lane, see `DEFAULT_LANE_WEIGHTS`.
+    """
+
+    def __init__(self, weights):
+        self.weights = weights
+        self.queues = {lane: deque() for lane in LANES}
+        self._credits = dict.fromkeys(LANES, 0)
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def push(self, lane, order_data):
+        self.queues[lane].append(order_data)
+
+    def count(self, lanes=LANES):
+        """Return the number of queued orders in the given lanes."""
+        return sum(len(self.queues[lane]) for lane in lanes)
+
+    def pop(self):
+        """Remove and return the next order to process, with its lane.
+
+        :rtype: tuple(str, order_data)
+        """
+        lanes = [lane for lane in LANES if self.queues[lane]]
+        for lane in lanes:
+            self._credits[lane] += self.weights[lane]
+        lane = max(lanes, key=self._credits.get)
+        self._credits[lane] -= sum(self.weights[queued_lane] for queued_lane in lanes)
+        order_data = self.queues[lane].popleft()
+        if not self.queues[lane]:
+            self._credits[lane] = 0  # Do not carry the credit of a drained lane over to the next orders.
+        return lane, order_data
+
+    def drain(self, max_deferred=0):
+        """Pop the orders to process now, by weighted round-robin.
+
+        The new orders are all popped, with the share of updates and cancellations given by the
+        weights; the remaining updates and cancellations are held back, up to `max_deferred` orders,
+        to process the new orders of the next pages first.
+
+        :param int max_deferred: The number of orders that may be left in the queues.
+        :return: A generator of `(lane, order_data)` tuples.
+        """
+        while self.count(NEW_ORDER_LANES) or len(self) > max_deferred:
+            yield self.pop()
+
+
+def run_weighted_fair(runs):
+    """Advance the given generators one step at a time until they are all exhausted.
+
+    Each step of a run yields its cost, added to the virtual time of the run, and the run with the
+    lowest virtual time is always advanced next (the ties in the given order). A run whose steps are
+    cheap, e.g. because it processes new orders, is thus advanced more often than a run processing
+    updates, without the latter ever being starved.
+
+    If a run raises, the remaining runs are closed before the error is propagated.
+
+    :param list runs: The generators, yielding the cost of each step as a number.
+    :return: None
+    """
+    heap = [(0.0, index, run) for index, run in enumerate(runs)]
+    try:
+        while heap:
+            virtual_time, index, run = heapq.heappop(heap)
+            try:
+                cost = next(run)
+            except StopIteration:
+                continue
+            heapq.heappush(heap, (virtual_time + cost, index, run))
+    finally:
+        for _virtual_time, _index, run in heap:
+            run.close()
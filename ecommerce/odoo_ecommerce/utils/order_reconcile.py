@@ -0,0 +1,48 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import fields
+
+
+def parse_write_date(value):
+    """Return the update date of an order stamp or payload as a naive UTC datetime.
+
+    :param value: The date, as a datetime or a string in '%Y-%m-%d %H:%M:%S' format.
+    :return: The date, or None if it is missing or malformed.
+    :rtype: datetime or None
+    """
+    if not value:
+        return None
+    try:
+        return fields.Datetime.to_datetime(value)
+    except ValueError:
+        return None
+
+
+def diff_order_stamps(remote_stamps, local_stamps):
+    """Compare the orders of a platform with the orders imported from it.
+
+    Both sides are sorted by identifier and walked once in parallel, like a merge join:
+
+    - a remote order without a local counterpart is missing;
+    - a remote order updated after the update date stored on its local counterpart is stale.
+      Local orders without a stored update date, imported before it was tracked, are not.
+
+    :param list remote_stamps: The `(identifier, write_date)` pairs of the platform orders.
+    :param list local_stamps: The `(identifier, write_date)` pairs of the local orders.
+    :return: The identifiers of the missing orders and of the stale orders, in identifier order.
+    :rtype: tuple(list, list)
+    """
+    remote_stamps = sorted((str(identifier), write_date) for identifier, write_date in remote_stamps)
+    local_stamps = sorted((str(identifier), write_date) for identifier, write_date in local_stamps)
+    missing, stale = [], []
+    local_index, local_count = 0, len(local_stamps)
+    for identifier, remote_date in remote_stamps:
+        while local_index < local_count and local_stamps[local_index][0] < identifier:
+            local_index += 1
+        if local_index == local_count or local_stamps[local_index][0] != identifier:
+            missing.append(identifier)
+            continue
+        local_date = local_stamps[local_index][1]
+        if remote_date and local_date and remote_date > local_date:
+            stale.append(identifier)
+    return missing, stale
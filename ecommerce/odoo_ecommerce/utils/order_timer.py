@@ -0,0 +1,81 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_timer = ContextVar('ecommerce_order_timer', default=None)
+
+
+class OrderTimer:
+    """Measure the wall time and the SQL queries spent processing one order, split by step.
+
+    The timer is started around `_process_order_data` with a `with` block; the steps are delimited
+    by `order_step` in the methods it calls, so that they are measured without changing their
+    signature. The measures of a step exclude those of the steps nested in it, and the time
+    spent outside of any step is reported as `other`.
+
+    :param cr: The cursor whose queries are counted.
+    """
+
+    def __init__(self, cr):
+        self.cr = cr
+        self.duration = 0.0
+        self.queries = 0
+        self.steps = {}  # {step: [duration, queries]}
+        self._nested = []  # [duration, queries] of the nested steps of each running step.
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_timer.set(self)
+        self._start = time.perf_counter()
+        self._start_queries = self.cr.sql_log_count
+        self._nested.append([0.0, 0])
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_timer.reset(self._token)
+        self.duration = time.perf_counter() - self._start
+        self.queries = self.cr.sql_log_count - self._start_queries
+        nested_duration, nested_queries = self._nested.pop()
+        self.steps['other'] = [self.duration - nested_duration, self.queries - nested_queries]
+
+    @contextmanager
+    def step(self, name):
+        """Add the time and the queries of the `with` block to the given step."""
+        start = time.perf_counter()
+        start_queries = self.cr.sql_log_count
+        self._nested.append([0.0, 0])
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            queries = self.cr.sql_log_count - start_queries
+            nested_duration, nested_queries = self._nested.pop()
+            stats = self.steps.setdefault(name, [0.0, 0])
+            stats[0] += duration - nested_duration
+            stats[1] += queries - nested_queries
+            self._nested[-1][0] += duration
+            self._nested[-1][1] += queries
+
+    def format_steps(self):
+        """Return the breakdown of the steps, slowest first, e.g. 'partners: 1.20s/310q, ...'.
+
+        :rtype: str
+        """
+        steps = sorted(self.steps.items(), key=lambda item: item[1][0], reverse=True)
+        return ", ".join(f"{name}: {duration:.2f}s/{queries}q" for name, (duration, queries) in steps)
+
+
+@contextmanager
+def order_step(name):
+    """Attribute the `with` block to the given step of the order being timed, if any.
+
+    Outside of an `OrderTimer`, e.g. when an order is synchronized by reference, nothing is measured.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.step(name):
+        yield
@@ -0,0 +1,28 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def prefetch_pages(fetch_page, cursor):
+    """Yield the pages returned by `fetch_page`, downloading the next page while the current one is
+    being processed by the caller.
+
+    The pages are fetched one at a time by a single background I/O thread, so the total time of a
+    sync approaches max(fetch, process) instead of their sum. As it runs outside the cron thread,
+    `fetch_page` must not use the ORM nor the database cursor: everything it needs (URL, headers,
+    credentials, `AccountRef`) must be read beforehand.
+
+    Errors raised by `fetch_page` are re-raised in the caller when the faulty page is reached.
+    If the caller stops iterating, the page being downloaded is awaited and dropped.
+
+    :param callable fetch_page: Function taking a cursor and returning a `(page, next_cursor)`
+                                tuple, where `next_cursor` is `None` on the last page.
+    :param cursor: The cursor of the first page (page number, pagination token, ...).
+    :return: A generator of pages.
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='ecommerce_prefetch') as executor:
+        future = executor.submit(fetch_page, cursor)
+        while future:
+            page, next_cursor = future.result()
+            future = executor.submit(fetch_page, next_cursor) if next_cursor is not None else None
+            yield page
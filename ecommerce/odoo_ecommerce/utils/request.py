@@ -0,0 +1,133 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import logging
+import time
+from collections import namedtuple
+
+import requests
+
+from odoo.addons.odoo_ecommerce.utils import ECommerceAccountWideError, metrics
+from odoo.addons.odoo_ecommerce.utils.api_ledger import get_body_size, record_api_call
+from odoo.addons.odoo_ecommerce.utils.circuit_breaker import HALF_OPEN, get_circuit_breaker
+from odoo.addons.odoo_ecommerce.utils.http_cassette import get_active_cassette
+
+_logger = logging.getLogger(__name__)
+
+# Statuses meaning the whole account is unusable for now (authentication, rate limit, downtime).
+ACCOUNT_WIDE_STATUSES = {401, 403, 429, 500, 502, 503, 504}
+# Among them, the statuses that are raised directly instead of being handed back to the connector.
+# Authentication failures are handed back so connectors can refresh their token and retry.
+RAISED_ACCOUNT_WIDE_STATUSES = {429, 500, 502, 503, 504}
+
+# Lightweight, ORM-free reference to an `ecommerce.account` record, safe to pass to I/O threads.
+AccountRef = namedtuple('AccountRef', ['dbname', 'account_id', 'channel_code'])
+
+
+def get_account_ref(account):
+    """Return the `AccountRef` of the given account.
+
+    :param account: An `ecommerce.account` record or an `AccountRef`.
+    :rtype: AccountRef
+    """
+    if isinstance(account, AccountRef):
+        return account
+    return account._get_account_ref()
+
+
+def _observe_call(account_ref, status_code, latency):
+    labels = {'channel': account_ref.channel_code}
+    metrics.inc(account_ref.dbname, 'ecommerce_api_requests_total', {**labels, 'status': str(status_code)})
+    metrics.observe(account_ref.dbname, 'ecommerce_api_request_duration_seconds', labels, latency / 1000)
+
+
+def _get_response_size(response, stream):
+    content_length = response.headers.get('Content-Length')
+    if content_length and content_length.isdigit():
+        return int(content_length)
+    return 0 if stream else len(response.content)  # Do not download a streamed body here.
+
+
+def ecommerce_request(account, method, url, retry_count=0, **kwargs):
+    """Send an HTTP request to an E-commerce platform on behalf of the given account.
+
+    This is the transport used by all connectors. It behaves like `requests.request` but guards the
+    call with the circuit breaker of the account:
+
+    - If the circuit is open, no request is sent and an `ECommerceAccountWideError` is raised.
+    - Connection errors, timeouts, rate limits and server errors are raised as
+      `ECommerceAccountWideError` and counted as account-wide failures.
+    - Authentication failures are counted as account-wide failures but the response is returned
+      to let the connector handle it.
+    - Any other response, even a client error, proves the platform is up and closes the circuit.
+
+    Every call that is sent is also recorded in the API call ledger of the account (see
+    `ecommerce.api.call`), and recorded or answered by the active HTTP cassette, if any (see
+    `utils.http_cassette`).
+
+    :param account: The `ecommerce.account` record or its `AccountRef`.
+    :param str method: The HTTP method.
+    :param str url: The URL of the request.
+    :param int retry_count: The number of previous attempts of the same call, for the ledger.
+    :param kwargs: Any keyword argument accepted by `requests.request`.
+    :return: The response of the platform.
+    :rtype: requests.Response
+    :raise ECommerceAccountWideError: If the account cannot be reached.
+    """
+    account_ref = get_account_ref(account)
+    breaker = get_circuit_breaker(account_ref)
+    if not breaker.allow_request():
+        raise ECommerceAccountWideError(
+            f"Requests to {account_ref.channel_code} account with id {account_ref.account_id} are suspended "
+            f"for {breaker.retry_after()} seconds after repeated failures: {breaker.last_error}",
+        )
+    probing = breaker.state == HALF_OPEN
+    try:
+        return _send_request(account_ref, breaker, method, url, retry_count, **kwargs)
+    except BaseException:
+        # The outcome of a half-open probe that ended on another error (e.g. a missing cassette
+        # entry) is unknown; let the next request probe again rather than rejecting them all.
+        if probing:
+            breaker.release_probe()
+        raise
+
+
+def _send_request(account_ref, breaker, method, url, retry_count, **kwargs):
+    """Send the request of `ecommerce_request` and record its outcome in the circuit breaker."""
+    cassette = get_active_cassette()
+    start = time.monotonic()
+    try:
+        if cassette and cassette.replaying:
+            response = cassette.replay(method, url, **kwargs)
+        else:
+            response = requests.request(method, url, **kwargs)
+    except requests.exceptions.RequestException as error:
+        latency = (time.monotonic() - start) * 1000
+        record_api_call(
+            account_ref, method, url, 0, latency,
+            request_size=get_body_size(getattr(error.request, 'body', None)), retry_count=retry_count, error=error,
+        )
+        _observe_call(account_ref, 0, latency)
+        breaker.record_failure(error)
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            _logger.error("Could not reach %s: %s", url, error)
+            raise ECommerceAccountWideError(f"Could not reach {url}: {error}") from error
+        raise  # Invalid URL or schema: every call of the account would fail as well.
+    latency = (time.monotonic() - start) * 1000
+    if cassette and not cassette.replaying:
+        cassette.record(method, url, kwargs, response, latency)
+    record_api_call(
+        account_ref, method, url, response.status_code, latency,
+        request_size=get_body_size(response.request.body),
+        response_size=_get_response_size(response, kwargs.get('stream')),
+        retry_count=retry_count,
+    )
+    _observe_call(account_ref, response.status_code, latency)
+    if response.status_code in ACCOUNT_WIDE_STATUSES:
+        error = f"HTTP {response.status_code} on {url}: {response.text[:300]}"
+        breaker.record_failure(error)
+        if response.status_code in RAISED_ACCOUNT_WIDE_STATUSES:
+            _logger.error("Account-wide error received from %s", error)
+            raise ECommerceAccountWideError(error, error_code=response.status_code)
+    else:
+        breaker.record_success()
+    return response
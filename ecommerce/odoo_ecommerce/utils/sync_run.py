@@ -0,0 +1,131 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import time
+from contextlib import contextmanager
+
+from odoo import fields
+from odoo.tools.profiler import Profiler
+
+PHASES = ('fetch', 'normalize', 'process', 'commit')
+
+
+class SyncRunRecorder:
+    """Collect the timings and counters of one sync flow for one account.
+
+    The durations of the phases are accumulated with `phase`; the time spent outside of any phase
+    (logging, bookkeeping) only shows in the total duration, and the time spent in `paused` does
+    not count at all. The recorder is written as an `ecommerce.sync.run` record by
+    `ecommerce.sync.run._log_run`.
+
+    :param str flow: The synchronized flow, one of the selection values of `ecommerce.sync.run.flow`.
+    :param datetime watermark_from: The date from which the platform data was requested, if any.
+    """
+
+    def __init__(self, flow, watermark_from=None):
+        self.flow = flow
+        self.start_date = fields.Datetime.now()
+        self._start = time.monotonic()
+        self._paused_duration = 0.0
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.count_fetched = 0
+        self.count_processed = 0
+        self.count_failed = 0
+        self.watermark_from = watermark_from
+        self._profiler = None
+        self._profiler_cr = None
+        self._profiler_start_queries = 0
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent in the `with` block to the duration of the given phase."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.durations[name] += time.monotonic() - start
+
+    @contextmanager
+    def paused(self):
+        """Leave the time spent in the `with` block out of the duration of the run.
+
+        Meant for the runs interleaved with the runs of other accounts, around the `yield` of the
+        generators driven by `odoo_ecommerce.utils.order_lanes.run_weighted_fair`.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._paused_duration += time.monotonic() - start
+
+    def iter_phase(self, iterable, name='fetch'):
+        """Yield the items of `iterable`, adding the time spent producing them to the given phase.
+
+        Meant for generators that download the platform data as they are consumed, so that only
+        the time spent waiting for the data is counted, not the processing of the items.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    @contextmanager
+    def profiling(self, cr, description):
+        """Profile the run during the `with` block, or until it is logged by `get_values`.
+
+        The run is profiled with the sampling and SQL collectors of `odoo.tools.profiler`, which
+        save an `ir.profile` record with a separate cursor when they stop.
+
+        :param cr: The cursor of the run, whose queries are counted.
+        :param str description: The name of the profile.
+        """
+        self._profiler = Profiler(collectors=['sql', 'traces_async'], db=cr.dbname, description=description)
+        self._profiler_cr = cr
+        self._profiler_start_queries = cr.sql_log_count
+        self._profiler.__enter__()
+        try:
+            yield
+        finally:
+            self.stop_profiling()
+
+    def stop_profiling(self):
+        """Stop the profiler of the run, if any, and return the values of the profile to log.
+
+        :rtype: dict
+        """
+        if self._profiler is None:
+            return {}
+        profiler, self._profiler = self._profiler, None
+        profiler.__exit__(None, None, None)
+        return {
+            'profile_id': profiler.profile_id,
+            'query_count': self._profiler_cr.sql_log_count - self._profiler_start_queries,
+        }
+
+    def get_values(self, state, watermark_to=None, error=None):
+        """Return the values of the `ecommerce.sync.run` record of the run.
+
+        :param str state: The outcome of the run, one of the selection values of `ecommerce.sync.run.state`.
+        :param datetime watermark_to: The new sync date of the account, if it was moved forward.
+        :param str error: The error that interrupted the run, if any.
+        :rtype: dict
+        """
+        profile_values = self.stop_profiling()  # Do not profile the logging of the run.
+        return {
+            'flow': self.flow,
+            'state': state,
+            'start_date': self.start_date,
+            'end_date': fields.Datetime.now(),
+            'duration': time.monotonic() - self._start - self._paused_duration,
+            **{f'{name}_duration': duration for name, duration in self.durations.items()},
+            'count_fetched': self.count_fetched,
+            'count_processed': self.count_processed,
+            'count_failed': self.count_failed,
+            'watermark_from': self.watermark_from,
+            'watermark_to': watermark_to,
+            'error': error and str(error).split('DETAIL')[0],
+            **profile_values,
+        }